@@ -1,23 +1,67 @@
 import json
-import subprocess
+import os
 import time
 import syslog
 from swsscommon import swsscommon
 from sonic_py_common.general import getstatusoutput_noshell
+from bgpcfgd.frr import VtyClient
 
 class BfdFrrMon:
+    VTY_RETRY_INTERVAL = 30 # Wait in seconds before the next attempt to connect to bfdd vty socket
+
     def __init__(self):
         # Initialize local sets to store current BFD peer states
         self.local_v4_peers = set()
         self.local_v6_peers = set()
+        # Per-peer session status, as last written to the per-peer table
+        self.local_peer_states = {}
+        self.frr_peer_states = {}
         self.status_table = "DPU_BFD_PROBE_STATE"
+        self.peer_status_table = "DPU_BFD_PEER_STATE"
         self.db_connector = swsscommon.DBConnector("STATE_DB", 0)
         self.table = swsscommon.Table(self.db_connector, self.status_table)
+        self.peer_table = swsscommon.Table(self.db_connector, self.peer_status_table)
+
+        self.vty = VtyClient(["bfdd"])
+        self.vty_retry_time = 0
 
         self.bfdd_running = False
         self.init_done = False
         self.MAX_RETRY_ATTEMPTS = 3
 
+    def connect_vty(self):
+        """
+        Open a persistent connection to bfdd vty socket, if it isn't opened yet.
+        Failed attempts are retried not more often than VTY_RETRY_INTERVAL.
+        Return: True if the connection is established, False otherwise.
+        """
+        if self.vty.is_connected():
+            return True
+        if time.monotonic() < self.vty_retry_time:
+            return False
+        if not os.path.exists(VtyClient.VTY_SOCKET_PATH % "bfdd"):
+            return False
+        if self.vty.connect():
+            return True
+        self.vty_retry_time = time.monotonic() + self.VTY_RETRY_INTERVAL
+        return False
+
+    def get_bfd_peers_output(self, cmd):
+        """
+        Execute 'show bfd peers json' over the persistent bfdd connection.
+        Return: tuple of rc and output, or None when the connection isn't available
+        and the command has to be executed with vtysh.
+        """
+        if not self.connect_vty():
+            return None
+        try:
+            rc, output = self.vty.execute("bfdd", cmd[-1])
+        except (ConnectionError, OSError) as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* bfdd vty connection failed: {}".format(e))
+            self.vty.close()
+            return None
+        return (0 if rc == VtyClient.CMD_SUCCESS else rc), output
+
     def check_bfdd(self):
         """
         Check if bfdd is running.
@@ -43,10 +87,12 @@ class BfdFrrMon:
     
         self.frr_v4_peers = set()
         self.frr_v6_peers = set()
+        self.frr_peer_states = {}
 
-        # Update bfdd state if it wasn't previously running
+        # Update bfdd state if it wasn't previously running.
+        # An established vty connection means bfdd is running
         if not self.bfdd_running:
-            self.bfdd_running = self.check_bfdd()
+            self.bfdd_running = self.connect_vty() or self.check_bfdd()
             
         if not self.bfdd_running:
             syslog.syslog(syslog.LOG_WARNING, "*WARNING* bfdd not currently running")
@@ -56,7 +102,8 @@ class BfdFrrMon:
         cmd = ['vtysh', '-c', 'show bfd peers json']
         while retry_attempt < self.MAX_RETRY_ATTEMPTS:
             try:
-                rc, output = getstatusoutput_noshell(cmd)
+                result = self.get_bfd_peers_output(cmd)
+                rc, output = result if result is not None else getstatusoutput_noshell(cmd)
                 if rc:
                     syslog.syslog(syslog.LOG_ERR, "*ERROR* Failed with rc:{} when execute: {}".format(rc, cmd))
                     return False
@@ -67,6 +114,8 @@ class BfdFrrMon:
                 bfd_data = json.loads(output)
                 if bfd_data:
                     for session in bfd_data:
+                        if "peer" in session and "status" in session:
+                            self.frr_peer_states[session["peer"]] = session["status"]
                         if "status" in session and session["status"] == "up":
                             if "peer" in session:
                                 if ":" in session["peer"]:  # IPv6
@@ -95,10 +144,36 @@ class BfdFrrMon:
             "*ERROR* Maximum retry attempts reached. Failed to execute: {}".format(cmd))
         return False
     
+    def update_peer_states(self):
+        """
+        Update the per-peer table only for the peers which changed their status,
+        so consumers can subscribe to the deltas.
+        Return: True if any peer entry was updated, False otherwise.
+        """
+        if not self.init_done:
+            # remove entries left by the previous run
+            for peer in self.peer_table.getKeys():
+                if peer not in self.frr_peer_states:
+                    self.peer_table._del(peer)
+        changed = False
+        for peer, status in self.frr_peer_states.items():
+            if self.local_peer_states.get(peer) != status:
+                self.peer_table.set(peer, [("status", status)])
+                changed = True
+        for peer in self.local_peer_states:
+            if peer not in self.frr_peer_states:
+                self.peer_table._del(peer)
+                changed = True
+        self.local_peer_states = self.frr_peer_states
+        return changed
+
     def update_state_db(self):
         """
         Update the state DB only with changes (additions or deletions) to the peer list.
+        Return: True if the state DB was updated, False otherwise.
         """
+        changed = self.update_peer_states()
+
         # Check differences between local sets and new data
         new_v4_peers = self.frr_v4_peers - self.local_v4_peers  # Peers to add
         removed_v4_peers = self.local_v4_peers - self.frr_v4_peers  # Peers to remove
@@ -122,18 +197,24 @@ class BfdFrrMon:
                 self.status_table, self.local_v4_peers, self.local_v6_peers))
 
             self.init_done = True
-    
+            changed = True
+
+        return changed
+
+    def run(self, interval):
+        """
+        Poll bfdd forever, waiting interval seconds between the polls.
+        """
+        while True:
+            time.sleep(interval)
+            if self.get_bfd_sessions():
+                self.update_state_db()
+
 def main():
     SLEEP_TIME = 2 # Wait in seconds between each iteration
     syslog.syslog(syslog.LOG_INFO, "bfdmon service started")
     bfd_mon = BfdFrrMon()
-
-    while True:
-        # Sleep for a while before checking again (adjust as necessary)
-        time.sleep(SLEEP_TIME)
-
-        if bfd_mon.get_bfd_sessions():
-            bfd_mon.update_state_db()
+    bfd_mon.run(SLEEP_TIME)
 
     syslog.syslog(syslog.LOG_INFO, "bfdmon service stopped")
 
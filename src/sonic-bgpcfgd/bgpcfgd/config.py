@@ -1,32 +1,277 @@
+import hashlib
+import re
+import time
+from collections import defaultdict, OrderedDict
+
+from .log import log_debug
+
+
+class ConfigIndex(object):
+    """
+    Index of FRR running configuration. It is built once per configuration read,
+    and the changes committed into FRR are applied to it
+    """
+    RE_PREFIX_LIST = re.compile(r'^(ip|ipv6) prefix-list (\S+) seq (\d+) (.*)$')
+    RE_COMMUNITY_LIST = re.compile(r'^bgp community-list standard (\S+) permit (.*)$')
+    RE_AS_PATH_LIST = re.compile(r'^bgp as-path access-list (\S+) ')
+    RE_ROUTE_MAP = re.compile(r'^route-map (\S+) (permit|deny) (\d+)$')
+    RE_PEER_GROUP = re.compile(r'^neighbor\s+(\S+)\s+peer-group$')
+    RE_NEIGHBOR_ROUTE_MAP = re.compile(r'^neighbor (\S+) route-map (\S+) (in|out)$')
+    RE_NO_PREFIX_LIST = re.compile(r'^no (ip|ipv6) prefix-list (\S+)(?: seq (\d+).*)?$')
+    RE_NO_COMMUNITY_LIST = re.compile(r'^no bgp community-list standard (\S+)(?: permit (.*))?$')
+    RE_NO_AS_PATH_LIST = re.compile(r'^no (bgp as-path access-list (\S+)(?: .*)?)$')
+    RE_NO_ROUTE_MAP = re.compile(r'^no route-map (\S+)(?: (permit|deny) (\d+))?$')
+    RE_NO_NEIGHBOR = re.compile(r'^no neighbor (\S+)(?: peer-group)?$')
+    RE_NO_NEIGHBOR_ROUTE_MAP = re.compile(r'^no neighbor (\S+) route-map (\S+) (in|out)$')
+    # Lines of the changes, which affect the indexed configuration in a way which isn't modelled by apply()
+    RE_NOT_APPLICABLE = re.compile(r'^(no router bgp|(no )?(ip|ipv6) prefix-list (\S+) (permit|deny)|'
+                                   r'(no )?bgp community-list (expanded|\d+)|no route-map .*)')
+
+    def __init__(self, lines):
+        """
+        Build the index
+        :param lines: running configuration lines
+        """
+        self.prefix_lists = defaultdict(list)         # (family, name) -> [(seq, rule)]
+        self.community_lists = defaultdict(list)      # name -> [community value]
+        self.as_path_lists = defaultdict(list)        # name -> [line]
+        self.route_maps = defaultdict(OrderedDict)    # name -> (action, seq) -> [body line]
+        self.peer_groups = []                         # peer-group names in order of appearance
+        self.neighbor_route_maps = defaultdict(list)  # (neighbor or peer-group, direction) -> [route-map name]
+        self.apply(lines)
+
+    def apply(self, lines):
+        """
+        Apply configuration lines to the index, the same way FRR applies them to its running configuration
+        :param lines: configuration lines: running configuration, or changes committed into FRR
+        :return: True if all lines were applied. False if the lines have changes, which can't be applied to the index
+        """
+        applied = True
+        route_map_body = None
+        for line in lines:
+            s_line = ' '.join(line.split())
+            if s_line == '' or s_line.startswith('!'):
+                continue
+            if route_map_body is not None:
+                if line[0].isspace():
+                    if s_line.startswith('no '):
+                        if s_line[3:] in route_map_body:
+                            route_map_body.remove(s_line[3:])
+                    elif s_line not in route_map_body:
+                        # FRR replaces a 'set'/'match'/'call'/... line of the same kind. The kind isn't modelled
+                        # here, so a new line of a command which the entry already had can't be applied
+                        first_word = s_line.split()[0]
+                        applied = applied and not any(body_line.split()[0] == first_word
+                                                      for body_line in route_map_existing_body)
+                        route_map_body.append(s_line)
+                    continue
+                route_map_body = None
+            m = self.RE_ROUTE_MAP.match(s_line)
+            if m:
+                route_map_body = self.route_maps[m.group(1)].setdefault((m.group(2), int(m.group(3))), [])
+                route_map_existing_body = list(route_map_body)
+                continue
+            if s_line.startswith('no '):
+                applied = self.apply_no(s_line) and applied
+                continue
+            if self.RE_NOT_APPLICABLE.match(s_line):
+                applied = False
+                continue
+            m = self.RE_PREFIX_LIST.match(s_line)
+            if m:
+                rules = self.prefix_lists[(m.group(1), m.group(2))]
+                seq = int(m.group(3))
+                rules[:] = sorted([rule for rule in rules if rule[0] != seq] + [(seq, m.group(4))])
+                continue
+            m = self.RE_COMMUNITY_LIST.match(s_line)
+            if m:
+                if m.group(2) not in self.community_lists[m.group(1)]:
+                    self.community_lists[m.group(1)].append(m.group(2))
+                continue
+            m = self.RE_AS_PATH_LIST.match(s_line)
+            if m:
+                if s_line not in self.as_path_lists[m.group(1)]:
+                    self.as_path_lists[m.group(1)].append(s_line)
+                continue
+            m = self.RE_PEER_GROUP.match(s_line)
+            if m:
+                if m.group(1) not in self.peer_groups:
+                    self.peer_groups.append(m.group(1))
+                continue
+            m = self.RE_NEIGHBOR_ROUTE_MAP.match(s_line)
+            if m:
+                if m.group(2) not in self.neighbor_route_maps[(m.group(1), m.group(3))]:
+                    self.neighbor_route_maps[(m.group(1), m.group(3))].append(m.group(2))
+        return applied
+
+    def apply_no(self, s_line):
+        """
+        Apply a 'no' configuration line to the index
+        :param s_line: stripped configuration line
+        :return: True if the line was applied, False if it can't be applied to the index
+        """
+        m = self.RE_NO_PREFIX_LIST.match(s_line)
+        if m:
+            key = (m.group(1), m.group(2))
+            if m.group(3) is None:
+                self.prefix_lists.pop(key, None)
+            elif key in self.prefix_lists:
+                self.prefix_lists[key] = [rule for rule in self.prefix_lists[key] if rule[0] != int(m.group(3))]
+            return True
+        m = self.RE_NO_COMMUNITY_LIST.match(s_line)
+        if m:
+            if m.group(2) is None:
+                self.community_lists.pop(m.group(1), None)
+            elif m.group(2) in self.community_lists.get(m.group(1), []):
+                self.community_lists[m.group(1)].remove(m.group(2))
+            return True
+        m = self.RE_NO_AS_PATH_LIST.match(s_line)
+        if m:
+            if m.group(1) == 'bgp as-path access-list %s' % m.group(2):
+                self.as_path_lists.pop(m.group(2), None)
+            elif m.group(1) in self.as_path_lists.get(m.group(2), []):
+                self.as_path_lists[m.group(2)].remove(m.group(1))
+            return True
+        m = self.RE_NO_ROUTE_MAP.match(s_line)
+        if m:
+            if m.group(2) is None:
+                self.route_maps.pop(m.group(1), None)
+            elif m.group(1) in self.route_maps:
+                self.route_maps[m.group(1)].pop((m.group(2), int(m.group(3))), None)
+            return True
+        m = self.RE_NO_NEIGHBOR_ROUTE_MAP.match(s_line)
+        if m:
+            if m.group(2) in self.neighbor_route_maps.get((m.group(1), m.group(3)), []):
+                self.neighbor_route_maps[(m.group(1), m.group(3))].remove(m.group(2))
+            return True
+        m = self.RE_NO_NEIGHBOR.match(s_line)
+        if m:
+            if m.group(1) in self.peer_groups:
+                self.peer_groups.remove(m.group(1))
+            for direction in ('in', 'out'):
+                self.neighbor_route_maps.pop((m.group(1), direction), None)
+            return True
+        return not self.RE_NOT_APPLICABLE.match(s_line)
+
+    def get_prefix_list(self, family, name):
+        """
+        Get prefix-list rules
+        :param family: 'ip' or 'ipv6'
+        :param name: prefix-list name
+        :return: list of (sequence number, rule) tuples. Empty list if the prefix-list doesn't exist
+        """
+        return self.prefix_lists.get((family, name), [])
+
+    def get_community_list(self, name):
+        """ Get community values of the standard community-list. Empty list if the community-list doesn't exist """
+        return self.community_lists.get(name, [])
+
+    def get_as_path_list(self, name):
+        """ Get lines of the as-path access-list. Empty list if the as-path access-list doesn't exist """
+        return self.as_path_lists.get(name, [])
+
+    def get_route_map(self, name):
+        """
+        Get route-map entries
+        :param name: route-map name
+        :return: ordered dictionary: (action, sequence number) -> list of the entry lines
+        """
+        return self.route_maps.get(name, OrderedDict())
+
+    def get_peer_groups(self):
+        """ Get names of all configured peer-groups """
+        return self.peer_groups
+
+    def get_neighbor_route_maps(self, neighbor, direction):
+        """
+        Get route-maps applied to a neighbor or a peer-group
+        :param neighbor: neighbor address or peer-group name
+        :param direction: 'in' or 'out'
+        :return: list of route-map names, in order of appearance
+        """
+        return self.neighbor_route_maps.get((neighbor, direction), [])
+
+    def get_all_neighbor_route_maps(self, direction):
+        """ Get names of all route-maps applied to neighbors and peer-groups in the direction """
+        return {rm for (_, d), rms in self.neighbor_route_maps.items() if d == direction for rm in rms}
+
+
 class ConfigMgr(object):
     """ The class represents frr configuration """
+    RESYNC_INTERVAL = 60  # seconds. Maximum age of the cached running configuration
+
     def __init__(self, frr):
         self.frr = frr
-        self.current_config = None
-        self.current_config_raw = None
+        self._current_config = None
+        self._current_config_raw = None
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.commit_callbacks = []        # called with the result of the next commit
+        self.generation = 0               # incremented on every configuration change pushed into FRR
+        self.synced_generation = None     # generation of the cached running configuration index
+        self.text_generation = None       # generation of the cached running configuration text
+        self.synced_time = None           # time when the cached running configuration was read
+        self.config_hash = None           # hash of the cached running configuration text
+        self.index = None
 
     def reset(self):
-        """ Reset stored config """
-        self.current_config = None
-        self.current_config_raw = None
+        """ Reset pending changes """
         self.changes = ""
         self.peer_groups_to_restart = []
+        self.commit_callbacks = []
 
-    def update(self):
-        """ Read current config from FRR """
-        self.current_config = None
-        self.current_config_raw = None
+    def update(self, force=False):
+        """
+        Read current config from FRR.
+        The cached config is reused when its index is up to date with the committed changes
+        and it is not older than RESYNC_INTERVAL seconds. The config is re-parsed only when its text was changed
+        :param force: re-read the config from FRR unconditionally
+        """
+        if not force and self.synced_generation == self.generation \
+           and time.monotonic() - self.synced_time < self.RESYNC_INTERVAL:
+            log_debug("ConfigMgr::update(): use cached running config. generation=%d" % self.generation)
+            return
         out = self.frr.get_config()
+        self.synced_generation = self.generation
+        self.text_generation = self.generation
+        self.synced_time = time.monotonic()
+        config_hash = hashlib.sha1(out.encode('utf-8')).hexdigest()
+        if config_hash == self.config_hash:
+            log_debug("ConfigMgr::update(): running config wasn't changed")
+            return
         text = []
         for line in out.split('\n'):
             if line.lstrip().startswith('!'):
                 continue
             text.append(line)
         text += ["     "]  # Add empty line to have something to work on, if there is no text
-        self.current_config_raw = text
-        self.current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self._current_config_raw = text
+        self._current_config = self.to_canonical(out)  # FIXME: use text as an input
+        self.config_hash = config_hash
+        self.index = None
+
+    @property
+    def current_config(self):
+        """ Running config in canonical format. It is re-read, when changes were committed after it was read """
+        self.sync_text()
+        return self._current_config
+
+    @property
+    def current_config_raw(self):
+        """ Running config text. It is re-read, when changes were committed after it was read """
+        self.sync_text()
+        return self._current_config_raw
+
+    def sync_text(self):
+        """ Re-read the running config text, when changes were committed into FRR after it was read """
+        if self.text_generation is not None and self.text_generation != self.generation:
+            self.update(force=True)
+
+    def get_index(self):
+        """ Return index of the running config. The config must be read by self.update() first """
+        if self.index is None:
+            self.index = ConfigIndex(self.current_config_raw or [])
+        return self.index
 
     def push_list(self, cmdlist):
         """
@@ -50,6 +295,14 @@ class ConfigMgr(object):
         """
         self.peer_groups_to_restart.extend(peer_groups)
 
+    def add_commit_callback(self, callback):
+        """
+        Register a callback for the next commit
+        :param callback: function, which is called with True if the pending changes were applied successfully,
+                         False otherwise
+        """
+        self.commit_callbacks.append(callback)
+
     def commit(self):
         """
         Write configuration change to FRR.
@@ -59,10 +312,35 @@ class ConfigMgr(object):
             return True
         rc_write = self.frr.write(self.changes)
         rc_restart = self.frr.restart_peer_groups(self.peer_groups_to_restart)
+        self.apply_changes(rc_write)
+        callbacks = self.commit_callbacks
         self.reset()
+        for callback in callbacks:
+            callback(rc_write)
         return rc_write and rc_restart
 
+    def apply_changes(self, applied):
+        """
+        Apply the committed changes to the index of the cached running config, instead of re-reading it from FRR.
+        The config is re-read on the next update(), when the changes were rejected by FRR,
+        or they can't be applied to the index
+        :param applied: True if FRR applied the changes successfully
+        """
+        index_synced = self.synced_generation == self.generation
+        self.generation += 1
+        if not applied or not index_synced:
+            return
+        if self.index is None:
+            self.index = ConfigIndex(self._current_config_raw or [])
+        if self.index.apply(self.changes.split('\n')):
+            self.synced_generation = self.generation
+            self.config_hash = None  # the index doesn't correspond to the cached text anymore
+        else:
+            log_debug("ConfigMgr::commit(): the changes can't be applied to the config index. Re-read the config")
+            self.index = None
+
     def get_text(self):
+        """ Return the running config text. The text is re-read, when changes were committed after it was read """
         return self.current_config_raw
 
     @staticmethod
@@ -1,14 +1,36 @@
 from collections import defaultdict
+from functools import lru_cache
 
 from .log import log_err
 
 
+@lru_cache(maxsize=1024)
+def split_path(path):
+    """
+    Split the path into components. The most recently used paths are cached
+    :param path: storage path as a string where each internal key is separated by '/'
+    :return: tuple of path components. Empty tuple for the empty path
+    """
+    return tuple(path.split("/")) if path != '' else ()
+
+
 class Directory(object):
     """ This class stores values and notifies callbacks which were registered to be executed as soon
         as some value is changed. This class works as DB cache mostly """
     def __init__(self):
         self.data = defaultdict(dict)  # storage. A key is a slot name, a value is a dictionary with data
-        self.notify = defaultdict(lambda: defaultdict(list))  # registered callbacks: slot -> path -> handlers[]
+        # registered callbacks: slot -> first path component -> path -> handlers[]
+        self.notify = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        self.versions = defaultdict(int)  # slot name -> number of changes of the slot
+
+    @staticmethod
+    def split_path(path):
+        """
+        Split the path into components
+        :param path: storage path as a string where each internal key is separated by '/'
+        :return: tuple of path components. Empty tuple for the empty path
+        """
+        return split_path(path)
 
     @staticmethod
     def get_slot_name(db, table):
@@ -29,10 +51,8 @@ class Directory(object):
         """
         if slot not in self.data:
             return False, None
-        elif path == '':
-            return True, self.data[slot]
         d = self.data[slot]
-        for p in path.split("/"):
+        for p in self.split_path(path):
             if p not in d:
                 return False, None
             d = d[p]
@@ -62,7 +82,9 @@ class Directory(object):
 
     def put(self, db, table, key, value):
         """
-        Put information into the storage. Notify handlers which are dependant to the information
+        Put information into the storage. Notify handlers which are dependant to the information.
+        Only handlers subscribed to the whole slot or to a path under the changed key are notified,
+        if their path exists after the change. Every handler is run once, even if it's subscribed to several paths
         :param db: db name
         :param table: table name
         :param key: key to change
@@ -71,12 +93,16 @@ class Directory(object):
         """
         slot = self.get_slot_name(db, table)
         self.data[slot][key] = value
+        self.versions[slot] += 1
         if slot in self.notify:
-            handlers_to_run = []
-
-            for path in self.notify[slot].keys():
-                if self.path_exist(db, table, path):
-                    handlers_to_run += self.notify[slot][path]
+            handlers_to_run = {}  # used as an ordered set
+            slot_notify = self.notify[slot]
+            for first in ('', key):
+                if first not in slot_notify:
+                    continue
+                for path, handlers in slot_notify[first].items():
+                    if self.path_traverse(slot, path)[0]:
+                        handlers_to_run.update(dict.fromkeys(handlers))
 
             for handler in handlers_to_run:
                 handler()
@@ -102,6 +128,16 @@ class Directory(object):
         slot = self.get_slot_name(db, table)
         return self.data[slot]
 
+    def get_slot_version(self, db, table):
+        """
+        Get version of the slot. The version is changed on every change of the slot
+        :param db: db name
+        :param table: table name
+        :return: version of the slot
+        """
+        slot = self.get_slot_name(db, table)
+        return self.versions[slot]
+
     def remove(self, db, table, key):
         """
         Remove a value from the storage
@@ -113,6 +149,7 @@ class Directory(object):
         if slot in self.data:
             if key in self.data[slot]:
                 del self.data[slot][key]
+                self.versions[slot] += 1
             else:
                 log_err("Directory: Can't remove key '%s' from slot '%s'. The key doesn't exist" % (key, slot))
         else:
@@ -127,6 +164,7 @@ class Directory(object):
         slot = self.get_slot_name(db, table)
         if slot in self.data:
             del self.data[slot]
+            self.versions[slot] += 1
         else:
             log_err("Directory: Can't remove slot '%s'. The slot doesn't exist" % slot)
 
@@ -160,11 +198,15 @@ class Directory(object):
         """
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
-            self.notify[slot][path].append(handler)
+            split_path = self.split_path(path)
+            first = split_path[0] if split_path else ''
+            self.notify[slot][first][path].append(handler)
 
     def unsubscribe(self, deps):
         for db, table, path in deps:
             slot = self.get_slot_name(db, table)
             if slot in self.notify:
-                if path in self.notify[slot]:
-                    del self.notify[slot][path]
\ No newline at end of file
+                split_path = self.split_path(path)
+                first = split_path[0] if split_path else ''
+                if path in self.notify[slot][first]:
+                    del self.notify[slot][first][path]
\ No newline at end of file
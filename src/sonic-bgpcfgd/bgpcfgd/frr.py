@@ -1,17 +1,240 @@
 import os
 import datetime
+import socket
 import time
 import tempfile
+from collections import OrderedDict
 
-from bgpcfgd.log import log_err, log_info, log_warn, log_crit
+from bgpcfgd.log import log_err, log_info, log_warn, log_crit, log_notice, log_debug
 from .vars import g_debug
 from .utils import run_command
 
 
+class VtyClient(object):
+    """
+    Long-lived connections to FRR daemons over their vty unix sockets.
+    The same protocol as vtysh uses: a command is terminated by '\\0',
+    a reply is terminated by three '\\0' bytes followed by the command status
+    """
+    VTY_SOCKET_PATH = '/run/frr/%s.vty'
+    SOCKET_TIMEOUT = 60  # seconds
+    RECV_SIZE = 16384
+    CMD_SUCCESS = 0
+    CMD_WARNING = 1
+    # Daemons which own top-level configuration commands, the same way vtysh routes them.
+    # 'no' forms of the commands are routed the same way
+    COMMAND_DAEMONS = [
+        ('router bgp', ('bgpd',)),
+        ('route-map', ('bgpd', 'zebra')),
+        ('ip prefix-list', ('bgpd', 'zebra')),
+        ('ipv6 prefix-list', ('bgpd', 'zebra')),
+        ('bgp community-list', ('bgpd',)),
+        ('bgp extcommunity-list', ('bgpd',)),
+        ('bgp large-community-list', ('bgpd',)),
+        ('bgp as-path access-list', ('bgpd',)),
+        ('ip route', ('staticd',)),
+        ('ipv6 route', ('staticd',)),
+        ('ip protocol', ('zebra',)),
+        ('ipv6 protocol', ('zebra',)),
+        ('ip nht', ('zebra',)),
+        ('ipv6 nht', ('zebra',)),
+        ('segment-routing', ('zebra',)),
+        ('vrf', ('zebra', 'staticd')),
+    ]
+    # Commands which open a configuration context. The following lines are sent to the daemons of the context
+    CONTEXT_COMMANDS = ('router bgp', 'route-map', 'vrf', 'segment-routing')
+    # Commands inside a context, which are owned only by some daemons of the context
+    CONTEXT_COMMAND_DAEMONS = {
+        'vrf': [
+            ('ip route', ('staticd',)),
+            ('ipv6 route', ('staticd',)),
+            ('vni', ('zebra',)),
+            ('ip protocol', ('zebra',)),
+            ('ipv6 protocol', ('zebra',)),
+            ('ip nht', ('zebra',)),
+            ('ipv6 nht', ('zebra',)),
+        ],
+    }
+
+    def __init__(self, daemons):
+        """
+        Initialize the object
+        :param daemons: list of FRR daemons to connect to
+        """
+        self.daemons = daemons
+        self.socks = {}
+
+    def connect(self):
+        """
+        Connect to all daemons and enter the enable mode
+        :return: True if all daemons were connected, False otherwise
+        """
+        self.close()
+        for daemon in self.daemons:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.SOCKET_TIMEOUT)
+            try:
+                sock.connect(self.VTY_SOCKET_PATH % daemon)
+                self.socks[daemon] = sock
+                rc, out = self.execute(daemon, "enable")
+            except (socket.error, OSError) as exc:
+                log_warn("VtyClient: can't connect to FRR daemon '%s': %s" % (daemon, str(exc)))
+                sock.close()
+                self.close()
+                return False
+            if rc != self.CMD_SUCCESS:
+                log_warn("VtyClient: 'enable' command failed on FRR daemon '%s': rc=%d out='%s'" % (daemon, rc, out))
+                self.close()
+                return False
+        return True
+
+    def is_connected(self):
+        """ Return True if the connections to the daemons are established """
+        return len(self.socks) > 0
+
+    def close(self):
+        """ Close all connections """
+        for sock in self.socks.values():
+            try:
+                sock.close()
+            except (socket.error, OSError):
+                pass
+        self.socks = {}
+
+    def execute(self, daemon, command):
+        """
+        Execute a command on the daemon
+        :param daemon: daemon name
+        :param command: command to execute. Type: String
+        :return: Tuple: integer command status, command output as a string
+        """
+        sock = self.socks[daemon]
+        sock.sendall(command.encode('utf-8') + b'\0')
+        reply = bytearray()
+        while True:
+            chunk = sock.recv(self.RECV_SIZE)
+            if not chunk:
+                raise ConnectionError("connection to FRR daemon '%s' was closed" % daemon)
+            reply += chunk
+            if len(reply) >= 4 and reply[-4:-1] == b'\0\0\0':
+                return reply[-1], reply[:-4].decode('utf-8', errors='replace')
+
+    def show(self, command):
+        """
+        Execute a show command on all daemons
+        :param command: command to execute. Type: String
+        :return: Tuple: True if at least one daemon executed the command successfully, outputs of the daemons
+        """
+        success = False
+        outputs = []
+        for daemon in self.socks:
+            rc, out = self.execute(daemon, command)
+            if rc == self.CMD_SUCCESS:
+                success = True
+                outputs.append(out)
+        return success, outputs
+
+    @staticmethod
+    def match_command(command, table):
+        """
+        Find the daemons of the command in the routing table
+        :param command: configuration command without 'no' prefix
+        :param table: list of (command prefix, daemons) tuples
+        :return: tuple: matched command prefix, daemons. (None, None) if the command isn't in the table
+        """
+        for prefix, daemons in table:
+            if command == prefix or command.startswith(prefix + ' '):
+                return prefix, daemons
+        return None, None
+
+    def plan(self, config_text):
+        """
+        Route configuration commands to the daemons which own them.
+        A command which opens a configuration context (router bgp, route-map, etc) is routed to its daemons,
+        and the following commands are routed to the daemons of the context until the next top-level command.
+        :param config_text: configuration text in FRR format
+        :return: list of (command, daemons, is top-level command, opens context) tuples.
+                 None, if there is a command which can't be routed, or its daemons aren't connected
+        """
+        plan = []
+        context = None
+        context_daemons = None
+        for line in config_text.split('\n'):
+            cmd = line.strip()
+            if cmd == '' or cmd.startswith('!'):
+                continue
+            if cmd == 'end':
+                context = None
+                continue
+            if cmd in ('exit', 'quit') and not line[0].isspace():
+                if context is not None:
+                    plan.append((cmd, context_daemons, False, False))
+                context = None
+                continue
+            is_no = cmd.startswith('no ')
+            command = cmd[3:] if is_no else cmd
+            if context is not None:
+                _, daemons = self.match_command(command, self.CONTEXT_COMMAND_DAEMONS.get(context, []))
+                if daemons is None and self.match_command(command, self.COMMAND_DAEMONS)[1] is None:
+                    daemons = context_daemons
+                if daemons is not None:
+                    daemons = [daemon for daemon in daemons if daemon in self.socks]
+                    if not daemons:
+                        return None
+                    plan.append((cmd, daemons, False, False))
+                    continue
+            prefix, daemons = self.match_command(command, self.COMMAND_DAEMONS)
+            if daemons is None:
+                return None
+            daemons = [daemon for daemon in daemons if daemon in self.socks]
+            if not daemons:
+                return None
+            opens_context = not is_no and prefix in self.CONTEXT_COMMANDS
+            context = prefix if opens_context else None
+            context_daemons = daemons
+            plan.append((cmd, daemons, True, opens_context))
+        return plan
+
+    def configure(self, plan):
+        """
+        Apply a batch of routed configuration commands, in one configuration session per daemon.
+        Every daemon receives only commands which it owns. A daemon which was moved into a configuration context
+        is returned into the configuration mode explicitly before it receives the next top-level command.
+        A command is considered applied when all its daemons accepted it, as vtysh does
+        :param plan: commands routed by self.plan()
+        :return: list of (command, outputs) tuples for the commands which were rejected
+        """
+        daemons = [daemon for daemon in self.socks if any(daemon in cmd_daemons for _, cmd_daemons, _, _ in plan)]
+        for daemon in daemons:
+            self.execute(daemon, "configure terminal")
+        in_context = dict.fromkeys(daemons, False)
+        failed = []
+        for cmd, cmd_daemons, top_level, opens_context in plan:
+            outputs = []
+            accepted = True
+            for daemon in cmd_daemons:
+                if top_level and in_context[daemon]:
+                    self.execute(daemon, "end")
+                    self.execute(daemon, "configure terminal")
+                    in_context[daemon] = False
+                rc, out = self.execute(daemon, cmd)
+                if rc not in (self.CMD_SUCCESS, self.CMD_WARNING):
+                    accepted = False
+                    if out.strip():
+                        outputs.append("%s: %s" % (daemon, out.strip()))
+                in_context[daemon] = in_context[daemon] or opens_context
+            if not accepted:
+                failed.append((cmd, outputs))
+        for daemon in daemons:
+            self.execute(daemon, "end")
+        return failed
+
+
 class FRR(object):
     """Proxy object with FRR"""
     def __init__(self, daemons):
         self.daemons = daemons
+        self.vty = None
 
     def wait_for_daemons(self, seconds):
         """
@@ -30,8 +253,43 @@ class FRR(object):
             time.sleep(0.1)  # sleep 100 ms
         raise RuntimeError("FRR daemons hasn't been started in %d seconds" % seconds)
 
-    @staticmethod
-    def get_config():
+    def open_vty_sessions(self):
+        """
+        Open long-lived connections to the FRR daemons vty sockets.
+        When the connections are established, configuration is streamed over them instead of forking vtysh.
+        vtysh is still used as a fallback, when the connections are not available
+        :return: True if the connections were established, False otherwise
+        """
+        vty = VtyClient(self.daemons)
+        if vty.connect():
+            self.vty = vty
+            log_notice("Established vty sessions with FRR daemons: %s" % ", ".join(self.daemons))
+            return True
+        self.vty = None
+        log_warn("Can't establish vty sessions with FRR daemons. Fallback to vtysh")
+        return False
+
+    def close_vty_sessions(self):
+        """ Close the vty sessions. vtysh will be used for all following requests """
+        if self.vty is not None:
+            self.vty.close()
+            self.vty = None
+
+    def _vty_failed(self, exc):
+        """ Drop broken vty sessions and try to re-establish them for following requests """
+        log_err("vty session with FRR failed: %s. Reconnecting" % str(exc))
+        self.close_vty_sessions()
+        self.open_vty_sessions()
+
+    def get_config(self):
+        if self.vty is not None:
+            try:
+                success, outputs = self.vty.show("show running-config")
+                if success:
+                    return self.merge_configs(outputs)
+                log_err("can't read running config over vty sessions. Fallback to vtysh")
+            except (socket.error, OSError) as exc:
+                self._vty_failed(exc)
         ret_code, out, err = run_command(["vtysh", "-c", "show running-config"])
         if ret_code != 0:
             log_crit("can't update running config: rc=%d out='%s' err='%s'" % (ret_code, out, err))
@@ -39,7 +297,46 @@ class FRR(object):
         return out
 
     @staticmethod
-    def write(config_text):
+    def merge_configs(configs):
+        """
+        Merge running configs of several daemons into one config, as vtysh does.
+        Top-level blocks with the same header line (route-maps, vrfs, prefix-lists, etc) are merged into one block:
+        lines of the block which are reported by several daemons are kept once
+        :param configs: list of running configs
+        :return: merged config as a string
+        """
+        blocks = OrderedDict()  # header line -> lines of the block
+        for config in configs:
+            body = None
+            for line in config.split('\n'):
+                if line.strip() == '' or line.startswith('!'):
+                    continue
+                if line[0].isspace() or line.startswith('exit'):
+                    if body is None:
+                        continue
+                    if merging and line in body:
+                        continue
+                    if merging and body and body[-1].startswith('exit'):
+                        body.insert(len(body) - 1, line)
+                    else:
+                        body.append(line)
+                    continue
+                merging = line in blocks
+                body = blocks.setdefault(line, [])
+        return "".join("\n".join([header] + body) + "\n" for header, body in blocks.items())
+
+    def write(self, config_text):
+        if self.vty is not None:
+            try:
+                plan = self.vty.plan(config_text)
+                if plan is not None:
+                    failed = self.vty.configure(plan)
+                    for cmd, outputs in failed:
+                        log_err("ConfigMgr::commit(): FRR rejected command '%s': %s" % (cmd, "; ".join(outputs)))
+                    return len(failed) == 0
+                log_debug("ConfigMgr::commit(): the change has commands which can't be routed to daemons. Use vtysh")
+            except (socket.error, OSError) as exc:
+                self._vty_failed(exc)
         fd, tmp_filename = tempfile.mkstemp(dir='/tmp')
         os.close(fd)
         with open(tmp_filename, 'w') as fp:
@@ -54,15 +351,24 @@ class FRR(object):
                 os.remove(tmp_filename)
         return ret_code == 0
 
-    @staticmethod
-    def restart_peer_groups(peer_groups):
+    def restart_peer_groups(self, peer_groups):
         """ Restart peer-groups which support BBR
         :param peer_groups: List of peer_groups to restart
         :return: True if restart of all peer-groups was successful, False otherwise
         """
         res = True
         for peer_group in sorted(peer_groups):
-            rc, out, err = run_command(["vtysh", "-c", "clear bgp peer-group %s soft in" % peer_group])
+            command = "clear bgp peer-group %s soft in" % peer_group
+            if self.vty is not None and "bgpd" in self.vty.socks:
+                try:
+                    rc, out = self.vty.execute("bgpd", command)
+                    if rc != VtyClient.CMD_SUCCESS:
+                        log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s'" % (peer_group, rc, out))
+                    res = res and (rc == VtyClient.CMD_SUCCESS)
+                    continue
+                except (socket.error, OSError) as exc:
+                    self._vty_failed(exc)
+            rc, out, err = run_command(["vtysh", "-c", command])
             if rc != 0:
                 log_value = peer_group, rc, out, err
                 log_crit("Can't restart bgp peer-group '%s'. rc='%d', out='%s', err='%s'" % log_value)
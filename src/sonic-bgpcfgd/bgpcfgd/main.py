@@ -15,7 +15,7 @@ from .log import log_notice, log_crit
 from .managers_advertise_rt import AdvertiseRouteMgr
 from .managers_allow_list import BGPAllowListMgr
 from .managers_bbr import BBRMgr
-from .managers_bgp import BGPPeerMgrBase
+from .managers_bgp import BGPPeerMgrBase, BGPPeerInventory
 from .managers_db import BGPDataBaseMgr
 from .managers_intf import InterfaceMgr
 from .managers_setsrc import ZebraSetSrc
@@ -39,14 +39,18 @@ def do_work():
     st_rt_timer = StaticRouteTimer()
     thr = threading.Thread(target = st_rt_timer.run)
     thr.start()
+    constants = read_constants()
     frr = FRR(["bgpd", "zebra", "staticd"])
     frr.wait_for_daemons(seconds=20)
+    if constants.get("bgp", {}).get("bgpcfgd", {}).get("vty_sessions", False):
+        frr.open_vty_sessions()
     #
     common_objs = {
         'directory': Directory(),
         'cfg_mgr':   ConfigMgr(frr),
         'tf':        TemplateFabric(),
-        'constants': read_constants(),
+        'constants': constants,
+        'peer_inventory': BGPPeerInventory(),
     }
     managers = [
         # Config DB managers
@@ -101,10 +105,12 @@ def do_work():
         managers.append(PrefixListMgr(common_objs, "CONFIG_DB", "PREFIX_LIST"))
         managers.append(AsPathMgr(common_objs, "CONFIG_DB", "DEVICE_METADATA"))
 
-    runner = Runner(common_objs['cfg_mgr'])
+    coalescing = constants.get("bgp", {}).get("bgpcfgd", {}).get("coalescing", {})
+    runner = Runner(common_objs['cfg_mgr'], coalescing.get("window_ms", 0), coalescing.get("max_ops", 1000))
     for mgr in managers:
         runner.add_manager(mgr)
     runner.run()
+    frr.close_vty_sessions()
     thr.join()
 
 
@@ -43,7 +43,7 @@ class AsPathMgr(Manager):
         regex = re.compile(r"bgp as-path access-list T2_GROUP_ASNS seq \d+ permit _(\d+)_")
         # Read current FRR configuration and get as-path already configured
         self.cfg_mgr.update()
-        for line in self.cfg_mgr.get_text():
+        for line in self.cfg_mgr.get_index().get_as_path_list(T2_GROUP_ASNS):
             match = regex.match(line)
             if match:
                 old_asns[match.group(1)] = line
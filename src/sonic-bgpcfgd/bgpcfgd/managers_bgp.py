@@ -1,10 +1,11 @@
 import json
+import time
 from swsscommon import swsscommon
 
 import jinja2
 import netaddr
 
-from .log import log_warn, log_err, log_info, log_debug, log_crit
+from .log import log_warn, log_err, log_info, log_debug, log_crit, log_notice
 from .manager import Manager
 from .template import TemplateFabric
 from .utils import run_command
@@ -12,7 +13,11 @@ from .managers_device_global import DeviceGlobalCfgMgr
 
 
 class BGPPeerGroupMgr(object):
-    """ This class represents peer-group and routing policy for the peer_type """
+    """ This class represents peer-group and routing policy for the peer_type.
+        The peer-group and the policy are the same for all peers with the same template inputs,
+        so they are rendered and pushed into FRR once per change of the inputs, not once per peer """
+    RENDER_CACHE_SIZE = 64
+
     def __init__(self, common_objs, base_template):
         """
         Construct the object
@@ -24,7 +29,40 @@ class BGPPeerGroupMgr(object):
         tf = common_objs['tf']
         self.policy_template = tf.from_file(base_template + "policies.conf.j2")
         self.peergroup_template = tf.from_file(base_template + "peer-group.conf.j2")
+        self.policy_variables = tf.get_variables(base_template + "policies.conf.j2")
+        self.peergroup_variables = tf.get_variables(base_template + "peer-group.conf.j2")
         self.device_global_cfgmgr = DeviceGlobalCfgMgr(common_objs, "CONFIG_DB", swsscommon.CFG_BGP_DEVICE_GLOBAL_TABLE_NAME)
+        self.render_cache = {}  # (template name, template inputs) -> rendered text
+        self.pushed = {}        # (template name, vrf, bgp_asn) -> the last text pushed into FRR
+
+    def freeze(self, value):
+        """ Convert a template input into a hashable value """
+        if value is self.constants:
+            return id(value)  # constants are not changed in runtime
+        if isinstance(value, dict):
+            return tuple(sorted(((repr(k), self.freeze(v)) for k, v in value.items()), key=lambda item: item[0]))
+        if isinstance(value, (list, tuple)):
+            return tuple(self.freeze(v) for v in value)
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted(repr(v) for v in value))
+        return repr(value)
+
+    def render(self, name, template, variables, kwargs):
+        """
+        Render the template. The text is reused for the same values of the variables used by the template
+        :param name: template name for the cache key
+        :param template: Jinja2 template object
+        :param variables: set of variables used by the template. None if the template could use any variable
+        :param kwargs: dictionary with parameters for rendering
+        :return: rendered text
+        """
+        key = (name, tuple((k, self.freeze(v)) for k, v in sorted(kwargs.items())
+                           if variables is None or k in variables))
+        if key not in self.render_cache:
+            if len(self.render_cache) >= self.RENDER_CACHE_SIZE:
+                self.render_cache.clear()
+            self.render_cache[key] = template.render(**kwargs)
+        return self.render_cache[key]
 
     def update(self, name, **kwargs):
         """
@@ -43,11 +81,11 @@ class BGPPeerGroupMgr(object):
         :param kwargs: dictionary with parameters for rendering
         """
         try:
-            policy = self.policy_template.render(**kwargs)
+            policy = self.render("policy", self.policy_template, self.policy_variables, kwargs)
         except jinja2.TemplateError as e:
             log_err("Can't render policy template name: '%s': %s" % (name, str(e)))
             return False
-        self.update_entity(policy, "Routing policy for peer '%s'" % name)
+        self.update_entity_once(("policy", kwargs['vrf'], kwargs['bgp_asn']), policy, "Routing policy for peer '%s'" % name)
         return True
 
     def update_pg(self, name, **kwargs):
@@ -57,7 +95,7 @@ class BGPPeerGroupMgr(object):
         :param kwargs: dictionary with parameters for rendering
         """
         try:
-            pg = self.peergroup_template.render(**kwargs)
+            pg = self.render("peer-group", self.peergroup_template, self.peergroup_variables, kwargs)
             tsa_rm = self.device_global_cfgmgr.check_state_and_get_tsa_routemaps(pg)
             idf_isolation_rm = self.device_global_cfgmgr.check_state_and_get_idf_isolation_routemaps()
         except jinja2.TemplateError as e:
@@ -68,7 +106,7 @@ class BGPPeerGroupMgr(object):
             cmd = ('router bgp %s\n' % kwargs['bgp_asn']) + pg + tsa_rm + idf_isolation_rm + "\nexit"
         else:
             cmd = ('router bgp %s vrf %s\n' % (kwargs['bgp_asn'], kwargs['vrf'])) + pg + tsa_rm + idf_isolation_rm + "\nexit"
-        self.update_entity(cmd, "Peer-group for peer '%s'" % name)
+        self.update_entity_once(("peer-group", kwargs['vrf'], kwargs['bgp_asn']), cmd, "Peer-group for peer '%s'" % name)
         return True
 
     def update_entity(self, cmd, txt):
@@ -82,6 +120,103 @@ class BGPPeerGroupMgr(object):
         log_info("%s has been scheduled to be updated" % txt)
         return True
 
+    def update_entity_once(self, key, cmd, txt):
+        """
+        Send commands to FRR, if they are different from the commands sent last time for the key
+        :param key: key of the entity
+        :param cmd: commands to send in a raw form
+        :param txt: text for the syslog output
+        :return:
+        """
+        if self.pushed.get(key) == cmd:
+            log_debug("%s is up-to-date" % txt)
+            return True
+        self.pushed[key] = cmd
+        self.cfg_mgr.add_commit_callback(lambda success: self.on_commit(key, cmd, success))
+        return self.update_entity(cmd, txt)
+
+    def on_commit(self, key, cmd, success):
+        """
+        Forget the commands pushed for the key, when FRR didn't apply them. They will be pushed again on the next update
+        :param key: key of the entity
+        :param cmd: commands which were pushed for the key
+        :param success: True if the commit was successful, False otherwise
+        """
+        if not success and self.pushed.get(key) == cmd:
+            del self.pushed[key]
+
+
+class BGPPeerInventory(object):
+    """ Peers which are already installed in FRR. They are read once per process and shared by all peer managers """
+    def __init__(self):
+        self.peers = None
+
+    def get_peers(self):
+        """
+        Get peers installed in FRR. The peers are read from FRR on the first call only
+        :return: a new set of (vrf, neighbor) tuples
+        """
+        if self.peers is None:
+            start = time.time()
+            self.peers = self.load_peers()
+            log_notice("Loaded %d BGP peers from FRR in %.3f seconds" % (len(self.peers), time.time() - start))
+        return set(self.peers)
+
+    @staticmethod
+    def load_peers():
+        """
+        Load peers from FRR with one 'show bgp vrf all neighbors json' request.
+        The neighbors list has all configured peers, including ones which aren't activated in any address-family,
+        which are missed in 'show bgp summary'.
+        Fallback to per vrf 'show bgp vrf X neighbors json' requests, if the neighbors can't be read
+        :return: set of peers, which are already installed in FRR
+        """
+        command = ["vtysh", "-H", "/dev/null", "-c", "show bgp vrf all neighbors json"]
+        ret_code, out, err = run_command(command)
+        if ret_code == 0:
+            try:
+                js_neighbors = json.loads(out)
+                peers = set()
+                for vrf, neighbors in js_neighbors.items():
+                    for nbr, info in neighbors.items():
+                        if isinstance(info, dict):  # skip 'vrfId' and 'vrfName' attributes of the vrf
+                            peers.add((vrf, nbr))
+                return peers
+            except (ValueError, AttributeError) as e:
+                log_warn("Can't parse bgp neighbors: %s. Fallback to per vrf neighbors requests" % str(e))
+        else:
+            log_warn("Can't read bgp neighbors: %s. Fallback to per vrf neighbors requests" % err)
+        return BGPPeerInventory.load_peers_per_vrf()
+
+    @staticmethod
+    def load_peers_per_vrf():
+        """
+        Load peers from FRR.
+        :return: set of peers, which are already installed in FRR
+        """
+        command = ["vtysh", "-H", "/dev/null", "-c", "show bgp vrfs json"]
+        ret_code, out, err = run_command(command)
+        if ret_code == 0:
+            js_vrf = json.loads(out)
+            vrfs = js_vrf['vrfs'].keys()
+        else:
+            log_crit("Can't read bgp vrfs: %s" % err)
+            raise Exception("Can't read bgp vrfs: %s" % err)
+        peers = set()
+        for vrf in vrfs:
+            command = ["vtysh", "-c", 'show bgp vrf %s neighbors json' % str(vrf)]
+            ret_code, out, err = run_command(command)
+            if ret_code == 0:
+                js_bgp = json.loads(out)
+                for nbr, info in js_bgp.items():
+                    if isinstance(info, dict):
+                        peers.add((vrf, nbr))
+            else:
+                log_crit("Can't read vrf '%s' neighbors: %s" % (vrf, str(err)))
+                raise Exception("Can't read vrf '%s' neighbors: %s" % (vrf, str(err)))
+
+        return peers
+
 
 class BGPPeerMgrBase(Manager):
     """ Manager of BGP peers """
@@ -142,8 +277,9 @@ class BGPPeerMgrBase(Manager):
             table_name,
         )
 
-        self.peers = self.load_peers()
+        self.peers = self.common_objs.setdefault('peer_inventory', BGPPeerInventory()).get_peers()
         self.peer_group_mgr = BGPPeerGroupMgr(self.common_objs, base_template)
+        self.loopback_interfaces = None  # (LOOPBACK_INTERFACE slot version, interfaces in the template format)
         return
 
     def set_handler(self, key, data):
@@ -202,8 +338,7 @@ class BGPPeerMgrBase(Manager):
             'vrf': vrf,
             'neighbor_addr': nbr,
             'bgp_session': data,
-            'CONFIG_DB__LOOPBACK_INTERFACE':{ tuple(key.split('|')) : {} for key in self.directory.get_slot("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
-                                                                         if '|' in key }
+            'CONFIG_DB__LOOPBACK_INTERFACE': self.get_loopback_interfaces(),
         }
         if lo0_ipv4 is not None:
             kwargs['loopback0_ipv4'] = lo0_ipv4
@@ -313,6 +448,18 @@ class BGPPeerMgrBase(Manager):
         self.cfg_mgr.push(cmd)
         return True
 
+    def get_loopback_interfaces(self):
+        """
+        Get LOOPBACK_INTERFACE ip addresses in the template format. It's rebuilt only when the table was changed
+        :return: dictionary where a key is a tuple (interface, ip prefix)
+        """
+        version = self.directory.get_slot_version("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
+        if self.loopback_interfaces is None or self.loopback_interfaces[0] != version:
+            interfaces = { tuple(key.split('|')) : {} for key in self.directory.get_slot("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME)
+                                                      if '|' in key }
+            self.loopback_interfaces = (version, interfaces)
+        return self.loopback_interfaces[1]
+
     def get_lo_ipv4(self, loopback_str):
         """
         Extract Loopback0 ipv4 address from the Directory
@@ -373,31 +520,3 @@ class BGPPeerMgrBase(Manager):
             return 'default', key
         else:
             return tuple(key.split('|', 1))
-
-    @staticmethod
-    def load_peers():
-        """
-        Load peers from FRR.
-        :return: set of peers, which are already installed in FRR
-        """
-        command = ["vtysh", "-H", "/dev/null", "-c", "show bgp vrfs json"]
-        ret_code, out, err = run_command(command)
-        if ret_code == 0:
-            js_vrf = json.loads(out)
-            vrfs = js_vrf['vrfs'].keys()
-        else:
-            log_crit("Can't read bgp vrfs: %s" % err)
-            raise Exception("Can't read bgp vrfs: %s" % err)
-        peers = set()
-        for vrf in vrfs:
-            command = ["vtysh", "-c", 'show bgp vrf %s neighbors json' % str(vrf)]
-            ret_code, out, err = run_command(command)
-            if ret_code == 0:
-                js_bgp = json.loads(out)
-                for nbr in js_bgp.keys():
-                    peers.add((vrf, nbr))
-            else:
-                log_crit("Can't read vrf '%s' neighbors: %s" % (vrf, str(err)))
-                raise Exception("Can't read vrf '%s' neighbors: %s" % (vrf, str(err)))
-
-        return peers
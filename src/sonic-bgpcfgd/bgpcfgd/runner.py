@@ -1,7 +1,8 @@
+import time
 from collections import defaultdict
 from swsscommon import swsscommon
 
-from .log import log_debug, log_crit
+from .log import log_debug, log_crit, log_info
 
 
 g_run = True
@@ -13,20 +14,92 @@ def signal_handler(_, __):  # signal_handler(signum, frame)
     g_run = False
 
 
+class EventQueue(object):
+    """ Queue of table events in order of arrival, which coalesces consecutive events for the same key.
+        Several SETs for a key are merged into the last one, SET followed by DEL is collapsed into DEL.
+        DEL followed by SET is kept as is, so handlers still see the entry re-creation.
+        Events for a key separated by events for other keys are kept, because handlers of the other keys
+        may depend on the intermediate state """
+    def __init__(self):
+        self.events = []  # (db, table, key, op, data)
+        self.received = 0
+        self.collapsed = 0
+
+    def put(self, db, table, key, op, data):
+        """
+        Put an event into the queue
+        :param db: db id
+        :param table: table name
+        :param key: key of the table entry
+        :param op: operation on the table entry
+        :param data: associated data of the event
+        """
+        self.received += 1
+        entry = (db, table, key)
+        last_op = self.last_op(entry)
+        if op == swsscommon.SET_COMMAND and last_op == swsscommon.SET_COMMAND:
+            self.events[-1] = entry + (op, data)
+            self.collapsed += 1
+        elif op == swsscommon.DEL_COMMAND and last_op == swsscommon.SET_COMMAND:
+            self.events.pop()
+            self.collapsed += 1
+            if self.last_op(entry) == swsscommon.DEL_COMMAND:
+                self.collapsed += 1
+            else:
+                self.events.append(entry + (op, data))
+        elif op == swsscommon.DEL_COMMAND and last_op == swsscommon.DEL_COMMAND:
+            self.collapsed += 1
+        else:
+            self.events.append(entry + (op, data))
+
+    def last_op(self, entry):
+        """ Return operation of the last event, if it is for the (db, table, key) entry. None otherwise """
+        if self.events and self.events[-1][:3] == entry:
+            return self.events[-1][3]
+        return None
+
+    def items(self):
+        """ Iterate over coalesced events in order of arrival """
+        return iter(self.events)
+
+
 class Runner(object):
     """ Implements main io-loop of the application
         It will run event handlers inside of Manager objects
         when corresponding db/table is updated
     """
     SELECT_TIMEOUT = 1000
+    COALESCING_IDLE_TIMEOUT = 10  # milliseconds. The collected events are handled when no events arrive for this time
+    STATS_TABLE_NAME = "BGPCFGD_STATS"
+    STATS_KEY = "runner"
+    STATS_PUBLISH_INTERVAL = 10  # seconds
 
-    def __init__(self, cfg_manager):
-        """ Constructor """
+    def __init__(self, cfg_manager, coalescing_window=0, coalescing_max_ops=1000):
+        """
+        Constructor
+        :param cfg_manager: ConfigMgr object
+        :param coalescing_window: maximum time in milliseconds to collect events before they are handled and
+                                  committed. Events are handled on every select wakeup, when it's 0
+        :param coalescing_max_ops: maximum number of events collected in one window
+        """
         self.cfg_manager = cfg_manager
+        self.coalescing_window = coalescing_window
+        self.coalescing_max_ops = coalescing_max_ops
         self.db_connectors = {}
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
         self.subscribers = set()
+        self.stats = {
+            'events_received': 0,
+            'events_collapsed': 0,
+            'commits': 0,
+            'commit_latency_ms_last': 0,
+            'commit_latency_ms_max': 0,
+            'commit_latency_ms_total': 0,
+        }
+        self.stats_table = None
+        self.stats_published = None
+        self.stats_published_values = None
 
     def add_manager(self, manager):
         """
@@ -56,18 +129,81 @@ class Runner(object):
         while g_run:
             state, _ = self.selector.select(Runner.SELECT_TIMEOUT)
             if state == self.selector.TIMEOUT:
+                self.publish_stats()
                 continue
             elif state == self.selector.ERROR:
                 raise Exception("Received error from select")
 
-            for subscriber in self.subscribers:
-                while True:
-                    key, op, fvs = subscriber.pop()
-                    if not key:
+            events = EventQueue()
+            self.collect(events)
+            if self.coalescing_window > 0:
+                deadline = time.monotonic() + self.coalescing_window / 1000.0
+                while events.received < self.coalescing_max_ops:
+                    timeout = int((deadline - time.monotonic()) * 1000)
+                    if timeout <= 0:
                         break
-                    log_debug("Received message : '%s'" % str((key, op, fvs)))
-                    for callback in self.callbacks[subscriber.getDbConnector().getDbId()][subscriber.getTableName()]:
-                        callback(key, op, dict(fvs))
-            rc = self.cfg_manager.commit()
-            if not rc:
-                log_crit("Runner::commit was unsuccessful")
+                    # Handle the events as soon as no more events arrive, an isolated event isn't delayed by the window
+                    state, _ = self.selector.select(min(timeout, Runner.COALESCING_IDLE_TIMEOUT))
+                    if state == self.selector.TIMEOUT:
+                        break
+                    elif state == self.selector.ERROR:
+                        raise Exception("Received error from select")
+                    self.collect(events)
+            self.dispatch(events)
+            self.commit()
+            self.publish_stats()
+
+    def collect(self, events):
+        """
+        Drain all subscribers into the event queue
+        :param events: EventQueue object
+        """
+        for subscriber in self.subscribers:
+            while True:
+                key, op, fvs = subscriber.pop()
+                if not key:
+                    break
+                log_debug("Received message : '%s'" % str((key, op, fvs)))
+                events.put(subscriber.getDbConnector().getDbId(), subscriber.getTableName(), key, op, dict(fvs))
+
+    def dispatch(self, events):
+        """
+        Run handlers for coalesced events
+        :param events: EventQueue object
+        """
+        self.stats['events_received'] += events.received
+        self.stats['events_collapsed'] += events.collapsed
+        if events.collapsed:
+            log_debug("Runner: %d of %d events were collapsed" % (events.collapsed, events.received))
+        for db, table, key, op, data in events.items():
+            for callback in self.callbacks[db][table]:
+                callback(key, op, data)
+
+    def commit(self):
+        """ Commit collected changes into FRR and account the commit """
+        generation = self.cfg_manager.generation
+        start = time.monotonic()
+        rc = self.cfg_manager.commit()
+        if self.cfg_manager.generation != generation:
+            latency = int((time.monotonic() - start) * 1000)
+            self.stats['commits'] += 1
+            self.stats['commit_latency_ms_last'] = latency
+            self.stats['commit_latency_ms_max'] = max(self.stats['commit_latency_ms_max'], latency)
+            self.stats['commit_latency_ms_total'] += latency
+        if not rc:
+            log_crit("Runner::commit was unsuccessful")
+
+    def publish_stats(self):
+        """ Publish changed runner counters into STATE_DB, not more often than once in STATS_PUBLISH_INTERVAL seconds """
+        now = time.monotonic()
+        if self.stats_published is not None and now - self.stats_published < self.STATS_PUBLISH_INTERVAL:
+            return
+        if self.stats == self.stats_published_values:
+            return
+        self.stats_published = now
+        self.stats_published_values = dict(self.stats)
+        if self.stats_table is None:
+            self.stats_table = swsscommon.Table(swsscommon.DBConnector("STATE_DB", 0), self.STATS_TABLE_NAME)
+        fvs = swsscommon.FieldValuePairs([(name, str(value)) for name, value in sorted(self.stats.items())])
+        self.stats_table.set(self.STATS_KEY, fvs)
+        log_info("Runner stats: %s" % ", ".join("%s=%d" % item for item in sorted(self.stats.items())))
@@ -2,6 +2,8 @@ from collections import OrderedDict
 from functools import partial
 
 import jinja2
+import jinja2.meta
+import jinja2.nodes
 import netaddr
 
 from .log import log_err
@@ -11,7 +13,8 @@ class TemplateFabric(object):
     def __init__(self, template_path = '/usr/share/sonic/templates'):
         j2_template_paths = [template_path]
         j2_loader = jinja2.FileSystemLoader(j2_template_paths)
-        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False)
+        j2_bytecode_cache = jinja2.FileSystemBytecodeCache()  # compiled templates are reused across restarts
+        j2_env = jinja2.Environment(loader=j2_loader, trim_blocks=False, bytecode_cache=j2_bytecode_cache)
         j2_env.filters['ipv4'] = self.is_ipv4
         j2_env.filters['ipv6'] = self.is_ipv6
         j2_env.filters['pfx_filter'] = self.pfx_filter
@@ -27,6 +30,19 @@ class TemplateFabric(object):
         """
         return self.env.get_template(filename)
 
+    def get_variables(self, filename):
+        """
+        Find variables which are used by a template from a file
+        :param filename: filename of the file. Type String
+        :return: set of variable names. None if the template includes or extends other templates,
+                 so the template could use any variable
+        """
+        source, _, _ = self.env.loader.get_source(self.env, filename)
+        ast = self.env.parse(source)
+        if any(True for _ in ast.find_all((jinja2.nodes.Include, jinja2.nodes.Extends))):
+            return None
+        return jinja2.meta.find_undeclared_variables(ast)
+
     def from_string(self, tmpl):
         """
         Read a template from a string
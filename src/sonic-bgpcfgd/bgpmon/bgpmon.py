@@ -23,9 +23,19 @@ Description: bgpmon.py -- populating bgp related information in stateDB.
     "previous" neighbor dictionary will be kept and used to determine if there
     is a need to perform update or the peer is stale to be removed from the
     state DB
+
+    With --mode stream, the daemon follows frr.log and reacts to the
+    "%ADJCHANGE" neighbor state change notifications bgpd emits
+    (bgp log-neighbor-changes), querying and updating only the neighbors that
+    changed. The snapshot poller described above is kept as a reconciliation
+    pass, run as often as in poll mode. FRR logs to syslog by default, so
+    stream mode is only useful when FRR is also configured to log into
+    frr.log, and poll is the default mode.
 """
+import argparse
 import json
 import os
+import re
 import sys
 import syslog
 from swsscommon import swsscommon
@@ -33,6 +43,91 @@ import time
 from sonic_py_common.general import getstatusoutput_noshell
 
 PIPE_BATCH_MAX_COUNT = 50
+FRR_LOG_FILE = "/var/log/frr/frr.log"
+POLL_INTERVAL = 15
+STREAM_INTERVAL = 1
+RECONCILE_INTERVAL = POLL_INTERVAL
+
+class FrrLogFollower:
+    """ Follow frr.log and extract the BGP neighbor state change notifications """
+    ADJCHANGE_RE = re.compile(r"%ADJCHANGE: (?:vrf \S+ )?neighbor (?P<peer>[^\s(]+)(?:\(\S*\))?(?: in vrf (?P<vrf>\S+))? (?P<event>Up|Down)")
+
+    def __init__(self, path=FRR_LOG_FILE):
+        """
+        Initialize the object. Only notifications written after this point are reported
+        :param path: path to the FRR log file
+        """
+        self.path = path
+        self.fd = None
+        self.inode = None
+        self.position = 0
+        self.partial = ""
+        self.open(from_start=False)
+
+    def open(self, from_start):
+        """
+        (Re)open the log file
+        :param from_start: read the file from its beginning when True, otherwise from its end
+        :return: True if the file was opened
+        """
+        self.close()
+        try:
+            self.fd = open(self.path, "r", errors="replace")
+            st = os.fstat(self.fd.fileno())
+        except (IOError, OSError):
+            self.fd = None
+            return False
+        self.inode = st.st_ino
+        self.position = 0 if from_start else st.st_size
+        self.fd.seek(self.position)
+        return True
+
+    def close(self):
+        """ Close the log file """
+        if self.fd is not None:
+            self.fd.close()
+            self.fd = None
+        self.partial = ""
+
+    def read_lines(self):
+        """
+        Read complete lines appended to the log file since the previous call.
+        Handles the file being rotated (new inode) or truncated.
+        :return: list of new lines
+        """
+        try:
+            st = os.stat(self.path)
+        except (IOError, OSError):
+            self.close()
+            return []
+        if self.fd is None or st.st_ino != self.inode or st.st_size < self.position:
+            if not self.open(from_start=True):
+                return []
+        data = self.fd.read()
+        self.position = self.fd.tell()
+        if not data:
+            return []
+        data = self.partial + data
+        lines = data.split("\n")
+        self.partial = lines.pop()
+        return lines
+
+    def get_changed_peers(self):
+        """
+        Get the default vrf neighbors which changed their state since the previous call.
+        Neighbors in the other vrfs are ignored, as the snapshot covers the default vrf only
+        :return: list of neighbor addresses, in the order of the notifications
+        """
+        peers = {}
+        for line in self.read_lines():
+            m = self.ADJCHANGE_RE.search(line)
+            if m is None:
+                continue
+            vrf = m.group("vrf")
+            if vrf is not None and vrf != "default":
+                continue
+            peers[m.group("peer")] = None
+        return list(peers)
 
 class BgpStateGet:
     def __init__(self):
@@ -58,7 +153,7 @@ class BgpStateGet:
     # out, it will default back to constant pulling every 15 seconds
     def bgp_activity_detected(self):
         try:
-            timestamp = os.stat("/var/log/frr/frr.log").st_mtime
+            timestamp = os.stat(FRR_LOG_FILE).st_mtime
             if timestamp != self.cached_timestamp:
                 self.cached_timestamp = timestamp
                 return True
@@ -67,13 +162,17 @@ class BgpStateGet:
         except (IOError, OSError):
             return True
 
-    def update_new_peer_states(self, peer_dict):
-        peer_l = peer_dict["peers"].keys()
-        self.new_peer_l.update(peer_l)
-        for peer in peer_l:
-            self.new_peer_state[peer] = (peer_dict["peers"][peer]["state"], 
-                                         peer_dict["peers"][peer]["remoteAs"],
-                                         peer_dict["peers"][peer]["localAs"])
+    # Extract the (state, remoteAs, localAs) tuples of the neighbors from the
+    # json output of 'show bgp summary json'. Only ipv4 and ipv6 unicast
+    # neighbors are reported, the same way for the snapshot and the stream paths
+    @staticmethod
+    def get_summary_peer_states(peer_info):
+        states = {}
+        for key, value in peer_info.items():
+            if key == "ipv4Unicast" or key == "ipv6Unicast":
+                for peer, info in value["peers"].items():
+                    states[peer] = (info["state"], info["remoteAs"], info["localAs"])
+        return states
 
     # Get a new snapshot of BGP neighbors and store them in the "new" location
     def get_all_neigh_states(self):
@@ -94,9 +193,8 @@ class BgpStateGet:
                 # cmd ran successfully, safe to Clean the "new" set/dict for new snapshot
                 self.new_peer_l.clear()
                 self.new_peer_state.clear()
-                for key, value in peer_info.items():
-                    if key == "ipv4Unicast" or key == "ipv6Unicast":
-                        self.update_new_peer_states(value)
+                self.new_peer_state.update(self.get_summary_peer_states(peer_info))
+                self.new_peer_l.update(self.new_peer_state.keys())
                 return
 
             except json.JSONDecodeError as decode_error:
@@ -148,6 +246,50 @@ class BgpStateGet:
         self.pipe.flush()
         data.clear()
 
+    # Query the states of the neighbors with one 'show bgp summary json' request, the
+    # same source as the snapshot uses. Returns {peer: (state, remoteAs, localAs)}. Raises on failure
+    def get_neigh_states(self):
+        cmd = ["vtysh", "-H", "/dev/null", "-c", 'show bgp summary json']
+        rc, output = getstatusoutput_noshell(cmd)
+        if rc:
+            raise Exception("Failed with rc:{} when execute: {}".format(rc, cmd))
+        return self.get_summary_peer_states(json.loads(output))
+
+    def update_changed_neigh_states(self, peers):
+        """
+        Update State DB entries only for the neighbors which were reported as changed.
+        When too many neighbors changed at once, the full reconciliation path is used instead.
+        :param peers: list of neighbor addresses with a state change notification
+        """
+        if len(peers) > PIPE_BATCH_MAX_COUNT:
+            self.get_all_neigh_states()
+            self.update_neigh_states()
+            return
+        try:
+            states = self.get_neigh_states()
+        except Exception as e:
+            syslog.syslog(syslog.LOG_WARNING, "*WARNING* Can't get the neighbor states: {}. Left for reconciliation".format(e))
+            return
+        data = {}
+        for peer in peers:
+            new_state = states.get(peer)
+            key = "NEIGH_STATE_TABLE|%s" % peer
+            if new_state is None:
+                if peer in self.peer_l:
+                    data[key] = None
+                    self.peer_l.remove(peer)
+                    self.peer_state.pop(peer, None)
+                continue
+            state = new_state[0]
+            if peer in self.peer_l and self.peer_state.get(peer) == state:
+                continue
+            peerType = "i-BGP" if new_state[1] == new_state[2] else "e-BGP"
+            data[key] = {'state':state, 'peerType':peerType}
+            self.peer_l.add(peer)
+            self.peer_state[peer] = state
+        if len(data) > 0:
+            self.flush_pipe(data)
+
     def update_neigh_states(self):
         data = {}
         for peer in self.new_peer_l:
@@ -185,9 +327,41 @@ class BgpStateGet:
         # Save the new set
         self.peer_l = self.new_peer_l.copy()
 
+def run_poll(bgp_state_get):
+    # periodically obtain the new neighbor information and update if necessary
+    while True:
+        time.sleep(POLL_INTERVAL)
+        if bgp_state_get.bgp_activity_detected():
+            bgp_state_get.get_all_neigh_states()
+            bgp_state_get.update_neigh_states()
+
+def run_stream(bgp_state_get, reconcile_interval):
+    # react on the neighbor state change notifications and reconcile periodically
+    follower = FrrLogFollower()
+    bgp_state_get.get_all_neigh_states()
+    bgp_state_get.update_neigh_states()
+    last_reconcile = time.monotonic()
+    while True:
+        time.sleep(STREAM_INTERVAL)
+        peers = follower.get_changed_peers()
+        if peers:
+            bgp_state_get.update_changed_neigh_states(peers)
+        if time.monotonic() - last_reconcile >= reconcile_interval:
+            last_reconcile = time.monotonic()
+            if bgp_state_get.bgp_activity_detected():
+                bgp_state_get.get_all_neigh_states()
+                bgp_state_get.update_neigh_states()
+
 def main():
+    parser = argparse.ArgumentParser(description="Populate BGP neighbor states in STATE_DB")
+    parser.add_argument("-m", "--mode", choices=["stream", "poll"], default="poll",
+                        help="poll: periodic snapshots only, stream: also react on FRR neighbor notifications "
+                             "in frr.log")
+    parser.add_argument("-r", "--reconcile-interval", type=int, default=RECONCILE_INTERVAL,
+                        help="seconds between full reconciliation passes in stream mode")
+    args = parser.parse_args()
 
-    syslog.syslog(syslog.LOG_INFO, "bgpmon service started")
+    syslog.syslog(syslog.LOG_INFO, "bgpmon service started in {} mode".format(args.mode))
     bgp_state_get = None
     try:
         bgp_state_get = BgpStateGet()
@@ -195,12 +369,10 @@ def main():
         syslog.syslog(syslog.LOG_ERR, "{}: error exit 1, reason {}".format("THIS_MODULE", str(e)))
         sys.exit(1)
 
-    # periodically obtain the new neighbor information and update if necessary
-    while True:
-        time.sleep(15)
-        if bgp_state_get.bgp_activity_detected():
-            bgp_state_get.get_all_neigh_states()
-            bgp_state_get.update_neigh_states()
+    if args.mode == "poll":
+        run_poll(bgp_state_get)
+    else:
+        run_stream(bgp_state_get, args.reconcile_interval)
 
 if __name__ == '__main__':
     main()
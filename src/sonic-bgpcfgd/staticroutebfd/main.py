@@ -110,14 +110,23 @@ class StaticRouteBfd(object):
         #interface, portchannel_interface and loopback_interface share same table, assume name is unique
         #assume only one ipv4  and/or one ipv6 for each interface
         self.local_db[LOCAL_INTERFACE_TABLE] = defaultdict(dict)
+        #reverse indexes: interface name -> nexthop keys, and nexthop key -> interface names.
+        #Together with LOCAL_NEXTHOP_TABLE (nexthop key -> routes) they lead from an interface to its
+        #routes, the bfd session key is derived from the nexthop key
+        self.intf_nexthop_index = defaultdict(set)
+        self.nexthop_intf_index = defaultdict(set)
 
         self.config_db  = swsscommon.DBConnector(CONFIG_DB_NAME, 0, False)
         self.appl_db = swsscommon.DBConnector(APPL_DB_NAME, 0, False)
         self.state_db = swsscommon.DBConnector(STATE_DB_NAME, 0, False)
 
-        self.bfd_appl_tbl = swsscommon.ProducerStateTable(self.appl_db, BFD_SESSION_TABLE_NAME)
+        #appl_db writes are buffered in the pipeline and flushed once per batch of events
+        self.appl_pipe = swsscommon.RedisPipeline(self.appl_db)
+        self.bfd_appl_tbl = swsscommon.ProducerStateTable(self.appl_pipe, BFD_SESSION_TABLE_NAME, True)
 
-        self.static_route_appl_tbl = swsscommon.Table(self.appl_db, STATIC_ROUTE_TABLE_NAME)
+        self.static_route_appl_tbl = swsscommon.Table(self.appl_pipe, STATIC_ROUTE_TABLE_NAME, True)
+        #static route key -> latest route data, or None for deletion. Only the latest update is written on flush
+        self.static_route_appl_pending = {}
 
         self.selector = swsscommon.Select()
         self.callbacks = defaultdict(lambda: defaultdict(list))  # db -> table -> handlers[]
@@ -162,9 +171,11 @@ class StaticRouteBfd(object):
             if key in self.local_db[table]:
                 del self.local_db[table][key]
 
-    def append_to_nh_table_entry(self, nh_key, ip_prefix):
+    def append_to_nh_table_entry(self, nh_key, ip_prefix, intf):
         entry = self.get_local_db(LOCAL_NEXTHOP_TABLE, nh_key)
         entry.add(ip_prefix)
+        self.intf_nexthop_index[intf].add(nh_key)
+        self.nexthop_intf_index[nh_key].add(intf)
 
     def remove_from_nh_table_entry(self, nh_key, ip_prefix):
         entry = self.get_local_db(LOCAL_NEXTHOP_TABLE, nh_key)
@@ -172,6 +183,23 @@ class StaticRouteBfd(object):
             entry.remove(ip_prefix)
             if len(entry) == 0:
                 self.remove_from_local_db(LOCAL_NEXTHOP_TABLE, nh_key)
+                self.remove_nh_from_intf_index(nh_key)
+
+    def remove_nh_from_intf_index(self, nh_key):
+        #the nexthop isn't used by any route, drop it with its pending bfd sessions
+        nh_vrf, nh_ip = nh_key.split("|", 1)
+        bfd_key = nh_vrf + ":default:" + nh_ip
+        for intf in self.nexthop_intf_index.pop(nh_key, ()):
+            self.remove_from_local_db(LOCAL_BFD_PENDING_TABLE, intf + "_" + bfd_key)
+            nh_keys = self.intf_nexthop_index.get(intf)
+            if nh_keys is not None:
+                nh_keys.discard(nh_key)
+                if len(nh_keys) == 0:
+                    del self.intf_nexthop_index[intf]
+
+    def add_bfd_pending(self, intf, nh_ip, bfd_key):
+        pending_key = intf + "_" + bfd_key
+        self.set_local_db(LOCAL_BFD_PENDING_TABLE, pending_key, [intf, nh_ip, bfd_key])
 
     def set_bfd_session_into_appl_db(self, key, data):
         fvs = swsscommon.FieldValuePairs(list(data.items()))
@@ -219,7 +247,11 @@ class StaticRouteBfd(object):
 
     def update_bfd_pending(self, if_name):
         del_list=[]
-        for k, v in self.local_db[LOCAL_BFD_PENDING_TABLE].items():
+        #visit only the nexthops over this interface instead of the whole pending table
+        for nh_key in self.intf_nexthop_index.get(if_name, ()):
+            nh_vrf, nh_ip = nh_key.split("|", 1)
+            k = if_name + "_" + nh_vrf + ":default:" + nh_ip
+            v = self.local_db[LOCAL_BFD_PENDING_TABLE].get(k, [])
             if len(v) == 3 and v[0] == if_name:
                 intf, nh_ip, bfd_key = v[0], v[1], v[2]
                 valid, local_addr = self.find_interface_ip(intf, nh_ip)
@@ -240,7 +272,7 @@ class StaticRouteBfd(object):
                 del_list.append(k)
 
         for k in del_list:
-            self.local_db[LOCAL_BFD_PENDING_TABLE].pop(k)
+            self.remove_from_local_db(LOCAL_BFD_PENDING_TABLE, k)
 
     def strip_table_name(self, key, splitter):
         return key.split(splitter, 1)[1]
@@ -478,8 +510,8 @@ class StaticRouteBfd(object):
                 valid, local_addr = self.find_interface_ip(intf, nh_ip)
                 if not valid:
                     #interface IP is not available yet, put this request to cache
-                    self.set_local_db(LOCAL_BFD_PENDING_TABLE, intf+"_"+bfd_key, [intf, nh_ip, bfd_key])
-                    self.append_to_nh_table_entry(nh_key, vrf + "|" + ip_prefix)
+                    self.add_bfd_pending(intf, nh_ip, bfd_key)
+                    self.append_to_nh_table_entry(nh_key, vrf + "|" + ip_prefix, intf)
                     log_warn("bfd_pending: cannot find ip for interface: %s, postpone bfd session creation" %intf)
                     continue
 
@@ -495,7 +527,7 @@ class StaticRouteBfd(object):
                 bfd_entry_cfg["static_route"] = "true"
                 self.set_local_db(LOCAL_BFD_TABLE, bfd_key, bfd_entry_cfg)
 
-            self.append_to_nh_table_entry(nh_key, vrf + "|" + ip_prefix)
+            self.append_to_nh_table_entry(nh_key, vrf + "|" + ip_prefix, intf)
 
         self.refresh_active_nh(route_cfg_key)
 
@@ -585,12 +617,26 @@ class StaticRouteBfd(object):
                 self.remove_from_local_db(LOCAL_SRT_TABLE, srt_key)
 
     def set_static_route_into_appl_db(self, key, data):
-        fvs = swsscommon.FieldValuePairs(list(data.items()))
-        self.static_route_appl_tbl.set(key, fvs)
+        self.static_route_appl_pending[key] = data.copy()
         log_debug("SRT_BFD: set static route to appl_db, key %s, data %s"%(key, str(data)))
 
     def del_static_route_from_appl_db(self, key):
-        self.static_route_appl_tbl.delete(key)
+        self.static_route_appl_pending[key] = None
+
+    def flush_appl_db(self):
+        """
+        Write the buffered appl_db updates. A static route updated several times
+        within the batch is written only once, with its latest data
+        """
+        for key, data in self.static_route_appl_pending.items():
+            if data is None:
+                self.static_route_appl_tbl.delete(key)
+            else:
+                fvs = swsscommon.FieldValuePairs(list(data.items()))
+                self.static_route_appl_tbl.set(key, fvs)
+        self.static_route_appl_pending.clear()
+        self.static_route_appl_tbl.flush()
+        self.bfd_appl_tbl.flush()
 
     def reconstruct_static_route_config(self, original_config, reachable_nexthops):
         arg_list    = lambda v: [x.strip() for x in v.split(',')] if len(v.strip()) != 0 else None
@@ -756,6 +802,7 @@ class StaticRouteBfd(object):
                     log_debug("Received message : '%s'" % str((key, op, fvs)))
                     for callback in self.callbacks[sub.getDbConnector().getDbId()][sub.getTableName()]:
                         callback(key, op, dict(fvs))
+            self.flush_appl_db()
 
 def do_work():
     sr_bfd = StaticRouteBfd()
@@ -0,0 +1,97 @@
+"""
+Benchmark of staticroutebfd with BFD enabled static routes and interface flaps.
+
+Run from src/sonic-bgpcfgd:
+    python tests/benchmark_static_rt_bfd.py [--routes N] [--interfaces N] [--flaps N]
+
+Every route has two nexthops over two neighboring interfaces. Half of the
+interfaces get their ip after the routes, so the pending BFD sessions are
+exercised. APPL_DB tables are mocks, so the measured time is the time of
+the handlers and the batched writes.
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+
+sys.path.insert(0, os.path.join(TEST_DIR, '..'))
+
+from staticroutebfd.main import StaticRouteBfd, LOCAL_BFD_PENDING_TABLE
+
+
+def create_static_route_bfd():
+    with patch('swsscommon.swsscommon.DBConnector.__init__', return_value=None), \
+            patch('swsscommon.swsscommon.RedisPipeline.__init__', return_value=None), \
+            patch('swsscommon.swsscommon.ProducerStateTable.__init__', return_value=None), \
+            patch('swsscommon.swsscommon.Table.__init__', return_value=None):
+        dut = StaticRouteBfd()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+    return dut
+
+
+def intf_key(i):
+    return "if%d|10.%d.%d.1/24" % (i, i // 256, i % 256)
+
+
+def nexthop(i):
+    return "10.%d.%d.2" % (i // 256, i % 256)
+
+
+def bench(args):
+    dut = create_static_route_bfd()
+
+    start = time.time()
+    for i in range(args.interfaces // 2):
+        dut.interface_set_handler(intf_key(i), {})
+    for j in range(args.routes):
+        a, b = j % args.interfaces, (j + 1) % args.interfaces
+        dut.static_route_set_handler("20.%d.%d.0/24" % (j // 256, j % 256), {
+            "bfd": "true",
+            "ifname": "if%d,if%d" % (a, b),
+            "nexthop": "%s,%s" % (nexthop(a), nexthop(b)),
+        })
+    for i in range(args.interfaces // 2, args.interfaces):
+        dut.interface_set_handler(intf_key(i), {})
+    for i in range(args.interfaces):
+        dut.bfd_state_set_handler(nexthop(i), {"state": "Up"})
+    dut.flush_appl_db()
+    setup_time = time.time() - start
+    assert dut.bfd_appl_tbl.set.call_count == args.interfaces
+    assert dut.static_route_appl_tbl.set.call_count == args.routes
+    assert len(dut.local_db[LOCAL_BFD_PENDING_TABLE]) == 0
+
+    writes = 0
+    start = time.time()
+    for i in range(args.flaps):
+        i %= args.interfaces
+        dut.static_route_appl_tbl.reset_mock()
+        dut.bfd_state_set_handler(nexthop(i), {"state": "Down"})
+        dut.interface_del_handler(intf_key(i))
+        dut.interface_set_handler(intf_key(i), {})
+        dut.bfd_state_set_handler(nexthop(i), {"state": "Up"})
+        dut.flush_appl_db()
+        writes += dut.static_route_appl_tbl.set.call_count
+    flap_time = time.time() - start
+
+    print("routes: {}, interfaces: {}, flaps: {}".format(args.routes, args.interfaces, args.flaps))
+    print("setup: {:.3f} s".format(setup_time))
+    print("flaps: {:.3f} s, {:.2f} ms per flap, {} route writes per flap".format(
+        flap_time, flap_time * 1000 / args.flaps, writes // args.flaps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark staticroutebfd interface flaps")
+    parser.add_argument('--routes', type=int, default=10000, help="number of BFD enabled static routes")
+    parser.add_argument('--interfaces', type=int, default=100, help="number of interfaces")
+    parser.add_argument('--flaps', type=int, default=20, help="number of interface flaps")
+    args = parser.parse_args()
+    bench(args)
+
+
+if __name__ == '__main__':
+    main()
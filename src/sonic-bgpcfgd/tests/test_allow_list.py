@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 import bgpcfgd.frr
+from bgpcfgd.config import ConfigIndex
 from bgpcfgd.directory import Directory
 from bgpcfgd.template import TemplateFabric
 import bgpcfgd
@@ -57,6 +58,7 @@ def set_del_test(op, args, currect_config, expected_config, update_global_defaul
     #
     cfg_mgr = MagicMock()
     cfg_mgr.update.return_value = None
+    cfg_mgr.get_index.side_effect = lambda: ConfigIndex(cfg_mgr.get_text())
     cfg_mgr.push_list = push_list
     cfg_mgr.get_text.return_value = currect_config
     common_objs = {
@@ -651,6 +653,7 @@ def test_set_handler_no_community_data_is_already_presented():
     from bgpcfgd.managers_allow_list import BGPAllowListMgr
     cfg_mgr = MagicMock()
     cfg_mgr.update.return_value = None
+    cfg_mgr.get_index.side_effect = lambda: ConfigIndex(cfg_mgr.get_text())
     cfg_mgr.get_text.return_value = [
         'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_5_COMMUNITY_empty_V4 seq 10 deny 0.0.0.0/0 le 17',
         'ip prefix-list PL_ALLOW_LIST_DEPLOYMENT_ID_5_COMMUNITY_empty_V4 seq 20 permit 20.20.30.0/24 le 32',
@@ -1023,6 +1026,7 @@ def test___find_peer_group():
     from bgpcfgd.managers_allow_list import BGPAllowListMgr
     cfg_mgr = MagicMock()
     cfg_mgr.update.return_value = None
+    cfg_mgr.get_index.side_effect = lambda: ConfigIndex(cfg_mgr.get_text())
     cfg_mgr.get_text.return_value = [
         'router bgp 64601',
         ' neighbor BGPSLBPassive peer-group',
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, patch
 
+from bgpcfgd.config import ConfigIndex
 from bgpcfgd.directory import Directory
 from bgpcfgd.template import TemplateFabric
 from copy import deepcopy
@@ -434,5 +435,6 @@ def test__get_available_peer_groups():
         '  exit-address-family',
         '     ',
     ])
+    m.cfg_mgr.get_index = MagicMock(side_effect=lambda: ConfigIndex(m.cfg_mgr.get_text()))
     res = m._BBRMgr__get_available_peer_groups()
     assert res == {"PEER_V4", "PEER_V6"}
@@ -219,3 +219,63 @@ def test_update_state_db_del_all(mocked_syslog, bfd_mon):
     assert "DPU_BFD_PROBE_STATE table in STATE_DB updated" in mocked_syslog.call_args[0][1]
     assert all(value in bfd_mon.local_v4_peers for value in bfd_mon.frr_v4_peers), f"Expected {bfd_mon.frr_v4_peers} to be in {bfd_mon.local_v4_peers}"
     assert all(value in bfd_mon.local_v6_peers for value in bfd_mon.frr_v6_peers), f"Expected {bfd_mon.frr_v6_peers} to be in {bfd_mon.local_v6_peers}"
+
+@patch('bfdmon.bfdmon.getstatusoutput_noshell')
+def test_get_bfd_sessions_vty(mocked_getstatusoutput, bfd_mon):
+    # Persistent vty connection is used instead of vtysh
+    bfd_mon.vty = MagicMock()
+    bfd_mon.vty.is_connected.return_value = True
+    bfd_mon.vty.execute.return_value = (0, '[{"peer": "192.168.1.1", "status": "up"}, {"peer": "30ab::3", "status": "down"}]')
+    result = bfd_mon.get_bfd_sessions()
+    assert result == True
+    assert bfd_mon.bfdd_running == True
+    bfd_mon.vty.execute.assert_called_once_with("bfdd", "show bfd peers json")
+    mocked_getstatusoutput.assert_not_called()
+    assert bfd_mon.frr_v4_peers == {"192.168.1.1"}
+    assert bfd_mon.frr_v6_peers == set()
+    assert bfd_mon.frr_peer_states == {"192.168.1.1": "up", "30ab::3": "down"}
+
+@patch('bfdmon.bfdmon.getstatusoutput_noshell', return_value=(0, '[{"peer": "192.168.1.1", "status": "up"}]'))
+@patch('syslog.syslog')
+def test_get_bfd_sessions_vty_failure(mocked_syslog, mocked_getstatusoutput, bfd_mon):
+    # Broken vty connection falls back to vtysh
+    bfd_mon.bfdd_running = True
+    bfd_mon.vty = MagicMock()
+    bfd_mon.vty.is_connected.return_value = True
+    bfd_mon.vty.execute.side_effect = ConnectionError("closed")
+    result = bfd_mon.get_bfd_sessions()
+    assert result == True
+    bfd_mon.vty.close.assert_called_once()
+    mocked_getstatusoutput.assert_called_once_with(["vtysh", "-c", "show bfd peers json"])
+    assert bfd_mon.frr_v4_peers == {"192.168.1.1"}
+
+@patch('syslog.syslog')
+def test_update_peer_states(mocked_syslog, bfd_mon):
+    bfd_mon.peer_table = MagicMock()
+    bfd_mon.peer_table.getKeys.return_value = ["192.168.1.9"]
+    bfd_mon.frr_v4_peers = {"192.168.1.1"}
+    bfd_mon.frr_v6_peers = set()
+    bfd_mon.frr_peer_states = {"192.168.1.1": "up", "192.168.1.2": "down"}
+    assert bfd_mon.update_state_db() == True
+    bfd_mon.peer_table._del.assert_called_once_with("192.168.1.9")
+    bfd_mon.peer_table.set.assert_any_call("192.168.1.1", [("status", "up")])
+    bfd_mon.peer_table.set.assert_any_call("192.168.1.2", [("status", "down")])
+    assert bfd_mon.peer_table.set.call_count == 2
+
+    # Only the changed peers are written
+    bfd_mon.peer_table.reset_mock()
+    bfd_mon.frr_v4_peers = {"192.168.1.1"}
+    bfd_mon.frr_peer_states = {"192.168.1.1": "up", "192.168.1.3": "up"}
+    assert bfd_mon.update_state_db() == True
+    bfd_mon.peer_table.set.assert_called_once_with("192.168.1.3", [("status", "up")])
+    bfd_mon.peer_table._del.assert_called_once_with("192.168.1.2")
+    bfd_mon.peer_table.getKeys.assert_not_called()
+
+    # Nothing changed, nothing is written
+    bfd_mon.peer_table.reset_mock()
+    bfd_mon.table.reset_mock()
+    bfd_mon.frr_peer_states = {"192.168.1.1": "up", "192.168.1.3": "up"}
+    assert bfd_mon.update_state_db() == False
+    bfd_mon.peer_table.set.assert_not_called()
+    bfd_mon.peer_table._del.assert_not_called()
+    bfd_mon.table.set.assert_not_called()
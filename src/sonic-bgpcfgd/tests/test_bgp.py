@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 import os
+from bgpcfgd.config import ConfigMgr
 from bgpcfgd.directory import Directory
 from bgpcfgd.template import TemplateFabric
 from . import swsscommon_test
@@ -32,8 +33,7 @@ def constructor(constants_path, bgp_router_id="", peer_type="general", with_lo0_
     }
 
     return_value_map = {
-        "['vtysh', '-H', '/dev/null', '-c', 'show bgp vrfs json']": (0, "{\"vrfs\": {\"default\": {}}}", ""),
-        "['vtysh', '-c', 'show bgp vrf default neighbors json']": (0, "{\"10.10.10.1\": {}, \"20.20.20.1\": {}, \"fc00:10::1\": {}}", "")
+        "['vtysh', '-H', '/dev/null', '-c', 'show bgp vrf all neighbors json']": (0, "{\"default\": {\"vrfId\": 0, \"vrfName\": \"default\", \"10.10.10.1\": {}, \"20.20.20.1\": {}, \"fc00:10::1\": {}}}", ""),
     }
 
     bgpcfgd.managers_bgp.run_command = lambda cmd: return_value_map[str(cmd)]
@@ -193,3 +193,68 @@ def test_del_handler_nonexist_peer(mocked_log_warn):
         m = constructor(constant)
         m.del_handler("40.40.40.1")
         mocked_log_warn.assert_called_with("Peer '(default|40.40.40.1)' has not been found")
+
+def test_peer_inventory_shared():
+    calls = []
+    def run_command(cmd):
+        calls.append(cmd)
+        return 0, '{"default": {"vrfId": 0, "vrfName": "default", "10.10.10.1": {"bgpState": "Established"}}, "Vrf1": {"vrfId": 5, "vrfName": "Vrf1", "fc00:10::1": {"bgpState": "Idle"}}}', ""
+    bgpcfgd.managers_bgp.run_command = run_command
+    inventory = bgpcfgd.managers_bgp.BGPPeerInventory()
+    peers_1 = inventory.get_peers()
+    peers_2 = inventory.get_peers()
+    assert peers_1 == {("default", "10.10.10.1"), ("Vrf1", "fc00:10::1")}
+    assert peers_1 == peers_2
+    assert peers_1 is not peers_2
+    assert len(calls) == 1
+
+def test_peer_inventory_fallback():
+    return_value_map = {
+        "['vtysh', '-H', '/dev/null', '-c', 'show bgp vrf all neighbors json']": (1, "", "error"),
+        "['vtysh', '-H', '/dev/null', '-c', 'show bgp vrfs json']": (0, "{\"vrfs\": {\"default\": {}, \"Vrf1\": {}}}", ""),
+        "['vtysh', '-c', 'show bgp vrf default neighbors json']": (0, "{\"10.10.10.1\": {}}", ""),
+        "['vtysh', '-c', 'show bgp vrf Vrf1 neighbors json']": (0, "{\"20.20.20.1\": {}}", ""),
+    }
+    bgpcfgd.managers_bgp.run_command = lambda cmd: return_value_map[str(cmd)]
+    peers = bgpcfgd.managers_bgp.BGPPeerInventory.load_peers()
+    assert peers == {("default", "10.10.10.1"), ("Vrf1", "20.20.20.1")}
+
+def test_add_peers_push_peer_group_once():
+    for constant in load_constant_files():
+        m = constructor(constant)
+        m.set_handler("30.30.30.1", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
+        assert m.cfg_mgr.push.call_count == 3  # policy, peer-group, peer
+        m.set_handler("30.30.30.2", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
+        assert m.cfg_mgr.push.call_count == 4  # peer only
+        # the peer-group template input was changed
+        m.directory.put("CONFIG_DB", swsscommon.CFG_DEVICE_METADATA_TABLE_NAME, "localhost", {"bgp_asn": "65100", "type": "LeafRouter"})
+        m.set_handler("30.30.30.3", {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'})
+        assert m.cfg_mgr.push.call_count > 5
+
+def test_add_peers_push_peer_group_after_failed_commit():
+    m = constructor("../../files/image_config/constants/constants.yml")
+    frr = MagicMock()
+    frr.write = MagicMock(return_value=False)
+    cfg_mgr = ConfigMgr(frr)
+    m.cfg_mgr = cfg_mgr
+    m.peer_group_mgr.cfg_mgr = cfg_mgr
+    data = {'asn': '65200', 'holdtime': '180', 'keepalive': '60', 'local_addr': '30.30.30.30', 'name': 'TOR', 'nhopself': '0', 'rrclient': '0'}
+    m.set_handler("30.30.30.1", data)
+    pushed = dict(m.peer_group_mgr.pushed)
+    assert len(pushed) == 2  # policy, peer-group
+    assert not cfg_mgr.commit()
+    assert m.peer_group_mgr.pushed == {}
+    frr.write.return_value = True
+    m.set_handler("30.30.30.2", data)
+    assert cfg_mgr.commit()
+    for cmd in pushed.values():
+        assert cmd in frr.write.call_args[0][0]  # the peer-group and the policy were pushed again
+    assert m.peer_group_mgr.pushed == pushed
+
+def test_get_loopback_interfaces():
+    m = constructor("../../files/image_config/constants/constants.yml")
+    interfaces = m.get_loopback_interfaces()
+    assert interfaces == {("Loopback0", "11.11.11.11/32"): {}, ("Loopback0", "FC00:1::32/128"): {}}
+    assert m.get_loopback_interfaces() is interfaces
+    m.directory.put("CONFIG_DB", swsscommon.CFG_LOOPBACK_INTERFACE_TABLE_NAME, "Loopback4096|12.12.12.12/32", {})
+    assert ("Loopback4096", "12.12.12.12/32") in m.get_loopback_interfaces()
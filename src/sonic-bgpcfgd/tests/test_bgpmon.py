@@ -0,0 +1,123 @@
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+from swsscommon import swsscommon
+from bgpmon.bgpmon import BgpStateGet, FrrLogFollower
+import bgpmon.bgpmon
+
+
+@pytest.fixture
+@patch('swsscommon.swsscommon.RedisPipeline')
+@patch('swsscommon.swsscommon.SonicV2Connector')
+def bgp_mon(mock_conn, mock_pipe):
+    m = BgpStateGet()
+    m.flush_pipe = MagicMock()
+    return m
+
+def summary_json(peers, ipv6_peers=None):
+    def af(peers):
+        return {"peers": {peer: {"state": state, "remoteAs": remote_as, "localAs": local_as}
+                          for peer, (state, remote_as, local_as) in peers.items()}}
+    summary = {"ipv4Unicast": af(peers)}
+    if ipv6_peers is not None:
+        summary["ipv6Unicast"] = af(ipv6_peers)
+    return json.dumps(summary)
+
+def test_follower_adjchange(tmp_path):
+    log = tmp_path / "frr.log"
+    log.write_text("Jan  1 00:00:00 bgpd[1]: %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T1) in vrf default Up\n")
+    follower = FrrLogFollower(str(log))
+    # the notifications written before start are skipped
+    assert follower.get_changed_peers() == []
+    with open(str(log), "a") as fp:
+        fp.write("Jan  1 00:00:01 bgpd[1]: [M59KS-A3ZXZ] %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T1) in vrf default Down BGP Notification send\n")
+        fp.write("Jan  1 00:00:01 bgpd[1]: %ADJCHANGE: neighbor fc00::2(Unknown) in vrf default Up\n")
+        fp.write("Jan  1 00:00:01 bgpd[1]: %ADJCHANGE: neighbor 10.1.0.1(Unknown) in vrf Vrf_red Up\n")
+        fp.write("Jan  1 00:00:01 bgpd[1]: %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T1) in vrf default Up\n")
+        fp.write("Jan  1 00:00:02 zebra[2]: some other message\n")
+        fp.write("Jan  1 00:00:02 bgpd[1]: %ADJCHANGE: neighbor 10.0.0.5 Up")
+    assert follower.get_changed_peers() == ["10.0.0.1", "fc00::2"]
+    # the partial line is reported once it is complete
+    with open(str(log), "a") as fp:
+        fp.write("\n")
+    assert follower.get_changed_peers() == ["10.0.0.5"]
+    assert follower.get_changed_peers() == []
+
+def test_follower_rotation(tmp_path):
+    log = tmp_path / "frr.log"
+    log.write_text("Jan  1 00:00:00 bgpd[1]: start\n")
+    follower = FrrLogFollower(str(log))
+    log.rename(tmp_path / "frr.log.1")
+    assert follower.get_changed_peers() == []
+    log.write_text("Jan  1 00:00:01 bgpd[1]: %ADJCHANGE: neighbor 10.0.0.1(ARISTA01T1) in vrf default Up\n")
+    assert follower.get_changed_peers() == ["10.0.0.1"]
+    # truncated in place
+    log.write_text("bgpd[1]: %ADJCHANGE: neighbor 10.0.0.2 Up\n")
+    assert follower.get_changed_peers() == ["10.0.0.2"]
+
+def test_follower_missing_file(tmp_path):
+    follower = FrrLogFollower(str(tmp_path / "frr.log"))
+    assert follower.get_changed_peers() == []
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_update_changed_new_and_changed(mocked_getstatusoutput, bgp_mon):
+    bgp_mon.peer_l = {"10.0.0.1"}
+    bgp_mon.peer_state = {"10.0.0.1": "Established"}
+    mocked_getstatusoutput.return_value = (0, summary_json({"10.0.0.1": ("Active", 65200, 65100),
+                                                            "10.0.0.3": ("Established", 65200, 65100)},
+                                                           {"fc00::2": ("Established", 65100, 65100)}))
+    bgp_mon.update_changed_neigh_states(["10.0.0.1", "fc00::2"])
+    mocked_getstatusoutput.assert_called_once_with(["vtysh", "-H", "/dev/null", "-c", "show bgp summary json"])
+    bgp_mon.flush_pipe.assert_called_once_with({
+        "NEIGH_STATE_TABLE|10.0.0.1": {'state': 'Active', 'peerType': 'e-BGP'},
+        "NEIGH_STATE_TABLE|fc00::2": {'state': 'Established', 'peerType': 'i-BGP'},
+    })
+    assert bgp_mon.peer_l == {"10.0.0.1", "fc00::2"}
+    assert bgp_mon.peer_state == {"10.0.0.1": "Active", "fc00::2": "Established"}
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_update_changed_unchanged_state(mocked_getstatusoutput, bgp_mon):
+    bgp_mon.peer_l = {"10.0.0.1"}
+    bgp_mon.peer_state = {"10.0.0.1": "Established"}
+    mocked_getstatusoutput.return_value = (0, summary_json({"10.0.0.1": ("Established", 65200, 65100)}))
+    bgp_mon.update_changed_neigh_states(["10.0.0.1"])
+    bgp_mon.flush_pipe.assert_not_called()
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_update_changed_deleted(mocked_getstatusoutput, bgp_mon):
+    bgp_mon.peer_l = {"10.0.0.1"}
+    bgp_mon.peer_state = {"10.0.0.1": "Established"}
+    mocked_getstatusoutput.return_value = (0, summary_json({"10.0.0.2": ("Established", 65200, 65100)}))
+    bgp_mon.update_changed_neigh_states(["10.0.0.1"])
+    bgp_mon.flush_pipe.assert_called_once_with({"NEIGH_STATE_TABLE|10.0.0.1": None})
+    assert bgp_mon.peer_l == set()
+    assert bgp_mon.peer_state == {}
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell', return_value=(1, ""))
+def test_update_changed_failure(mocked_getstatusoutput, bgp_mon):
+    bgp_mon.peer_l = {"10.0.0.1"}
+    bgp_mon.peer_state = {"10.0.0.1": "Established"}
+    bgp_mon.update_changed_neigh_states(["10.0.0.1"])
+    bgp_mon.flush_pipe.assert_not_called()
+    assert bgp_mon.peer_state == {"10.0.0.1": "Established"}
+
+def test_update_changed_many_peers(bgp_mon):
+    bgp_mon.get_all_neigh_states = MagicMock()
+    bgp_mon.update_neigh_states = MagicMock()
+    bgp_mon.get_neigh_states = MagicMock()
+    peers = ["10.0.0.%d" % i for i in range(bgpmon.bgpmon.PIPE_BATCH_MAX_COUNT + 1)]
+    bgp_mon.update_changed_neigh_states(peers)
+    bgp_mon.get_all_neigh_states.assert_called_once()
+    bgp_mon.update_neigh_states.assert_called_once()
+    bgp_mon.get_neigh_states.assert_not_called()
+
+@patch('bgpmon.bgpmon.getstatusoutput_noshell')
+def test_stream_and_reconcile_agree(mocked_getstatusoutput, bgp_mon):
+    mocked_getstatusoutput.return_value = (0, summary_json({"10.0.0.1": ("Idle (Admin)", 65200, 65100)}))
+    bgp_mon.update_changed_neigh_states(["10.0.0.1"])
+    assert bgp_mon.flush_pipe.call_count == 1
+    bgp_mon.get_all_neigh_states()
+    bgp_mon.update_neigh_states()
+    assert bgp_mon.flush_pipe.call_count == 1  # the reconciliation found the same state
+    assert bgp_mon.peer_l == {"10.0.0.1"}
+    assert bgp_mon.peer_state == {"10.0.0.1": "Idle (Admin)"}
@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock
 
-from bgpcfgd.config import ConfigMgr
+from bgpcfgd.config import ConfigMgr, ConfigIndex
 
 
 def test_constructor():
@@ -205,3 +205,185 @@ def test_from_canonical():
     c = ConfigMgr(frr)
     raw = c.from_canonical(canonical)
     assert raw == expected
+
+def test_update_cached():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 65100\n")
+    c = ConfigMgr(frr)
+    c.update()
+    c.update()
+    assert frr.get_config.call_count == 1
+    c.update(force=True)
+    assert frr.get_config.call_count == 2
+
+def test_update_after_commit():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 65100\n")
+    frr.write = MagicMock(return_value=True)
+    c = ConfigMgr(frr)
+    c.update()
+    index = c.get_index()
+    c.push_list(["route-map A10 permit 10", " set tag 1", "ip prefix-list PL_V4 seq 10 permit 10.0.0.0/8"])
+    c.commit()
+    c.update()
+    assert frr.get_config.call_count == 1  # the committed changes were applied to the index
+    assert c.get_index() is index
+    assert list(c.get_index().get_route_map("A10").items()) == [(("permit", 10), ["set tag 1"])]
+    assert c.get_index().get_prefix_list("ip", "PL_V4") == [(10, "permit 10.0.0.0/8")]
+    frr.get_config.return_value = "router bgp 65100\nroute-map A10 permit 10\n set tag 1\n"
+    assert c.get_text() == ["router bgp 65100", "route-map A10 permit 10", " set tag 1", "", "     "]
+    assert frr.get_config.call_count == 2  # the text is re-read after a commit
+
+def test_update_after_failed_commit():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 65100\n")
+    frr.write = MagicMock(return_value=False)
+    c = ConfigMgr(frr)
+    c.update()
+    index = c.get_index()
+    c.push("route-map A10 permit 10")
+    c.commit()
+    c.update()
+    assert frr.get_config.call_count == 2
+    assert c.get_index() is index  # the config text wasn't changed, so it wasn't parsed again
+    assert list(c.get_index().get_route_map("A10").keys()) == []
+
+def test_update_after_commit_not_applicable():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 65100\nroute-map A10 permit 10\n set tag 1\n")
+    frr.write = MagicMock(return_value=True)
+    c = ConfigMgr(frr)
+    c.update()
+    c.get_index()
+    c.push_list(["route-map A10 permit 10", " set tag 2"])
+    c.commit()
+    frr.get_config.return_value = "router bgp 65100\nroute-map A10 permit 10\n set tag 2\n"
+    c.update()
+    assert frr.get_config.call_count == 2
+    assert list(c.get_index().get_route_map("A10").items()) == [(("permit", 10), ["set tag 2"])]
+
+def test_update_resync_interval():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 65100\n")
+    c = ConfigMgr(frr)
+    c.update()
+    c.synced_time -= ConfigMgr.RESYNC_INTERVAL
+    c.update()
+    assert frr.get_config.call_count == 2
+
+def test_config_index():
+    raw_config = """
+!
+ip prefix-list PL_V4 seq 10 deny 0.0.0.0/0 le 17
+ip prefix-list PL_V4 seq 20 permit 10.0.0.0/8 le 32
+ipv6 prefix-list PL_V6 seq 10 deny ::/0 le 59
+bgp community-list standard COMMUNITY_1 permit 1010:2020
+bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_
+!
+router bgp 12345
+  bgp router-id 1020
+  neighbor PEER_V4 peer-group
+  neighbor PEER_V6 peer-group
+  address-family ipv4
+    neighbor PEER_V4 route-map A10 in
+    neighbor PEER_V4 route-map A30 out
+  exit-address-family
+  address-family ipv6
+    neighbor PEER_V6 route-map A20 in
+  exit-address-family
+route-map A10 permit 10
+  match ip address prefix-list PL_V4
+  call A20
+!
+route-map A10 deny 20
+!
+route-map A20 permit 10
+!
+"""
+    index = ConfigIndex(raw_config.split("\n"))
+    assert index.get_prefix_list("ip", "PL_V4") == [(10, "deny 0.0.0.0/0 le 17"), (20, "permit 10.0.0.0/8 le 32")]
+    assert index.get_prefix_list("ipv6", "PL_V6") == [(10, "deny ::/0 le 59")]
+    assert index.get_prefix_list("ipv6", "PL_V4") == []
+    assert index.get_community_list("COMMUNITY_1") == ["1010:2020"]
+    assert index.get_community_list("COMMUNITY_2") == []
+    assert index.get_as_path_list("T2_GROUP_ASNS") == ["bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_"]
+    assert index.get_peer_groups() == ["PEER_V4", "PEER_V6"]
+    assert index.get_neighbor_route_maps("PEER_V4", "in") == ["A10"]
+    assert index.get_all_neighbor_route_maps("out") == {"A30"}
+    assert list(index.get_route_map("A10").items()) == [
+        (("permit", 10), ["match ip address prefix-list PL_V4", "call A20"]),
+        (("deny", 20), []),
+    ]
+    assert list(index.get_route_map("A30").items()) == []
+
+def test_config_index_apply():
+    index = ConfigIndex("""
+ip prefix-list PL_V4 seq 10 deny 0.0.0.0/0 le 17
+ip prefix-list PL_V4 seq 20 permit 10.0.0.0/8 le 32
+bgp community-list standard COMMUNITY_1 permit 1010:2020
+bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_
+router bgp 12345
+  neighbor PEER_V4 peer-group
+  neighbor PEER_V6 peer-group
+  address-family ipv4
+    neighbor PEER_V4 route-map A10 in
+  exit-address-family
+route-map A10 permit 10
+  match ip address prefix-list PL_V4
+route-map A10 permit 20
+""".split("\n"))
+    assert index.apply("""
+no ip prefix-list PL_V4 seq 10
+ip prefix-list PL_V4 seq 15 permit 20.0.0.0/8 le 32
+no bgp community-list standard COMMUNITY_1
+bgp community-list standard COMMUNITY_2 permit 1010:3030
+no bgp as-path access-list T2_GROUP_ASNS seq 5 permit _64128_
+router bgp 12345
+  no neighbor PEER_V6 peer-group
+  address-family ipv4
+    no neighbor PEER_V4 route-map A10 in
+    neighbor PEER_V4 route-map A20 in
+  exit-address-family
+exit
+no route-map A10 permit 20
+route-map A10 permit 10
+  no match ip address prefix-list PL_V4
+  call A20
+""".split("\n"))
+    assert index.get_prefix_list("ip", "PL_V4") == [(15, "permit 20.0.0.0/8 le 32"), (20, "permit 10.0.0.0/8 le 32")]
+    assert index.get_community_list("COMMUNITY_1") == []
+    assert index.get_community_list("COMMUNITY_2") == ["1010:3030"]
+    assert index.get_as_path_list("T2_GROUP_ASNS") == []
+    assert index.get_peer_groups() == ["PEER_V4"]
+    assert index.get_neighbor_route_maps("PEER_V4", "in") == ["A20"]
+    assert list(index.get_route_map("A10").items()) == [(("permit", 10), ["call A20"])]
+    assert not index.apply(["ip prefix-list PL_V4 permit 30.0.0.0/8"])
+    assert not index.apply(["no router bgp 12345"])
+
+def test_current_config_after_commit():
+    frr = MagicMock()
+    frr.get_config = MagicMock(return_value="router bgp 65100\n")
+    frr.write = MagicMock(return_value=True)
+    c = ConfigMgr(frr)
+    c.update()
+    c.push_list(["route-map A10 permit 10", " set tag 1"])
+    c.commit()
+    c.update()
+    assert frr.get_config.call_count == 1
+    frr.get_config.return_value = "router bgp 65100\nroute-map A10 permit 10\n set tag 1\n"
+    assert c.current_config == [["router bgp 65100"], ["route-map A10 permit 10"], ["route-map A10 permit 10", "set tag 1"]]
+    assert frr.get_config.call_count == 2
+
+def test_config_index_apply_route_map_replaced_line():
+    index = ConfigIndex("""
+route-map A10 permit 10
+  match ip address prefix-list PL_V4
+  call A20
+""".split("\n"))
+    assert index.apply(["route-map A10 permit 10", "  call  A20"])
+    assert not index.apply(["route-map A10 permit 10", "  call A30"])
+    # lines added by the same changes don't replace each other
+    assert index.apply(["route-map A40 permit 10", "  match ip address prefix-list PL_V4",
+                        "  match community COMMUNITY_1"])
+    assert list(index.get_route_map("A40").items()) == [
+        (("permit", 10), ["match ip address prefix-list PL_V4", "match community COMMUNITY_1"])]
@@ -55,3 +55,60 @@ def test_directory(mocked_log_err):
     # Test remove_slot() with nonexist table
     directory.remove_slot("db_name", "table_nonexist")
     mocked_log_err.assert_called_with("Directory: Can't remove slot 'db_name__table_nonexist'. The slot doesn't exist")
+
+def test_directory_notify():
+    directory = Directory()
+    handler_slot = MagicMock()
+    handler_asn = MagicMock()
+    handler_both = MagicMock()
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "")], handler_slot)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")], handler_asn)
+    directory.subscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn"),
+                         ("CONFIG_DB", "DEVICE_METADATA", "localhost/type")], handler_both)
+
+    # the dependency isn't satisfied yet
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"hostname": "switch"})
+    assert handler_slot.call_count == 1
+    assert handler_asn.call_count == 0
+    assert handler_both.call_count == 0
+
+    # a handler subscribed to several satisfied paths runs once
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100", "type": "ToRRouter"})
+    assert handler_slot.call_count == 2
+    assert handler_asn.call_count == 1
+    assert handler_both.call_count == 1
+
+    # a change of the unrelated key doesn't notify path handlers
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "other", {"bgp_asn": "65200"})
+    assert handler_slot.call_count == 3
+    assert handler_asn.call_count == 1
+    assert handler_both.call_count == 1
+
+    # a change of another slot doesn't notify anybody
+    directory.put("CONFIG_DB", "BGP_NEIGHBOR", "localhost", {"bgp_asn": "65200"})
+    assert handler_slot.call_count == 3
+    assert handler_asn.call_count == 1
+
+    directory.unsubscribe([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")])
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100", "type": "ToRRouter"})
+    assert handler_asn.call_count == 1
+    assert handler_both.call_count == 2  # still subscribed to localhost/type
+
+def test_directory_available_deps():
+    directory = Directory()
+    directory.put("CONFIG_DB", "DEVICE_METADATA", "localhost", {"bgp_asn": "65100"})
+    assert directory.available_deps([("CONFIG_DB", "DEVICE_METADATA", "localhost/bgp_asn")])
+    assert directory.available_deps([("CONFIG_DB", "DEVICE_METADATA", "")])
+    assert not directory.available_deps([("CONFIG_DB", "DEVICE_METADATA", "localhost/type")])
+    assert directory.split_path("localhost/bgp_asn") == ("localhost", "bgp_asn")
+    assert directory.split_path("") == ()
+
+def test_directory_slot_version():
+    directory = Directory()
+    assert directory.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE") == 0
+    directory.put("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0|10.1.0.32/32", {})
+    version = directory.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE")
+    assert version > 0
+    directory.remove("CONFIG_DB", "LOOPBACK_INTERFACE", "Loopback0|10.1.0.32/32")
+    assert directory.get_slot_version("CONFIG_DB", "LOOPBACK_INTERFACE") > version
+    assert directory.get_slot_version("CONFIG_DB", "DEVICE_METADATA") == 0
@@ -66,3 +66,140 @@ def test_restart_peer_groups_fail(mocked_log_crit):
     res = f.restart_peer_groups(["pg_1", "pg_2"])
     assert not res, "Expect False return value"
     mocked_log_crit.assert_called_with("Can't restart bgp peer-group 'pg_2'. rc='1', out='some output', err='some error'")
+
+class FakeVtySocket(object):
+    """ Emulates vty socket of FRR daemon. The reply is produced by handler(command) -> (rc, output) """
+    def __init__(self, handler):
+        self.handler = handler
+        self.commands = []
+        self.reply = b""
+
+    def sendall(self, data):
+        command = data.decode('utf-8').rstrip('\0')
+        self.commands.append(command)
+        rc, out = self.handler(command)
+        self.reply = out.encode('utf-8') + b'\0\0\0' + bytes([rc])
+
+    def recv(self, size):
+        chunk, self.reply = self.reply[:size], self.reply[size:]
+        return chunk
+
+    def close(self):
+        pass
+
+def make_vty(handlers):
+    vty = bgpcfgd.frr.VtyClient(list(handlers.keys()))
+    vty.socks = {daemon: FakeVtySocket(handler) for daemon, handler in handlers.items()}
+    return vty
+
+def test_vty_execute():
+    vty = make_vty({"bgpd": lambda cmd: (0, "x" * 40000)})
+    rc, out = vty.execute("bgpd", "show running-config")
+    assert rc == 0
+    assert out == "x" * 40000
+
+def test_vty_execute_closed():
+    vty = make_vty({"bgpd": lambda cmd: (0, "")})
+    vty.socks["bgpd"].recv = lambda size: b""
+    with pytest.raises(ConnectionError):
+        vty.execute("bgpd", "show running-config")
+
+def test_vty_configure():
+    bgpd = lambda cmd: (0, "") if not cmd.startswith("ip route") else (2, "% Unknown command")
+    staticd = lambda cmd: (0, "") if cmd.startswith(("ip route", "configure", "end")) else (2, "% Unknown command")
+    vty = make_vty({"bgpd": bgpd, "staticd": staticd})
+    failed = vty.configure(vty.plan("router bgp 65100\n neighbor 10.0.0.1 remote-as 65200\n!\nip route 10.1.0.0/24 10.0.0.1\n"))
+    assert failed == []
+    assert vty.socks["bgpd"].commands == ["configure terminal", "router bgp 65100", "neighbor 10.0.0.1 remote-as 65200", "end"]
+    assert vty.socks["staticd"].commands == ["configure terminal", "ip route 10.1.0.0/24 10.0.0.1", "end"]
+
+def test_vty_configure_failed():
+    zebra = lambda cmd: (2, "% Unknown command") if cmd == "set tag 2" else (0, "")
+    vty = make_vty({"bgpd": lambda cmd: (0, ""), "zebra": zebra})
+    failed = vty.configure(vty.plan("route-map RM permit 10\n set tag 2\n"))
+    assert failed == [("set tag 2", ["zebra: % Unknown command"])]
+
+def test_vty_configure_context():
+    vty = make_vty({"bgpd": lambda cmd: (0, ""), "zebra": lambda cmd: (0, "")})
+    failed = vty.configure(vty.plan("route-map RM permit 10\n set tag 1\nrouter bgp 65100\n bgp router-id 1.1.1.1\n"
+                                    "route-map RM permit 20\nip protocol bgp route-map RM\n"))
+    assert failed == []
+    assert vty.socks["bgpd"].commands == ["configure terminal", "route-map RM permit 10", "set tag 1",
+                                          "end", "configure terminal", "router bgp 65100", "bgp router-id 1.1.1.1",
+                                          "end", "configure terminal", "route-map RM permit 20", "end"]
+    assert vty.socks["zebra"].commands == ["configure terminal", "route-map RM permit 10", "set tag 1",
+                                           "end", "configure terminal", "route-map RM permit 20",
+                                           "end", "configure terminal", "ip protocol bgp route-map RM", "end"]
+
+def test_vty_plan():
+    vty = make_vty({"bgpd": lambda cmd: (0, ""), "zebra": lambda cmd: (0, ""), "staticd": lambda cmd: (0, "")})
+    plan = vty.plan("vrf Vrf1\n vni 100\n ip route 10.1.0.0/24 10.0.0.1\nexit-vrf\nno route-map RM\n"
+                    "segment-routing\nsrv6\nlocators\n")
+    assert plan == [("vrf Vrf1", ["zebra", "staticd"], True, True),
+                    ("vni 100", ["zebra"], False, False),
+                    ("ip route 10.1.0.0/24 10.0.0.1", ["staticd"], False, False),
+                    ("exit-vrf", ["zebra", "staticd"], False, False),
+                    ("no route-map RM", ["bgpd", "zebra"], True, False),
+                    ("segment-routing", ["zebra"], True, True),
+                    ("srv6", ["zebra"], False, False),
+                    ("locators", ["zebra"], False, False)]
+
+def test_vty_plan_unknown_command():
+    vty = make_vty({"bgpd": lambda cmd: (0, ""), "zebra": lambda cmd: (0, "")})
+    assert vty.plan("hostname sonic\n") is None
+    assert vty.plan("route-map RM permit 10\nexit\n set tag 1\n") is None
+    assert vty.plan("ip route 10.1.0.0/24 10.0.0.1\n") is None
+
+def test_merge_configs():
+    bgpd = "hostname sonic\n!\nroute-map RM permit 10\n set tag 1\nexit\n!\nrouter bgp 65100\n bgp router-id 1.1.1.1\nexit\n"
+    zebra = "hostname sonic\n!\nroute-map RM permit 10\n set tag 1\nexit\n!\nip protocol bgp route-map RM\n"
+    out = bgpcfgd.frr.FRR.merge_configs([bgpd, zebra])
+    assert out == "hostname sonic\nroute-map RM permit 10\n set tag 1\nexit\nrouter bgp 65100\n bgp router-id 1.1.1.1\nexit\nip protocol bgp route-map RM\n"
+
+def test_merge_configs_same_named_blocks():
+    zebra = "vrf Vrf1\n vni 100\nexit-vrf\n!\nroute-map RM permit 10\n set src 10.1.0.32\nexit\n"
+    staticd = "vrf Vrf1\n ip route 10.1.0.0/24 10.0.0.1\nexit-vrf\n"
+    bgpd = "route-map RM permit 10\n set tag 1\nexit\n"
+    out = bgpcfgd.frr.FRR.merge_configs([zebra, staticd, bgpd])
+    assert out == "vrf Vrf1\n vni 100\n ip route 10.1.0.0/24 10.0.0.1\nexit-vrf\n" \
+                  "route-map RM permit 10\n set src 10.1.0.32\n set tag 1\nexit\n"
+
+def test_write_vty():
+    f = bgpcfgd.frr.FRR(["bgpd"])
+    f.vty = make_vty({"bgpd": lambda cmd: (0, "")})
+    bgpcfgd.frr.run_command = lambda cmd: (1, "", "vtysh must not be called")
+    assert f.write("router bgp 65100")
+
+@patch('bgpcfgd.frr.log_err')
+def test_write_vty_failed(mocked_log_err):
+    f = bgpcfgd.frr.FRR(["bgpd"])
+    f.vty = make_vty({"bgpd": lambda cmd: (2, "% Unknown command") if cmd == "bad command" else (0, "")})
+    assert not f.write("router bgp 65100\n bad command")
+    mocked_log_err.assert_called_with("ConfigMgr::commit(): FRR rejected command 'bad command': bgpd: % Unknown command")
+
+def test_write_vty_unknown_command():
+    f = bgpcfgd.frr.FRR(["bgpd"])
+    f.vty = make_vty({"bgpd": lambda cmd: (0, "")})
+    bgpcfgd.frr.run_command = lambda cmd: (0, "some output", "")
+    assert f.write("hostname sonic")
+    assert f.vty.socks["bgpd"].commands == []
+
+def test_write_vty_fallback():
+    f = bgpcfgd.frr.FRR(["bgpd"])
+    f.vty = make_vty({"bgpd": lambda cmd: (0, "")})
+    f.vty.socks["bgpd"].recv = lambda size: b""
+    f.open_vty_sessions = lambda: False
+    bgpcfgd.frr.run_command = lambda cmd: (0, "some output", "")
+    assert f.write("router bgp 65100")
+    assert f.vty is None
+
+def test_get_config_vty():
+    f = bgpcfgd.frr.FRR(["bgpd", "zebra"])
+    f.vty = make_vty({"bgpd": lambda cmd: (0, "router bgp 65100\n"), "zebra": lambda cmd: (0, "ip protocol bgp route-map RM\n")})
+    assert f.get_config() == "router bgp 65100\nip protocol bgp route-map RM\n"
+
+def test_restart_peer_groups_vty():
+    f = bgpcfgd.frr.FRR(["bgpd"])
+    f.vty = make_vty({"bgpd": lambda cmd: (0, "")})
+    assert f.restart_peer_groups(["pg_1", "pg_2"])
+    assert f.vty.socks["bgpd"].commands == ["clear bgp peer-group pg_1 soft in", "clear bgp peer-group pg_2 soft in"]
@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock, patch
+
+from . import swsscommon_test
+
+import sys
+sys.modules["swsscommon"] = swsscommon_test
+
+import bgpcfgd.runner
+from bgpcfgd.runner import EventQueue, Runner
+from swsscommon import swsscommon
+
+SET = swsscommon.SET_COMMAND
+DEL = swsscommon.DEL_COMMAND
+
+
+def test_event_queue_merge_sets():
+    q = EventQueue()
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "1"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "3"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.2", SET, {"asn": "2"})
+    assert list(q.items()) == [
+        (4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "3"}),
+        (4, "BGP_NEIGHBOR", "10.0.0.2", SET, {"asn": "2"}),
+    ]
+    assert q.received == 3
+    assert q.collapsed == 1
+
+def test_event_queue_keeps_order_across_keys():
+    q = EventQueue()
+    q.put(4, "PREFIX_LIST", "PL1", SET, {"a": "1"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"pl": "PL1"})
+    q.put(4, "PREFIX_LIST", "PL1", DEL, {})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.2", SET, {"asn": "2"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {})
+    assert list(q.items()) == [
+        (4, "PREFIX_LIST", "PL1", SET, {"a": "1"}),
+        (4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"pl": "PL1"}),
+        (4, "PREFIX_LIST", "PL1", DEL, {}),
+        (4, "BGP_NEIGHBOR", "10.0.0.2", SET, {"asn": "2"}),
+        (4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {}),
+    ]
+    assert q.collapsed == 0
+
+def test_run_handles_isolated_event_without_window():
+    runner = Runner(MagicMock(), coalescing_window=200)
+    runner.selector = MagicMock()
+    timeouts = []
+    def select(timeout):
+        timeouts.append(timeout)
+        if len(timeouts) == 1:
+            return runner.selector.OBJECT, None
+        bgpcfgd.runner.g_run = False
+        return runner.selector.TIMEOUT, None
+    runner.selector.select.side_effect = select
+    runner.collect = MagicMock()
+    runner.dispatch = MagicMock()
+    runner.commit = MagicMock()
+    runner.publish_stats = MagicMock()
+    try:
+        runner.run()
+    finally:
+        bgpcfgd.runner.g_run = True
+    assert timeouts[1] <= Runner.COALESCING_IDLE_TIMEOUT
+    runner.dispatch.assert_called_once()
+
+def test_event_queue_set_del():
+    q = EventQueue()
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "1"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "2"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {})
+    assert list(q.items()) == [(4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {})]
+    assert q.collapsed == 2
+
+def test_event_queue_del_set():
+    q = EventQueue()
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "1"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "2"})
+    assert list(q.items()) == [
+        (4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {}),
+        (4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "2"}),
+    ]
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {})
+    assert list(q.items()) == [(4, "BGP_NEIGHBOR", "10.0.0.1", DEL, {})]
+    assert q.received == 4
+    assert q.collapsed == 3
+
+def test_event_queue_different_tables():
+    q = EventQueue()
+    q.put(4, "BGP_NEIGHBOR", "key", SET, {"a": "1"})
+    q.put(4, "BGP_MONITORS", "key", SET, {"a": "2"})
+    q.put(0, "BGP_NEIGHBOR", "key", DEL, {})
+    assert len(list(q.items())) == 3
+    assert q.collapsed == 0
+
+def test_dispatch():
+    runner = Runner(MagicMock())
+    handler = MagicMock()
+    runner.callbacks[4]["BGP_NEIGHBOR"].append(handler)
+    q = EventQueue()
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "1"})
+    q.put(4, "BGP_NEIGHBOR", "10.0.0.1", SET, {"asn": "2"})
+    runner.dispatch(q)
+    handler.assert_called_once_with("10.0.0.1", SET, {"asn": "2"})
+    assert runner.stats["events_received"] == 2
+    assert runner.stats["events_collapsed"] == 1
+
+def test_commit_stats():
+    cfg_mgr = MagicMock()
+    cfg_mgr.generation = 0
+    def commit():
+        cfg_mgr.generation += 1
+        return True
+    cfg_mgr.commit = commit
+    runner = Runner(cfg_mgr)
+    runner.commit()
+    assert runner.stats["commits"] == 1
+    cfg_mgr.commit = MagicMock(return_value=True)  # nothing to commit
+    runner.commit()
+    assert runner.stats["commits"] == 1
+
+@patch('bgpcfgd.runner.log_info')
+def test_publish_stats(mocked_log_info):
+    runner = Runner(MagicMock())
+    runner.stats_table = MagicMock()
+    runner.publish_stats()
+    assert runner.stats_table.set.call_count == 1
+    runner.publish_stats()  # too early
+    assert runner.stats_table.set.call_count == 1
+    runner.stats_published -= Runner.STATS_PUBLISH_INTERVAL
+    runner.publish_stats()  # nothing was changed
+    assert runner.stats_table.set.call_count == 1
+    runner.stats["commits"] += 1
+    runner.publish_stats()
+    assert runner.stats_table.set.call_count == 2
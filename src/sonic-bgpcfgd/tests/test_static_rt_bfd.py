@@ -1,14 +1,15 @@
-from unittest.mock import patch
-#from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 from staticroutebfd.main import *
 from swsscommon import swsscommon
 
 @patch('swsscommon.swsscommon.DBConnector.__init__')
+@patch('swsscommon.swsscommon.RedisPipeline.__init__')
 @patch('swsscommon.swsscommon.ProducerStateTable.__init__')
 @patch('swsscommon.swsscommon.Table.__init__')
-def constructor(mock_db, mock_producer, mock_tbl):
+def constructor(mock_db, mock_pipe, mock_producer, mock_tbl):
     mock_db.return_value = None
+    mock_pipe.return_value = None
     mock_producer.return_value = None
     mock_tbl.return_value = None
 
@@ -750,3 +751,118 @@ def test_set_del_ifname_only_route():
 
     assert "Static route bfd set Failed, nexthop, interface and vrf lists do not match or some of them is empty."\
         in test_set_del_ifname_only_route.logs
+
+def test_bfd_pending_index():
+    dut = constructor()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+
+    # interface ip is not available yet, bfd sessions are pending
+    dut.static_route_set_handler("2.2.2.0/24", {
+        "bfd": "true",
+        "ifname": "if1, if2",
+        "nexthop": "192.168.1.2,192.168.2.2"
+    })
+    assert dut.intf_nexthop_index == {
+        "if1": {"default|192.168.1.2"},
+        "if2": {"default|192.168.2.2"},
+    }
+    assert dut.nexthop_intf_index == {
+        "default|192.168.1.2": {"if1"},
+        "default|192.168.2.2": {"if2"},
+    }
+    assert len(dut.local_db[LOCAL_BFD_PENDING_TABLE]) == 2
+    dut.bfd_appl_tbl.set.assert_not_called()
+
+    dut.interface_set_handler("if1|192.168.1.1/24", {})
+    assert list(dut.local_db[LOCAL_BFD_PENDING_TABLE].keys()) == ["if2_default:default:192.168.2.2"]
+    assert dut.bfd_appl_tbl.set.call_count == 1
+    assert dut.bfd_appl_tbl.set.call_args[0][0] == "default:default:192.168.1.2"
+
+    # other interfaces don't affect the pending sessions
+    dut.interface_set_handler("if3|192.168.3.1/24", {})
+    assert dut.bfd_appl_tbl.set.call_count == 1
+
+    dut.interface_set_handler("if2|192.168.2.1/24", {})
+    assert len(dut.local_db[LOCAL_BFD_PENDING_TABLE]) == 0
+    assert dut.bfd_appl_tbl.set.call_count == 2
+
+def test_nexthop_removal_drops_pending_bfd():
+    dut = constructor()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+
+    dut.static_route_set_handler("2.2.2.0/24", {
+        "bfd": "true",
+        "ifname": "if1, if2",
+        "nexthop": "192.168.1.2,192.168.2.2"
+    })
+    dut.static_route_set_handler("3.3.3.0/24", {
+        "bfd": "true",
+        "ifname": "if1",
+        "nexthop": "192.168.1.2"
+    })
+
+    # 192.168.2.2 is not used by any route anymore, 192.168.1.2 is still used by 3.3.3.0/24
+    dut.static_route_del_handler("2.2.2.0/24", True)
+    assert dut.intf_nexthop_index == {"if1": {"default|192.168.1.2"}}
+    assert dut.nexthop_intf_index == {"default|192.168.1.2": {"if1"}}
+    assert list(dut.local_db[LOCAL_BFD_PENDING_TABLE].keys()) == ["if1_default:default:192.168.1.2"]
+
+    # the removed nexthop doesn't get a bfd session when its interface gets an ip
+    dut.interface_set_handler("if2|192.168.2.1/24", {})
+    dut.bfd_appl_tbl.set.assert_not_called()
+    dut.interface_set_handler("if1|192.168.1.1/24", {})
+    assert dut.bfd_appl_tbl.set.call_count == 1
+    assert dut.bfd_appl_tbl.set.call_args[0][0] == "default:default:192.168.1.2"
+
+def test_flush_appl_db():
+    dut = constructor()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+
+    dut.set_static_route_into_appl_db("default:2.2.2.0/24", {"nexthop": "192.168.1.2"})
+    dut.set_static_route_into_appl_db("default:2.2.2.0/24", {"nexthop": "192.168.1.2,192.168.2.2"})
+    dut.set_static_route_into_appl_db("default:3.3.3.0/24", {"nexthop": "192.168.1.2"})
+    dut.del_static_route_from_appl_db("default:3.3.3.0/24")
+    dut.static_route_appl_tbl.set.assert_not_called()
+
+    dut.flush_appl_db()
+    # only the latest update of each route is written
+    assert dut.static_route_appl_tbl.set.call_count == 1
+    assert dut.static_route_appl_tbl.set.call_args[0][0] == "default:2.2.2.0/24"
+    dut.static_route_appl_tbl.delete.assert_called_once_with("default:3.3.3.0/24")
+    dut.static_route_appl_tbl.flush.assert_called_once()
+    dut.bfd_appl_tbl.flush.assert_called_once()
+    assert dut.static_route_appl_pending == {}
+
+def test_interface_flap_writes_routes_once():
+    # 20 bfd enabled static routes over 4 interfaces, every nexthop serves 10 routes
+    n_routes, n_intfs = 20, 4
+    dut = constructor()
+    dut.bfd_appl_tbl = MagicMock()
+    dut.static_route_appl_tbl = MagicMock()
+
+    for i in range(n_intfs):
+        dut.interface_set_handler("if%d|10.0.%d.1/24" % (i, i), {})
+    for j in range(n_routes):
+        a, b = j % n_intfs, (j + 1) % n_intfs
+        dut.static_route_set_handler("20.0.%d.0/24" % j, {
+            "bfd": "true",
+            "ifname": "if%d,if%d" % (a, b),
+            "nexthop": "10.0.%d.2,10.0.%d.2" % (a, b),
+        })
+    for i in range(n_intfs):
+        dut.bfd_state_set_handler("10.0.%d.2" % i, {"state": "Up"})
+    dut.flush_appl_db()
+    assert dut.bfd_appl_tbl.set.call_count == n_intfs
+    assert dut.static_route_appl_tbl.set.call_count == n_routes
+
+    dut.static_route_appl_tbl.reset_mock()
+    dut.bfd_state_set_handler("10.0.0.2", {"state": "Down"})
+    dut.interface_del_handler("if0|10.0.0.1/24")
+    dut.interface_set_handler("if0|10.0.0.1/24", {})
+    dut.bfd_state_set_handler("10.0.0.2", {"state": "Up"})
+    dut.flush_appl_db()
+    # every route over the flapped interface is written once per batch
+    assert dut.static_route_appl_tbl.set.call_count == 2 * n_routes // n_intfs
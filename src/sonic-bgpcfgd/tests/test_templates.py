@@ -164,3 +164,8 @@ def test_sentinel_pg():
 def test_sentinel_instance():
     test_data = load_tests("sentinels", "instance.conf")
     run_tests("sentinel_instance", *test_data)
+
+def test_get_variables():
+    tf = TemplateFabric(TEMPLATE_PATH)
+    variables = tf.get_variables("bgpd/templates/general/peer-group.conf.j2")
+    assert variables == {"CONFIG_DB__DEVICE_METADATA", "CONFIG_DB__BGP_BBR"}
@@ -0,0 +1,105 @@
+"""
+Thin client of the resident sonic-cfggen server.
+
+sonic-cfggen is called many times during boot, and every call pays for the
+interpreter start, the imports and re-reading CONFIG_DB. When the server
+(sonic-cfggen --server) is running, the command line is forwarded to it over
+a unix socket and executed in the warm server process. The client only uses
+the standard library, so it can run before the heavy imports of sonic-cfggen.
+
+When the server isn't available, or it fails before replying, the caller runs
+the request locally. sonic-cfggen operations are idempotent, so running a
+request again locally is safe.
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+
+SOCKET_PATH = '/var/run/sonic-cfggen/sonic-cfggen.sock'
+SOCKET_PATH_ENV = 'SONIC_CFGGEN_SOCKET'
+# Set to a non-empty value to always run sonic-cfggen locally
+DISABLE_ENV = 'SONIC_CFGGEN_NO_SERVER'
+REQUEST_TIMEOUT = 300  # seconds
+
+HEADER = struct.Struct('!I')
+
+# Arguments which refer to the streams of the calling process can't be executed by the server
+LOCAL_ONLY_ARGS = ('--server', '/dev/stdin', '/dev/stdout', '/dev/stderr', '/dev/fd/', '/proc/self/')
+
+
+def get_socket_path():
+    return os.environ.get(SOCKET_PATH_ENV) or SOCKET_PATH
+
+
+def send_message(sock, message):
+    """ Send a json message prefixed with its length """
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock):
+    """ Receive a json message prefixed with its length. Returns None if the connection was closed """
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    data = _recv_exact(sock, HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def can_forward(argv):
+    if os.environ.get(DISABLE_ENV):
+        return False
+    for arg in argv:
+        if arg == '-' or any(pattern in arg for pattern in LOCAL_ONLY_ARGS):
+            return False
+    return True
+
+
+def forward(argv):
+    """
+    Execute the sonic-cfggen command line on the server
+    :param argv: sonic-cfggen arguments, without the program name
+    :return: exit code of the command, or None if the command must be executed locally
+    """
+    if not can_forward(argv):
+        return None
+    path = get_socket_path()
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(REQUEST_TIMEOUT)
+    try:
+        sock.connect(path)
+        send_message(sock, {
+            'argv': list(argv),
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+        })
+        reply = recv_message(sock)
+    except (socket.error, OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+    if reply is None:
+        return None
+    sys.stdout.write(reply.get('stdout', ''))
+    sys.stderr.write(reply.get('stderr', ''))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return reply.get('rc', 1)
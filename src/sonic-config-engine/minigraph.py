@@ -1,5 +1,7 @@
 from __future__ import print_function
 
+import filecmp
+import hashlib
 import ipaddress
 import math
 import os
@@ -15,7 +17,9 @@ from lxml.etree import QName
 
 from natsort import natsorted, ns as natsortns
 
+import portconfig
 from portconfig import get_port_config, get_fabric_port_config, get_fabric_monitor_config
+from portconfig import file_signature, get_cache_dir, load_cache_file, store_cache_file
 from sonic_py_common.interface import backplane_prefix
 from sonic_py_common.multi_asic import is_multi_asic, get_asic_id_from_name
 
@@ -44,6 +48,29 @@ ns1 = "http://schemas.datacontract.org/2004/07/Microsoft.Search.Autopilot.Evolut
 ns2 = "Microsoft.Search.Autopilot.NetMux"
 ns3 = "http://www.w3.org/2001/XMLSchema-instance"
 
+class QNameTable(dict):
+    """ Element tags of a namespace: str(QName(namespace, name)), computed once per name """
+
+    def __init__(self, namespace):
+        super(QNameTable, self).__init__()
+        self.namespace = namespace
+
+    def __missing__(self, name):
+        tag = self[name] = str(QName(self.namespace, name))
+        return tag
+
+NS_TAG = QNameTable(ns)
+NS1_TAG = QNameTable(ns1)
+NS2_TAG = QNameTable(ns2)
+NS3_TAG = QNameTable(ns3)
+
+def index_children(element):
+    """ Map the tag of each child element to the first child with that tag, like element.find(tag) """
+    children = {}
+    for child in element:
+        children.setdefault(child.tag, child)
+    return children
+
 # Device types
 spine_chassis_frontend_role = 'SpineChassisFrontendRouter'
 chassis_backend_role = 'ChassisBackendRouter'
@@ -142,16 +169,16 @@ def get_chassis_type_and_hostname(root, hname):
     chassis_type = None
     chassis_hostname = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+        if child.tag == NS_TAG["MetadataDeclaration"]:
+            devices = child.find(NS_TAG["Devices"])
+            for device_meta in devices.findall(NS1_TAG["DeviceMetadata"]):
+                device_name = device_meta.find(NS1_TAG["Name"]).text
                 if device_name != hname:
                     continue
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(NS1_TAG["Properties"])
+                for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+                    name = device_property.find(NS1_TAG["Name"]).text
+                    value = device_property.find(NS1_TAG["Value"]).text
                     if name == "ForwardingMethod":
                         chassis_type = value
                     if name == "ParentRouter":
@@ -161,16 +188,16 @@ def get_chassis_type_and_hostname(root, hname):
 def is_chassis_lc_macsec_enabled(root, hname):
     macsec_enble = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+        if child.tag == NS_TAG["MetadataDeclaration"]:
+            devices = child.find(NS_TAG["Devices"])
+            for device_meta in devices.findall(NS1_TAG["DeviceMetadata"]):
+                device_name = device_meta.find(NS1_TAG["Name"]).text
                 if device_name != hname:
                     continue
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(NS1_TAG["Properties"])
+                for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+                    name = device_property.find(NS1_TAG["Name"]).text
+                    value = device_property.find(NS1_TAG["Value"]).text
                     if name == "MacSecEnabled":
                         macsec_enble = value
     return macsec_enble
@@ -224,16 +251,16 @@ def parse_chassis_metadata(root,hname, lcname):
     max_num_core = None
     num_voq = None
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device_meta in devices.findall(str(QName(ns1, "DeviceMetadata"))):
+        if child.tag == NS_TAG["MetadataDeclaration"]:
+            devices = child.find(NS_TAG["Devices"])
+            for device_meta in devices.findall(NS1_TAG["DeviceMetadata"]):
                 slot_index = None
-                device_name = device_meta.find(str(QName(ns1, "Name"))).text
+                device_name = device_meta.find(NS1_TAG["Name"]).text
 
-                properties = device_meta.find(str(QName(ns1, "Properties")))
-                for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                    name = device_property.find(str(QName(ns1, "Name"))).text
-                    value = device_property.find(str(QName(ns1, "Value"))).text
+                properties = device_meta.find(NS1_TAG["Properties"])
+                for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+                    name = device_property.find(NS1_TAG["Name"]).text
+                    value = device_property.find(NS1_TAG["Value"]).text
                     if device_name == hname or device_name == lcname:
                         if name == "TotalCountOfVoQ":
                             num_voq = value
@@ -271,15 +298,15 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
     port_default_speed = {}
     system_port_id = 1
 
-    interface_metadata = device_info.find(str(QName(ns, "InterfaceMetadata")))
-    for interface in interface_metadata.findall(str(QName(ns1, "DeviceInterfaceMetadata"))):
+    interface_metadata = device_info.find(NS_TAG["InterfaceMetadata"])
+    for interface in interface_metadata.findall(NS1_TAG["DeviceInterfaceMetadata"]):
         linecard_name = None
         asic_name = None
         core_port_id = None
         core_id = None
         switch_id = None
         slot_index = None
-        intf_name = interface.find(str(QName(ns1, "InterfaceName"))).text
+        intf_name = interface.find(NS1_TAG["InterfaceName"]).text
         # ignore the managment interfaces
         if any(mgmt_intf in intf_name for mgmt_intf in ['Management', 'console']) == True:
             continue
@@ -301,16 +328,16 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
                   (intf_name), file=sys.stderr)
             continue
 
-        intf_properties = interface.find(str(QName(ns1, "Properties")))
+        intf_properties = interface.find(NS1_TAG["Properties"])
         if intf_properties is None:
             print('Warning cannot find interface porperties  for interface' %
                   (intf_name), file=sys.stderr)
             continue
 
-        for intf_property in intf_properties.findall(str(QName(ns1, "InterfaceProperty"))):
+        for intf_property in intf_properties.findall(NS1_TAG["InterfaceProperty"]):
 
-            name = intf_property.find(str(QName(ns1, "Name"))).text
-            value = intf_property.find(str(QName(ns1, "Value"))).text
+            name = intf_property.find(NS1_TAG["Name"]).text
+            value = intf_property.find(NS1_TAG["Value"]).text
             if name == "CoreId":
                 core_id = value
             if name == "SlotIndex":
@@ -391,14 +418,14 @@ def parse_chassis_deviceinfo_intf_metadata(device_info, chassis_linecards_info,
 
 def parse_chassis_deviceinfo_voq_int_intfs(device_info):
     backend_intf_map = {}
-    backend_interfaces = device_info.find(str(QName(ns, "BackendFabricInterfaces"))).findall(
-        str(QName(ns1, "BackendFabricInterface")))
+    backend_interfaces = device_info.find(NS_TAG["BackendFabricInterfaces"]).findall(
+        NS1_TAG["BackendFabricInterface"])
     voq_internal_intf_attr = {}
     for backend_interface in backend_interfaces:
-        intf_name = backend_interface.find(str(QName(ns, "InterfaceName"))).text
+        intf_name = backend_interface.find(NS_TAG["InterfaceName"]).text
         if any(voq_intf in intf_name.lower() for voq_intf in voq_internal_intfs) == True:
-            sonic_name = backend_interface.find(str(QName(ns, "SonicName"))).text
-            speed = backend_interface.find(str(QName(ns, "Speed"))).text
+            sonic_name = backend_interface.find(NS_TAG["SonicName"]).text
+            speed = backend_interface.find(NS_TAG["Speed"]).text
             backend_intf_map[intf_name] = {'sonic_name': sonic_name, 'speed': speed}
     return backend_intf_map
 
@@ -406,16 +433,16 @@ def parse_chassis_deviceinfo_voq_int_intfs(device_info):
 def parse_chassis_deviceinfo_intfs(device_info):
     interface_map = {}
 
-    interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(
-        str(QName(ns1, "EthernetInterface")))
+    interfaces = device_info.find(NS_TAG["EthernetInterfaces"]).findall(
+        NS1_TAG["EthernetInterface"])
 
     for interface in interfaces:
         # the interface name is at the chassis level, so the interface name will have
         # the slot information. It will be of format
         # Ethernet<slot_index>/port
-        intf_name = interface.find(str(QName(ns, "InterfaceName"))).text
-        sonic_name = interface.find(str(QName(ns, "SonicName"))).text
-        speed = interface.find(str(QName(ns, "Speed"))).text
+        intf_name = interface.find(NS_TAG["InterfaceName"]).text
+        sonic_name = interface.find(NS_TAG["SonicName"]).text
+        speed = interface.find(NS_TAG["Speed"]).text
         interface_map[intf_name] = {'sonic_name': sonic_name, 'speed': speed}
     return interface_map
 
@@ -426,8 +453,8 @@ def parse_chassis_deviceinfo(deviceinfos, chassis_linecards_info, chassis_hwsku,
     chassis_name = None
     port_default_speed = {}
 
-    for device_info in deviceinfos.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in deviceinfos.findall(NS_TAG["DeviceInfo"]):
+        dev_sku = device_info.find(NS_TAG["HwSku"]).text
         if dev_sku == chassis_hwsku:
             # The chassis device_info for sonic chassiss will 3 sections
             # level information
@@ -481,47 +508,41 @@ def get_peer_switch_info(link_metadata, devices):
     return peer_switch_table, mux_tunnel_name, peer_switch_ip
 
 
+# parse_device() fields, by the tag of the child element they are read from
+DEVICE_PREFIX_FIELDS = {
+    NS_TAG["Address"]: 'lo_prefix',
+    NS_TAG["AddressV6"]: 'lo_prefix_v6',
+    NS_TAG["ManagementAddress"]: 'mgmt_prefix',
+    NS_TAG["ManagementAddressV6"]: 'mgmt_prefix_v6',
+}
+DEVICE_TEXT_FIELDS = {
+    NS_TAG["Hostname"]: 'name',
+    NS_TAG["HwSku"]: 'hwsku',
+    NS_TAG["DeploymentId"]: 'deployment_id',
+    NS_TAG["ElementType"]: 'd_type',   # don't shadow type()
+    NS_TAG["ClusterName"]: 'cluster',
+    NS_TAG["SubType"]: 'd_subtype',
+}
+
 def parse_device(device):
-    lo_prefix = None
-    lo_prefix_v6 = None
-    mgmt_prefix = None
-    mgmt_prefix_v6 = None
-    d_type = None   # don't shadow type()
-    hwsku = None
-    name = None
-    deployment_id = None
-    cluster = None
-    d_subtype = None
+    fields = dict.fromkeys(list(DEVICE_PREFIX_FIELDS.values()) + list(DEVICE_TEXT_FIELDS.values()))
     slice_type = None
 
     for node in device:
-        if node.tag == str(QName(ns, "Address")):
-            lo_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "AddressV6")):
-            lo_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddress")):
-            mgmt_prefix = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "ManagementAddressV6")):
-            mgmt_prefix_v6 = node.find(str(QName(ns2, "IPPrefix"))).text
-        elif node.tag == str(QName(ns, "Hostname")):
-            name = node.text
-        elif node.tag == str(QName(ns, "HwSku")):
-            hwsku = node.text
-        elif node.tag == str(QName(ns, "DeploymentId")):
-            deployment_id = node.text
-        elif node.tag == str(QName(ns, "ElementType")):
-            d_type = node.text
-        elif node.tag == str(QName(ns, "ClusterName")):
-            cluster = node.text
-        elif node.tag == str(QName(ns, "SubType")):
-            d_subtype = node.text
-        elif node.tag == str(QName(ns, "AssociatedSliceStr")) and node.text and "AZNG_Production" in node.text:
+        tag = node.tag
+        if tag in DEVICE_PREFIX_FIELDS:
+            fields[DEVICE_PREFIX_FIELDS[tag]] = node.find(NS2_TAG["IPPrefix"]).text
+        elif tag in DEVICE_TEXT_FIELDS:
+            fields[DEVICE_TEXT_FIELDS[tag]] = node.text
+        elif tag == NS_TAG["AssociatedSliceStr"] and node.text and "AZNG_Production" in node.text:
             slice_type = "AZNG_Production"
 
-    if d_type is None and str(QName(ns3, "type")) in device.attrib:
-        d_type = device.attrib[str(QName(ns3, "type"))]
+    d_type = fields['d_type']
+    if d_type is None and NS3_TAG["type"] in device.attrib:
+        d_type = device.attrib[NS3_TAG["type"]]
 
-    return (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype, slice_type)
+    return (fields['lo_prefix'], fields['lo_prefix_v6'], fields['mgmt_prefix'], fields['mgmt_prefix_v6'], fields['name'],
+            fields['hwsku'], d_type, fields['deployment_id'], fields['cluster'], fields['d_subtype'], slice_type)
 
 
 def calculate_lcm_for_ecmp (nhdevices_bank_map, nhip_bank_map):
@@ -604,16 +625,39 @@ def parse_png(png, hname, dpg_ecmp_content = None):
     NEIGH = {}
 
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
-                linktype = link.find(str(QName(ns, "ElementType"))).text
+        if child.tag == NS_TAG["DeviceInterfaceLinks"]:
+            for link in child.findall(NS_TAG["DeviceLinkBase"]):
+                link_nodes = index_children(link)
+                linktype = link_nodes.get(NS_TAG["ElementType"]).text
+
+                link_type = link.attrib.get(NS3_TAG["type"])
+                if link_type == 'DeviceSerialLink':
+                    if NS_TAG["EndPort"] in link_nodes:
+                        console_port = link_nodes[NS_TAG["EndPort"]].text.split()[-1]
+                    if NS_TAG["EndDevice"] in link_nodes:
+                        console_dev = link_nodes[NS_TAG["EndDevice"]].text
+                elif link_type == 'DeviceMgmtLink':
+                    if NS_TAG["EndPort"] in link_nodes:
+                        mgmt_port = link_nodes[NS_TAG["EndPort"]].text.split()[-1]
+                    if NS_TAG["EndDevice"] in link_nodes:
+                        mgmt_dev = link_nodes[NS_TAG["EndDevice"]].text
+
+                if linktype == "LogicalLink":
+                    intf_name = link_nodes.get(NS_TAG["EndPort"]).text
+                    start_device = link_nodes.get(NS_TAG["StartDevice"]).text
+                    if intf_name in port_alias_map:
+                        intf_name = port_alias_map[intf_name]
+
+                    mux_cable_ports[intf_name] = start_device
+
                 if linktype == "DeviceSerialLink":
-                    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                    startport = link.find(str(QName(ns, "StartPort"))).text
-                    baudrate = link.find(str(QName(ns, "Bandwidth"))).text
-                    flowcontrol = 1 if link.find(str(QName(ns, "FlowControl"))) is not None and link.find(str(QName(ns, "FlowControl"))).text == 'true' else 0
+                    enddevice = link_nodes.get(NS_TAG["EndDevice"]).text
+                    endport = link_nodes.get(NS_TAG["EndPort"]).text
+                    startdevice = link_nodes.get(NS_TAG["StartDevice"]).text
+                    startport = link_nodes.get(NS_TAG["StartPort"]).text
+                    baudrate = link_nodes.get(NS_TAG["Bandwidth"]).text
+                    flowcontrol_node = link_nodes.get(NS_TAG["FlowControl"])
+                    flowcontrol = 1 if flowcontrol_node is not None and flowcontrol_node.text == 'true' else 0
                     if enddevice.lower() == hname.lower() and endport.isdigit():
                         console_ports[endport] = {
                             'remote_device': startdevice,
@@ -629,18 +673,18 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     continue
 
                 if linktype == "DeviceInterfaceLink":
-                    endport = link.find(str(QName(ns, "EndPort"))).text
-                    startdevice = link.find(str(QName(ns, "StartDevice"))).text
+                    endport = link_nodes.get(NS_TAG["EndPort"]).text
+                    startdevice = link_nodes.get(NS_TAG["StartDevice"]).text
                     port_device_map[endport] = startdevice
 
                 if linktype != "DeviceInterfaceLink" and linktype != "UnderlayInterfaceLink" and linktype != "DeviceMgmtLink":
                     continue
 
-                enddevice = link.find(str(QName(ns, "EndDevice"))).text
-                endport = link.find(str(QName(ns, "EndPort"))).text
-                startdevice = link.find(str(QName(ns, "StartDevice"))).text
-                startport = link.find(str(QName(ns, "StartPort"))).text
-                bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+                enddevice = link_nodes.get(NS_TAG["EndDevice"]).text
+                endport = link_nodes.get(NS_TAG["EndPort"]).text
+                startdevice = link_nodes.get(NS_TAG["StartDevice"]).text
+                startport = link_nodes.get(NS_TAG["StartPort"]).text
+                bandwidth_node = link_nodes.get(NS_TAG["Bandwidth"])
                 bandwidth = bandwidth_node.text if bandwidth_node is not None else None
                 if enddevice.lower() == hname.lower():
                     if endport in port_alias_map:
@@ -657,8 +701,8 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     if bandwidth:
                         port_speeds[startport] = bandwidth
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == NS_TAG["Devices"]:
+            for device in child.findall(NS_TAG["Device"]):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, d_subtype, slice_type) = \
                                         parse_device(device)
                 device_data = {}
@@ -684,54 +728,28 @@ def parse_png(png, hname, dpg_ecmp_content = None):
                     device_data['slice_type'] = slice_type
                 devices[name] = device_data
 
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for if_link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if str(QName(ns3, "type")) in if_link.attrib:
-                    link_type = if_link.attrib[str(QName(ns3, "type"))]
-                    if link_type == 'DeviceSerialLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                console_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                console_dev = node.text
-                    elif link_type == 'DeviceMgmtLink':
-                        for node in if_link:
-                            if node.tag == str(QName(ns, "EndPort")):
-                                mgmt_port = node.text.split()[-1]
-                            elif node.tag == str(QName(ns, "EndDevice")):
-                                mgmt_dev = node.text
-
-
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, 'DeviceLinkBase'))):
-                if link.find(str(QName(ns, "ElementType"))).text == "LogicalLink":
-                    intf_name = link.find(str(QName(ns, "EndPort"))).text
-                    start_device = link.find(str(QName(ns, "StartDevice"))).text
-                    if intf_name in port_alias_map:
-                        intf_name = port_alias_map[intf_name]
-
-                    mux_cable_ports[intf_name] = start_device
-
-        if dpg_ecmp_content and (len(dpg_ecmp_content)):
-            for version, content in dpg_ecmp_content.items():  # version is ipv4 or ipv6
-                fine_grained_content = formulate_fine_grained_ecmp(version, content, port_device_map, port_alias_map)  # port_alias_map
-                FG_NHG_MEMBER.update(fine_grained_content['FG_NHG_MEMBER'])
-                FG_NHG.update(fine_grained_content['FG_NHG'])
-                NEIGH.update(fine_grained_content['NEIGH'])
+    # The fine grained ECMP groups need the device of each port of the whole PNG
+    if dpg_ecmp_content and (len(dpg_ecmp_content)) and len(png):
+        for version, content in dpg_ecmp_content.items():  # version is ipv4 or ipv6
+            fine_grained_content = formulate_fine_grained_ecmp(version, content, port_device_map, port_alias_map)  # port_alias_map
+            FG_NHG_MEMBER.update(fine_grained_content['FG_NHG_MEMBER'])
+            FG_NHG.update(fine_grained_content['FG_NHG'])
+            NEIGH.update(fine_grained_content['NEIGH'])
 
-            png_ecmp_content = {"FG_NHG_MEMBER": FG_NHG_MEMBER, "FG_NHG": FG_NHG, "NEIGH": NEIGH}
+        png_ecmp_content = {"FG_NHG_MEMBER": FG_NHG_MEMBER, "FG_NHG": FG_NHG, "NEIGH": NEIGH}
 
     return (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speeds, console_ports, mux_cable_ports, png_ecmp_content)
 
 
 def parse_asic_external_link(link, asic_name, hostname):
+    link_nodes = index_children(link)
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link_nodes.get(NS_TAG["EndDevice"]).text
+    endport = link_nodes.get(NS_TAG["EndPort"]).text
+    startdevice = link_nodes.get(NS_TAG["StartDevice"]).text
+    startport = link_nodes.get(NS_TAG["StartPort"]).text
+    bandwidth_node = link_nodes.get(NS_TAG["Bandwidth"])
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     # if chassis internal is false, the interface name will be
     # interface alias which should be converted to asic port name
@@ -751,13 +769,14 @@ def parse_asic_external_link(link, asic_name, hostname):
     return neighbors, port_speeds
 
 def parse_asic_internal_link(link, asic_name, hostname):
+    link_nodes = index_children(link)
     neighbors = {}
     port_speeds = {}
-    enddevice = link.find(str(QName(ns, "EndDevice"))).text
-    endport = link.find(str(QName(ns, "EndPort"))).text
-    startdevice = link.find(str(QName(ns, "StartDevice"))).text
-    startport = link.find(str(QName(ns, "StartPort"))).text
-    bandwidth_node = link.find(str(QName(ns, "Bandwidth")))
+    enddevice = link_nodes.get(NS_TAG["EndDevice"]).text
+    endport = link_nodes.get(NS_TAG["EndPort"]).text
+    startdevice = link_nodes.get(NS_TAG["StartDevice"]).text
+    startport = link_nodes.get(NS_TAG["StartPort"]).text
+    bandwidth_node = link_nodes.get(NS_TAG["Bandwidth"])
     bandwidth = bandwidth_node.text if bandwidth_node is not None else None
     if ((enddevice.lower() == asic_name.lower()) and
             (startdevice.lower() != hostname.lower())):
@@ -781,13 +800,13 @@ def parse_asic_png(png, asic_name, hostname):
     devices = {}
     port_speeds = {}
     for child in png:
-        if child.tag == str(QName(ns, "DeviceInterfaceLinks")):
-            for link in child.findall(str(QName(ns, "DeviceLinkBase"))):
+        if child.tag == NS_TAG["DeviceInterfaceLinks"]:
+            for link in child.findall(NS_TAG["DeviceLinkBase"]):
                 # Chassis internal node is used in multi-asic device or chassis minigraph
                 # where the minigraph will contain the internal asic connectivity and
                 # external neighbor information. The ChassisInternal node will be used to
                 # determine if the link is internal to the device or chassis.
-                chassis_internal_node = link.find(str(QName(ns, "ChassisInternal")))
+                chassis_internal_node = link.find(NS_TAG["ChassisInternal"])
                 chassis_internal = chassis_internal_node.text if chassis_internal_node is not None else "false"
 
                 # If the link is an external link include the external neighbor
@@ -801,8 +820,8 @@ def parse_asic_png(png, asic_name, hostname):
                     neighbors.update(int_neighbors)
                     port_speeds.update(int_port_speeds)
 
-        if child.tag == str(QName(ns, "Devices")):
-            for device in child.findall(str(QName(ns, "Device"))):
+        if child.tag == NS_TAG["Devices"]:
+            for device in child.findall(NS_TAG["Device"]):
                 (lo_prefix, lo_prefix_v6, mgmt_prefix, mgmt_prefix_v6, name, hwsku, d_type, deployment_id, cluster, _, slice_type) = parse_device(device)
                 device_data = {}
                 if hwsku != None:
@@ -829,11 +848,11 @@ def parse_asic_png(png, asic_name, hostname):
 
 
 def parse_loopback_intf(child):
-    lointfs = child.find(str(QName(ns, "LoopbackIPInterfaces")))
+    lointfs = child.find(NS_TAG["LoopbackIPInterfaces"])
     lo_intfs = {}
-    for lointf in lointfs.findall(str(QName(ns1, "LoopbackIPInterface"))):
-        intfname = lointf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = lointf.find(str(QName(ns1, "PrefixStr"))).text
+    for lointf in lointfs.findall(NS1_TAG["LoopbackIPInterface"]):
+        intfname = lointf.find(NS_TAG["AttachTo"]).text
+        ipprefix = lointf.find(NS1_TAG["PrefixStr"]).text
         lo_intfs[(intfname, ipprefix)] = {}
     return lo_intfs
 
@@ -861,39 +880,41 @@ def parse_dpg(dpg, hname):
     tunnelintfs_qos_remap_config = defaultdict(dict)
 
     for child in dpg:
+        child_nodes = index_children(child)
         """
             In Multi-NPU platforms the acl intfs are defined only for the host not for individual asic.
             There is just one aclintf node in the minigraph
             Get the aclintfs node first.
         """
-        if not aclintfs and child.find(str(QName(ns, "AclInterfaces"))) is not None and child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface"))):
-            aclintfs = child.find(str(QName(ns, "AclInterfaces"))).findall(str(QName(ns, "AclInterface")))
+        if not aclintfs and child_nodes.get(NS_TAG["AclInterfaces"]) is not None and child_nodes.get(NS_TAG["AclInterfaces"]).findall(NS_TAG["AclInterface"]):
+            aclintfs = child_nodes.get(NS_TAG["AclInterfaces"]).findall(NS_TAG["AclInterface"])
         """
             In Multi-NPU platforms the mgmt intfs are defined only for the host not for individual asic
             There is just one mgmtintf node in the minigraph
             Get the mgmtintfs node first. We need mgmt intf to get mgmt ip in per asic dockers.
         """
-        if not mgmtintfs and child.find(str(QName(ns, "ManagementIPInterfaces"))) is not None and  child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-            mgmtintfs = child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface")))
-        hostname = child.find(str(QName(ns, "Hostname")))
+        if not mgmtintfs and child_nodes.get(NS_TAG["ManagementIPInterfaces"]) is not None and  child_nodes.get(NS_TAG["ManagementIPInterfaces"]).findall(NS1_TAG["ManagementIPInterface"]):
+            mgmtintfs = child_nodes.get(NS_TAG["ManagementIPInterfaces"]).findall(NS1_TAG["ManagementIPInterface"])
+        hostname = child_nodes.get(NS_TAG["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
 
         vni = vni_default
-        vni_element = child.find(str(QName(ns, "VNI")))
+        vni_element = child_nodes.get(NS_TAG["VNI"])
         if vni_element != None:
             if vni_element.text.isdigit():
                 vni = int(vni_element.text)
             else:
                 print("VNI must be an integer (use default VNI %d instead)" % vni_default, file=sys.stderr)
 
-        ipintfs = child.find(str(QName(ns, "IPInterfaces")))
+        ipintfs = child_nodes.get(NS_TAG["IPInterfaces"])
         intfs = {}
         ip_intfs_map = {}
-        for ipintf in ipintfs.findall(str(QName(ns, "IPInterface"))):
-            ipprefix = ipintf.find(str(QName(ns, "Prefix"))).text
-            ipintf_name  = ipintf.find(str(QName(ns, "Name"))).text
-            intfalias = ipintf.find(str(QName(ns, "AttachTo"))).text
+        for ipintf in ipintfs.findall(NS_TAG["IPInterface"]):
+            ipintf_nodes = index_children(ipintf)
+            ipprefix = ipintf_nodes.get(NS_TAG["Prefix"]).text
+            ipintf_name  = ipintf_nodes.get(NS_TAG["Name"]).text
+            intfalias = ipintf_nodes.get(NS_TAG["AttachTo"]).text
             """
                 VoqInband interfaces are special ip interfaces needed on inter linecard
                 control plane communications on Voq Chassis
@@ -915,58 +936,60 @@ def parse_dpg(dpg, hname):
             ip_intfs_map[ipprefix] = intfalias
         lo_intfs = parse_loopback_intf(child)
 
-        subintfs = child.find(str(QName(ns, "SubInterfaces")))
+        subintfs = child_nodes.get(NS_TAG["SubInterfaces"])
         if subintfs is not None:
-            for subintf in subintfs.findall(str(QName(ns, "SubInterface"))):
-                intfalias = subintf.find(str(QName(ns, "AttachTo"))).text
+            for subintf in subintfs.findall(NS_TAG["SubInterface"]):
+                subintf_nodes = index_children(subintf)
+                intfalias = subintf_nodes.get(NS_TAG["AttachTo"]).text
                 intfname = port_alias_map.get(intfalias, intfalias)
-                ipprefix = subintf.find(str(QName(ns, "Prefix"))).text
-                subintfvlan = subintf.find(str(QName(ns, "Vlan"))).text
+                ipprefix = subintf_nodes.get(NS_TAG["Prefix"]).text
+                subintfvlan = subintf_nodes.get(NS_TAG["Vlan"]).text
                 subintfname = intfname + VLAN_SUB_INTERFACE_SEPARATOR + subintfvlan
                 intfs[(subintfname, ipprefix)] = {}
 
-        mvrfConfigs = child.find(str(QName(ns, "MgmtVrfConfigs")))
+        mvrfConfigs = child_nodes.get(NS_TAG["MgmtVrfConfigs"])
         mvrf = {}
         if mvrfConfigs != None:
-            mv = mvrfConfigs.find(str(QName(ns1, "MgmtVrfGlobal")))
+            mv = mvrfConfigs.find(NS1_TAG["MgmtVrfGlobal"])
             if mv != None:
-                mvrf_en_flag = mv.find(str(QName(ns, "mgmtVrfEnabled"))).text
+                mvrf_en_flag = mv.find(NS_TAG["mgmtVrfEnabled"]).text
                 mvrf["vrf_global"] = {"mgmtVrfEnabled": mvrf_en_flag}
 
         mgmt_intf = {}
         for mgmtintf in mgmtintfs:
-            intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-            ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+            intfname = mgmtintf.find(NS_TAG["AttachTo"]).text
+            ipprefix = mgmtintf.find(NS1_TAG["PrefixStr"]).text
             mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
             gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
             mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
 
-        voqinbandintfs = child.find(str(QName(ns, "VoqInbandInterfaces")))
+        voqinbandintfs = child_nodes.get(NS_TAG["VoqInbandInterfaces"])
         if voqinbandintfs:
-            for voqintf in voqinbandintfs.findall(str(QName(ns1, "VoqInbandInterface"))):
-                intfname = voqintf.find(str(QName(ns, "Name"))).text
-                intftype = voqintf.find(str(QName(ns, "Type"))).text
-                ipprefix = voqintf.find(str(QName(ns1, "PrefixStr"))).text
+            for voqintf in voqinbandintfs.findall(NS1_TAG["VoqInbandInterface"]):
+                intfname = voqintf.find(NS_TAG["Name"]).text
+                intftype = voqintf.find(NS_TAG["Type"]).text
+                ipprefix = voqintf.find(NS1_TAG["PrefixStr"]).text
                 if intfname not in voq_inband_intfs:
                    voq_inband_intfs[intfname] = {'inband_type': intftype}
                 voq_inband_intfs["%s|%s" % (intfname, ipprefix)] = {}
 
-        pcintfs = child.find(str(QName(ns, "PortChannelInterfaces")))
+        pcintfs = child_nodes.get(NS_TAG["PortChannelInterfaces"])
         pc_intfs = []
         pcs = {}
         pc_members = {}
         intfs_inpc = [] # List to hold all the LAG member interfaces
-        for pcintf in pcintfs.findall(str(QName(ns, "PortChannel"))):
-            pcintfname = pcintf.find(str(QName(ns, "Name"))).text
-            pcintfmbr = pcintf.find(str(QName(ns, "AttachTo"))).text
+        for pcintf in pcintfs.findall(NS_TAG["PortChannel"]):
+            pcintf_nodes = index_children(pcintf)
+            pcintfname = pcintf_nodes.get(NS_TAG["Name"]).text
+            pcintfmbr = pcintf_nodes.get(NS_TAG["AttachTo"]).text
             pcmbr_list = pcintfmbr.split(';')
             pc_intfs.append(pcintfname)
             for i, member in enumerate(pcmbr_list):
                 pcmbr_list[i] = port_alias_map.get(member, member)
                 intfs_inpc.append(pcmbr_list[i])
                 pc_members[(pcintfname, pcmbr_list[i])] = {}
-            if pcintf.find(str(QName(ns, "Fallback"))) != None:
-                pcs[pcintfname] = {'fallback': pcintf.find(str(QName(ns, "Fallback"))).text, 'min_links': str(int(math.ceil(len() * 0.75))), 'lacp_key': 'auto'}
+            if pcintf_nodes.get(NS_TAG["Fallback"]) != None:
+                pcs[pcintfname] = {'fallback': pcintf_nodes.get(NS_TAG["Fallback"]).text, 'min_links': str(int(math.ceil(len() * 0.75))), 'lacp_key': 'auto'}
             else:
                 pcs[pcintfname] = {'min_links': str(int(math.ceil(len(pcmbr_list) * 0.75))), 'lacp_key': 'auto' }
         port_nhipv4_map = {}
@@ -975,26 +998,27 @@ def parse_dpg(dpg, hname):
         nhportlist = []
         dpg_ecmp_content = {}
         static_routes = {}
-        ipnhs = child.find(str(QName(ns, "IPNextHops")))
+        ipnhs = child_nodes.get(NS_TAG["IPNextHops"])
         if ipnhs is not None:
-            for ipnh in ipnhs.findall(str(QName(ns, "IPNextHop"))):
-                if ipnh.find(str(QName(ns, "Type"))).text == 'FineGrainedECMPGroupMember':
-                    ipnhfmbr = ipnh.find(str(QName(ns, "AttachTo"))).text
-                    ipnhaddr = ipnh.find(str(QName(ns, "Address"))).text
+            for ipnh in ipnhs.findall(NS_TAG["IPNextHop"]):
+                ipnh_nodes = index_children(ipnh)
+                if ipnh_nodes.get(NS_TAG["Type"]).text == 'FineGrainedECMPGroupMember':
+                    ipnhfmbr = ipnh_nodes.get(NS_TAG["AttachTo"]).text
+                    ipnhaddr = ipnh_nodes.get(NS_TAG["Address"]).text
                     nhportlist.append(ipnhfmbr)
                     if "." in ipnhaddr:
                         port_nhipv4_map[ipnhfmbr] = ipnhaddr
                     elif ":" in ipnhaddr:
                         port_nhipv6_map[ipnhfmbr] = ipnhaddr
-                elif ipnh.find(str(QName(ns, "Type"))).text == 'StaticRoute':
-                    prefix = ipnh.find(str(QName(ns, "Address"))).text
+                elif ipnh_nodes.get(NS_TAG["Type"]).text == 'StaticRoute':
+                    prefix = ipnh_nodes.get(NS_TAG["Address"]).text
                     ifname = []
                     nexthop = []
-                    for nexthop_tuple in ipnh.find(str(QName(ns, "AttachTo"))).text.split(";"):
+                    for nexthop_tuple in ipnh_nodes.get(NS_TAG["AttachTo"]).text.split(";"):
                         ifname.append(nexthop_tuple.split(",")[0])
                         nexthop.append(nexthop_tuple.split(",")[1])
-                    if ipnh.find(str(QName(ns, "Advertise"))):
-                       advertise = ipnh.find(str(QName(ns, "Advertise"))).text
+                    if ipnh_nodes.get(NS_TAG["Advertise"]):
+                       advertise = ipnh_nodes.get(NS_TAG["Advertise"]).text
                     else:
                         advertise = "false"
                     if '/' not in prefix:
@@ -1018,30 +1042,31 @@ def parse_dpg(dpg, hname):
                 dpg_ecmp_content['ipv4'] = ipv4_content
                 dpg_ecmp_content['ipv6'] = ipv6_content
 
-        vlanintfs = child.find(str(QName(ns, "VlanInterfaces")))
+        vlanintfs = child_nodes.get(NS_TAG["VlanInterfaces"])
         vlans = {}
         vlan_members = {}
         vlan_member_list = {}
         dhcp_relay_table = {}
         # Dict: vlan member (port/PortChannel) -> set of VlanID, in which the member if an untagged vlan member
         untagged_vlan_mbr = defaultdict(set)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        vintf_nodes_list = [index_children(vintf) for vintf in vlanintfs.findall(NS_TAG["VlanInterface"])]
+        for vintf_nodes in vintf_nodes_list:
+            vlanid = vintf_nodes.get(NS_TAG["VlanID"]).text
+            vlantype = vintf_nodes.get(NS_TAG["Type"])
             if vlantype is None:
                 vlantype_name = ""
             else:
                 vlantype_name = vlantype.text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
+            vintfmbr = vintf_nodes.get(NS_TAG["AttachTo"]).text
             vmbr_list = vintfmbr.split(';')
             if vlantype_name != "Tagged":
                 for member in vmbr_list:
                     untagged_vlan_mbr[member].add(vlanid)
-        for vintf in vlanintfs.findall(str(QName(ns, "VlanInterface"))):
-            vintfname = vintf.find(str(QName(ns, "Name"))).text
-            vlanid = vintf.find(str(QName(ns, "VlanID"))).text
-            vintfmbr = vintf.find(str(QName(ns, "AttachTo"))).text
-            vlantype = vintf.find(str(QName(ns, "Type")))
+        for vintf_nodes in vintf_nodes_list:
+            vintfname = vintf_nodes.get(NS_TAG["Name"]).text
+            vlanid = vintf_nodes.get(NS_TAG["VlanID"]).text
+            vintfmbr = vintf_nodes.get(NS_TAG["AttachTo"]).text
+            vlantype = vintf_nodes.get(NS_TAG["Type"])
             if vlantype is None:
                 vlantype_name = ""
             else:
@@ -1062,13 +1087,13 @@ def parse_dpg(dpg, hname):
 
             # If this VLAN requires a DHCP relay agent, it will contain a <DhcpRelays> element
             # containing a list of DHCP server IPs
-            vintf_node = vintf.find(str(QName(ns, "DhcpRelays")))
+            vintf_node = vintf_nodes.get(NS_TAG["DhcpRelays"])
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
                 vlan_attributes['dhcp_servers'] = vdhcpserver_list
 
-            vintf_node = vintf.find(str(QName(ns, "Dhcpv6Relays")))
+            vintf_node = vintf_nodes.get(NS_TAG["Dhcpv6Relays"])
             if vintf_node is not None and vintf_node.text is not None:
                 vintfdhcpservers = vintf_node.text
                 vdhcpserver_list = vintfdhcpservers.split(';')
@@ -1077,11 +1102,11 @@ def parse_dpg(dpg, hname):
                 sonic_vlan_member_name = "Vlan%s" % (vlanid)
                 dhcp_relay_table[sonic_vlan_member_name] = dhcp_attributes
 
-            vlanmac = vintf.find(str(QName(ns, "MacAddress")))
+            vlanmac = vintf_nodes.get(NS_TAG["MacAddress"])
             if vlanmac is not None and vlanmac.text is not None:
                 vlan_attributes['mac'] = vlanmac.text
 
-            vintf_node = vintf.find(str(QName(ns, "SecondarySubnets")))
+            vintf_node = vintf_nodes.get(NS_TAG["SecondarySubnets"])
             if vintf_node is not None and vintf_node.text is not None:
                 subnets = vintf_node.text.split(';')
                 for subnet in subnets:
@@ -1099,15 +1124,16 @@ def parse_dpg(dpg, hname):
             vlan_member_list[sonic_vlan_name] = vmbr_list
 
         for aclintf in aclintfs:
-            if aclintf.find(str(QName(ns, "InAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "InAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            aclintf_nodes = index_children(aclintf)
+            if aclintf_nodes.get(NS_TAG["InAcl"]) is not None:
+                aclname = aclintf_nodes.get(NS_TAG["InAcl"]).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "ingress"
-            elif aclintf.find(str(QName(ns, "OutAcl"))) is not None:
-                aclname = aclintf.find(str(QName(ns, "OutAcl"))).text.upper().replace(" ", "_").replace("-", "_")
+            elif aclintf_nodes.get(NS_TAG["OutAcl"]) is not None:
+                aclname = aclintf_nodes.get(NS_TAG["OutAcl"]).text.upper().replace(" ", "_").replace("-", "_")
                 stage = "egress"
             else:
                 sys.exit("Error: 'AclInterface' must contain either an 'InAcl' or 'OutAcl' subelement.")
-            aclattach = aclintf.find(str(QName(ns, "AttachTo"))).text.split(';')
+            aclattach = aclintf_nodes.get(NS_TAG["AttachTo"]).text.split(';')
             acl_intfs = []
             is_bmc_data = False
             is_bmc_data_v6 = False
@@ -1193,7 +1219,7 @@ def parse_dpg(dpg, hname):
                         if panel_port not in intfs_inpc and panel_port not in acl_intfs:
                             acl_intfs.append(panel_port)
                     break
-            if aclintf.find(str(QName(ns, "Type"))) is not None and aclintf.find(str(QName(ns, "Type"))).text.upper() == "BMCDATA":
+            if aclintf_nodes.get(NS_TAG["Type"]) is not None and aclintf_nodes.get(NS_TAG["Type"]).text.upper() == "BMCDATA":
                 if 'v6' in aclname.lower():
                     is_bmc_data_v6 = True
                     acl_table_types['BMCDATAV6'] = acl_table_type_defination['BMCDATAV6']
@@ -1229,7 +1255,7 @@ def parse_dpg(dpg, hname):
             else:
                 # This ACL has no interfaces to attach to -- consider this a control plane ACL
                 try:
-                    aclservice = aclintf.find(str(QName(ns, "Type"))).text
+                    aclservice = aclintf_nodes.get(NS_TAG["Type"]).text
 
                     # If we already have an ACL with this name and this ACL is bound to a different service,
                     # append the service to our list of services
@@ -1249,7 +1275,7 @@ def parse_dpg(dpg, hname):
                     print("Warning: Ignoring Control Plane ACL %s without type" % aclname, file=sys.stderr)
 
 
-        mg_tunnels = child.find(str(QName(ns, "TunnelInterfaces")))
+        mg_tunnels = child_nodes.get(NS_TAG["TunnelInterfaces"])
         if mg_tunnels is not None:
             table_key_to_mg_key_map = {"encap_ecn_mode": "EcnEncapsulationMode",
                                        "ecn_mode": "EcnDecapsulationMode",
@@ -1262,7 +1288,7 @@ def parse_dpg(dpg, hname):
                                        "encap_tc_to_queue_map": "EncapTcToQueueMap",
                                        "encap_tc_to_dscp_map": "EncapTcToDscpMap"}
 
-            for mg_tunnel in mg_tunnels.findall(str(QName(ns, "TunnelInterface"))):
+            for mg_tunnel in mg_tunnels.findall(NS_TAG["TunnelInterface"]):
                 tunnel_type = mg_tunnel.attrib["Type"]
                 tunnel_name = mg_tunnel.attrib["Name"]
                 tunnelintfs[tunnel_type][tunnel_name] = {
@@ -1287,7 +1313,7 @@ def parse_dpg(dpg, hname):
 
 def parse_host_loopback(dpg, hname):
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(NS_TAG["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
         lo_intfs = parse_loopback_intf(child)
@@ -1303,38 +1329,39 @@ def parse_cpg(cpg, hname, local_devices=[]):
     bgp_sentinel_sessions = {}
     for child in cpg:
         tag = child.tag
-        if tag == str(QName(ns, "PeeringSessions")):
-            for session in child.findall(str(QName(ns, "BGPSession"))):
-                start_router = session.find(str(QName(ns, "StartRouter"))).text
-                start_peer = session.find(str(QName(ns, "StartPeer"))).text
-                end_router = session.find(str(QName(ns, "EndRouter"))).text
-                end_peer = session.find(str(QName(ns, "EndPeer"))).text
-                rrclient = 1 if session.find(str(QName(ns, "RRClient"))) is not None else 0
-                if session.find(str(QName(ns, "HoldTime"))) is not None:
-                    holdtime = session.find(str(QName(ns, "HoldTime"))).text
+        if tag == NS_TAG["PeeringSessions"]:
+            for session in child.findall(NS_TAG["BGPSession"]):
+                session_nodes = index_children(session)
+                start_router = session_nodes.get(NS_TAG["StartRouter"]).text
+                start_peer = session_nodes.get(NS_TAG["StartPeer"]).text
+                end_router = session_nodes.get(NS_TAG["EndRouter"]).text
+                end_peer = session_nodes.get(NS_TAG["EndPeer"]).text
+                rrclient = 1 if session_nodes.get(NS_TAG["RRClient"]) is not None else 0
+                if session_nodes.get(NS_TAG["HoldTime"]) is not None:
+                    holdtime = session_nodes.get(NS_TAG["HoldTime"]).text
                 else:
                     holdtime = 180
-                if session.find(str(QName(ns, "KeepAliveTime"))) is not None:
-                    keepalive = session.find(str(QName(ns, "KeepAliveTime"))).text
+                if session_nodes.get(NS_TAG["KeepAliveTime"]) is not None:
+                    keepalive = session_nodes.get(NS_TAG["KeepAliveTime"]).text
                 else:
                     keepalive = 60
-                nhopself = 1 if session.find(str(QName(ns, "NextHopSelf"))) is not None else 0
+                nhopself = 1 if session_nodes.get(NS_TAG["NextHopSelf"]) is not None else 0
 
                 # choose the right table and admin_status for the peer
                 chassis_internal_ibgp = None
-                if session.find(str(QName(ns, "ChassisInternal")))is not None:
+                if session_nodes.get(NS_TAG["ChassisInternal"])is not None:
 
-                    chassis_internal_ibgp = session.find(str(QName(ns, "ChassisInternal"))).text
+                    chassis_internal_ibgp = session_nodes.get(NS_TAG["ChassisInternal"]).text
                 else:
-                    if session.find(str(QName(ns, "BgpGroup"))) is not None:
-                        chassis_internal_ibgp_group = session.find(str(QName(ns, "BgpGroup")))
+                    if session_nodes.get(NS_TAG["BgpGroup"]) is not None:
+                        chassis_internal_ibgp_group = session_nodes.get(NS_TAG["BgpGroup"])
                         start_group_peer = None
                         end_group_peer = None
 
-                        if chassis_internal_ibgp_group.find(str(QName(ns, "Start"))) is not None:
-                            start_group_peer = chassis_internal_ibgp_group.find(str(QName(ns, "Start"))).text
-                        if chassis_internal_ibgp_group.find(str(QName(ns, "End"))) is not None:
-                            end_group_peer = chassis_internal_ibgp_group.find(str(QName(ns, "End"))).text
+                        if chassis_internal_ibgp_group.find(NS_TAG["Start"]) is not None:
+                            start_group_peer = chassis_internal_ibgp_group.find(NS_TAG["Start"]).text
+                        if chassis_internal_ibgp_group.find(NS_TAG["End"]) is not None:
+                            end_group_peer = chassis_internal_ibgp_group.find(NS_TAG["End"]).text
 
                         if start_group_peer == CHASSIS_CARD_VOQ  and end_group_peer == CHASSIS_CARD_VOQ:
                             chassis_internal_ibgp = "voq"
@@ -1377,35 +1404,36 @@ def parse_cpg(cpg, hname, local_devices=[]):
                     }
                     if admin_status:
                         table[end_peer.lower()]['admin_status'] = admin_status
-        elif child.tag == str(QName(ns, "Routers")):
-            for router in child.findall(str(QName(ns1, "BGPRouterDeclaration"))):
-                asn = router.find(str(QName(ns1, "ASN"))).text
-                hostname = router.find(str(QName(ns1, "Hostname"))).text
+        elif child.tag == NS_TAG["Routers"]:
+            for router in child.findall(NS1_TAG["BGPRouterDeclaration"]):
+                asn = router.find(NS1_TAG["ASN"]).text
+                hostname = router.find(NS1_TAG["Hostname"]).text
                 if hostname.lower() == hname.lower():
                     myasn = asn
-                    peers = router.find(str(QName(ns1, "Peers")))
-                    for bgpPeer in peers.findall(str(QName(ns, "BGPPeer"))):
-                        addr = bgpPeer.find(str(QName(ns, "Address"))).text
-                        if bgpPeer.find(str(QName(ns1, "PeersRange"))) is not None: # FIXME: is better to check for type BGPPeerPassive
-                            name = bgpPeer.find(str(QName(ns1, "Name"))).text
-                            ip_range = bgpPeer.find(str(QName(ns1, "PeersRange"))).text
+                    peers = router.find(NS1_TAG["Peers"])
+                    for bgpPeer in peers.findall(NS_TAG["BGPPeer"]):
+                        bgpPeer_nodes = index_children(bgpPeer)
+                        addr = bgpPeer_nodes.get(NS_TAG["Address"]).text
+                        if bgpPeer_nodes.get(NS1_TAG["PeersRange"]) is not None: # FIXME: is better to check for type BGPPeerPassive
+                            name = bgpPeer_nodes.get(NS1_TAG["Name"]).text
+                            ip_range = bgpPeer_nodes.get(NS1_TAG["PeersRange"]).text
                             ip_range_group = ip_range.split(';') if ip_range and ip_range != "" else []
                             if name == "BGPSentinel" or name == "BGPSentinelV6":
                                 bgp_sentinel_sessions[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
+                                if bgpPeer_nodes.get(NS_TAG["Address"]) is not None:
+                                    bgp_sentinel_sessions[name]['src_address'] = bgpPeer_nodes.get(NS_TAG["Address"]).text
                             else:
                                 bgp_peers_with_range[name] = {
                                     'name': name,
                                     'ip_range': ip_range_group
                                 }
-                                if bgpPeer.find(str(QName(ns, "Address"))) is not None:
-                                    bgp_peers_with_range[name]['src_address'] = bgpPeer.find(str(QName(ns, "Address"))).text
-                                if bgpPeer.find(str(QName(ns1, "PeerAsn"))) is not None:
-                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer.find(str(QName(ns1, "PeerAsn"))).text
+                                if bgpPeer_nodes.get(NS_TAG["Address"]) is not None:
+                                    bgp_peers_with_range[name]['src_address'] = bgpPeer_nodes.get(NS_TAG["Address"]).text
+                                if bgpPeer_nodes.get(NS1_TAG["PeerAsn"]) is not None:
+                                    bgp_peers_with_range[name]['peer_asn'] = bgpPeer_nodes.get(NS1_TAG["PeerAsn"]).text
                 else:
                     for peer in bgp_sessions:
                         bgp_session = bgp_sessions[peer]
@@ -1440,13 +1468,13 @@ def parse_chassis_meta(meta, hname):
     macsec_profile = {}
     qos_profile = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(NS_TAG["Devices"])
+    for device in device_metas.findall(NS1_TAG["DeviceMetadata"]):
+        if device.find(NS1_TAG["Name"]).text.lower() == hname.lower():
+            properties = device.find(NS1_TAG["Properties"])
+            for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+                name = device_property.find(NS1_TAG["Name"]).text
+                value = device_property.find(NS1_TAG["Value"]).text
                 value_group = value.strip().split(';') if value and value != "" else []
                 if name == "NtpResources":
                     ntp_servers = value_group
@@ -1493,13 +1521,13 @@ def parse_meta(meta, hname):
     qos_profile = None
     rack_mgmt_map = None
 
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(NS_TAG["Devices"])
+    for device in device_metas.findall(NS1_TAG["DeviceMetadata"]):
+        if device.find(NS1_TAG["Name"]).text.lower() == hname.lower():
+            properties = device.find(NS1_TAG["Properties"])
+            for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+                name = device_property.find(NS1_TAG["Name"]).text
+                value = device_property.find(NS1_TAG["Value"]).text
                 value_group = value.strip().split(';') if value and value != "" else []
                 if name == "DhcpResources":
                     dhcp_servers = value_group
@@ -1547,14 +1575,15 @@ def parse_meta(meta, hname):
 
 
 def parse_linkmeta(meta, hname):
-    link = meta.find(str(QName(ns, "Link")))
+    link = meta.find(NS_TAG["Link"])
     linkmetas = {}
-    for linkmeta in link.findall(str(QName(ns1, "LinkMetadata"))):
+    for linkmeta in link.findall(NS1_TAG["LinkMetadata"]):
+        linkmeta_nodes = index_children(linkmeta)
         port = None
         fec_disabled = None
 
         # Sample: ARISTA05T1:Ethernet1/33;switch-t0:fortyGigE0/4
-        key = linkmeta.find(str(QName(ns1, "Key"))).text
+        key = linkmeta_nodes.get(NS1_TAG["Key"]).text
         endpoints = key.split(';')
         for endpoint in endpoints:
             t = endpoint.split(':')
@@ -1572,10 +1601,10 @@ def parse_linkmeta(meta, hname):
         macsec_enabled = False
         tx_power = None
         laser_freq = None
-        properties = linkmeta.find(str(QName(ns1, "Properties")))
-        for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-            name = device_property.find(str(QName(ns1, "Name"))).text
-            value = device_property.find(str(QName(ns1, "Value"))).text
+        properties = linkmeta_nodes.get(NS1_TAG["Properties"])
+        for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+            name = device_property.find(NS1_TAG["Name"]).text
+            value = device_property.find(NS1_TAG["Value"]).text
             if name == "FECDisabled":
                 fec_disabled = value
             elif name in [ "GeminiPeeringLink", "LibraPeeringLink" ]:
@@ -1629,15 +1658,12 @@ def parse_global_info(root):
     hwsku = hostname = None
     docker_routing_config_mode = "separated"
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
     for child in root:
-        if child.tag == str(hwsku_qn):
+        if child.tag == NS_TAG["HwSku"]:
             hwsku = child.text
-        if child.tag == str(hostname_qn):
+        if child.tag == NS_TAG["Hostname"]:
             hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
+        if child.tag == NS_TAG["DockerRoutingConfigMode"]:
             docker_routing_config_mode = child.text
             
     chassis_type, chassis_hostname  =  get_chassis_type_and_hostname(root, hostname)
@@ -1650,13 +1676,13 @@ def parse_asic_meta(meta, hname):
     max_cores = None
     deployment_id = None
     macsec_profile = {}
-    device_metas = meta.find(str(QName(ns, "Devices")))
-    for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-        if device.find(str(QName(ns1, "Name"))).text.lower() == hname.lower():
-            properties = device.find(str(QName(ns1, "Properties")))
-            for device_property in properties.findall(str(QName(ns1, "DeviceProperty"))):
-                name = device_property.find(str(QName(ns1, "Name"))).text
-                value = device_property.find(str(QName(ns1, "Value"))).text
+    device_metas = meta.find(NS_TAG["Devices"])
+    for device in device_metas.findall(NS1_TAG["DeviceMetadata"]):
+        if device.find(NS1_TAG["Name"]).text.lower() == hname.lower():
+            properties = device.find(NS1_TAG["Properties"])
+            for device_property in properties.findall(NS1_TAG["DeviceProperty"]):
+                name = device_property.find(NS1_TAG["Name"]).text
+                value = device_property.find(NS1_TAG["Value"]).text
                 if name == "SubRole":
                     sub_role = value
                 elif name == "SwitchId" or name == "AsicSwitchId":
@@ -1676,31 +1702,33 @@ def parse_deviceinfo(meta, hwsku):
     port_speeds = {}
     port_descriptions = {}
     sys_ports = {}
-    for device_info in meta.findall(str(QName(ns, "DeviceInfo"))):
-        dev_sku = device_info.find(str(QName(ns, "HwSku"))).text
+    for device_info in meta.findall(NS_TAG["DeviceInfo"]):
+        dev_sku = device_info.find(NS_TAG["HwSku"]).text
         if dev_sku == hwsku:
-            interfaces = device_info.find(str(QName(ns, "EthernetInterfaces"))).findall(str(QName(ns1, "EthernetInterface")))
-            interfaces = interfaces + device_info.find(str(QName(ns, "ManagementInterfaces"))).findall(str(QName(ns1, "ManagementInterface")))
+            interfaces = device_info.find(NS_TAG["EthernetInterfaces"]).findall(NS1_TAG["EthernetInterface"])
+            interfaces = interfaces + device_info.find(NS_TAG["ManagementInterfaces"]).findall(NS1_TAG["ManagementInterface"])
             for interface in interfaces:
-                alias = interface.find(str(QName(ns, "InterfaceName"))).text
-                speed = interface.find(str(QName(ns, "Speed"))).text
-                desc  = interface.find(str(QName(ns, "Description")))
+                interface_nodes = index_children(interface)
+                alias = interface_nodes.get(NS_TAG["InterfaceName"]).text
+                speed = interface_nodes.get(NS_TAG["Speed"]).text
+                desc  = interface_nodes.get(NS_TAG["Description"])
                 if desc != None:
                     port_descriptions[port_alias_map.get(alias, alias)] = desc.text
                 port_speeds[port_alias_map.get(alias, alias)] = speed
 
-            sysports = device_info.find(str(QName(ns, "SystemPorts")))
+            sysports = device_info.find(NS_TAG["SystemPorts"])
             if sysports is not None:
-                for sysport in sysports.findall(str(QName(ns, "SystemPort"))):
-                    portname = sysport.find(str(QName(ns, "Name"))).text
-                    hostname = sysport.find(str(QName(ns, "Hostname")))
-                    asic_name = sysport.find(str(QName(ns, "AsicName")))
-                    system_port_id = sysport.find(str(QName(ns, "SystemPortId"))).text
-                    switch_id = sysport.find(str(QName(ns, "SwitchId"))).text
-                    core_id = sysport.find(str(QName(ns, "CoreId"))).text
-                    core_port_id = sysport.find(str(QName(ns, "CorePortId"))).text
-                    speed = sysport.find(str(QName(ns, "Speed"))).text
-                    num_voq = sysport.find(str(QName(ns, "NumVoq"))).text
+                for sysport in sysports.findall(NS_TAG["SystemPort"]):
+                    sysport_nodes = index_children(sysport)
+                    portname = sysport_nodes.get(NS_TAG["Name"]).text
+                    hostname = sysport_nodes.get(NS_TAG["Hostname"])
+                    asic_name = sysport_nodes.get(NS_TAG["AsicName"])
+                    system_port_id = sysport_nodes.get(NS_TAG["SystemPortId"]).text
+                    switch_id = sysport_nodes.get(NS_TAG["SwitchId"]).text
+                    core_id = sysport_nodes.get(NS_TAG["CoreId"]).text
+                    core_port_id = sysport_nodes.get(NS_TAG["CorePortId"]).text
+                    speed = sysport_nodes.get(NS_TAG["Speed"]).text
+                    num_voq = sysport_nodes.get(NS_TAG["NumVoq"]).text
                     key = portname
                     if asic_name is not None:
                        key = "%s|%s" % (asic_name.text, key)
@@ -1930,6 +1958,9 @@ def select_mmu_profiles(profile, platform, hwsku):
             file_in_dir = os.path.join(dir_path, file_item)
             if os.path.isfile(file_in_dir):
                 base_file = os.path.join(path, file_item)
+                # Skip identical files, so the hwsku dir (and the parse_xml cache signature) is left untouched
+                if os.path.isfile(base_file) and filecmp.cmp(file_in_dir, base_file, shallow=False):
+                    continue
                 exec_cmd(["sudo", "cp", file_in_dir, base_file])
 
 def address_type(address):
@@ -1959,6 +1990,101 @@ def update_forced_mgmt_route(mgmt_intf, mgmt_routes):
         if len(forced_mgmt_routes) > 0:
             mgmt_intf[mgmt_intf_key]['forced_mgmt_routes'] = forced_mgmt_routes
 
+###############################################################################
+#
+# Parsed minigraph cache
+#
+###############################################################################
+
+# The minigraph is read by many sonic-cfggen calls during boot, and parse_xml is
+# called for each namespace of multi-asic devices. The xml tree is parsed once per
+# process, and the results of parse_xml are cached on disk until the minigraph,
+# any platform file it was rendered with, or the CONFIG_DB port tables change.
+MINIGRAPH_CACHE_NAME = 'minigraph'
+# Overrides the directory of the minigraph cache, an empty value disables it
+MINIGRAPH_CACHE_DIR_ENV = 'SONIC_MINIGRAPH_CACHE_DIR'
+MINIGRAPH_CACHE_VERSION = 1
+
+# minigraph path -> (file signature, root, sections)
+_minigraph_roots = {}
+
+def _dir_signature(path, depth=1):
+    """ Signatures of the files in the directory, and in its sub-directories up to depth """
+    signatures = []
+    try:
+        names = sorted(os.listdir(path))
+    except OSError:
+        return [(path, None)]
+    for name in names:
+        entry = os.path.join(path, name)
+        if os.path.isdir(entry):
+            if depth > 0:
+                signatures.extend(_dir_signature(entry, depth - 1))
+        else:
+            signatures.append(file_signature(entry))
+    return signatures
+
+def load_minigraph_root(filename):
+    """ Parse the minigraph file, once per version of the file.
+
+    Returns the root element and the index of the top level sections,
+    from the tag to the first element with that tag.
+    """
+    path = os.path.realpath(filename)
+    signature = file_signature(path)
+    cached = _minigraph_roots.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1], cached[2]
+
+    root = ET.parse(filename).getroot()
+    sections = index_children(root)
+    if signature[1] is not None:
+        _minigraph_roots[path] = (signature, root, sections)
+    return root, sections
+
+def get_dns_conf_path():
+    if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2":
+        return os.path.join(os.path.dirname(__file__), "tests/", "dns.j2")
+    return "/usr/share/sonic/templates/dns.j2"
+
+def _parse_xml_cache_key(filename, args):
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    # The results depend on the parser code as well
+    code = [file_signature(os.path.abspath(f)) for f in (__file__, portconfig.__file__)]
+    context = (MINIGRAPH_CACHE_VERSION, sys.version, os.path.realpath(filename), args, code, os.environ.get('PLATFORM'))
+    digest.update(repr(context).encode('utf-8'))
+    return digest.hexdigest()
+
+def _parse_xml_config_db_dependencies(port_config_file, fabric_port_config_file, asic_name):
+    """ Contents of the CONFIG_DB tables which parse_xml reads in place of the port config files """
+    config_db = portconfig.db_connect_configdb(asic_name)
+    if config_db is None:
+        return [None]
+    tables = ['FABRIC_MONITOR']
+    if port_config_file is None:
+        tables.append('PORT')
+    if fabric_port_config_file is None:
+        tables.append('FABRIC_PORT')
+    return [(table, config_db.get_table(table)) for table in tables]
+
+def _parse_xml_dependencies(filename, platform, port_config_file, hwsku_config_file, fabric_port_config_file, hwsku, config_db_dependencies):
+    """ Signatures of the files and the CONFIG_DB tables which the results of parse_xml are derived from """
+    files = [filename, port_config_file, hwsku_config_file, fabric_port_config_file, get_dns_conf_path(),
+             '/host/machine.conf']
+    signatures = [file_signature(f) for f in files if f]
+    signatures.extend(config_db_dependencies)
+    dirs = [portconfig.PLATFORM_ROOT_PATH_DOCKER, portconfig.HWSKU_ROOT_PATH]
+    if platform:
+        dirs.append(os.path.join(portconfig.PLATFORM_ROOT_PATH, platform))
+        if hwsku:
+            dirs.append(os.path.join(portconfig.PLATFORM_ROOT_PATH, platform, hwsku))
+    for d in dirs:
+        signatures.extend(_dir_signature(d))
+    return signatures
+
 ###############################################################################
 #
 # Main functions
@@ -1975,8 +2101,37 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     generate asic specific configuration.
     fabric_port_config_file -- fabric port config file name
      """
+    args = (platform, port_config_file, asic_name, hwsku_config_file, fabric_port_config_file)
+    cache_dir = get_cache_dir(MINIGRAPH_CACHE_NAME, MINIGRAPH_CACHE_DIR_ENV)
+    # The port maps of earlier calls in this process affect the results
+    if cache_dir is None or port_names_map or port_alias_map or port_alias_asic_map:
+        return _parse_xml(filename, *args)
+
+    cache_file = os.path.join(cache_dir, _parse_xml_cache_key(filename, args) + '.pickle')
+    entry = load_cache_file(cache_file)
+    # Read before the parsing, so a change made during the parsing isn't recorded with stale results
+    config_db_dependencies = _parse_xml_config_db_dependencies(port_config_file, fabric_port_config_file, asic_name)
+    if entry is not None and entry['dependencies'] == _parse_xml_dependencies(filename, platform, port_config_file, hwsku_config_file,
+                                                                               fabric_port_config_file, entry['mmu_profile'][2],
+                                                                               config_db_dependencies):
+        # Replay the side effects of the parsing
+        port_names_map.update(entry['ports'])
+        port_alias_map.update(entry['alias_map'])
+        port_alias_asic_map.update(entry['alias_asic_map'])
+        select_mmu_profiles(*entry['mmu_profile'])
+        return entry['results']
+
+    parse_info = {}
+    results = _parse_xml(filename, *args, parse_info=parse_info)
+    parse_info['results'] = results
+    parse_info['dependencies'] = _parse_xml_dependencies(filename, platform, port_config_file, hwsku_config_file,
+                                                         fabric_port_config_file, parse_info['mmu_profile'][2],
+                                                         config_db_dependencies)
+    store_cache_file(cache_dir, cache_file, parse_info)
+    return results
 
-    root = ET.parse(filename).getroot()
+def _parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hwsku_config_file=None, fabric_port_config_file=None, parse_info=None):
+    root, _ = load_minigraph_root(filename)
 
     u_neighbors = None
     u_devices = None
@@ -2047,17 +2202,6 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     card_type = None
     macsec_enabled = None
 
-    hwsku_qn = QName(ns, "HwSku")
-    hostname_qn = QName(ns, "Hostname")
-    docker_routing_config_mode_qn = QName(ns, "DockerRoutingConfigMode")
-    for child in root:
-        if child.tag == str(hwsku_qn):
-            hwsku = child.text
-        if child.tag == str(hostname_qn):
-            hostname = child.text
-        if child.tag == str(docker_routing_config_mode_qn):
-            docker_routing_config_mode = child.text
-
     hwsku, hostname, docker_routing_config_mode, chassis_type, chassis_hostname = parse_global_info(root)
     macsec_enabled = is_chassis_lc_macsec_enabled(root, hostname)
 
@@ -2075,6 +2219,8 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
     port_names_map.update(ports)
     port_alias_map.update(alias_map)
     port_alias_asic_map.update(alias_asic_map)
+    if parse_info is not None:
+        parse_info.update(ports=ports, alias_map=alias_map, alias_asic_map=alias_asic_map)
 
     slot_index = get_linecard_slot_index(hostname, chassis_linecards_info)
     # Get the local device node from DeviceMetadata
@@ -2082,45 +2228,47 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
 
     for child in root:
         if asic_hostname is None:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if child.tag == NS_TAG["DpgDec"]:
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif child.tag == NS_TAG["CpgDec"]:
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, hostname)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif child.tag == NS_TAG["PngDec"]:
                 (neighbors, devices, console_dev, console_port, mgmt_dev, mgmt_port, port_speed_png, console_ports, mux_cable_ports, png_ecmp_content) = parse_png(child, hostname, dpg_ecmp_content)
-            elif child.tag == str(QName(ns, "UngDec")):
+            elif child.tag == NS_TAG["UngDec"]:
                 (u_neighbors, u_devices, _, _, _, _, _, _) = parse_png(child, hostname, None)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == NS_TAG["MetadataDeclaration"]:
                 (syslog_servers, dhcp_servers, dhcpv6_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, cloudtype, resource_type, downstream_subrole, switch_id, switch_type, max_cores, kube_data, macsec_profile, downstream_redundancy_types, redundancy_type, qos_profile, rack_mgmt_map) = parse_meta(child, hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == NS_TAG["LinkMetadataDeclaration"]:
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif child.tag == NS_TAG["DeviceInfos"]:
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
         else:
-            if child.tag == str(QName(ns, "DpgDec")):
+            if child.tag == NS_TAG["DpgDec"]:
                 (intfs, lo_intfs, mvrf, mgmt_intf, voq_inband_intfs, vlans, vlan_members, dhcp_relay_table, pcs, pc_members, acls, acl_table_types, vni, tunnel_intfs, dpg_ecmp_content, static_routes, tunnel_intfs_qos_remap_config) = parse_dpg(child, asic_hostname)
                 host_lo_intfs = parse_host_loopback(child, hostname)
-            elif child.tag == str(QName(ns, "CpgDec")):
+            elif child.tag == NS_TAG["CpgDec"]:
                 (bgp_sessions, bgp_internal_sessions, bgp_voq_chassis_sessions, bgp_asn, bgp_peers_with_range, bgp_monitors, bgp_sentinel_sessions) = parse_cpg(child, asic_hostname, local_devices)
-            elif child.tag == str(QName(ns, "PngDec")):
+            elif child.tag == NS_TAG["PngDec"]:
                 (neighbors, devices, port_speed_png) = parse_asic_png(child, asic_hostname, hostname)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == NS_TAG["MetadataDeclaration"]:
                 (sub_role, switch_id, switch_type, max_cores, deployment_id, macsec_profile) = parse_asic_meta(child, asic_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == NS_TAG["LinkMetadataDeclaration"]:
                 linkmetas = parse_linkmeta(child, hostname)
-            elif child.tag == str(QName(ns, "DeviceInfos")):
+            elif child.tag == NS_TAG["DeviceInfos"]:
                 (port_speeds_default, port_descriptions, sys_ports) = parse_deviceinfo(child, hwsku)
 
         if chassis_hostname:
-            if child.tag == str(QName(ns, "DeviceInfos")):
+            if child.tag == NS_TAG["DeviceInfos"]:
                 if asic_hostname is not None:
                     (sys_ports, chassis_port_alias, port_speeds_default) = parse_chassis_deviceinfo(child, chassis_linecards_info, chassis_hwsku, num_voq, chassis_type, voq_intf_attributes)
-            elif child.tag == str(QName(ns, "MetadataDeclaration")):
+            elif child.tag == NS_TAG["MetadataDeclaration"]:
                 (syslog_servers, ntp_servers, tacacs_servers, mgmt_routes, erspan_dst, deployment_id, region, macsec_profile) = parse_chassis_meta(child, chassis_hostname)
-            elif child.tag == str(QName(ns, "LinkMetadataDeclaration")):
+            elif child.tag == NS_TAG["LinkMetadataDeclaration"]:
                 linkmetas = parse_linkmeta(child, chassis_hostname)
 
     select_mmu_profiles(qos_profile, platform, hwsku)
+    if parse_info is not None:
+        parse_info['mmu_profile'] = (qos_profile, platform, hwsku)
     
     # for chassis get the device type from chassis metadata not the asic or linecard type
     if chassis_hostname:
@@ -2646,10 +2794,7 @@ def parse_xml(filename, platform=None, port_config_file=None, asic_name=None, hw
         results['NTP_SERVER'] = dict((item, {'iburst': 'on'}) for item in ntp_servers)
         # Set default DNS nameserver from dns.j2
         results['DNS_NAMESERVER'] = {}
-        if os.environ.get("CFGGEN_UNIT_TESTING", "0") == "2":
-            dns_conf = os.path.join(os.path.dirname(__file__), "tests/", "dns.j2")
-        else:
-            dns_conf = "/usr/share/sonic/templates/dns.j2"
+        dns_conf = get_dns_conf_path()
         if os.path.isfile(dns_conf):
             text = ""
             with open(dns_conf) as template_file:
@@ -2787,11 +2932,11 @@ def get_ports_in_active_active(root, devices, neighbors):
     """Parse out ports in active-active cable type."""
     servers = {hostname.lower(): device_data for hostname, device_data in devices.items() if device_data["type"] == "Server"}
     ports_in_active_active = {}
-    dpg_section = root.find(str(QName(ns, "DpgDec")))
+    dpg_section = root.find(NS_TAG["DpgDec"])
     neighbor_to_port_mapping = {neighbor["name"].lower(): port for port, neighbor in neighbors.items()}
     if dpg_section is not None:
         for child in dpg_section:
-            hostname = child.find(str(QName(ns, "Hostname")))
+            hostname = child.find(NS_TAG["Hostname"])
             if hostname is None:
                 continue
             hostname = hostname.text.lower()
@@ -2885,63 +3030,61 @@ def parse_hostname(filename):
     hostName = None
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    hostname_qn = QName(ns, "Hostname")
-    for child in root:
-        if child.tag == str(hostname_qn):
-            hostName = child.text
-            break
+    _, sections = load_minigraph_root(filename)
+    hostname = sections.get(NS_TAG["Hostname"])
+    if hostname is not None:
+        hostName = hostname.text
 
     return hostName
 
 def parse_asic_sub_role(filename, asic_name):
     if not os.path.isfile(filename):
         return None
-    root = ET.parse(filename).getroot()
-    for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            sub_role, _, _, _, _, _= parse_asic_meta(child, asic_name)
-            return sub_role
+    _, sections = load_minigraph_root(filename)
+    meta = sections.get(NS_TAG["MetadataDeclaration"])
+    if meta is not None:
+        sub_role, _, _, _, _, _= parse_asic_meta(meta, asic_name)
+        return sub_role
 
 def parse_asic_switch_type(filename, asic_name, hostname):
     if os.path.isfile(filename):
-        root = ET.parse(filename).getroot()
+        root, sections = load_minigraph_root(filename)
         switch_type, _ = get_chassis_type_and_hostname(root, hostname)
         if switch_type:
             return switch_type
-        for child in root:
-            if child.tag == str(QName(ns, "MetadataDeclaration")):
-                _, _, switch_type, _, _, _ = parse_asic_meta(child, asic_name)
-                return switch_type
+        meta = sections.get(NS_TAG["MetadataDeclaration"])
+        if meta is not None:
+            _, _, switch_type, _, _, _ = parse_asic_meta(meta, asic_name)
+            return switch_type
     return None
 
 def parse_asic_meta_get_devices(root):
     local_devices = []
 
     for child in root:
-        if child.tag == str(QName(ns, "MetadataDeclaration")):
-            device_metas = child.find(str(QName(ns, "Devices")))
-            for device in device_metas.findall(str(QName(ns1, "DeviceMetadata"))):
-                name = device.find(str(QName(ns1, "Name"))).text.lower()
+        if child.tag == NS_TAG["MetadataDeclaration"]:
+            device_metas = child.find(NS_TAG["Devices"])
+            for device in device_metas.findall(NS1_TAG["DeviceMetadata"]):
+                name = device.find(NS1_TAG["Name"]).text.lower()
                 local_devices.append(name)
 
     return local_devices
 
 def parse_chassis_hwsku(root,chassis_hostname):
     for child in root:
-        if child.tag == str(QName(ns, "PngDec")):
-            devices = child.find(str(QName(ns, "Devices")))
-            for device in devices.findall(str(QName(ns, "Device"))):
-                if chassis_hostname.lower() ==  device.find(str(QName(ns, "Hostname"))).text.lower():
-                    hwsku =  device.find(str(QName(ns, "HwSku"))).text
+        if child.tag == NS_TAG["PngDec"]:
+            devices = child.find(NS_TAG["Devices"])
+            for device in devices.findall(NS_TAG["Device"]):
+                if chassis_hostname.lower() ==  device.find(NS_TAG["Hostname"]).text.lower():
+                    hwsku =  device.find(NS_TAG["HwSku"]).text
                     return hwsku
     return None
 
 def parse_mgmt_intf(child):
     mgmt_intf = {}
-    for mgmtintf in child.find(str(QName(ns, "ManagementIPInterfaces"))).findall(str(QName(ns1, "ManagementIPInterface"))):
-        intfname = mgmtintf.find(str(QName(ns, "AttachTo"))).text
-        ipprefix = mgmtintf.find(str(QName(ns1, "PrefixStr"))).text
+    for mgmtintf in child.find(NS_TAG["ManagementIPInterfaces"]).findall(NS1_TAG["ManagementIPInterface"]):
+        intfname = mgmtintf.find(NS_TAG["AttachTo"]).text
+        ipprefix = mgmtintf.find(NS1_TAG["PrefixStr"]).text
         mgmtipn = ipaddress.ip_network(UNICODE_TYPE(ipprefix), False)
         gwaddr = ipaddress.ip_address(next(mgmtipn.hosts()))
         mgmt_intf[(intfname, ipprefix)] = {'gwaddr': gwaddr}
@@ -2949,9 +3092,9 @@ def parse_mgmt_intf(child):
 
 def parse_linecard_mgmt_ip(root, hname):
     linecard_mgmt_intfs = {}
-    dpg = root.find(str(QName(ns, "DpgDec")))
+    dpg = root.find(NS_TAG["DpgDec"])
     for child in dpg:
-        hostname = child.find(str(QName(ns, "Hostname")))
+        hostname = child.find(NS_TAG["Hostname"])
         if hostname.text.lower() != hname.lower():
             continue
         linecard_mgmt_intfs = parse_mgmt_intf(child)
@@ -2961,6 +3104,12 @@ port_names_map = {}
 port_alias_map = {}
 port_alias_asic_map = {}
 
+def reset_port_maps():
+    """ Forget the port maps filled by the earlier parse_xml calls of this process """
+    port_names_map.clear()
+    port_alias_map.clear()
+    port_alias_asic_map.clear()
+
 
 def print_parse_xml(filename):
     results = parse_xml(filename)
@@ -1,9 +1,14 @@
+from __future__ import print_function
+
 try:
     import ast
+    import hashlib
     import json
     import os
+    import pickle
     import re
     import sys
+    import tempfile
 
     from swsscommon import swsscommon
     from sonic_py_common import device_info
@@ -41,6 +46,14 @@ OPTIONAL_HWSKU_ATTRIBUTES = ["fec", "autoneg", "role"]
 
 BRKOUT_PATTERN = r'(\d{1,6})x(\d{1,6}G?)(\[(\d{1,6}G?,?)*\])?(\((\d{1,6})\))?'
 BRKOUT_PATTERN_GROUPS = 6
+BRKOUT_RE = re.compile(BRKOUT_PATTERN)
+
+# On-disk caches of sonic-cfggen, one sub-directory per cache
+CACHE_ROOT_PATH = '/var/cache/sonic'
+# Overrides CACHE_ROOT_PATH, an empty value disables the on-disk caches
+CACHE_ROOT_PATH_ENV = 'SONIC_CFGGEN_CACHE_DIR'
+CACHE_MAX_ENTRIES = 64
+PORTCONFIG_CACHE_NAME = 'portconfig'
 
 #
 # Helper Functions
@@ -68,6 +81,112 @@ def readJson(filename):
         print("error occurred while parsing json: {}".format(sys.exc_info()[1]))
         return None
 
+#
+# Cache Functions
+#
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path, None)
+    return (path, getattr(st, 'st_mtime_ns', st.st_mtime), st.st_size, st.st_ino)
+
+def get_cache_dir(name, dir_env=None):
+    """
+    Return the directory of the named on-disk cache, or None if the cache can't be used.
+    dir_env names an environment variable overriding the directory of this cache only,
+    an empty value disables it.
+    """
+    cache_dir = os.environ.get(dir_env) if dir_env else None
+    if cache_dir is None:
+        root = os.environ.get(CACHE_ROOT_PATH_ENV)
+        if root is None:
+            if os.environ.get("CFGGEN_UNIT_TESTING"):
+                return None
+            root = CACHE_ROOT_PATH
+        if not root:
+            return None
+        cache_dir = os.path.join(root, name)
+    elif not cache_dir:
+        return None
+
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, 0o700)
+        st = os.stat(cache_dir)
+    except OSError:
+        return None
+    # The cached entries are unpickled, only trust a directory nobody else can write to
+    if st.st_uid != os.geteuid() or st.st_mode & 0o022:
+        return None
+    return cache_dir
+
+def load_cache_file(cache_file):
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def store_cache_file(cache_dir, cache_file, entry):
+    try:
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, cache_file)
+    except Exception as e:
+        print("Warning: failed to write cache file {}: {}".format(cache_file, e), file=sys.stderr)
+        os.remove(tmp_file)
+        return
+
+    try:
+        cached = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith('.pickle')]
+        if len(cached) > CACHE_MAX_ENTRIES:
+            cached.sort(key=os.path.getmtime)
+            for f in cached[:-CACHE_MAX_ENTRIES]:
+                os.remove(f)
+    except OSError:
+        # Another process is pruning the cache
+        pass
+
+# (kind, paths) -> (file signatures, parsed result)
+_parsed_files = {}
+
+def load_parsed_files(kind, paths, parse):
+    """
+    Return the result of parse(), which is derived from the files in paths.
+    The result is memoized in the process and cached on disk until one of the
+    files changes. It is shared by the callers, which must not modify it.
+    """
+    signatures = [file_signature(path) for path in paths]
+    key = (kind, tuple(paths))
+    cached = _parsed_files.get(key)
+    if cached is not None and cached[0] == signatures:
+        return cached[1]
+
+    if any(signature[1] is None for signature in signatures):
+        return parse()
+
+    cache_dir = get_cache_dir(PORTCONFIG_CACHE_NAME)
+    if cache_dir is not None:
+        # The result depends on the parser code as well
+        context = (kind, [os.path.realpath(path) for path in paths], sys.version, file_signature(os.path.abspath(__file__)))
+        cache_file = os.path.join(cache_dir, hashlib.sha1(repr(context).encode('utf-8')).hexdigest() + '.pickle')
+        entry = load_cache_file(cache_file)
+        if entry is not None and entry['signatures'] == signatures:
+            _parsed_files[key] = (signatures, entry['result'])
+            return entry['result']
+
+    result = parse()
+    _parsed_files[key] = (signatures, result)
+    if cache_dir is not None:
+        store_cache_file(cache_dir, cache_file, {'signatures': signatures, 'result': result})
+    return result
+
 def db_connect_configdb(namespace=None):
     """
     Connect to configdb
@@ -245,6 +364,9 @@ def parse_port_config_file(port_config_file):
                 port_alias_asic_map[data['alias']] = data['asic_port_name'].strip()
     return (ports, port_alias_map, port_alias_asic_map)
 
+# (breakout mode, number of lanes) -> parsed BreakoutCfg.BreakoutModeEntry tuple
+_breakout_entries = {}
+
 class BreakoutCfg(object):
 
     class BreakoutModeEntry:
@@ -343,12 +465,17 @@ class BreakoutCfg(object):
             2x50G ---------------> [('2', '50G', None, None, None)]
         """
 
-        try:
-            groups_list = [re.match(BRKOUT_PATTERN, i).groups() for i in bmode.split("+")]
-        except Exception:
-            raise RuntimeError('Breakout mode "{}" validation failed!'.format(bmode))
+        # Ports of a platform share a handful of breakout modes, parse each mode once
+        key = (bmode, len(self._lanes))
+        entries = _breakout_entries.get(key)
+        if entries is None:
+            try:
+                groups_list = [BRKOUT_RE.match(i).groups() for i in bmode.split("+")]
+            except Exception:
+                raise RuntimeError('Breakout mode "{}" validation failed!'.format(bmode))
 
-        return [self._re_group_to_entry(group) for group in groups_list]
+            entries = _breakout_entries[key] = tuple(self._re_group_to_entry(group) for group in groups_list)
+        return entries
 
     def get_config(self):
         # Ensure that we have corret number of configured lanes
@@ -399,10 +526,39 @@ def get_child_ports(interface, breakout_mode, platform_json_file):
 
     return mode_handler.get_config()
 
-def parse_platform_json_file(hwsku_json_file, platform_json_file):
+def expand_breakout_ports(platform_interfaces, hwsku_interfaces):
+    """
+    Compute the child ports of all the interfaces in one pass, from the
+    'interfaces' of platform.json and the default breakout modes in hwsku.json
+    """
     ports = {}
+    for intf, properties in platform_interfaces.items():
+        if intf not in hwsku_interfaces:
+            continue
+
+        # take default_brkout_mode from hwsku.json
+        brkout_mode = hwsku_interfaces[intf][BRKOUT_MODE]
+
+        child_ports = BreakoutCfg(intf, brkout_mode, properties).get_config()
+
+        # take optional fields from hwsku.json
+        for child_port in child_ports:
+            if child_port in hwsku_interfaces:
+                for key, item in hwsku_interfaces[child_port].items():
+                    if key in OPTIONAL_HWSKU_ATTRIBUTES:
+                        for child in child_ports:
+                            child_ports.get(child)[key] = item
+
+        ports.update(child_ports)
+    return ports
+
+def parse_platform_json_file(hwsku_json_file, platform_json_file):
+    (ports, port_alias_map) = load_parsed_files('platform_json', [hwsku_json_file, platform_json_file],
+                                                lambda: _parse_platform_json_file(hwsku_json_file, platform_json_file))
+    return ({name: dict(port) for name, port in ports.items()}, dict(port_alias_map), {})
+
+def _parse_platform_json_file(hwsku_json_file, platform_json_file):
     port_alias_map = {}
-    port_alias_asic_map = {}
 
     port_dict = readJson(platform_json_file)
     hwsku_dict = readJson(hwsku_json_file)
@@ -415,32 +571,14 @@ def parse_platform_json_file(hwsku_json_file, platform_json_file):
     if INTF_KEY not in port_dict or INTF_KEY not in  hwsku_dict:
         raise Exception("INTF_KEY is not present in appropriate file")
 
-    for intf in port_dict[INTF_KEY]:
-        if intf not in hwsku_dict[INTF_KEY]:
-            continue
-
-        # take default_brkout_mode from hwsku.json
-        brkout_mode = hwsku_dict[INTF_KEY][intf][BRKOUT_MODE]
-
-        child_ports = get_child_ports(intf, brkout_mode, platform_json_file)
-
-        # take optional fields from hwsku.json
-        hwsku_entry = hwsku_dict[INTF_KEY]
-        for child_port in child_ports:
-            if child_port in hwsku_entry:
-                for key, item in hwsku_entry[child_port].items():
-                    if key in OPTIONAL_HWSKU_ATTRIBUTES:
-                        for child in child_ports:
-                            child_ports.get(child)[key] = item
-
-        ports.update(child_ports)
+    ports = expand_breakout_ports(port_dict[INTF_KEY], hwsku_dict[INTF_KEY])
 
     if ports is None:
         raise Exception("Ports dictionary is None")
 
     for i in ports.keys():
         port_alias_map[ports[i]["alias"]]= i
-    return (ports, port_alias_map, port_alias_asic_map)
+    return (ports, port_alias_map)
 
 
 def get_breakout_mode(hwsku=None, platform=None, port_config_file=None):
@@ -458,6 +596,10 @@ def get_breakout_mode(hwsku=None, platform=None, port_config_file=None):
         return None
 
 def parse_breakout_mode(hwsku_json_file):
+    brkout_table = load_parsed_files('breakout_mode', [hwsku_json_file], lambda: _parse_breakout_mode(hwsku_json_file))
+    return {intf: dict(mode) for intf, mode in brkout_table.items()}
+
+def _parse_breakout_mode(hwsku_json_file):
     brkout_table = {}
     hwsku_dict = readJson(hwsku_json_file)
     if not hwsku_dict:
@@ -48,6 +48,7 @@ else:
 
 # Common modules for python2 and python3
 py_modules = [
+    'cfggen_client',
     'config_samples',
     'minigraph',
     'openconfig_acl',
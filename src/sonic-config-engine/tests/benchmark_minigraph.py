@@ -0,0 +1,65 @@
+"""
+Benchmark of the minigraph parser over the sample minigraphs.
+
+Run from src/sonic-config-engine:
+    python tests/benchmark_minigraph.py [--rounds N]
+
+Each sample is parsed by a fresh call of parse_xml and the warnings are
+discarded. The on-disk cache of the parsed minigraph is disabled, so the
+numbers are the parsing time.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import timeit
+
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+DEVICE_DIR = os.path.join(TEST_DIR, '..', '..', '..', 'device')
+
+sys.path.insert(0, os.path.join(TEST_DIR, '..'))
+os.environ['SONIC_CFGGEN_CACHE_DIR'] = ''
+
+import minigraph
+
+# name, minigraph, port config, asic name
+SAMPLES = [
+    ('T0', 'sample-arista-7050-t0-minigraph.xml',
+     'arista/x86_64-arista_7050_qx32s/Arista-7050-QX-32S/port_config.ini', None),
+    ('T1', 'sample-arista-7260-t1-minigraph.xml',
+     'arista/x86_64-arista_7260cx3_64/Arista-7260CX3-C64/port_config.ini', None),
+    ('dual-ToR', 'sample-arista-7260-dualtor-minigraph.xml',
+     'arista/x86_64-arista_7260cx3_64/Arista-7260CX3-D108C8/port_config.ini', None),
+    ('chassis-LC', 'sample-arista-7800r3a-36dm2-c36-lc-t2-minigraph.xml',
+     'arista/x86_64-arista_7800r3a_36dm2_lc/Arista-7800R3A-36DM2-C36/0/port_config.ini', None),
+    ('packet-chassis-LC', 'minigraph-str2-temp-2-lc04.xml',
+     os.path.join(TEST_DIR, 'sample-chassis-packet-lc-port-config.ini'), None),
+]
+
+
+def parse(filename, port_config_file, asic_name):
+    minigraph.port_names_map.clear()
+    minigraph.port_alias_map.clear()
+    minigraph.port_alias_asic_map.clear()
+    minigraph._minigraph_roots.clear()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        return minigraph.parse_xml(filename, port_config_file=port_config_file, asic_name=asic_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the minigraph parser")
+    parser.add_argument('--rounds', type=int, default=20, help="parsing rounds per sample")
+    args = parser.parse_args()
+
+    print("{:<20} {:>10} {:>10}".format("sample", "size (KB)", "ms/parse"))
+    for name, graph, port_config, asic_name in SAMPLES:
+        graph = os.path.join(TEST_DIR, graph)
+        port_config = os.path.join(DEVICE_DIR, port_config)
+        parse(graph, port_config, asic_name)
+        elapsed = min(timeit.repeat(lambda: parse(graph, port_config, asic_name), number=1, repeat=args.rounds))
+        print("{:<20} {:>10} {:>10.2f}".format(name, os.path.getsize(graph) // 1024, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
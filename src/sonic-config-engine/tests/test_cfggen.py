@@ -1,6 +1,8 @@
 import json
+import shutil
 import subprocess
 import os
+import tempfile
 import tests.common_utils as utils
 
 from unittest import TestCase
@@ -152,6 +154,80 @@ class TestCfgGen(TestCase):
         output = self.run_script(argument)
         self.assertEqual(utils.to_dict(output.strip()), utils.to_dict('{\n    "k11": "v11"\n}'))
 
+    def test_manifest(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            templates = {
+                'hostname.j2': "{{ DEVICE_METADATA['localhost']['hostname'] }} {{ key1 }}",
+                'extra.j2': "{{ key1 }} {{ key2 }}",
+                'stdout.j2': "{{ (PORT.keys()|list)|length }} {{ extra['k'] }}",
+                'db.j2': '{"DB_TABLE": {"key": {"field": "{{ key1 }}"}}}',
+                'from_db.j2': "{{ DB_TABLE['key']['field'] }}",
+            }
+            for name, text in templates.items():
+                with open(os.path.join(tmp_dir, name), 'w') as f:
+                    f.write(text)
+            with open(os.path.join(tmp_dir, 'extra.json'), 'w') as f:
+                f.write('{"key2": "value2"}')
+            manifest = [
+                {'template': os.path.join(tmp_dir, 'hostname.j2'), 'dest': os.path.join(tmp_dir, 'hostname')},
+                {'template': os.path.join(tmp_dir, 'extra.j2'), 'dest': os.path.join(tmp_dir, 'extra'),
+                 'json': [os.path.join(tmp_dir, 'extra.json')]},
+                {'template': os.path.join(tmp_dir, 'stdout.j2'), 'additional_data': {'extra': {'k': 'v'}}},
+                {'template': os.path.join(tmp_dir, 'from_db.j2'), 'dest': os.path.join(tmp_dir, 'from_db')},
+                {'template': os.path.join(tmp_dir, 'db.j2'), 'dest': 'config-db'},
+            ]
+            manifest_file = os.path.join(tmp_dir, 'manifest.json')
+            with open(manifest_file, 'w') as f:
+                json.dump(manifest, f)
+
+            argument = ['-m', self.sample_graph, '-p', self.port_config, '-a', '{"key1": "value1"}',
+                        '--manifest', manifest_file, '--print-timing']
+            output = subprocess.check_output(self.script_file + argument, stderr=subprocess.PIPE).decode()
+            self.assertEqual(output.strip(), '{} v'.format(len(json.loads(self.run_script(['-m', self.sample_graph, '-p', self.port_config, '--var-json', 'PORT'])))))
+            expected = {'hostname': 'OCPSCH01040DDLF value1', 'extra': 'value1 value2', 'from_db': 'value1'}
+            for name, text in expected.items():
+                with open(os.path.join(tmp_dir, name)) as f:
+                    self.assertEqual(f.read().strip(), text)
+
+            # the entry sources are visible only to the template of the entry
+            manifest[0]['template'] = os.path.join(tmp_dir, 'extra.j2')
+            with open(manifest_file, 'w') as f:
+                json.dump(manifest[:1], f)
+            p = subprocess.Popen(self.script_file + argument, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            _, error = p.communicate()
+            self.assertEqual(p.returncode, 0)
+            with open(os.path.join(tmp_dir, 'hostname')) as f:
+                self.assertEqual(f.read().strip(), 'value1')
+            self.assertIn('extra.j2 -> ' + os.path.join(tmp_dir, 'hostname'), error.decode())
+
+            # failed template is reported, the other templates are rendered
+            manifest[0]['template'] = os.path.join(tmp_dir, 'nonexistent.j2')
+            with open(manifest_file, 'w') as f:
+                json.dump(manifest[:2], f)
+            p = subprocess.Popen(self.script_file + argument + ['--jobs', '1'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            _, error = p.communicate()
+            self.assertEqual(p.returncode, 1)
+            self.assertIn("Failed to render template '{}'".format(manifest[0]['template']), error.decode())
+            with open(os.path.join(tmp_dir, 'extra')) as f:
+                self.assertEqual(f.read().strip(), 'value1 value2')
+
+            # failed config-db template is reported, the other templates are rendered
+            with open(os.path.join(tmp_dir, 'bad_db.j2'), 'w') as f:
+                f.write('{"DB_TABLE": ')
+            manifest[0] = {'template': os.path.join(tmp_dir, 'bad_db.j2'), 'dest': 'config-db'}
+            with open(manifest_file, 'w') as f:
+                json.dump(manifest[:2], f)
+            os.remove(os.path.join(tmp_dir, 'extra'))
+            p = subprocess.Popen(self.script_file + argument, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            _, error = p.communicate()
+            self.assertEqual(p.returncode, 1)
+            self.assertIn("Failed to render template '{}'".format(manifest[0]['template']), error.decode())
+            with open(os.path.join(tmp_dir, 'extra')) as f:
+                self.assertEqual(f.read().strip(), 'value1 value2')
+        finally:
+            shutil.rmtree(tmp_dir)
+
     def test_var_json_data(self, **kwargs):
         graph_file = kwargs.get('graph_file', self.sample_graph_simple)
         tag_mode = kwargs.get('tag_mode', 'untagged')
@@ -1,12 +1,15 @@
 import ast
 import json
 import os
+import shutil
 import subprocess
 import sys
 import ast
+import tempfile
 import tests.common_utils as utils
 
 from unittest import TestCase
+import portconfig
 from portconfig import get_port_config, INTF_KEY
 
 if sys.version_info.major == 3:
@@ -116,3 +119,37 @@ class TestCfgGenPlatformJson(TestCase):
         (ports, _, _) = get_port_config(port_config_file=self.platform_json)
         self.assertNotEqual(ports, None)
         self.assertEqual(ports, {})
+
+    def test_platform_json_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        platform_json = os.path.join(cache_dir, 'platform.json')
+        hwsku_json = os.path.join(cache_dir, 'hwsku.json')
+        shutil.copy(self.platform_json, platform_json)
+        shutil.copy(self.hwsku_json, hwsku_json)
+        try:
+            with mock.patch.dict(os.environ, {portconfig.CACHE_ROOT_PATH_ENV: cache_dir}):
+                (ports, alias_map, _) = portconfig.parse_platform_json_file(hwsku_json, platform_json)
+                self.assertEqual(ports['Ethernet8']['speed'], '25000')
+                ports['Ethernet8']['speed'] = '10000'
+
+                # Memoized in the process, callers get their own copy
+                with mock.patch('portconfig.readJson') as read_json:
+                    self.assertEqual(portconfig.parse_platform_json_file(hwsku_json, platform_json)[0]['Ethernet8']['speed'], '25000')
+                    read_json.assert_not_called()
+
+                # Cached on disk for the other processes
+                portconfig._parsed_files.clear()
+                with mock.patch('portconfig.readJson') as read_json:
+                    self.assertEqual(portconfig.parse_platform_json_file(hwsku_json, platform_json)[1], alias_map)
+                    read_json.assert_not_called()
+
+                # Parsed again when a file changes
+                with open(hwsku_json) as f:
+                    hwsku = json.load(f)
+                hwsku[INTF_KEY]['Ethernet8'][portconfig.BRKOUT_MODE] = '1x100G[40G]'
+                with open(hwsku_json, 'w') as f:
+                    json.dump(hwsku, f)
+                (ports, _, _) = portconfig.parse_platform_json_file(hwsku_json, platform_json)
+                self.assertEqual(ports['Ethernet8']['speed'], '100000')
+        finally:
+            shutil.rmtree(cache_dir)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import tests.common_utils as utils
+
+from unittest import TestCase
+
+import cfggen_client
+
+
+class TestCfgGenServer(TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.dirname(os.path.realpath(__file__))
+        self.script_file = [utils.PYTHON_INTERPRETTER, os.path.join(self.test_dir, '..', 'sonic-cfggen')]
+        self.sample_graph = os.path.join(self.test_dir, 'sample_graph.xml')
+        self.port_config = os.path.join(self.test_dir, 't0-sample-port-config.ini')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'sonic-cfggen.sock')
+        self.env = dict(os.environ)
+        self.env["CFGGEN_UNIT_TESTING"] = "2"
+        self.env[cfggen_client.SOCKET_PATH_ENV] = self.socket_path
+        self.env.pop(cfggen_client.DISABLE_ENV, None)
+        self.server = subprocess.Popen(self.script_file + ['--server', self.socket_path], env=self.env)
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.1)
+        self.assertTrue(os.path.exists(self.socket_path))
+
+    def tearDown(self):
+        self.server.terminate()
+        self.server.wait()
+        shutil.rmtree(self.tmp_dir)
+
+    def run_script(self, argument, local=False, cwd=None):
+        env = dict(self.env)
+        if local:
+            env[cfggen_client.DISABLE_ENV] = "1"
+        process = subprocess.Popen(self.script_file + argument, env=env, cwd=cwd,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, error = process.communicate()
+        return process.returncode, output.decode(), error.decode()
+
+    def test_same_output(self):
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '--print-data']
+        local = self.run_script(argument, local=True)
+        self.assertEqual(local[0], 0)
+        self.assertEqual(self.run_script(argument), local)
+        # the second request is served with the warm server state
+        self.assertEqual(self.run_script(argument), local)
+
+    def test_template_relative_path(self):
+        with open(os.path.join(self.tmp_dir, 'test.j2'), 'w') as f:
+            f.write("{{ DEVICE_METADATA['localhost']['hostname'] }} {{ x }}")
+        argument = ['-m', self.sample_graph, '-p', self.port_config, '-a', '{"x": "y"}', '-t', 'test.j2,output']
+        rc, output, _ = self.run_script(argument, cwd=self.tmp_dir)
+        self.assertEqual(rc, 0)
+        self.assertEqual(output, '')
+        with open(os.path.join(self.tmp_dir, 'output')) as f:
+            self.assertEqual(f.read().strip(), 'OCPSCH01040DDLF y')
+
+        # the loaded template is refreshed when the file changes
+        with open(os.path.join(self.tmp_dir, 'test.j2'), 'w') as f:
+            f.write("{{ x }} {{ DEVICE_METADATA['localhost']['hostname'] }} changed")
+        os.utime(os.path.join(self.tmp_dir, 'test.j2'), (time.time() + 10, time.time() + 10))
+        rc, output, _ = self.run_script(argument, cwd=self.tmp_dir)
+        self.assertEqual(rc, 0)
+        with open(os.path.join(self.tmp_dir, 'output')) as f:
+            self.assertEqual(f.read().strip(), 'y OCPSCH01040DDLF changed')
+
+    def test_errors(self):
+        rc, output, error = self.run_script(['--unknown-option'])
+        self.assertEqual(rc, 2)
+        self.assertIn('unrecognized arguments', error)
+
+        rc, output, error = self.run_script(['-j', os.path.join(self.tmp_dir, 'nonexistent.json')])
+        self.assertEqual(rc, 1)
+        self.assertIn('No such file or directory', error)
+
+    def test_can_forward(self):
+        self.assertTrue(cfggen_client.can_forward(['-d', '-v', 'DEVICE_METADATA']))
+        self.assertFalse(cfggen_client.can_forward(['-j', '/dev/stdin']))
+        self.assertFalse(cfggen_client.can_forward(['-t', 'test.j2,/dev/stdout']))
+        self.assertFalse(cfggen_client.can_forward(['--server']))
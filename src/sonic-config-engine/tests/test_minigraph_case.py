@@ -2,11 +2,20 @@ import json
 import os
 import subprocess
 import ipaddress
+import shutil
+import sys
+import tempfile
 import tests.common_utils as utils
 import minigraph
+import portconfig
 
 from unittest import TestCase
 
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
 TOR_ROUTER = 'ToRRouter'
 BACKEND_TOR_ROUTER = 'BackEndToRRouter'
 BMC_MGMT_TOR_ROUTER = 'BmcMgmtToRRouter'
@@ -575,3 +584,101 @@ class TestCfgGenCaseInsensitive(TestCase):
         # TC2: For other minigraph, result should not contain FLEX_COUNTER_TABLE
         result = minigraph.parse_xml(self.sample_graph, port_config_file=self.port_config)
         self.assertNotIn('FLEX_COUNTER_TABLE', result)
+
+    def test_parse_xml_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        graph = os.path.join(cache_dir, 'minigraph.xml')
+        shutil.copy(self.sample_graph, graph)
+
+        def parse_xml():
+            # The cache is only used by the first parsing of a process
+            with mock.patch.dict(minigraph.port_names_map, clear=True), \
+                    mock.patch.dict(minigraph.port_alias_map, clear=True), \
+                    mock.patch.dict(minigraph.port_alias_asic_map, clear=True):
+                return minigraph.parse_xml(graph, port_config_file=self.port_config)
+
+        try:
+            with mock.patch.dict(os.environ, {portconfig.CACHE_ROOT_PATH_ENV: cache_dir}):
+                expected = parse_xml()
+                minigraph_cache_dir = os.path.join(cache_dir, minigraph.MINIGRAPH_CACHE_NAME)
+                self.assertEqual(len([f for f in os.listdir(minigraph_cache_dir) if f.endswith('.pickle')]), 1)
+
+                # The second parsing is served from the cache
+                with mock.patch('minigraph._parse_xml') as parse:
+                    self.assertEqual(parse_xml(), expected)
+                    parse.assert_not_called()
+
+                # The cache is invalidated when the minigraph changes
+                with open(graph) as f:
+                    content = f.read()
+                with open(graph, 'w') as f:
+                    f.write(content.replace('switch-t0', 'switch-t00'))
+                self.assertEqual(parse_xml()['DEVICE_METADATA']['localhost']['hostname'], 'switch-t00')
+                self.assertEqual(minigraph.parse_hostname(graph), 'switch-t00')
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_parse_xml_cache_config_db_port(self):
+        cache_dir = tempfile.mkdtemp()
+        tables = {'PORT': {'Ethernet0': {'alias': 'fortyGigE0/0', 'lanes': '29,30,31,32'}}}
+        config_db = mock.Mock()
+        config_db.get_table.side_effect = lambda table: json.loads(json.dumps(tables.get(table, {})))
+
+        def parse_xml():
+            # The ports are read from CONFIG_DB, when no port config file is given
+            with mock.patch.dict(minigraph.port_names_map, clear=True), \
+                    mock.patch.dict(minigraph.port_alias_map, clear=True), \
+                    mock.patch.dict(minigraph.port_alias_asic_map, clear=True), \
+                    mock.patch('portconfig.db_connect_configdb', return_value=config_db):
+                return minigraph.parse_xml(self.sample_graph)
+
+        try:
+            with mock.patch.dict(os.environ, {portconfig.CACHE_ROOT_PATH_ENV: cache_dir}):
+                expected = parse_xml()
+                self.assertNotIn('Ethernet4', expected['PORT'])
+                with mock.patch('minigraph._parse_xml') as parse:
+                    self.assertEqual(parse_xml(), expected)
+                    parse.assert_not_called()
+
+                # The cache is invalidated when the PORT table changes
+                tables['PORT']['Ethernet4'] = {'alias': 'fortyGigE0/4', 'lanes': '25,26,27,28'}
+                result = parse_xml()
+                self.assertIn('Ethernet4', result['PORT'])
+                self.assertNotIn('fortyGigE0/4', result['PORT'])
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_minigraph_cache_dir_env(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch.dict(os.environ, {portconfig.CACHE_ROOT_PATH_ENV: '/nonexistent',
+                                              minigraph.MINIGRAPH_CACHE_DIR_ENV: cache_dir}):
+                self.assertEqual(portconfig.get_cache_dir(minigraph.MINIGRAPH_CACHE_NAME, minigraph.MINIGRAPH_CACHE_DIR_ENV), cache_dir)
+            with mock.patch.dict(os.environ, {portconfig.CACHE_ROOT_PATH_ENV: cache_dir,
+                                              minigraph.MINIGRAPH_CACHE_DIR_ENV: ''}):
+                self.assertIsNone(portconfig.get_cache_dir(minigraph.MINIGRAPH_CACHE_NAME, minigraph.MINIGRAPH_CACHE_DIR_ENV))
+                self.assertEqual(portconfig.get_cache_dir(portconfig.PORTCONFIG_CACHE_NAME),
+                                 os.path.join(cache_dir, portconfig.PORTCONFIG_CACHE_NAME))
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_select_mmu_profiles_skips_identical_files(self):
+        device_dir = tempfile.mkdtemp()
+        hwsku_dir = os.path.join(device_dir, 'x86_64-test-r0', 'test-hwsku')
+        profile_dir = os.path.join(hwsku_dir, 'RDMA-CENTRIC')
+        os.makedirs(profile_dir)
+        for name, base, profile in (('qos.json.j2', 'qos', 'qos'), ('pg_profile_lookup.ini', 'pg', 'pg-rdma')):
+            with open(os.path.join(hwsku_dir, name), 'w') as f:
+                f.write(base)
+            with open(os.path.join(profile_dir, name), 'w') as f:
+                f.write(profile)
+
+        try:
+            with mock.patch.dict(os.environ, {'CFGGEN_UNIT_TESTING': '2'}), \
+                    mock.patch('minigraph.os.walk', return_value=[(os.path.join(device_dir, 'x86_64-test-r0'), [], [])]), \
+                    mock.patch('minigraph.exec_cmd') as exec_cmd:
+                minigraph.select_mmu_profiles('RDMA-CENTRIC', 'x86_64-test-r0', 'test-hwsku')
+                exec_cmd.assert_called_once_with(['sudo', 'cp', os.path.join(profile_dir, 'pg_profile_lookup.ini'),
+                                                  os.path.join(hwsku_dir, 'pg_profile_lookup.ini')])
+        finally:
+            shutil.rmtree(device_dir)
@@ -52,6 +52,7 @@ setup(
         'console_scripts': [
             'sonic-db-load = sonic_py_common.sonic_db_dump_load:sonic_db_dump_load',
             'sonic-db-dump = sonic_py_common.sonic_db_dump_load:sonic_db_dump_load',
+            'sonic-device-facts = sonic_py_common.device_info:save_facts_snapshot_main',
         ],
     },
     classifiers=[
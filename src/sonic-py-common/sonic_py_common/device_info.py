@@ -1,11 +1,17 @@
+import copy
+import ctypes
 import glob
 import hashlib
 import json
 import os
 import random
 import re
+import socket
+import struct
 import subprocess
+import tempfile
 import yaml
+import zlib
 from natsort import natsorted
 from sonic_py_common.general import getstatusoutput_noshell_pipe
 from swsscommon.swsscommon import ConfigDBConnector, SonicV2Connector
@@ -35,6 +41,7 @@ HWSKU_JSON_FILE = 'hwsku.json'
 # TODO: Move Multi-ASIC-related functions and constants to a "multi_asic.py" module
 NPU_NAME_PREFIX = "asic"
 NAMESPACE_PATH_GLOB = "/run/netns/*"
+NAMESPACE_PATH = "/run/netns"
 ASIC_CONF_FILENAME = "asic.conf"
 PLATFORM_ENV_CONF_FILENAME = "platform_env.conf"
 FRONTEND_ASIC_SUB_ROLE = "FrontEnd"
@@ -51,9 +58,146 @@ CHASSIS_INFO_REV_FIELD = 'revision'
 # DPU constants
 DPU_NAME_PREFIX = "dpu"
 
+# System MAC address sources
+SYSEEPROM_CACHE_PATH = "/var/cache/sonic/decode-syseeprom/syseeprom_cache"
+SYSTEM_MAC_CACHE_DIR = "/run/sonic/system_mac"
+SYSTEM_MAC_CACHE_HOST = "host"
+ONIE_TLV_HEADER = b"TlvInfo\x00"
+ONIE_TLV_MAX_SIZE = 2048
+ONIE_TLV_CODE_MAC_BASE = 0x24
+ONIE_TLV_CODE_CRC_32 = 0xFE
+
+# Netlink constants from linux/netlink.h and linux/rtnetlink.h
+CLONE_NEWNET = 0x40000000
+NETLINK_ROUTE = 0
+NLMSG_ERROR = 2
+NLM_F_REQUEST = 1
+RTM_GETLINK = 18
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+NLMSG_HEADER = struct.Struct("=IHHII")
+IFINFOMSG = struct.Struct("=BxHiII")
+RTATTR_HEADER = struct.Struct("=HH")
+
+# Snapshot of the parsed platform files, written at boot by sonic-device-facts
+FACTS_SNAPSHOT_PATH = "/run/sonic/device_facts.json"
+FACTS_SNAPSHOT_VERSION = 1
+
 # Cacheable Objects
 sonic_ver_info = {}
 hw_info_dict = {}
+# path -> (file signature, parsed content) of the platform files
+parsed_files = {}
+facts_snapshot_loaded = False
+
+
+def clear_facts_cache():
+    """
+    Drops the cached platform files, they are read again at the next call
+    """
+    global sonic_ver_info, hw_info_dict, facts_snapshot_loaded
+    sonic_ver_info = {}
+    hw_info_dict = {}
+    parsed_files.clear()
+    facts_snapshot_loaded = False
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _load_facts_snapshot():
+    global facts_snapshot_loaded
+    if facts_snapshot_loaded:
+        return
+    facts_snapshot_loaded = True
+    try:
+        with open(FACTS_SNAPSHOT_PATH) as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != FACTS_SNAPSHOT_VERSION:
+            return
+        for path, entry in snapshot['files'].items():
+            parsed_files.setdefault(path, tuple(entry))
+    except (IOError, OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+
+def _load_parsed_file(path, parse):
+    """
+    Returns parse() of a platform file, the result is cached until the file
+    changes. The result is shared by the callers, which must not modify it.
+    """
+    try:
+        signature = _file_signature(path)
+    except OSError:
+        return parse()
+
+    _load_facts_snapshot()
+    cached = parsed_files.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    result = parse()
+    parsed_files[path] = (signature, result)
+    return result
+
+
+def _read_conf_file(path):
+    """
+    Returns a list of [key, value] of the lines in a key=value configuration file
+    """
+    def parse():
+        conf_vars = []
+        with open(path) as conf_file:
+            for line in conf_file:
+                tokens = line.split('=')
+                if len(tokens) < 2:
+                    continue
+                conf_vars.append([tokens[0], tokens[1].strip()])
+        return conf_vars
+
+    return _load_parsed_file(path, parse)
+
+
+def save_facts_snapshot(path=FACTS_SNAPSHOT_PATH):
+    """
+    Parses the platform files and writes them to the snapshot, which is
+    loaded by the processes reading the facts afterwards
+    """
+    clear_facts_cache()
+    get_machine_info()
+    get_sonic_version_info()
+    if get_asic_conf_file_path() is not None:
+        get_num_npus()
+    if get_platform_env_conf_file_path() is not None:
+        is_supervisor()
+
+    files = {}
+    for file_path, entry in parsed_files.items():
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            continue
+        files[file_path] = entry
+
+    snapshot_dir = os.path.dirname(path)
+    if not os.path.isdir(snapshot_dir):
+        os.makedirs(snapshot_dir)
+    fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': FACTS_SNAPSHOT_VERSION, 'files': files}, f)
+        os.chmod(tmp_path, 0o644)
+        os.rename(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def save_facts_snapshot_main():
+    save_facts_snapshot()
+
 
 def get_localhost_info(field, config_db=None):
     try:
@@ -87,15 +231,7 @@ def get_machine_info():
     if not os.path.isfile(MACHINE_CONF_PATH):
         return None
 
-    machine_vars = {}
-    with open(MACHINE_CONF_PATH) as machine_conf_file:
-        for line in machine_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-                continue
-            machine_vars[tokens[0]] = tokens[1].strip()
-
-    return machine_vars
+    return dict(_read_conf_file(MACHINE_CONF_PATH))
 
 def get_platform(**kwargs):
     """
@@ -187,13 +323,16 @@ def get_platform_json_data():
     if not os.path.isfile(platform_json):
         return None
 
-    try:
-        with open(platform_json, 'r') as f:
-            platform_data = json.loads(f.read())
-            return platform_data
-    except (json.JSONDecodeError, IOError, TypeError, ValueError):
-        # Handle any file reading and JSON parsing errors
-        return None
+    def parse():
+        try:
+            with open(platform_json, 'r') as f:
+                platform_data = json.loads(f.read())
+                return platform_data
+        except (json.JSONDecodeError, IOError, TypeError, ValueError):
+            # Handle any file reading and JSON parsing errors
+            return None
+
+    return copy.deepcopy(_load_parsed_file(platform_json, parse))
 
 
 def get_asic_conf_file_path():
@@ -463,7 +602,7 @@ def get_path_to_port_config_file(hwsku=None, asic=None):
     if os.path.isfile(hwsku_json_file):
         if os.path.isfile(os.path.join(platform_path, PLATFORM_JSON_FILE)):
             json_file = os.path.join(platform_path, PLATFORM_JSON_FILE)
-            platform_data = json.loads(open(json_file).read())
+            platform_data = _load_parsed_file(json_file, lambda: json.loads(open(json_file).read()))
             interfaces = platform_data.get('interfaces', None)
             if interfaces is not None and len(interfaces) > 0:
                 port_config_candidates.append(os.path.join(platform_path, PLATFORM_JSON_FILE))
@@ -488,12 +627,14 @@ def get_sonic_version_info():
     if sonic_ver_info:
         return sonic_ver_info
 
-    with open(SONIC_VERSION_YAML_PATH) as stream:
-        if yaml.__version__ >= "5.1":
-            sonic_ver_info = yaml.full_load(stream)
-        else:
-            sonic_ver_info = yaml.safe_load(stream)
+    def parse():
+        with open(SONIC_VERSION_YAML_PATH) as stream:
+            if yaml.__version__ >= "5.1":
+                return yaml.full_load(stream)
+            else:
+                return yaml.safe_load(stream)
 
+    sonic_ver_info = _load_parsed_file(SONIC_VERSION_YAML_PATH, parse)
     return sonic_ver_info
 
 def get_sonic_version_file():
@@ -575,14 +716,10 @@ def get_num_npus():
     asic_conf_file_path = get_asic_conf_file_path()
     if asic_conf_file_path is None:
         return 1
-    with open(asic_conf_file_path) as asic_conf_file:
-        for line in asic_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'num_asic':
-                num_npus = tokens[1].strip()
-        return int(num_npus)
+    for key, value in _read_conf_file(asic_conf_file_path):
+        if key.lower() == 'num_asic':
+            num_npus = value
+    return int(num_npus)
 
 
 def is_multi_npu():
@@ -604,16 +741,11 @@ def is_disaggregated_chassis():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0] == 'disaggregated_chassis':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, val in _read_conf_file(platform_env_conf_file_path):
+        if key == 'disaggregated_chassis':
+            if val == '1':
+                return True
+    return False
 
 
 def is_virtual_chassis():
@@ -661,16 +793,11 @@ def is_supervisor():
     platform_env_conf_file_path = get_platform_env_conf_file_path()
     if platform_env_conf_file_path is None:
         return False
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'supervisor':
-                val = tokens[1].strip()
-                if val == '1':
-                    return True
-        return False
+    for key, val in _read_conf_file(platform_env_conf_file_path):
+        if key.lower() == 'supervisor':
+            if val == '1':
+                return True
+    return False
 
 # Check if this platform has macsec capability.
 def is_macsec_supported():
@@ -681,15 +808,11 @@ def is_macsec_supported():
     if platform_env_conf_file_path is None:
         return supported
 
-    # Else open the file check for keyword - macsec_enabled -
-    with open(platform_env_conf_file_path) as platform_env_conf_file:
-        for line in platform_env_conf_file:
-            tokens = line.split('=')
-            if len(tokens) < 2:
-               continue
-            if tokens[0].lower() == 'macsec_enabled':
-                supported = tokens[1].strip()
-                break
+    # Else check the file for keyword - macsec_enabled -
+    for key, value in _read_conf_file(platform_env_conf_file_path):
+        if key.lower() == 'macsec_enabled':
+            supported = value
+            break
     return int(supported)
 
 
@@ -797,18 +920,204 @@ def generate_mac_for_vs(hostname, namespace):
 
     return _modify_mac_for_asic(mac, namespace)
 
+def _parse_onie_tlv_base_mac(data):
+    """
+    Returns the base MAC address of an ONIE TlvInfo EEPROM, or None if the
+    data isn't a valid TlvInfo EEPROM
+    """
+    data = bytearray(data)
+    header_size = len(ONIE_TLV_HEADER) + 3
+    if len(data) < header_size or bytes(data[:len(ONIE_TLV_HEADER)]) != ONIE_TLV_HEADER:
+        return None
+    end = header_size + struct.unpack_from(">H", data, len(ONIE_TLV_HEADER) + 1)[0]
+    if len(data) < end:
+        return None
+
+    mac = None
+    offset = header_size
+    while offset + 2 <= end:
+        code, length = data[offset], data[offset + 1]
+        value = data[offset + 2:offset + 2 + length]
+        if offset + 2 + length > end:
+            return None
+        if code == ONIE_TLV_CODE_MAC_BASE and length == 6:
+            mac = ':'.join('{:02x}'.format(byte) for byte in value)
+        elif code == ONIE_TLV_CODE_CRC_32 and length == 4:
+            # The CRC covers the EEPROM up to the value of the CRC TLV
+            crc = zlib.crc32(bytes(data[:offset + 2])) & 0xffffffff
+            if crc != struct.unpack(">I", bytes(value))[0]:
+                return None
+            return mac
+        offset += 2 + length
+    return None
+
+
+def _read_syseeprom_mac():
+    """
+    Returns the base MAC address of the system EEPROM, read from the cache of
+    decode-syseeprom, or from decode-syseeprom if the cache isn't usable
+    """
+    try:
+        with open(SYSEEPROM_CACHE_PATH, 'rb') as f:
+            mac = _parse_onie_tlv_base_mac(f.read(ONIE_TLV_MAX_SIZE))
+        if mac is not None:
+            return (mac, None)
+    except (IOError, OSError):
+        pass
+    return run_command(["sudo", "decode-syseeprom", "-m"])
+
+
+def _setns(fd):
+    if hasattr(os, 'setns'):
+        os.setns(fd, CLONE_NEWNET)
+        return
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.setns(fd, CLONE_NEWNET) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def _netlink_socket(namespace=None):
+    """
+    Opens a rtnetlink socket in a network namespace. The namespace is only
+    switched for the current thread, while the socket is created.
+    """
+    if namespace is None:
+        return socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    with open('/proc/self/ns/net') as own_ns, open(os.path.join(NAMESPACE_PATH, namespace)) as ns:
+        _setns(ns.fileno())
+        try:
+            return socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        finally:
+            _setns(own_ns.fileno())
+
+
+def _get_link_address(ifname, namespace=None):
+    """
+    Returns the link layer address of an interface, read with rtnetlink
+    """
+    name = ifname.encode('utf-8') + b'\0'
+    attr = RTATTR_HEADER.pack(RTATTR_HEADER.size + len(name), IFLA_IFNAME) + name
+    attr += b'\0' * (-len(attr) % 4)
+    body = IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0) + attr
+    request = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(body), RTM_GETLINK, NLM_F_REQUEST, 1, 0) + body
+
+    sock = _netlink_socket(namespace)
+    try:
+        sock.settimeout(1)
+        sock.sendto(request, (0, 0))
+        data = sock.recv(65536)
+    finally:
+        sock.close()
+
+    length, msg_type = NLMSG_HEADER.unpack_from(data)[:2]
+    if msg_type == NLMSG_ERROR:
+        err = -struct.unpack_from("=i", data, NLMSG_HEADER.size)[0]
+        raise OSError(err, os.strerror(err))
+    offset = NLMSG_HEADER.size + IFINFOMSG.size
+    while offset + RTATTR_HEADER.size <= length:
+        attr_len, attr_type = RTATTR_HEADER.unpack_from(data, offset)
+        if attr_len < RTATTR_HEADER.size:
+            break
+        if attr_type == IFLA_ADDRESS:
+            value = bytearray(data[offset + RTATTR_HEADER.size:offset + attr_len])
+            return ':'.join('{:02x}'.format(byte) for byte in value)
+        offset += (attr_len + 3) & ~3
+    return None
+
+
+def _read_interface_mac(ifname, namespace=None):
+    """
+    Returns the MAC address of an interface from sysfs, or from rtnetlink in
+    the namespace of an ASIC. Falls back to ip if they aren't usable.
+    """
+    try:
+        if namespace is None:
+            with open('/sys/class/net/{}/address'.format(ifname)) as f:
+                return (f.read(), None)
+        mac = _get_link_address(ifname, namespace)
+        if mac is not None:
+            return (mac, None)
+    except (IOError, OSError, ValueError, struct.error):
+        pass
+
+    iplink_cmd0 = ['ip', 'link', 'show', ifname]
+    if namespace is not None:
+        iplink_cmd0 = ['sudo', 'ip', 'netns', 'exec', str(namespace)] + iplink_cmd0
+    return run_command_pipe(iplink_cmd0, ['grep', 'ether'], ['awk', '{print $2}'])
+
+
+def _read_profile_mac(profile_file, key):
+    """
+    Returns the value of the lines of profile.ini containing key
+    """
+    try:
+        with open(profile_file) as f:
+            values = [line.split('=')[1].strip() if '=' in line else line.strip()
+                      for line in f if key in line]
+    except (IOError, OSError) as e:
+        return ('', str(e))
+    if not values:
+        return ('', '{} not found in {}'.format(key, profile_file))
+    return ('\n'.join(values), None)
+
+
+def _get_system_mac_cache_path(namespace):
+    return os.path.join(SYSTEM_MAC_CACHE_DIR, os.path.basename(namespace) if namespace else SYSTEM_MAC_CACHE_HOST)
+
+
+def _load_system_mac(namespace):
+    path = _get_system_mac_cache_path(namespace)
+    try:
+        st = os.stat(path)
+        if st.st_uid not in (0, os.geteuid()):
+            return None
+        with open(path) as f:
+            mac = f.read().strip()
+    except (IOError, OSError):
+        return None
+    return mac if _valid_mac_address(mac) else None
+
+
+def _store_system_mac(namespace, mac):
+    """
+    Saves the system MAC address of the namespace till the next boot, the
+    cache is only written by root
+    """
+    if os.geteuid() != 0:
+        return
+    try:
+        if not os.path.isdir(SYSTEM_MAC_CACHE_DIR):
+            os.makedirs(SYSTEM_MAC_CACHE_DIR)
+        fd, tmp_path = tempfile.mkstemp(dir=SYSTEM_MAC_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(mac + '\n')
+        os.chmod(tmp_path, 0o644)
+        os.rename(tmp_path, _get_system_mac_cache_path(namespace))
+    except (IOError, OSError):
+        pass
+
+
 def get_system_mac(namespace=None, hostname=None):
-    hw_mac_entry_outputs = []
-    syseeprom_cmd = ["sudo", "decode-syseeprom", "-m"]
-    iplink_cmd0 = ["ip", 'link', 'show', 'eth0']
-    iplink_cmd1 = ['grep', 'ether']
-    iplink_cmd2 = ['awk', '{print $2}']
-    version_info = get_sonic_version_info()
     platform = get_platform()
 
     if platform == VS_PLATFORM:
         return generate_mac_for_vs(hostname, namespace)
 
+    mac = _load_system_mac(namespace)
+    if mac is not None:
+        return mac
+
+    mac = _get_system_mac(platform, namespace)
+    if mac is not None:
+        _store_system_mac(namespace, mac)
+    return mac
+
+
+def _get_system_mac(platform, namespace):
+    hw_mac_entry_outputs = []
+    version_info = get_sonic_version_info()
+
     if (version_info['asic_type'] in ['mellanox', 'nvidia-bluefield']):
         # With Mellanox ONIE release(2019.05-5.2.0012) and above
         # "onie_base_mac" was added to /host/machine.conf:
@@ -823,50 +1132,27 @@ def get_system_mac(namespace=None, hostname=None):
             if _valid_mac_address(mac):
                 return mac
 
-        (mac, err) = run_command(syseeprom_cmd)
-        hw_mac_entry_outputs.append((mac, err))
+        hw_mac_entry_outputs.append(_read_syseeprom_mac())
     elif (version_info['asic_type'] == 'marvell-prestera'):
         # Try valid mac in eeprom, else fetch it from eth0
         machine_key = "onie_machine"
         machine_vars = get_machine_info()
-        (mac, err) = run_command(syseeprom_cmd)
-        hw_mac_entry_outputs.append((mac, err))
+        hw_mac_entry_outputs.append(_read_syseeprom_mac())
         if machine_vars is not None and machine_key in machine_vars:
             hwsku = machine_vars[machine_key]
             profile_file = HOST_DEVICE_PATH + '/' + platform + '/' + hwsku + '/profile.ini'
             if os.path.exists(profile_file):
-                profile_cmd0 = ['cat', profile_file]
-                profile_cmd1 = ['grep', 'switchMacAddress']
-                profile_cmd2 = ['cut', '-f2', '-d', '=']
-                (mac, err) = run_command_pipe(profile_cmd0, profile_cmd1, profile_cmd2)
-                hw_mac_entry_outputs.append((mac, err))
-        else:
-            profile_cmd = ["false"]
-            (mac, err) = run_command(profile_cmd)
-            hw_mac_entry_outputs.append((mac, err))
-        (mac, err) = run_command_pipe(iplink_cmd0, iplink_cmd1, iplink_cmd2)
-        hw_mac_entry_outputs.append((mac, err))
+                hw_mac_entry_outputs.append(_read_profile_mac(profile_file, 'switchMacAddress'))
+        hw_mac_entry_outputs.append(_read_interface_mac('eth0'))
     elif (version_info['asic_type'] == 'cisco-8000'):
         # Try to get valid MAC from profile.ini first, else fetch it from syseeprom or eth0
         if namespace is not None:
-            profile_cmd0 = ['cat', HOST_DEVICE_PATH + '/' + platform + '/profile.ini']
-            profile_cmd1 = ['grep', str(namespace)+'switchMacAddress']
-            profile_cmd2 = ['cut', '-f2', '-d', '=']
-            (mac, err) = run_command_pipe(profile_cmd0, profile_cmd1, profile_cmd2)
-        else:
-            profile_cmd = ["false"]
-            (mac, err) = run_command(profile_cmd)
-        hw_mac_entry_outputs.append((mac, err))
-        (mac, err) = run_command(syseeprom_cmd)
-        hw_mac_entry_outputs.append((mac, err))
-        (mac, err) = run_command_pipe(iplink_cmd0, iplink_cmd1, iplink_cmd2)
-        hw_mac_entry_outputs.append((mac, err))
+            profile_file = HOST_DEVICE_PATH + '/' + platform + '/profile.ini'
+            hw_mac_entry_outputs.append(_read_profile_mac(profile_file, str(namespace) + 'switchMacAddress'))
+        hw_mac_entry_outputs.append(_read_syseeprom_mac())
+        hw_mac_entry_outputs.append(_read_interface_mac('eth0'))
     else:
-        mac_address_cmd = ["cat", "/sys/class/net/eth0/address"]
-        if namespace is not None:
-            mac_address_cmd = ['sudo', 'ip', 'netns', 'exec', str(namespace)] + mac_address_cmd
-        (mac, err) = run_command(mac_address_cmd)
-        hw_mac_entry_outputs.append((mac, err))
+        hw_mac_entry_outputs.append(_read_interface_mac('eth0', namespace))
 
     for (mac, err) in hw_mac_entry_outputs:
         if err:
@@ -1,6 +1,9 @@
+import copy
 import glob
 import os
 import subprocess
+import threading
+import time
 
 from natsort import natsorted
 from swsscommon import swsscommon
@@ -30,9 +33,95 @@ PORT_ROLE = 'role'
 CHASSIS_STATE_DB='CHASSIS_STATE_DB'
 CHASSIS_FABRIC_ASIC_INFO_TABLE='CHASSIS_FABRIC_ASIC_TABLE'
 
-# Dictionary to cache config_db connection handle per namespace
-# to prevent duplicate connections from being opened
-config_db_handle = {}
+CONFIG_DB_TABLE_NAME_SEPARATOR = '|'
+# Seconds a CONFIG_DB table is served from the table cache. Keyspace
+# notifications invalidate the cached tables, the TTL bounds the staleness
+# if a notification is delivered late. A write of another process is seen
+# only once its notification is received, callers which must read their
+# own writes or the writes just made by another process (e.g. CLI commands)
+# set it to 0 to always read CONFIG_DB.
+TABLE_CACHE_TTL = 5
+
+
+class ConfigDBPool(threading.local):
+    """
+    Config DB connection handles and table caches of a thread. The handles
+    are not thread safe, so each thread gets its own.
+    """
+
+    def __init__(self):
+        # Dictionary to cache config_db connection handle per namespace
+        # to prevent duplicate connections from being opened
+        self.config_db_handle = {}
+        # Dictionary of ConfigDBTableCache per namespace
+        self.config_db_table_cache = {}
+
+
+config_db_pool = ConfigDBPool()
+
+
+class ConfigDBTableCache(object):
+    """
+    Read-through cache of the CONFIG_DB tables of a namespace. Tables are
+    cached only if the keyspace notifications of CONFIG_DB can be received.
+    A table is dropped when a notification for one of its keys is received,
+    or TABLE_CACHE_TTL seconds after it was read. A write whose notification
+    is not received yet is missed, see TABLE_CACHE_TTL.
+    """
+
+    def __init__(self, config_db):
+        self.config_db = config_db
+        self.tables = {}
+        self.pubsub = None
+        try:
+            pubsub = config_db.get_redis_client(config_db.db_name).pubsub()
+            pubsub.psubscribe("__keyspace@{}__:*".format(config_db.get_dbid(config_db.db_name)))
+            self.pubsub = pubsub
+        except Exception:
+            pass
+
+    def is_enabled(self):
+        return self.pubsub is not None
+
+    def process_notifications(self):
+        while True:
+            msg = self.pubsub.get_message()
+            if not msg:
+                break
+            if msg.get('type') != 'pmessage':
+                continue
+            channel = msg['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode('utf-8', 'replace')
+            key = channel.split(':', 1)[-1]
+            self.invalidate(key.split(CONFIG_DB_TABLE_NAME_SEPARATOR, 1)[0])
+
+    def lookup(self, table):
+        """
+        Returns:
+            the cached table, which must not be modified, or None
+        """
+        if not self.is_enabled():
+            return None
+        self.process_notifications()
+        cached = self.tables.get(table)
+        if cached is None or time.monotonic() - cached[0] > TABLE_CACHE_TTL:
+            return None
+        return cached[1]
+
+    def update(self, table, data, timestamp):
+        """
+        Cache a table read after the timestamp (time.monotonic())
+        """
+        if self.is_enabled():
+            self.tables[table] = (timestamp, data)
+
+    def invalidate(self, table=None):
+        if table is None:
+            self.tables.clear()
+        else:
+            self.tables.pop(table, None)
+
 
 def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     """
@@ -51,6 +140,44 @@ def connect_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
     return config_db
 
 
+def get_config_db_for_ns(namespace=DEFAULT_NAMESPACE):
+    """
+    Returns the pooled handle to the config DB for a given namespace, the
+    handle is connected at first use and shared by all the callers of the
+    calling thread.
+
+    Returns:
+      handle to the config_db for a namespace
+    """
+    config_db = config_db_pool.config_db_handle.get(namespace)
+    if config_db is None:
+        config_db = swsscommon.ConfigDBPipeConnector(namespace=namespace)
+        config_db.connect()
+        config_db_pool.config_db_handle[namespace] = config_db
+    return config_db
+
+
+def get_table_cache_for_ns(namespace=DEFAULT_NAMESPACE):
+    """
+    Returns the ConfigDBTableCache of the pooled config DB handle for a
+    given namespace
+    """
+    cache = config_db_pool.config_db_table_cache.get(namespace)
+    if cache is None:
+        cache = ConfigDBTableCache(get_config_db_for_ns(namespace))
+        config_db_pool.config_db_table_cache[namespace] = cache
+    return cache
+
+
+def clear_config_db_cache():
+    """
+    Drops the cached CONFIG_DB tables of all the namespaces of the calling
+    thread
+    """
+    for cache in config_db_pool.config_db_table_cache.values():
+        cache.invalidate()
+
+
 def connect_to_all_dbs_for_ns(namespace=DEFAULT_NAMESPACE):
     """
     The function connects to the DBs for a given namespace and
@@ -218,11 +345,7 @@ def get_all_namespaces():
     if is_multi_asic():
         for asic in range(num_asics):
             namespace = "{}{}".format(ASIC_NAME_PREFIX, asic)
-            if namespace not in config_db_handle:
-                config_db_handle[namespace] =  connect_config_db_for_ns(namespace)
-            config_db = config_db_handle[namespace]
-
-            metadata = config_db.get_table('DEVICE_METADATA')
+            metadata = get_table_for_asic('DEVICE_METADATA', namespace)
             if metadata['localhost']['sub_role'] == FRONTEND_ASIC_SUB_ROLE:
                 front_ns.append(namespace)
             elif metadata['localhost']['sub_role'] == BACKEND_ASIC_SUB_ROLE:
@@ -293,6 +416,42 @@ def get_table(table, namespace=None):
     return merged_table
 
 
+def get_tables(tables, namespaces=None):
+    """
+    Retrieves merged tables containing all entries across specified namespaces.
+    Tables which are not cached are read together with pipelined requests to
+    the config DB of each namespace.
+
+    Returns:
+        a dict of table name to a dict of all entries of the table across namespaces
+    """
+    merged_tables = {table: {} for table in tables}
+    if namespaces is None:
+        ns_list = get_namespace_list()
+    elif isinstance(namespaces, str):
+        ns_list = get_namespace_list(namespaces)
+    else:
+        ns_list = namespaces
+
+    for ns in ns_list:
+        cache = get_table_cache_for_ns(ns)
+        missing = []
+        for table in tables:
+            data = cache.lookup(table)
+            if data is None:
+                missing.append(table)
+            else:
+                merged_tables[table].update(copy.deepcopy(data))
+
+        if len(missing) == 1:
+            merged_tables[missing[0]].update(get_table_for_asic(missing[0], ns))
+        elif missing:
+            for table, data in _read_tables_for_asic(cache, missing).items():
+                merged_tables[table].update(copy.deepcopy(data))
+
+    return merged_tables
+
+
 def get_port_entry_for_asic(port, namespace):
 
     return get_table_entry_for_asic(PORT_CFG_DB_TABLE, port, namespace)
@@ -300,8 +459,15 @@ def get_port_entry_for_asic(port, namespace):
 
 def get_table_entry_for_asic(table, entry, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
-    return config_db.get_entry(table, entry)
+    cache = get_table_cache_for_ns(namespace)
+    if not cache.is_enabled():
+        return cache.config_db.get_entry(table, entry)
+
+    data = cache.lookup(table)
+    if data is None:
+        data = _read_table_for_asic(cache, table)
+    config_db = cache.config_db
+    return copy.deepcopy(data.get(config_db.deserialize_key(config_db.serialize_key(entry)), {}))
 
 def get_port_table_for_asic(namespace):
 
@@ -310,8 +476,54 @@ def get_port_table_for_asic(namespace):
 
 def get_table_for_asic(table, namespace):
 
-    config_db = connect_config_db_for_ns(namespace)
-    return config_db.get_table(table)
+    cache = get_table_cache_for_ns(namespace)
+    data = cache.lookup(table)
+    if data is None:
+        data = _read_table_for_asic(cache, table)
+    return copy.deepcopy(data)
+
+
+def _read_table_for_asic(cache, table):
+
+    timestamp = time.monotonic()
+    data = cache.config_db.get_table(table)
+    cache.update(table, data, timestamp)
+    return data
+
+
+def _read_tables_for_asic(cache, tables):
+    """
+    Reads tables with two pipelined round trips: the keys of all the tables,
+    then the entries of all the keys. Tables are read one by one if the
+    redis client has no pipeline.
+    """
+    config_db = cache.config_db
+    try:
+        pipe = config_db.get_redis_client(config_db.db_name).pipeline()
+    except Exception:
+        return {table: _read_table_for_asic(cache, table) for table in tables}
+
+    separator = config_db.TABLE_NAME_SEPARATOR
+    timestamp = time.monotonic()
+    for table in tables:
+        pipe.keys('{}{}*'.format(table.upper(), separator))
+    table_keys = pipe.execute()
+    for keys in table_keys:
+        for key in keys:
+            pipe.hgetall(key)
+    entries = iter(pipe.execute())
+
+    result = {}
+    for table, keys in zip(tables, table_keys):
+        data = {}
+        for key in keys:
+            entry = config_db.raw_to_typed(next(entries))
+            if entry is not None:
+                row = key.split(separator, 1)[1]
+                data[config_db.deserialize_key(row)] = entry
+        cache.update(table, data, timestamp)
+        result[table] = data
+    return result
 
 
 def mod_entry(table, key, value, namespace=None, modIfExists=False):
@@ -325,8 +537,9 @@ def mod_entry(table, key, value, namespace=None, modIfExists=False):
 
     for ns in ns_list:
         if not modIfExists or get_table_entry_for_asic(table, key, ns):
-            config_db = connect_config_db_for_ns(ns)
-            config_db.mod_entry(table, key, value)
+            cache = get_table_cache_for_ns(ns)
+            cache.config_db.mod_entry(table, key, value)
+            cache.invalidate(table)
 
 
 def get_namespace_for_port(port_name):
@@ -391,7 +604,7 @@ def is_port_channel_internal(port_channel, namespace=None):
     ns_list = get_namespace_list(namespace)
 
     for ns in ns_list:
-        config_db = connect_config_db_for_ns(ns)
+        config_db = get_config_db_for_ns(ns)
         port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
 
         for port_channel_member in port_channel_members:
@@ -416,7 +629,7 @@ def get_back_end_interface_set(namespace=None):
     if len(bk_end_intf_list):
         ns_list = get_namespace_list(namespace)
         for ns in ns_list:
-            config_db = connect_config_db_for_ns(ns)
+            config_db = get_config_db_for_ns(ns)
             port_channel_members = config_db.get_keys(PORT_CHANNEL_MEMBER_CFG_DB_TABLE)
             # a back-end LAG must be configured with all of its member from back-end interfaces.
             # mixing back-end and front-end interfaces is miss configuration and not allowed.
@@ -438,7 +651,7 @@ def is_bgp_session_internal(bgp_neigh_ip, namespace=None):
 
     for ns in ns_list:
 
-        config_db = connect_config_db_for_ns(ns)
+        config_db = get_config_db_for_ns(ns)
         bgp_sessions = config_db.get_entry(
             BGP_INTERNAL_NEIGH_CFG_DB_TABLE, bgp_neigh_ip
         )
@@ -0,0 +1,111 @@
+"""
+Benchmark of the import and of the platform facts of device_info.
+
+Run from src/sonic-py-common:
+    python tests/benchmark_device_info.py [--rounds N] [--device]
+
+The import time is measured in a fresh interpreter. The calls are measured
+cold, after clear_facts_cache(), and warm, from the cache. Without --device
+the platform files are generated in a temporary directory, so the benchmark
+runs outside of a SONiC device.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+
+sys.path.insert(0, os.path.join(TEST_DIR, '..'))
+
+from sonic_py_common import device_info
+
+PLATFORM = 'x86_64-bench_platform-r0'
+HWSKU = 'Bench-HwSku'
+PORTS = 128
+
+
+def create_device(root):
+    platform_dir = os.path.join(root, 'device', PLATFORM)
+    os.makedirs(os.path.join(platform_dir, HWSKU))
+    with open(os.path.join(root, 'machine.conf'), 'w') as f:
+        f.write('onie_platform={}\nonie_machine=bench\nonie_arch=x86_64\n'.format(PLATFORM))
+    with open(os.path.join(platform_dir, 'asic.conf'), 'w') as f:
+        f.write('NUM_ASIC=1\nDEV_ID_ASIC_0=03:00.0\n')
+    with open(os.path.join(platform_dir, 'platform_env.conf'), 'w') as f:
+        f.write('SYNCD_SHM_SIZE=256m\nmacsec_enabled=1\n')
+    with open(os.path.join(platform_dir, 'platform.json'), 'w') as f:
+        json.dump({'interfaces': {'Ethernet{}'.format(i * 4): {
+            'index': ','.join([str(i + 1)] * 4),
+            'lanes': ','.join(str(i * 4 + lane) for lane in range(4)),
+            'breakout_modes': {'1x400G': ['etp{}'.format(i + 1)]}
+        } for i in range(PORTS)}}, f)
+    with open(os.path.join(root, 'sonic_version.yml'), 'w') as f:
+        f.write("build_version: 'bench'\nasic_type: 'vs'\ncommit_id: 'bench'\n")
+
+    device_info.MACHINE_CONF_PATH = os.path.join(root, 'machine.conf')
+    device_info.SONIC_VERSION_YAML_PATH = os.path.join(root, 'sonic_version.yml')
+    device_info.HOST_DEVICE_PATH = os.path.join(root, 'device')
+    device_info.CONTAINER_PLATFORM_PATH = os.path.join(root, 'none')
+    device_info.FACTS_SNAPSHOT_PATH = os.path.join(root, 'device_facts.json')
+    os.environ.pop('PLATFORM', None)
+
+
+def import_time(rounds):
+    def run(statement):
+        return min(timeit.repeat(lambda: subprocess.check_call([sys.executable, '-c', statement],
+                                                               cwd=os.path.join(TEST_DIR, '..')),
+                                 number=1, repeat=rounds))
+    return run('from sonic_py_common import device_info') - run('pass')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the platform facts of device_info")
+    parser.add_argument('--rounds', type=int, default=20, help="rounds of each measurement")
+    parser.add_argument('--device', action='store_true', help="read the platform files of this device")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if not args.device:
+        tmp_dir = tempfile.mkdtemp()
+        create_device(tmp_dir)
+    hwsku = device_info.get_hwsku() if args.device else HWSKU
+
+    calls = [
+        ('get_platform', device_info.get_platform),
+        ('get_machine_info', device_info.get_machine_info),
+        ('get_sonic_version_info', device_info.get_sonic_version_info),
+        ('get_num_npus', device_info.get_num_npus),
+        ('is_supervisor', device_info.is_supervisor),
+        ('is_macsec_supported', device_info.is_macsec_supported),
+        ('get_platform_json_data', device_info.get_platform_json_data),
+        ('get_path_to_port_config_file', lambda: device_info.get_path_to_port_config_file(hwsku=hwsku)),
+    ]
+
+    print("{:<30} {:>10.1f}".format("import (ms)", import_time(args.rounds) * 1000))
+    print("{:<30} {:>10} {:>10}".format("call", "cold (us)", "warm (us)"))
+    for name, call in calls:
+        def cold():
+            device_info.clear_facts_cache()
+            call()
+        elapsed_cold = min(timeit.repeat(cold, number=1, repeat=args.rounds))
+        call()
+        elapsed_warm = min(timeit.repeat(call, number=100, repeat=args.rounds)) / 100
+        print("{:<30} {:>10.1f} {:>10.1f}".format(name, elapsed_cold * 1e6, elapsed_warm * 1e6))
+
+    if tmp_dir is not None:
+        device_info.clear_facts_cache()
+        device_info.save_facts_snapshot(device_info.FACTS_SNAPSHOT_PATH)
+        device_info.clear_facts_cache()
+        elapsed = min(timeit.repeat(lambda: (device_info.clear_facts_cache(), device_info.get_platform()),
+                                    number=1, repeat=args.rounds))
+        print("{:<30} {:>10.1f}".format("get_platform from snapshot", elapsed * 1e6))
+        subprocess.call(['rm', '-rf', tmp_dir])
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,8 @@ else:
 
 import pytest
 import json
+import struct
+import zlib
 
 from sonic_py_common import device_info
 
@@ -352,6 +354,119 @@ class TestDeviceInfo(object):
         mock_get_platform_json_data.return_value = {"DPUS": {"dpu0": {}, "dpu1": {}}}
         assert device_info.get_dpu_list() == ["dpu0", "dpu1"]
 
+    def test_parsed_file_cache(self, tmp_path):
+        device_info.clear_facts_cache()
+        conf_file = tmp_path / "asic.conf"
+        conf_file.write_text("NUM_ASIC=3\nDEV_ID_ASIC_0=03:00.0\n")
+        with mock.patch("sonic_py_common.device_info.get_asic_conf_file_path", return_value=str(conf_file)):
+            assert device_info.get_num_npus() == 3
+            # the parsed file is reused while it doesn't change
+            with mock.patch("{}.open".format(BUILTINS)) as open_mocked:
+                assert device_info.get_num_npus() == 3
+                open_mocked.assert_not_called()
+
+            conf_file.write_text("NUM_ASIC=6\n")
+            os.utime(str(conf_file), ns=(0, 0))
+            assert device_info.get_num_npus() == 6
+
+            device_info.clear_facts_cache()
+            with mock.patch("{}.open".format(BUILTINS), mock.mock_open(read_data="NUM_ASIC=4\n")):
+                assert device_info.get_num_npus() == 4
+
+    @mock.patch("sonic_py_common.device_info.get_localhost_info")
+    def test_hwsku_not_cached(self, mock_get_localhost_info):
+        # DEVICE_METADATA may change, the hwsku is read from ConfigDB at each call
+        mock_get_localhost_info.return_value = "ACS-MSN2700"
+        assert device_info.get_hwsku() == "ACS-MSN2700"
+        mock_get_localhost_info.return_value = "Mellanox-SN2700"
+        assert device_info.get_hwsku() == "Mellanox-SN2700"
+
+    @mock.patch("sonic_py_common.device_info.get_path_to_platform_dir")
+    @mock.patch("sonic_py_common.device_info.get_platform")
+    def test_platform_json_data_copy(self, mock_get_platform, mock_get_path_to_platform_dir, tmp_path):
+        mock_get_platform.return_value = "x86_64-mlnx_msn2700-r0"
+        mock_get_path_to_platform_dir.return_value = str(tmp_path)
+        (tmp_path / "platform.json").write_text(json.dumps({"chassis": {"name": "MSN2700"}}))
+        device_info.clear_facts_cache()
+
+        device_info.get_platform_json_data()["chassis"]["name"] = "modified"
+        assert device_info.get_platform_json_data() == {"chassis": {"name": "MSN2700"}}
+        device_info.clear_facts_cache()
+
+    def test_facts_snapshot(self, tmp_path):
+        machine_conf = tmp_path / "machine.conf"
+        machine_conf.write_text(MACHINE_CONF_CONTENTS)
+        snapshot = tmp_path / "run" / "device_facts.json"
+        with mock.patch("sonic_py_common.device_info.MACHINE_CONF_PATH", str(machine_conf)), \
+                mock.patch("sonic_py_common.device_info.FACTS_SNAPSHOT_PATH", str(snapshot)), \
+                mock.patch("sonic_py_common.device_info.get_asic_conf_file_path", return_value=None), \
+                mock.patch("sonic_py_common.device_info.get_platform_env_conf_file_path", return_value=None):
+            with mock.patch("sonic_py_common.device_info.get_sonic_version_info", return_value={}):
+                device_info.save_facts_snapshot(str(snapshot))
+            with open(str(snapshot)) as f:
+                assert str(machine_conf) in json.load(f)["files"]
+
+            # a new process uses the snapshot instead of parsing the file
+            device_info.clear_facts_cache()
+            with mock.patch("sonic_py_common.device_info.open", create=True) as open_mocked:
+                open_mocked.side_effect = open
+                assert device_info.get_machine_info() == EXPECTED_GET_MACHINE_INFO_RESULT
+                assert [c[0][0] for c in open_mocked.call_args_list] == [str(snapshot)]
+
+            # the snapshot is ignored once the file changes
+            machine_conf.write_text("onie_platform=x86_64-kvm_x86_64-r0\n")
+            os.utime(str(machine_conf), ns=(0, 0))
+            assert device_info.get_machine_info() == {"onie_platform": "x86_64-kvm_x86_64-r0"}
+        device_info.clear_facts_cache()
+
+    def test_parse_onie_tlv_base_mac(self):
+        tlvs = bytearray([0x21, 0x04]) + b"SKU1" + bytearray([0x24, 0x06, 0x00, 0x1c, 0x73, 0x01, 0x02, 0x03])
+        eeprom = bytearray(b"TlvInfo\x00\x01") + struct.pack(">H", len(tlvs) + 6) + tlvs + bytearray([0xfe, 0x04])
+        eeprom += struct.pack(">I", zlib.crc32(bytes(eeprom)) & 0xffffffff)
+        assert device_info._parse_onie_tlv_base_mac(bytes(eeprom) + b"\xff" * 16) == "00:1c:73:01:02:03"
+
+        corrupted = bytearray(eeprom)
+        corrupted[-1] ^= 0xff
+        assert device_info._parse_onie_tlv_base_mac(bytes(corrupted)) is None
+        assert device_info._parse_onie_tlv_base_mac(bytes(eeprom[:-3])) is None
+        assert device_info._parse_onie_tlv_base_mac(b"\xff" * 64) is None
+
+    @mock.patch("os.geteuid", return_value=0)
+    @mock.patch("sonic_py_common.device_info.run_command")
+    @mock.patch("sonic_py_common.device_info.get_sonic_version_info", return_value={"asic_type": "broadcom"})
+    @mock.patch("sonic_py_common.device_info.get_platform", return_value="x86_64-dell_s6000_s1220-r0")
+    def test_get_system_mac(self, mock_platform, mock_version, mock_run_command, mock_geteuid, tmp_path):
+        with mock.patch("sonic_py_common.device_info.SYSTEM_MAC_CACHE_DIR", str(tmp_path / "system_mac")), \
+                mock.patch("sonic_py_common.device_info._get_link_address", return_value="00:1c:73:00:00:01"), \
+                mock.patch("sonic_py_common.device_info.open", mock.mock_open(read_data="00:1c:73:00:00:00\n"),
+                           create=True) as mock_sysfs:
+            assert device_info.get_system_mac() == "00:1c:73:00:00:00"
+            mock_sysfs.assert_called_once_with("/sys/class/net/eth0/address")
+            assert device_info.get_system_mac(namespace="asic0") == "00:1c:73:00:00:01"
+            device_info._get_link_address.assert_called_once_with("eth0", "asic0")
+        mock_run_command.assert_not_called()
+
+        # the addresses are read from the cache of the namespace afterwards
+        with mock.patch("sonic_py_common.device_info.SYSTEM_MAC_CACHE_DIR", str(tmp_path / "system_mac")), \
+                mock.patch("sonic_py_common.device_info._get_system_mac") as mock_get_system_mac:
+            assert device_info.get_system_mac() == "00:1c:73:00:00:00"
+            assert device_info.get_system_mac(namespace="asic0") == "00:1c:73:00:00:01"
+            mock_get_system_mac.assert_not_called()
+
+    @mock.patch("sonic_py_common.device_info.run_command")
+    def test_read_syseeprom_mac(self, mock_run_command, tmp_path):
+        cache = tmp_path / "syseeprom_cache"
+        mock_run_command.return_value = ("00:1c:73:00:00:02\n", "")
+        with mock.patch("sonic_py_common.device_info.SYSEEPROM_CACHE_PATH", str(cache)):
+            assert device_info._read_syseeprom_mac() == ("00:1c:73:00:00:02\n", "")
+            mock_run_command.assert_called_once_with(["sudo", "decode-syseeprom", "-m"])
+
+            mock_run_command.reset_mock()
+            cache.write_bytes(b"TlvInfo")
+            with mock.patch("sonic_py_common.device_info._parse_onie_tlv_base_mac", return_value="00:1c:73:00:00:03"):
+                assert device_info._read_syseeprom_mac() == ("00:1c:73:00:00:03", None)
+            mock_run_command.assert_not_called()
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
@@ -1,3 +1,6 @@
+import fnmatch
+
+
 class SonicV2Connector:
     TEST_SERIAL = "MT1822K07815"
     TEST_MODEL = "MSN2700-CS2FO"
@@ -14,3 +17,103 @@ class SonicV2Connector:
 
     def get(self, db, table, field):
         return self.data.get(field, "N/A")
+
+
+class PubSub:
+    def __init__(self):
+        self.messages = []
+
+    def psubscribe(self, pattern):
+        self.pattern = pattern
+
+    def get_message(self):
+        if self.messages:
+            return self.messages.pop(0)
+        return None
+
+
+class Pipeline:
+    def __init__(self, config_db):
+        self.config_db = config_db
+        self.commands = []
+
+    def keys(self, pattern):
+        self.commands.append(lambda: [key for key in self.config_db.raw_keys() if fnmatch.fnmatchcase(key, pattern)])
+
+    def hgetall(self, key):
+        self.commands.append(lambda: self.config_db.raw_entry(key))
+
+    def execute(self):
+        self.config_db.round_trips += 1
+        commands, self.commands = self.commands, []
+        return [command() for command in commands]
+
+
+class RedisClient:
+    def __init__(self, config_db):
+        self.config_db = config_db
+
+    def pubsub(self):
+        return self.config_db.notifications
+
+    def pipeline(self):
+        return Pipeline(self.config_db)
+
+
+class ConfigDBConnector:
+    db_name = 'CONFIG_DB'
+    TABLE_NAME_SEPARATOR = '|'
+
+    def __init__(self, namespace=''):
+        self.namespace = namespace
+        self.data = {}
+        self.reads = 0
+        self.round_trips = 0
+        self.notifications = PubSub()
+
+    def connect(self):
+        pass
+
+    def get_dbid(self, db_name):
+        return 4
+
+    def get_redis_client(self, db_name):
+        return RedisClient(self)
+
+    def raw_keys(self):
+        return ['{}|{}'.format(table, self.serialize_key(key)) for table, data in self.data.items() for key in data]
+
+    def raw_entry(self, raw_key):
+        table, key = raw_key.split('|', 1)
+        return dict(self.data.get(table, {}).get(self.deserialize_key(key), {}))
+
+    def raw_to_typed(self, raw_data):
+        return dict(raw_data) if raw_data is not None else None
+
+    def serialize_key(self, key):
+        return '|'.join(key) if isinstance(key, tuple) else key
+
+    def deserialize_key(self, key):
+        return tuple(key.split('|')) if '|' in key else key
+
+    def get_table(self, table):
+        self.reads += 1
+        return {key: dict(entry) for key, entry in self.data.get(table, {}).items()}
+
+    def get_entry(self, table, key):
+        self.reads += 1
+        return dict(self.data.get(table, {}).get(key, {}))
+
+    def get_config(self):
+        self.reads += 1
+        return {table: {key: dict(entry) for key, entry in data.items()} for table, data in self.data.items()}
+
+    def mod_entry(self, table, key, value):
+        self.data.setdefault(table, {}).setdefault(key, {}).update(value)
+        self.notify(table, key)
+
+    def notify(self, table, key):
+        self.notifications.messages.append({
+            'type': 'pmessage',
+            'channel': '__keyspace@4__:{}|{}'.format(table, self.serialize_key(key))
+        })
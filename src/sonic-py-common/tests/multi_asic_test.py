@@ -1,6 +1,118 @@
+import sys
+import threading
+
+# TODO: Remove this if/else block once we no longer support Python 2
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    # Expect the 'mock' package for python 2
+    # https://pypi.python.org/pypi/mock
+    import mock
+
+import pytest
+
 from sonic_py_common import multi_asic
 
+from .mock_swsscommon import ConfigDBConnector
+
+PORT_TABLES = {
+    'asic0': {
+        'Ethernet0': {'alias': 'Eth1', 'role': 'Ext'},
+        'Ethernet-BP0': {'alias': 'Eth4-ASIC0', 'role': 'Int'}
+    },
+    'asic1': {
+        'Ethernet4': {'alias': 'Eth2', 'role': 'Ext'},
+        'Ethernet-BP4': {'alias': 'Eth4-ASIC1', 'role': 'Int'}
+    }
+}
+
+
+@pytest.fixture
+def config_dbs():
+    config_dbs = {}
+
+    def connector(namespace):
+        config_db = ConfigDBConnector(namespace)
+        config_db.data = {
+            'PORT': PORT_TABLES[namespace],
+            'DEVICE_METADATA': {'localhost': {'sub_role': 'FrontEnd'}}
+        }
+        config_dbs[namespace] = config_db
+        return config_db
+
+    with mock.patch.object(multi_asic, 'config_db_pool', multi_asic.ConfigDBPool()), \
+            mock.patch.object(multi_asic.swsscommon, 'ConfigDBPipeConnector', side_effect=connector, create=True), \
+            mock.patch.object(multi_asic, 'get_namespace_list', return_value=['asic0', 'asic1']):
+        yield config_dbs
+
 
 class TestMultiAsic:
     def test_get_container_name_from_asic_id(self):
         assert multi_asic.get_container_name_from_asic_id('database', 0) == 'database0'
+
+    def test_connection_pool(self, config_dbs):
+        assert multi_asic.get_config_db_for_ns('asic0') is multi_asic.get_config_db_for_ns('asic0')
+        assert multi_asic.get_config_db_for_ns('asic1') is not multi_asic.get_config_db_for_ns('asic0')
+        assert len(config_dbs) == 2
+
+        # each thread gets its own handles
+        config_db = multi_asic.get_config_db_for_ns('asic0')
+        handles = []
+        thread = threading.Thread(target=lambda: handles.append(multi_asic.get_config_db_for_ns('asic0')))
+        thread.start()
+        thread.join()
+        assert handles[0] is not config_db
+        assert multi_asic.get_config_db_for_ns('asic0') is config_db
+
+    def test_table_cache(self, config_dbs):
+        ports = multi_asic.get_port_table()
+        assert ports == dict(PORT_TABLES['asic0'], **PORT_TABLES['asic1'])
+        assert multi_asic.get_namespace_for_port('Ethernet4') == 'asic1'
+        assert multi_asic.is_port_internal('Ethernet-BP0')
+        assert not multi_asic.is_port_internal('Ethernet4')
+        assert config_dbs['asic0'].reads == 1
+        assert config_dbs['asic1'].reads == 1
+
+        # returned tables are copies of the cached tables
+        ports['Ethernet0']['role'] = 'Int'
+        assert not multi_asic.is_port_internal('Ethernet0')
+
+        # keyspace notification invalidates the table
+        config_dbs['asic0'].data['PORT']['Ethernet0']['role'] = 'Int'
+        assert not multi_asic.is_port_internal('Ethernet0')
+        config_dbs['asic0'].notify('PORT', 'Ethernet0')
+        assert multi_asic.is_port_internal('Ethernet0')
+        assert config_dbs['asic0'].reads == 2
+
+        # the table expires after TTL
+        with mock.patch.object(multi_asic.time, 'monotonic', return_value=multi_asic.time.monotonic() + multi_asic.TABLE_CACHE_TTL + 1):
+            multi_asic.get_port_table('asic1')
+        assert config_dbs['asic1'].reads == 2
+
+        multi_asic.mod_entry('PORT', 'Ethernet4', {'mtu': '9100'}, 'asic1')
+        assert multi_asic.get_port_entry('Ethernet4', 'asic1')['mtu'] == '9100'
+
+    def test_table_cache_without_notifications(self, config_dbs):
+        with mock.patch.object(ConfigDBConnector, 'get_redis_client', side_effect=Exception('no pubsub')):
+            multi_asic.get_port_table()
+            multi_asic.get_port_table()
+            assert multi_asic.get_port_entry('Ethernet0', None) == PORT_TABLES['asic0']['Ethernet0']
+        assert config_dbs['asic0'].reads == 3
+
+    def test_get_tables(self, config_dbs):
+        tables = multi_asic.get_tables(['PORT', 'DEVICE_METADATA', 'VLAN'])
+        assert tables == {
+            'PORT': dict(PORT_TABLES['asic0'], **PORT_TABLES['asic1']),
+            'DEVICE_METADATA': {'localhost': {'sub_role': 'FrontEnd'}},
+            'VLAN': {}
+        }
+        # keys and entries of the requested tables are read with one pipelined request each
+        assert config_dbs['asic0'].reads == 0
+        assert config_dbs['asic0'].round_trips == 2
+        assert multi_asic.get_tables(['PORT', 'VLAN'], ['asic0']) == {
+            'PORT': PORT_TABLES['asic0'],
+            'VLAN': {}
+        }
+        assert multi_asic.get_table('DEVICE_METADATA') == {'localhost': {'sub_role': 'FrontEnd'}}
+        assert config_dbs['asic0'].reads == 0
+        assert config_dbs['asic0'].round_trips == 2
@@ -14,6 +14,9 @@ class SonicYang(SonicYangExtMixin):
 
     def __init__(self, yang_dir, debug=False, print_log_enabled=True, sonic_yang_options=0):
         self.yang_dir = yang_dir
+        self._ctx = None
+        # yang model files which are not loaded in libyang context yet, see ctx
+        self._pendingYangFiles = list()
         self.ctx = None
         self.module = None
         self.root = None
@@ -44,6 +47,9 @@ class SonicYang(SonicYangExtMixin):
         # below dict will store preProcessed yang objects, which may be needed by
         # all yang modules, such as grouping.
         self.preProcessedYang = dict()
+        # leafDict and converters of leaf values for each yang list/container
+        # and config DB table, see _getLeafTables.
+        self._leafCache = dict()
         # element path for CONFIG DB. An example for this list could be:
         # ['PORT', 'Ethernet0', 'speed']
         self.elementPath = []
@@ -57,6 +63,37 @@ class SonicYang(SonicYangExtMixin):
     def __del__(self):
         pass
 
+    """
+    libyang context. When yang models are restored from snapshot, libyang
+    modules are loaded at first use of context, i.e. before loading or
+    validating data.
+    """
+    @property
+    def ctx(self):
+        if self._pendingYangFiles:
+            self._loadPendingYangModules()
+        return self._ctx
+
+    @ctx.setter
+    def ctx(self, ctx):
+        self._ctx = ctx
+
+    def _loadPendingYangModules(self):
+        yangFiles = self._pendingYangFiles
+        self._pendingYangFiles = list()
+        try:
+            for file in yangFiles:
+                m = self._load_schema_module(file)
+                if m is None:
+                    raise(Exception("Could not load module {}".format(file)))
+                self.sysLog(syslog.LOG_DEBUG, "module: {} is loaded successfully".format(m.name()))
+        except Exception as e:
+            self.sysLog(msg="Yang Models Load failed:{}".format(str(e)), \
+                debug=syslog.LOG_ERR, doPrint=True)
+            raise SonicYangException("Yang Models Load failed\n{}".format(str(e)))
+
+        return
+
     def sysLog(self, debug=syslog.LOG_INFO, msg=None, doPrint=False):
         # log debug only if enabled
         if self.DEBUG == False and debug == syslog.LOG_DEBUG:
@@ -3,11 +3,28 @@
 
 from __future__ import print_function
 import yang as ly
+import hashlib
+import multiprocessing
+import os
+import pickle
+import sys
 import syslog
+import tempfile
+import xmltodict
 from json import dump, dumps, loads
 from xmltodict import parse
 from glob import glob
 
+# Directory of snapshots of the parsed yang models, see loadYangModel.
+# Set the environment variable to an empty value to disable snapshots.
+YANG_SNAPSHOT_DIR = '/var/cache/sonic/yang'
+YANG_SNAPSHOT_DIR_ENV = 'SONIC_YANG_SNAPSHOT_DIR'
+# Bump it when the format of the parsed yang models changes
+YANG_SNAPSHOT_VERSION = 1
+# Config DB tables with at least these many keys are xlated in parallel
+# processes, if processes are requested in loadData.
+XLATE_PARALLEL_MIN_ENTRIES = 1000
+
 Type_1_list_maps_model = [
     'DSCP_TO_TC_MAP_LIST',
     'DOT1P_TO_TC_MAP_LIST',
@@ -35,6 +52,27 @@ LEAF_LIST_WITH_STRING_VALUE_DICT = {
     ('PORT', 'adv_interface_types'): ',',
 }
 
+"""
+Converters of leaf values between config DB and yang JSON, see _getLeafTables.
+"""
+def _yangUintValue(value):
+    return int(str(value), 10)
+
+def _revYangBoolValue(value):
+    return 'true' if value else 'false'
+
+"""
+(SonicYang, config DB json) xlated by the processes of parallel xlation. It
+is inherited by forked processes, see _xlateConfigDBtoYangInProcesses.
+"""
+_xlateContext = None
+
+def _xlateTableInProcess(table):
+    sy, jIn = _xlateContext
+    yangJ = dict()
+    sy._xlateTable(jIn, yangJ, table)
+    return yangJ
+
 """
 This is the Exception thrown out of all public function of this class.
 """
@@ -46,13 +84,25 @@ class SonicYangExtMixin:
 
     """
     load all YANG models, create JSON of yang models. (Public function)
+    The JSON of yang models and the maps created from it are restored from
+    a snapshot if the yang models are not changed since the snapshot was
+    stored. In that case libyang modules are loaded at first use of ctx.
     """
     def loadYangModel(self):
 
         try:
+            self._leafCache = dict()
             # get all files
-            self.yangFiles = glob(self.yang_dir +"/*.yang")
+            yangFiles = sorted(glob(self.yang_dir +"/*.yang"))
+            snapshotFile, snapshotKey = self._getYangSnapshot(yangFiles)
+            if self._loadYangSnapshot(snapshotFile, snapshotKey):
+                self._pendingYangFiles = yangFiles
+                self.sysLog(syslog.LOG_DEBUG, 'Restored Yang Models from {}'.\
+                    format(snapshotFile))
+                return True
+
             # load yang modules
+            self.yangFiles = yangFiles
             for file in self.yangFiles:
                 m = self._load_schema_module(file)
                 if m is not None:
@@ -70,6 +120,7 @@ class SonicYangExtMixin:
             self._loadJsonYangModel()
             # create a map from config DB table to yang container
             self._createDBTableToModuleMap()
+            self._storeYangSnapshot(snapshotFile, snapshotKey)
         except Exception as e:
             self.sysLog(msg="Yang Models Load failed:{}".format(str(e)), \
                 debug=syslog.LOG_ERR, doPrint=True)
@@ -77,6 +128,93 @@ class SonicYangExtMixin:
 
         return True
 
+    """
+    Get snapshot file of the yang directory and the key of the yang models.
+    The key is a hash of the yang files, and it is stored in the snapshot.
+    Returns (None, None) if snapshots are disabled.
+    """
+    def _getYangSnapshot(self, yangFiles):
+
+        snapshotDir = os.environ.get(YANG_SNAPSHOT_DIR_ENV, YANG_SNAPSHOT_DIR)
+        if not snapshotDir:
+            return None, None
+        try:
+            if not os.path.isdir(snapshotDir):
+                os.makedirs(snapshotDir, 0o700)
+            st = os.stat(snapshotDir)
+            # snapshot is unpickled, only trust a directory nobody else can write to
+            if st.st_uid != os.geteuid() or st.st_mode & 0o022:
+                return None, None
+
+            h = hashlib.sha256()
+            # JSON of yang models depends on libyang and xmltodict as well
+            lySt = os.stat(ly.__file__)
+            h.update(repr((YANG_SNAPSHOT_VERSION, sys.version, lySt.st_mtime, \
+                lySt.st_size, xmltodict.__version__)).encode())
+            for file in yangFiles:
+                with open(file, 'rb') as f:
+                    h.update(os.path.basename(file).encode() + b'\0')
+                    h.update(f.read())
+        except Exception as e:
+            self.sysLog(msg="Yang snapshot is not used:{}".format(str(e)), \
+                debug=syslog.LOG_WARNING)
+            return None, None
+
+        snapshotFile = os.path.join(snapshotDir, hashlib.sha1(\
+            os.path.realpath(self.yang_dir).encode()).hexdigest() + '.pickle')
+        return snapshotFile, h.hexdigest()
+
+    """
+    Restore JSON of yang models and the maps from snapshot.
+    Returns False if snapshot does not exist or it is stale.
+    """
+    def _loadYangSnapshot(self, snapshotFile, snapshotKey):
+
+        if snapshotFile is None:
+            return False
+        try:
+            with open(snapshotFile, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot['key'] != snapshotKey:
+                return False
+            self.yangFiles = snapshot['yangFiles']
+            self.yJson = snapshot['yJson']
+            self.confDbYangMap = snapshot['confDbYangMap']
+            self.preProcessedYang = snapshot['preProcessedYang']
+        except Exception:
+            return False
+
+        return True
+
+    """
+    Store JSON of yang models and the maps in snapshot.
+    """
+    def _storeYangSnapshot(self, snapshotFile, snapshotKey):
+
+        if snapshotFile is None:
+            return
+        snapshot = {
+            'key': snapshotKey,
+            'yangFiles': self.yangFiles,
+            'yJson': self.yJson,
+            'confDbYangMap': self.confDbYangMap,
+            'preProcessedYang': self.preProcessedYang
+        }
+        tmpFile = None
+        try:
+            fd, tmpFile = tempfile.mkstemp(dir=os.path.dirname(snapshotFile), \
+                suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmpFile, snapshotFile)
+        except Exception as e:
+            self.sysLog(msg="Failed to store yang snapshot:{}".format(str(e)), \
+                debug=syslog.LOG_WARNING)
+            if tmpFile is not None and os.path.exists(tmpFile):
+                os.remove(tmpFile)
+
+        return
+
     """
     load JSON schema format from yang models
     """
@@ -400,6 +538,96 @@ class SonicYangExtMixin:
 
         return leafDict
 
+    def _getLeafTables(self, model, table):
+        '''
+            Get leafDict and converters of leaf values for a yang list or
+            container of config DB table. These are created once and reused
+            by all translations. Models are kept in self.confDbYangMap, so
+            id of a model is unique till yang models are loaded again.
+
+            Parameters:
+                model (dict): json format of yang list or container.
+                table (str): config DB table, this table is being translated.
+
+            Returns:
+                 leafTables (dict): 'leafDict' from _createLeafDict, 'xlate'
+                    and 'revXlate' dicts of leaf name -> converter of value.
+        '''
+        leafTables = self._leafCache.get((id(model), table))
+        if leafTables is None or leafTables['model'] is not model:
+            leafDict = self._createLeafDict(model, table)
+            leafTables = {
+                'model': model,
+                'leafDict': leafDict,
+                'xlate': {key: self._createYangConverter(key, leaf, table) \
+                    for key, leaf in leafDict.items()},
+                'revXlate': {key: self._createRevYangConverter(key, leaf, table) \
+                    for key, leaf in leafDict.items()}
+            }
+            self._leafCache[(id(model), table)] = leafTables
+
+        return leafTables
+
+    def _createYangConverter(self, key, leaf, table):
+        '''
+            Create converter of config DB value to Yang value based on type
+            of the leaf in Yang model.
+
+            Parameters:
+                key (str): name of the leaf.
+                leaf (dict): json format of the leaf, from leafDict.
+                table (str): config DB table of the leaf.
+
+            Returns:
+                 converter (callable): converts a config DB value.
+        '''
+        # TODO: find type of leafref from schema node
+        # TODO: find type in sonic-head, as of now, all are enumeration
+        leafType = leaf.get('type', dict()).get('@name', '')
+        convert = _yangUintValue if 'uint' in leafType else str
+        if not leaf['__isleafList']:
+            return convert
+
+        # For field defined as leaf-list but has string value in CONFIG DB, need do special handling here. For exampe:
+        # port.adv_speeds in CONFIG DB has value "100,1000,10000", it shall be transferred to [100,1000,10000] as YANG value here to
+        # make it align with its YANG definition.
+        separator = LEAF_LIST_WITH_STRING_VALUE_DICT.get((table, key))
+        def _convertLeafList(value):
+            if separator is not None and isinstance(value, str):
+                value = (x.strip() for x in value.split(separator))
+            return [convert(v) for v in value]
+
+        return _convertLeafList
+
+    def _createRevYangConverter(self, key, leaf, table):
+        '''
+            Create converter of Yang value to config DB value based on type
+            of the leaf in Yang model.
+
+            Parameters:
+                key (str): name of the leaf.
+                leaf (dict): json format of the leaf, from leafDict.
+                table (str): config DB table of the leaf.
+
+            Returns:
+                 converter (callable): converts a Yang value.
+        '''
+        if leaf['__isleafList']:
+            # For field defined as leaf-list but has string value in CONFIG DB, we need do special handling here:
+            # e.g. port.adv_speeds is [10,100,1000] in YANG, need to convert it into a string for CONFIG DB: "10,100,1000"
+            separator = LEAF_LIST_WITH_STRING_VALUE_DICT.get((table, key))
+            def _revConvertLeafList(value):
+                if separator is not None and isinstance(value, list):
+                    return separator.join(str(x) for x in value)
+                return [str(v) for v in value]
+            return _revConvertLeafList
+
+        if leaf.get('type', dict()).get('@name') == 'boolean':
+            return _revYangBoolValue
+
+        # config DB has only strings
+        return str
+
     """
     Convert a string from Config DB value to Yang Value based on type of the
     key in Yang model.
@@ -407,39 +635,8 @@ class SonicYangExtMixin:
     """
     def _findYangTypedValue(self, key, value, leafDict):
 
-        # convert config DB string to yang Type
-        def _yangConvert(val):
-            # Convert everything to string
-            val = str(val)
-            # find type of this key from yang leaf
-            type = leafDict[key]['type']['@name']
-
-            if 'uint' in type:
-                vValue = int(val, 10)
-            # TODO: find type of leafref from schema node
-            elif 'leafref' in type:
-                vValue = val
-            #TODO: find type in sonic-head, as of now, all are enumeration
-            elif 'stypes:' in type:
-                vValue = val
-            else:
-                vValue = val
-            return vValue
-
-        # if it is a leaf-list do it for each element
-        if leafDict[key]['__isleafList']:
-            vValue = list()
-            if isinstance(value, str) and (self.elementPath[0], self.elementPath[-1]) in LEAF_LIST_WITH_STRING_VALUE_DICT:
-                # For field defined as leaf-list but has string value in CONFIG DB, need do special handling here. For exampe:
-                # port.adv_speeds in CONFIG DB has value "100,1000,10000", it shall be transferred to [100,1000,10000] as YANG value here to
-                # make it align with its YANG definition.
-                value = (x.strip() for x in value.split(LEAF_LIST_WITH_STRING_VALUE_DICT[(self.elementPath[0], self.elementPath[-1])]))
-            for v in value:
-                vValue.append(_yangConvert(v))
-        else:
-            vValue = _yangConvert(value)
-
-        return vValue
+        convert = self._createYangConverter(key, leafDict[key], self.elementPath[0])
+        return convert(value)
 
     """
     Xlate a Type 1 map list
@@ -502,7 +699,7 @@ class SonicYangExtMixin:
         inner_clist = model.get('list')
         if inner_clist:
             inner_listKey = inner_clist['key']['@value']
-            inner_leafDict = self._createLeafDict(inner_clist, table)
+            inner_leafDict = self._getLeafTables(inner_clist, table)['leafDict']
             for lkey in inner_leafDict:
                 if inner_listKey != lkey:
                     inner_listVal = lkey
@@ -591,7 +788,7 @@ class SonicYangExtMixin:
         #This is done to improve performance of mapping from values of TABLEs in
         #config DB to leaf in YANG LIST.
 
-        leafDict = self._createLeafDict(model, table)
+        converters = self._getLeafTables(model, table)['xlate']
         # get keys from YANG model list itself
         listKeys = model['key']['@value']
         self.sysLog(msg="xlateList keyList:{}".format(listKeys))
@@ -622,8 +819,7 @@ class SonicYangExtMixin:
                     self.elementPath.append(vKey)
                     self.sysLog(syslog.LOG_DEBUG, "xlateList vkey {}".format(vKey))
                     try:
-                        keyDict[vKey] = self._findYangTypedValue(vKey, \
-                                            config[pkey][vKey], leafDict)
+                        keyDict[vKey] = converters[vKey](config[pkey][vKey])
                     finally:
                         self.elementPath.pop()
                 yang.append(keyDict)
@@ -722,14 +918,16 @@ class SonicYangExtMixin:
                 self._xlateContainerInContainer(modelContainer, yang, configC, table)
 
         ## Handle other leaves in container,
-        leafDict = self._createLeafDict(model, table)
+        leafTables = self._getLeafTables(model, table)
+        leafDict = leafTables['leafDict']
+        converters = leafTables['xlate']
         vKeys = list(configC.keys())
         for vKey in vKeys:
             #vkey must be a leaf\leaf-list\choice in container
             if leafDict.get(vKey):
                 self.elementPath.append(vKey)
                 self.sysLog(syslog.LOG_DEBUG, "xlateContainer vkey {}".format(vKey))
-                yang[vKey] = self._findYangTypedValue(vKey, configC[vKey], leafDict)
+                yang[vKey] = converters[vKey](configC[vKey])
                 self.elementPath.pop()
                 # delete entry from copy of config
                 del configC[vKey]
@@ -748,34 +946,74 @@ class SonicYangExtMixin:
     """
     xlate ConfigDB json to Yang json
     """
-    def _xlateConfigDBtoYang(self, jIn, yangJ):
+    def _xlateConfigDBtoYang(self, jIn, yangJ, processes=1):
+
+        if processes > 1:
+            pTables = set(table for table in jIn.keys() \
+                if len(jIn[table]) >= XLATE_PARALLEL_MIN_ENTRIES)
+            if len(pTables):
+                self._xlateConfigDBtoYangInProcesses(jIn, yangJ, processes, pTables)
+                return
 
-        # find top level container for each table, and run the xlate_container.
         for table in jIn.keys():
-            cmap = self.confDbYangMap[table]
-            # create top level containers
-            key = cmap['module']+":"+cmap['topLevelContainer']
-            subkey = cmap['topLevelContainer']+":"+cmap['container']['@name']
-            # Add new top level container for first table in this container
-            yangJ[key] = dict() if yangJ.get(key) is None else yangJ[key]
-            yangJ[key][subkey] = dict()
-            self.sysLog(msg="xlateConfigDBtoYang {}:{}".format(key, subkey))
-            self.elementPath.append(table)
-            self._xlateContainer(cmap['container'], yangJ[key][subkey], \
-                                jIn[table], table)
-            self.elementPath = []
+            self._xlateTable(jIn, yangJ, table)
+
+        return
+
+    """
+    Xlate a table of config DB in yang JSON
+    """
+    def _xlateTable(self, jIn, yangJ, table):
+
+        # find top level container for table, and run the xlate_container.
+        cmap = self.confDbYangMap[table]
+        # create top level containers
+        key = cmap['module']+":"+cmap['topLevelContainer']
+        subkey = cmap['topLevelContainer']+":"+cmap['container']['@name']
+        # Add new top level container for first table in this container
+        yangJ[key] = dict() if yangJ.get(key) is None else yangJ[key]
+        yangJ[key][subkey] = dict()
+        self.sysLog(msg="xlateConfigDBtoYang {}:{}".format(key, subkey))
+        self.elementPath.append(table)
+        self._xlateContainer(cmap['container'], yangJ[key][subkey], \
+                            jIn[table], table)
+        self.elementPath = []
+
+        return
+
+    """
+    Xlate tables in pTables in forked processes, rest of the tables are
+    xlated in this process meanwhile. Tables are independent of each other.
+    """
+    def _xlateConfigDBtoYangInProcesses(self, jIn, yangJ, processes, pTables):
+
+        global _xlateContext
+        _xlateContext = (self, jIn)
+        try:
+            ctx = multiprocessing.get_context('fork')
+            with ctx.Pool(min(processes, len(pTables))) as pool:
+                results = pool.map_async(_xlateTableInProcess, list(pTables), \
+                    chunksize=1)
+                for table in jIn.keys():
+                    if table not in pTables:
+                        self._xlateTable(jIn, yangJ, table)
+                for tableYang in results.get():
+                    for key in tableYang:
+                        yangJ.setdefault(key, dict()).update(tableYang[key])
+        finally:
+            _xlateContext = None
 
         return
 
     """
     Read config file and crop it as per yang models
     """
-    def _xlateConfigDB(self, xlateFile=None):
+    def _xlateConfigDB(self, xlateFile=None, processes=1):
 
         jIn= self.jIn
         yangJ = self.xlateJson
         # xlation is written in self.xlateJson
-        self._xlateConfigDBtoYang(jIn, yangJ)
+        self._xlateConfigDBtoYang(jIn, yangJ, processes)
 
         if xlateFile:
             with open(xlateFile, 'w') as f:
@@ -813,27 +1051,8 @@ class SonicYangExtMixin:
     """
     def _revFindYangTypedValue(self, key, value, leafDict):
 
-        # convert yang Type to config DB string
-        def _revYangConvert(val):
-            # config DB has only strings, thank god for that :), wait not yet!!!
-            return str(val)
-
-        # if it is a leaf-list do it for each element
-        if leafDict[key]['__isleafList']:
-            if isinstance(value, list) and (self.elementPath[0], self.elementPath[-1]) in LEAF_LIST_WITH_STRING_VALUE_DICT:
-                # For field defined as leaf-list but has string value in CONFIG DB, we need do special handling here:
-                # e.g. port.adv_speeds is [10,100,1000] in YANG, need to convert it into a string for CONFIG DB: "10,100,1000"
-                vValue = LEAF_LIST_WITH_STRING_VALUE_DICT[(self.elementPath[0], self.elementPath[-1])].join((_revYangConvert(x) for x in value))
-            else:
-                vValue = list()
-                for v in value:
-                    vValue.append(_revYangConvert(v))
-        elif leafDict[key]['type']['@name'] == 'boolean':
-            vValue = 'true' if value else 'false'
-        else:
-            vValue = _revYangConvert(value)
-
-        return vValue
+        convert = self._createRevYangConverter(key, leafDict[key], self.elementPath[0])
+        return convert(value)
 
     """
     Rev xlate from <TABLE>_LIST to table in config DB
@@ -892,7 +1111,7 @@ class SonicYangExtMixin:
         inner_clist = model.get('list')
         if inner_clist:
             inner_listKey = inner_clist['key']['@value']
-            inner_leafDict = self._createLeafDict(inner_clist, table)
+            inner_leafDict = self._getLeafTables(inner_clist, table)['leafDict']
             for lkey in inner_leafDict:
                 if inner_listKey != lkey:
                     inner_listVal = lkey
@@ -931,7 +1150,7 @@ class SonicYangExtMixin:
         # create a dict to map each key under primary key with a dict yang model.
         # This is done to improve performance of mapping from values of TABLEs in
         # config DB to leaf in YANG LIST.
-        leafDict = self._createLeafDict(model, table)
+        converters = self._getLeafTables(model, table)['revXlate']
 
         # list with name <NAME>_LIST should be removed,
         if "_LIST" in model['@name']:
@@ -956,8 +1175,7 @@ class SonicYangExtMixin:
                             continue
 
                         self.elementPath.append(key)
-                        config[pkey][key] = self._revFindYangTypedValue(key, \
-                            entry[key], leafDict)
+                        config[pkey][key] = converters[key](entry[key])
                         self.elementPath.pop()
                 self.elementPath.pop()
 
@@ -1013,13 +1231,15 @@ class SonicYangExtMixin:
                 self._revXlateContainerInContainer(modelContainer, yang, config, table)
 
         ## Handle other leaves in container,
-        leafDict = self._createLeafDict(model, table)
+        leafTables = self._getLeafTables(model, table)
+        leafDict = leafTables['leafDict']
+        converters = leafTables['revXlate']
         for vKey in yang:
             #vkey must be a leaf\leaf-list\choice in container
             if leafDict.get(vKey):
                 self.sysLog(syslog.LOG_DEBUG, "revXlateContainer vkey {}".format(vKey))
                 self.elementPath.append(vKey)
-                config[vKey] = self._revFindYangTypedValue(vKey, yang[vKey], leafDict)
+                config[vKey] = converters[vKey](yang[vKey])
                 self.elementPath.pop()
 
         return
@@ -1155,9 +1375,11 @@ class SonicYangExtMixin:
     load_data: load Config DB, crop, xlate and create data tree from it. (Public)
     input:    data
               debug Flag
+              processes - number of processes to xlate large tables in
+              parallel, tables are xlated in this process by default.
     returns:  True - success   False - failed
     """
-    def loadData(self, configdbJson, debug=False):
+    def loadData(self, configdbJson, debug=False, processes=1):
 
        try:
           # write Translated config in file if debug enabled
@@ -1171,7 +1393,7 @@ class SonicYangExtMixin:
           # self.jIn will be cropped
           self._cropConfigDB()
           # xlated result will be in self.xlateJson
-          self._xlateConfigDB(xlateFile=xlateFile)
+          self._xlateConfigDB(xlateFile=xlateFile, processes=processes)
           #print(self.xlateJson)
           self.sysLog(msg="Try to load Data in the tree")
           self.root = self.ctx.parse_data_mem(dumps(self.xlateJson), \
@@ -1185,6 +1407,171 @@ class SonicYangExtMixin:
 
        return True
 
+    """
+    load_data_incremental: apply changes of Config DB to the data tree created
+    by loadData. Only the changed keys are cropped, xlated and replaced in the
+    data tree, self.xlateJson will have xlation of the changed keys only.
+    The changed entries are validated when parsed, except for references to
+    other entries. Those, and leafref dependents of the replaced entries, which
+    are recreated in the data tree, are checked in next validation.
+    On failure, data tree is reset and it must be loaded with loadData. (Public)
+    input:    configdbDiff - {table: {key: entry}}, entry replaces the key in
+              Config DB, None entry deletes the key and None table deletes
+              the table.
+              debug Flag
+    returns:  True - success
+    """
+    def loadDataIncremental(self, configdbDiff, debug=False):
+
+       try:
+          # write Translated config in file if debug enabled
+          xlateFile = None
+          if debug:
+              xlateFile = "xlateConfig.json"
+          # changed keys in current and new config
+          oldConfig = dict()
+          newConfig = dict()
+          for table, entries in configdbDiff.items():
+              if table not in self.confDbYangMap:
+                  self._applyTableDiff(self.tablesWithOutYang, table, entries)
+                  continue
+              keys = list(self.jIn.get(table, dict()).keys()) if entries is None \
+                  else list(entries.keys())
+              oldConfig[table] = self._cropTableKeys(self.jIn, table, keys)
+              self._applyTableDiff(self.jIn, table, entries)
+              newConfig[table] = self._cropTableKeys(self.jIn, table, keys)
+
+          # delete current entries from data tree, find dependents before
+          # unlinking any entry, because dependents are found by value.
+          oldYang = dict()
+          self._xlateConfigDBtoYang(oldConfig, oldYang)
+          oldNodes = list()
+          dependents = set()
+          for xpath in self._findXpathsYangJson(oldYang):
+              node = self._find_data_node(xpath) if self.root is not None else None
+              if node is not None:
+                  dependents.update(self._findSubtreeDependencies(node))
+                  oldNodes.append(node)
+          for node in oldNodes:
+              node.unlink()
+
+          # xlated result will be in self.xlateJson
+          self.xlateJson = dict()
+          self._xlateConfigDBtoYang(newConfig, self.xlateJson)
+          if xlateFile:
+              with open(xlateFile, 'w') as f:
+                  dump(self.xlateJson, f, indent=4)
+          self.sysLog(msg="Try to merge Data in the tree")
+          # changed entries are validated on their own, references to the
+          # rest of the tree are checked in next validation of data tree
+          node = self.ctx.parse_data_mem(dumps(self.xlateJson), ly.LYD_JSON, \
+              ly.LYD_OPT_CONFIG|ly.LYD_OPT_STRICT|ly.LYD_OPT_NOEXTDEPS)
+          if node is not None:
+              if self.root is None:
+                  self.root = node
+              else:
+                  self.root.merge(node, 0)
+
+          for xpath in dependents:
+              self._recreateDataNodeEntry(xpath)
+
+       except Exception as e:
+           self.root = None
+           self.sysLog(msg="Data Loading Failed:{}".format(str(e)), \
+            debug=syslog.LOG_ERR, doPrint=True)
+           raise SonicYangException("Data Loading Failed\n{}".format(str(e)))
+
+       return True
+
+    """
+    Apply changes of a table to config, table is deleted if it gets empty.
+    """
+    def _applyTableDiff(self, config, table, entries):
+
+        if entries is None:
+            config.pop(table, None)
+            return
+
+        tableConfig = config.setdefault(table, dict())
+        for key, entry in entries.items():
+            if entry is None:
+                tableConfig.pop(key, None)
+            else:
+                tableConfig[key] = entry
+        if not tableConfig:
+            del config[table]
+
+        return
+
+    """
+    Return config of the keys which exist in a table.
+    """
+    def _cropTableKeys(self, config, table, keys):
+
+        tableConfig = config.get(table, dict())
+        return {key: tableConfig[key] for key in keys if key in tableConfig}
+
+    """
+    Find xpath of each list entry, container and leaf of tables in yang JSON.
+    """
+    def _findXpathsYangJson(self, yangJ):
+
+        xpaths = list()
+        for moduleTop, tables in yangJ.items():
+            module, topc = moduleTop.split(':')
+            for tableName, tableJ in tables.items():
+                table = tableName.split(':')[-1]
+                container = self.confDbYangMap[table]['container']
+                clist = container.get('list', list())
+                clist = [clist] if isinstance(clist, dict) else clist
+                ylists = {l['@name']: l for l in clist}
+                xpath = "/" + module + ":" + topc + "/" + table
+                for name, value in tableJ.items():
+                    if name not in ylists:
+                        xpaths.append(xpath + "/" + name)
+                        continue
+                    listKeys = ylists[name]['key']['@value'].split()
+                    for entry in value:
+                        keys = [str(entry[listKey]) for listKey in listKeys]
+                        xpaths.append(self._findXpathList(xpath, ylists[name], keys))
+
+        return xpaths
+
+    """
+    Find data dependencies of all leafs in the subtree of a data node.
+    """
+    def _findSubtreeDependencies(self, node):
+
+        ref_list = list()
+        for dnode in node.tree_dfs():
+            snode = dnode.schema()
+            if snode.nodetype() != ly.LYS_LEAF:
+                continue
+            backlinks = ly.Schema_Node_Leaf(snode).backlinks()
+            if backlinks is None or backlinks.number() == 0:
+                continue
+            ref_list.extend(self.find_data_dependencies(dnode.path()))
+
+        return ref_list
+
+    """
+    Replace list entry or container of a data node with its copy. New nodes
+    are validated by libyang in next validation of data tree.
+    """
+    def _recreateDataNodeEntry(self, xpath):
+
+        node = self._find_data_node(xpath)
+        if node is None:
+            # dependent is deleted or replaced with the changes
+            return
+        entry = node.parent()
+        parent = entry.parent()
+        copy = entry.dup(1)
+        entry.unlink()
+        parent.insert(copy)
+
+        return
+
     """
     Get data from Data tree, data tree will be assigned in self.xlateJson. (Public)
     """
@@ -0,0 +1,122 @@
+"""
+Benchmark of loading and validating Config DB with large ACL and PORT tables.
+
+Run from src/sonic-yang-mgmt:
+    python tests/benchmark_sonic_yang.py [--ports N] [--rules N] [--rounds N]
+
+The sample config of sonic-yang-models is extended with N ports and N ACL
+rules. A patch of 3 ACL rules (add, modify and delete) is then applied with a
+full loadData and with loadDataIncremental, each followed by a validation of
+the data tree.
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+SAMPLE_CONFIG = os.path.join(TEST_DIR, '..', '..', 'sonic-yang-models', 'tests', 'files', 'sample_config_db.json')
+
+sys.path.insert(0, os.path.join(TEST_DIR, '..'))
+
+import sonic_yang as sy
+
+ACL_TABLE_NAME = 'BENCH-ACL-TABLE'
+
+
+def create_config(ports, rules):
+    with open(SAMPLE_CONFIG) as f:
+        config = json.load(f)['SAMPLE_CONFIG_DB_JSON']
+
+    port_names = ['Ethernet{}'.format(10000 + i) for i in range(ports)]
+    for i, name in enumerate(port_names):
+        config['PORT'][name] = {
+            'alias': 'etp{}'.format(10000 + i),
+            'lanes': str(10000 + i),
+            'speed': '100000',
+            'mtu': '9100',
+            'admin_status': 'up'
+        }
+    config['ACL_TABLE'][ACL_TABLE_NAME] = {
+        'type': 'L3',
+        'stage': 'INGRESS',
+        'policy_desc': ACL_TABLE_NAME,
+        'ports': port_names
+    }
+    for i in range(rules):
+        config['ACL_RULE']['{}|RULE_{}'.format(ACL_TABLE_NAME, i)] = acl_rule(i)
+
+    return config
+
+
+def acl_rule(i, action='FORWARD'):
+    return {
+        'PRIORITY': str(i + 1),
+        'PACKET_ACTION': action,
+        'SRC_IP': '10.{}.{}.{}/32'.format(i >> 16 & 0xff, i >> 8 & 0xff, i & 0xff)
+    }
+
+
+def create_diff(rules):
+    return {
+        'ACL_RULE': {
+            '{}|RULE_{}'.format(ACL_TABLE_NAME, rules): acl_rule(rules),
+            '{}|RULE_{}'.format(ACL_TABLE_NAME, rules // 2): acl_rule(rules // 2, 'DROP'),
+            '{}|RULE_0'.format(ACL_TABLE_NAME): None
+        }
+    }
+
+
+def apply_diff(config, diff):
+    config = copy.deepcopy(config)
+    for table, entries in diff.items():
+        for key, entry in entries.items():
+            if entry is None:
+                config[table].pop(key, None)
+            else:
+                config[table][key] = entry
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full and incremental loading of yang data")
+    parser.add_argument('--yang-dir', default='/usr/local/yang-models', help="directory of yang models")
+    parser.add_argument('--ports', type=int, default=1024, help="number of added ports")
+    parser.add_argument('--rules', type=int, default=40000, help="number of added ACL rules")
+    parser.add_argument('--rounds', type=int, default=3, help="rounds of each measurement")
+    args = parser.parse_args()
+
+    syc = sy.SonicYang(args.yang_dir, print_log_enabled=False)
+    syc.loadYangModel()
+
+    config = create_config(args.ports, args.rules)
+    diff = create_diff(args.rules)
+    patched = apply_diff(config, diff)
+
+    def full():
+        syc.loadData(copy.deepcopy(patched))
+        syc.validate_data_tree()
+
+    def incremental():
+        syc.loadDataIncremental(copy.deepcopy(diff))
+        syc.validate_data_tree()
+
+    elapsed_full = min(timeit.repeat(full, number=1, repeat=args.rounds))
+
+    elapsed_incremental = []
+    for _ in range(args.rounds):
+        syc.loadData(copy.deepcopy(config))
+        syc.validate_data_tree()
+        elapsed_incremental.append(timeit.timeit(incremental, number=1))
+
+    print("ports: {}, ACL rules: {}, changed ACL rules: {}".format(args.ports, args.rules, len(diff['ACL_RULE'])))
+    print("{:<20} {:>10}".format("load and validate", "ms"))
+    print("{:<20} {:>10.1f}".format("full", elapsed_full * 1000))
+    print("{:<20} {:>10.1f}".format("incremental", min(elapsed_incremental) * 1000))
+
+
+if __name__ == '__main__':
+    main()
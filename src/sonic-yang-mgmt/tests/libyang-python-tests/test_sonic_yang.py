@@ -2,6 +2,7 @@ import sys
 import os
 import pytest
 import sonic_yang as sy
+import sonic_yang_ext as sy_ext
 import json
 import glob
 import logging
@@ -381,5 +382,99 @@ class Test_SonicYang(object):
 
         return
 
+    def test_xlate_in_processes(self, sonic_yang_data, monkeypatch):
+        # in this test, tables are xlated in parallel processes and result
+        # must match with xlation in single process.
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+        xlateJson = syc.xlateJson
+        leafTables = syc._getLeafTables(syc.confDbYangMap['PORT']['container']['list'], 'PORT')
+        assert syc._getLeafTables(syc.confDbYangMap['PORT']['container']['list'], 'PORT') is leafTables
+
+        monkeypatch.setattr(sy_ext, 'XLATE_PARALLEL_MIN_ENTRIES', 10)
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn, processes=2)
+        assert syc.xlateJson == xlateJson
+        syc.validate_data_tree()
+
+        return
+
+    def test_load_data_incremental(self, sonic_yang_data):
+        # in this test, changes are applied to loaded data tree and result
+        # must match with loading whole changed config.
+        test_file = sonic_yang_data['test_file']
+        syc = sonic_yang_data['syc']
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        expected = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syc.loadData(jIn)
+        syc.validate_data_tree()
+
+        diff = {
+            'PORT': {'Ethernet1': dict(expected['PORT']['Ethernet1'], mtu='4500')},
+            'ACL_RULE': {
+                'V4-ACL-TABLE|Rule_20': None,
+                'V4-ACL-TABLE|Rule_9999': {'PACKET_ACTION': 'DROP', 'PRIORITY': '9999', 'SRC_IP': '10.0.0.1/32'}
+            },
+            'UNKNOWN_TABLE': {'key': {'field': 'value'}}
+        }
+        syc.loadDataIncremental(diff)
+        syc.validate_data_tree()
+        syc.getData()
+        assert syc.tablesWithOutYang == {'UNKNOWN_TABLE': {'key': {'field': 'value'}}}
+
+        expected['PORT']['Ethernet1']['mtu'] = '4500'
+        del expected['ACL_RULE']['V4-ACL-TABLE|Rule_20']
+        expected['ACL_RULE']['V4-ACL-TABLE|Rule_9999'] = diff['ACL_RULE']['V4-ACL-TABLE|Rule_9999']
+        assert syc.revXlateJson == expected
+
+        # Ethernet0 is a member of Vlan111
+        syc.loadDataIncremental({'PORT': {'Ethernet0': None}})
+        with pytest.raises(sy.SonicYangException):
+            syc.validate_data_tree()
+
+        # ACL rule of a missing ACL table
+        syc.loadData(json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON')))
+        syc.validate_data_tree()
+        with pytest.raises(sy.SonicYangException):
+            syc.loadDataIncremental({'ACL_RULE': {
+                'NO-SUCH-ACL-TABLE|Rule_1': {'PACKET_ACTION': 'DROP', 'PRIORITY': '1', 'SRC_IP': '10.0.0.1/32'}
+            }})
+            syc.validate_data_tree()
+
+        return
+
+    def test_yang_snapshot(self, sonic_yang_data, tmpdir, monkeypatch):
+        # in this test, yang models are restored from snapshot and libyang
+        # modules are loaded at first use of libyang context.
+        monkeypatch.setenv(sy_ext.YANG_SNAPSHOT_DIR_ENV, str(tmpdir))
+        yang_dir = sonic_yang_data['yang_dir']
+        test_file = sonic_yang_data['test_file']
+
+        syc = sy.SonicYang(yang_dir)
+        syc.loadYangModel()
+        assert len(tmpdir.listdir()) == 1
+        assert not syc._pendingYangFiles
+
+        syr = sy.SonicYang(yang_dir)
+        syr.loadYangModel()
+        assert syr._pendingYangFiles
+        assert syr.yangFiles == syc.yangFiles
+        assert syr.yJson == syc.yJson
+        assert syr.confDbYangMap == syc.confDbYangMap
+        assert syr.preProcessedYang == syc.preProcessedYang
+
+        jIn = json.loads(self.readIjsonInput(test_file, 'SAMPLE_CONFIG_DB_JSON'))
+        syr.loadData(jIn)
+        assert not syr._pendingYangFiles
+        syr.validate_data_tree()
+        syr.getData()
+        assert syr.jIn == syr.revXlateJson
+
+        return
+
     def teardown_class(self):
         pass
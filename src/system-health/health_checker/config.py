@@ -12,6 +12,10 @@ class Config(object):
     # Default system health check interval
     DEFAULT_INTERVAL = 60
 
+    # Default interval of the full check in incremental mode, the objects are re-evaluated on STATE_DB changes
+    # in between
+    DEFAULT_RECONCILIATION_INTERVAL = 600
+
     # Default boot up timeout. When reboot system, system health will wait a few seconds before starting to work.
     DEFAULT_BOOTUP_TIMEOUT = 300
 
@@ -23,6 +27,17 @@ class Config(object):
         'booting': 'red'
     }
 
+    # Default settings of a user defined checker:
+    #   timeout: time in seconds to wait for the command
+    #   interval: time in seconds between two runs of the command, the last result is reused in between. 0 to run the
+    #             command on every check
+    #   ttl: time in seconds the last good result is reused when the command times out or fails to run
+    DEFAULT_USER_DEFINED_CHECKER_SETTINGS = {
+        'timeout': 30,
+        'interval': 0,
+        'ttl': 0
+    }
+
     # System health configuration file name
     CONFIG_FILE = 'system_health_monitoring_config.json'
 
@@ -41,9 +56,12 @@ class Config(object):
         self._last_mtime = None
         self.config_data = None
         self.interval = Config.DEFAULT_INTERVAL
+        self.incremental_check = False
+        self.reconciliation_interval = Config.DEFAULT_RECONCILIATION_INTERVAL
         self.ignore_services = None
         self.ignore_devices = None
         self.user_defined_checkers = None
+        self.user_defined_checker_settings = {}
 
     def config_file_exists(self):
         return os.path.exists(self._config_file)
@@ -69,9 +87,12 @@ class Config(object):
                     self.config_data = json.load(f)
 
                 self.interval = self.config_data.get('polling_interval', Config.DEFAULT_INTERVAL)
+                self.incremental_check = self.config_data.get('incremental_check', False)
+                self.reconciliation_interval = self.config_data.get('reconciliation_interval',
+                                                                    Config.DEFAULT_RECONCILIATION_INTERVAL)
                 self.ignore_services = self._get_list_data('services_to_ignore')
                 self.ignore_devices = self._get_list_data('devices_to_ignore')
-                self.user_defined_checkers = self._get_list_data('user_defined_checkers')
+                self.user_defined_checkers, self.user_defined_checker_settings = self._get_user_defined_checkers()
             except Exception as e:
                 self._reset()
 
@@ -83,9 +104,12 @@ class Config(object):
         self._last_mtime = None
         self.config_data = None
         self.interval = Config.DEFAULT_INTERVAL
+        self.incremental_check = False
+        self.reconciliation_interval = Config.DEFAULT_RECONCILIATION_INTERVAL
         self.ignore_services = None
         self.ignore_devices = None
         self.user_defined_checkers = None
+        self.user_defined_checker_settings = {}
 
     def get_led_color(self, status):
         """
@@ -142,3 +166,34 @@ class Config(object):
             if isinstance(data, list):
                 return set(data)
         return None
+
+    def _get_user_defined_checkers(self):
+        """
+        Get the user defined checker commands and their settings. An element of "user_defined_checkers" is either a
+        command string, or an object with the command and its settings, for example:
+            {"command": "python my_checker.py", "timeout": 10, "interval": 300, "ttl": 900}
+        :return: A set of commands if key exists, and a dictionary {<command>: <settings dictionary>}
+        """
+        data = self.config_data.get('user_defined_checkers')
+        if not isinstance(data, list):
+            return None, {}
+
+        commands = set()
+        settings = {}
+        for item in data:
+            if isinstance(item, dict):
+                command = item['command']
+                settings[command] = {name: item[name] for name in Config.DEFAULT_USER_DEFINED_CHECKER_SETTINGS if name in item}
+            else:
+                command = item
+            commands.add(command)
+        return commands, settings
+
+    def get_user_defined_checker_setting(self, command, name):
+        """
+        Get a setting of a user defined checker.
+        :param command: Command string of the user defined checker
+        :param name: Setting name, 'timeout', 'interval' or 'ttl'
+        :return: Setting value in seconds
+        """
+        return self.user_defined_checker_settings.get(command, {}).get(name, Config.DEFAULT_USER_DEFINED_CHECKER_SETTINGS[name])
@@ -1,7 +1,10 @@
+import time
+
 from natsort import natsorted
 from swsscommon.swsscommon import SonicV2Connector
 
 from .health_checker import HealthChecker
+from .state_db_snapshot import StateDbSnapshotReader
 
 
 class HardwareChecker(HealthChecker):
@@ -10,6 +13,7 @@ class HardwareChecker(HealthChecker):
     """
 
     ASIC_TEMPERATURE_KEY = 'TEMPERATURE_INFO|ASIC'
+    TEMPERATURE_TABLE_NAME = 'TEMPERATURE_INFO'
     FAN_TABLE_NAME = 'FAN_INFO'
     PSU_TABLE_NAME = 'PSU_INFO'
 
@@ -17,16 +21,83 @@ class HardwareChecker(HealthChecker):
         HealthChecker.__init__(self)
         self._db = SonicV2Connector(use_unix_socket_path=True)
         self._db.connect(self._db.STATE_DB)
+        self._reader = StateDbSnapshotReader(self._db)
+        # STATE_DB entries of the checked objects, {<key>: <field-value dictionary>}
+        self._entries = {}
+        # Time of the last full read of the STATE_DB entries
+        self._entries_time = None
 
     def get_category(self):
         return 'Hardware'
 
+    def get_subscribed_tables(self):
+        return [HardwareChecker.TEMPERATURE_TABLE_NAME, HardwareChecker.FAN_TABLE_NAME, HardwareChecker.PSU_TABLE_NAME]
+
     def check(self, config):
+        """
+        Check all hardware objects. The STATE_DB entries are read again, in incremental mode this reconciles the
+        entries updated by update().
+        :param config: Health checker configuration
+        :return:
+        """
+        self._read_entries()
         self.reset()
         self._check_asic_status(config)
         self._check_fan_status(config)
         self._check_psu_status(config)
 
+    def update(self, config, changes):
+        """
+        Apply STATE_DB changes to the entries and re-evaluate the objects of the changed tables.
+        :param config: Health checker configuration
+        :param changes: A dictionary {<table_name>: {<key>: <field-value dictionary, or None if the key is removed>}}
+        :return:
+        """
+        if self._entries_time is None:
+            self.check(config)
+            return
+
+        changed_types = set()
+        for table, entries in changes.items():
+            for key, data in entries.items():
+                if table == HardwareChecker.TEMPERATURE_TABLE_NAME:
+                    if not key.startswith('ASIC'):
+                        continue
+                    changed_types.add('ASIC')
+                elif table == HardwareChecker.FAN_TABLE_NAME:
+                    changed_types.add('Fan')
+                elif table == HardwareChecker.PSU_TABLE_NAME:
+                    changed_types.add('PSU')
+                else:
+                    continue
+
+                db_key = '{}|{}'.format(table, key)
+                if data is None:
+                    self._entries.pop(db_key, None)
+                else:
+                    self._entries[db_key] = data
+
+        for object_type, check_func in (('ASIC', self._check_asic_status),
+                                        ('Fan', self._check_fan_status),
+                                        ('PSU', self._check_psu_status)):
+            if object_type in changed_types:
+                self._info = {name: data for name, data in self._info.items()
+                              if data[HealthChecker.INFO_FIELD_OBJECT_TYPE] != object_type}
+                check_func(config)
+
+    def _read_entries(self):
+        """
+        Read the STATE_DB entries of all hardware objects in one round trip.
+        :return:
+        """
+        self._entries = self._reader.read([pattern + '*' for pattern in (HardwareChecker.ASIC_TEMPERATURE_KEY,
+                                                                         HardwareChecker.FAN_TABLE_NAME,
+                                                                         HardwareChecker.PSU_TABLE_NAME)])
+        self._entries_time = time.monotonic()
+
+    def _get_keys(self, prefix):
+        return [key for key in self._entries if key.startswith(prefix)]
+
     def _check_asic_status(self, config):
         """
         Check if ASIC temperature is in valid range.
@@ -36,13 +107,10 @@ class HardwareChecker(HealthChecker):
         if config.ignore_devices and 'asic' in config.ignore_devices:
             return
 
-        ASIC_TEMPERATURE_KEY_LIST = self._db.keys(self._db.STATE_DB,
-                                                  HardwareChecker.ASIC_TEMPERATURE_KEY + '*')
+        ASIC_TEMPERATURE_KEY_LIST = self._get_keys(HardwareChecker.ASIC_TEMPERATURE_KEY)
         for asic_key in ASIC_TEMPERATURE_KEY_LIST:
-            temperature = self._db.get(self._db.STATE_DB, asic_key,
-                                                          'temperature')
-            temperature_threshold = self._db.get(self._db.STATE_DB, asic_key,
-                                                          'high_threshold')
+            temperature = self._entries[asic_key].get('temperature')
+            temperature_threshold = self._entries[asic_key].get('high_threshold')
             asic_name = asic_key.split('|')[1]
             if not temperature:
                 self.set_object_not_ok('ASIC', asic_name,
@@ -78,7 +146,7 @@ class HardwareChecker(HealthChecker):
         if config.ignore_devices and 'fan' in config.ignore_devices:
             return
 
-        keys = self._db.keys(self._db.STATE_DB, HardwareChecker.FAN_TABLE_NAME + '*')
+        keys = self._get_keys(HardwareChecker.FAN_TABLE_NAME)
         if not keys:
             self.set_object_not_ok('Fan', 'Fan', 'Failed to get fan information')
             return
@@ -93,7 +161,7 @@ class HardwareChecker(HealthChecker):
             name = key_list[1]
             if config.ignore_devices and name in config.ignore_devices:
                 continue
-            data_dict = self._db.get_all(self._db.STATE_DB, key)
+            data_dict = self._entries[key]
             presence = data_dict.get('presence', 'false')
             if presence.lower() != 'true':
                 self.set_object_not_ok('Fan', name, '{} is missing'.format(name))
@@ -169,7 +237,7 @@ class HardwareChecker(HealthChecker):
         if config.ignore_devices and 'psu' in config.ignore_devices:
             return
 
-        keys = self._db.keys(self._db.STATE_DB, HardwareChecker.PSU_TABLE_NAME + '*')
+        keys = self._get_keys(HardwareChecker.PSU_TABLE_NAME)
         if not keys:
             self.set_object_not_ok('PSU', 'PSU', 'Failed to get PSU information')
             return
@@ -184,7 +252,7 @@ class HardwareChecker(HealthChecker):
             if config.ignore_devices and name in config.ignore_devices:
                 continue
 
-            data_dict = self._db.get_all(self._db.STATE_DB, key)
+            data_dict = self._entries[key]
             presence = data_dict.get('presence', 'false')
             if presence.lower() != 'true':
                 self.set_object_not_ok('PSU', name, '{} is missing or not available'.format(name))
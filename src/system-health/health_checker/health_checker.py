@@ -45,6 +45,23 @@ class HealthChecker(object):
         """
         pass
 
+    def get_subscribed_tables(self):
+        """
+        Get the STATE_DB tables whose changes affect the check result. In incremental mode, update() is called when
+        these tables change.
+        :return: List of table names
+        """
+        return []
+
+    def update(self, config, changes):
+        """
+        Re-evaluate the objects affected by STATE_DB changes. By default, perform the whole check again.
+        :param config: Health checker configuration.
+        :param changes: A dictionary {<table_name>: {<key>: <field-value dictionary, or None if the key is removed>}}
+        :return:
+        """
+        self.check(config)
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -1,3 +1,6 @@
+import concurrent.futures
+import time
+
 from .config import Config
 from .health_checker import HealthChecker
 from .service_checker import ServiceChecker
@@ -10,8 +13,30 @@ class HealthCheckerManager(object):
     """
     Manage all system health checkers and system health configuration.
     """
+
+    # Maximum number of user defined checkers running at the same time
+    MAX_CONCURRENT_USER_DEFINED_CHECKS = 8
+
     def __init__(self):
         self._checkers = []
+        # Duration in seconds of the last check of each checker
+        self.checker_durations = {}
+        # Number of timeouts of each user defined checker
+        self.checker_timeouts = {}
+        # Result of the last check of each checker, {<checker_name>: (<category>, <info>)}
+        self._results = {}
+        # User defined checkers, {<command>: <checker>}
+        self._user_defined_checkers = {}
+        # Time of the last run of each user defined checker, {<command>: <time>}
+        self._user_defined_run_times = {}
+        # Last result of each user defined checker, {<command>: (<time>, <result>, <True if the check failed>)}
+        self._user_defined_results = {}
+        # Last good result of each user defined checker, {<command>: (<time>, <result>)}
+        self._user_defined_good_results = {}
+        # Running user defined checkers, {<command>: <future of _run_check>}
+        self._user_defined_futures = {}
+        # Workers of the user defined checkers, created at first use
+        self._user_defined_executor = None
         self.config = Config()
         self.initialize()
 
@@ -25,52 +50,177 @@ class HealthCheckerManager(object):
 
     def check(self, chassis):
         """
-        Load new configuration if any and perform the system health check for all existing checkers.
+        Load new configuration if any and perform the system health check for all existing checkers. User defined
+        checkers run in the background and report their last result, a caller checking once waits for them with
+        wait_user_defined_checkers() and checks again.
         :param chassis: A chassis object.
         :return: A dictionary that contains the status for all objects that was checked.
         """
-        HealthChecker.summary = HealthChecker.STATUS_OK
-        stats = {}
+        self.checker_durations = {}
+        self._results = {}
         self.config.load_config()
 
         for checker in self._checkers:
-            self._do_check(checker, stats)
+            self._do_check(checker)
 
-        if self.config.user_defined_checkers:
-            for udc in self.config.user_defined_checkers:
-                checker = UserDefinedChecker(udc)
-                self._do_check(checker, stats)
+        self._check_user_defined_checkers()
 
-        self._set_system_led(chassis)
-        return stats
+        return self._collect_stats(chassis)
+
+    def _check_user_defined_checkers(self):
+        """
+        Start the user defined checkers whose interval elapsed in the background and report the last result of each
+        checker, so the check never waits for a user defined command. When a command times out or the check raises,
+        its last good result is reported till its TTL expires.
+        :return:
+        """
+        commands = self.config.user_defined_checkers or set()
+        for command in list(self._user_defined_checkers):
+            if command not in commands:
+                checker = self._user_defined_checkers.pop(command)
+                self._user_defined_run_times.pop(command, None)
+                self._user_defined_results.pop(command, None)
+                self._user_defined_good_results.pop(command, None)
+                self._user_defined_futures.pop(command, None)
+                self.checker_timeouts.pop(str(checker), None)
+
+        self._collect_user_defined_results()
+
+        now = time.monotonic()
+        for command in commands:
+            checker = self._user_defined_checkers.get(command)
+            if checker is None:
+                checker = UserDefinedChecker(command)
+                self._user_defined_checkers[command] = checker
+            run_time = self._user_defined_run_times.get(command)
+            if command not in self._user_defined_futures and (
+                    run_time is None or now - run_time >= self.config.get_user_defined_checker_setting(command, 'interval')):
+                if self._user_defined_executor is None:
+                    self._user_defined_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=HealthCheckerManager.MAX_CONCURRENT_USER_DEFINED_CHECKS)
+                checker.timeout = self.config.get_user_defined_checker_setting(command, 'timeout')
+                self._user_defined_futures[command] = self._user_defined_executor.submit(self._run_check, checker)
+                self._user_defined_run_times[command] = now
+
+            if command not in self._user_defined_results:
+                continue
+            result_time, result, failed = self._user_defined_results[command]
+            if failed and command in self._user_defined_good_results:
+                good_time, good_result = self._user_defined_good_results[command]
+                if now - good_time < self.config.get_user_defined_checker_setting(command, 'ttl'):
+                    result = good_result
+            self._results[str(checker)] = result
+
+    def _collect_user_defined_results(self):
+        """
+        Save the results of the user defined checkers which completed since the last check.
+        :return:
+        """
+        now = time.monotonic()
+        for command, future in list(self._user_defined_futures.items()):
+            if not future.done():
+                continue
+            del self._user_defined_futures[command]
+            checker = self._user_defined_checkers[command]
+            result, duration = future.result()
+            self.checker_durations[str(checker)] = duration
+            if checker.timed_out:
+                self.checker_timeouts[str(checker)] = self.checker_timeouts.get(str(checker), 0) + 1
+            failed = checker.timed_out or result[0] == 'Internal'
+            if not failed:
+                self._user_defined_good_results[command] = (now, result)
+            self._user_defined_results[command] = (now, result, failed)
+
+    def wait_user_defined_checkers(self, timeout=None):
+        """
+        Wait for the running user defined checkers, their results are reported by the next check.
+        :param timeout: Maximum time in seconds to wait, None to wait till all of them complete.
+        :return:
+        """
+        concurrent.futures.wait(list(self._user_defined_futures.values()), timeout=timeout)
+
+    def check_changes(self, chassis, changes):
+        """
+        Re-evaluate the objects affected by STATE_DB changes, the results of the other objects are kept from the
+        last check.
+        :param chassis: A chassis object.
+        :param changes: A dictionary {<table_name>: {<key>: <field-value dictionary, or None if the key is removed>}}
+        :return: A dictionary that contains the status for all objects that was checked.
+        """
+        self.checker_durations = {}
+        for checker in self._checkers:
+            tables = checker.get_subscribed_tables()
+            checker_changes = {table: entries for table, entries in changes.items() if table in tables}
+            if checker_changes:
+                self._do_check(checker, checker_changes)
+
+        return self._collect_stats(chassis)
+
+    def get_subscribed_tables(self):
+        """
+        Get the STATE_DB tables whose changes are handled by check_changes.
+        :return: A set of table names
+        """
+        tables = set()
+        for checker in self._checkers:
+            tables.update(checker.get_subscribed_tables())
+        return tables
 
-    def _do_check(self, checker, stats):
+    def _do_check(self, checker, changes=None):
         """
-        Do check for a particular checker and collect the check statistic.
+        Do check for a particular checker and save its result.
         :param checker: A checker object.
-        :param stats: Check statistic.
+        :param changes: STATE_DB changes to re-evaluate, or None to perform the whole check.
         :return:
         """
+        result, duration = self._run_check(checker, changes)
+        self._results[str(checker)] = result
+        self.checker_durations[str(checker)] = duration
+
+    def _run_check(self, checker, changes=None):
+        """
+        Do check for a particular checker, the state of the manager is not modified.
+        :param checker: A checker object.
+        :param changes: STATE_DB changes to re-evaluate, or None to perform the whole check.
+        :return: A tuple (<result>, <duration in seconds>), the result is (<category>, <info>)
+        """
+        begin = time.monotonic()
         try:
-            checker.check(self.config)
-            category = checker.get_category()
-            info = checker.get_info()
-            if category not in stats:
-                stats[category] = info
+            if changes is None:
+                checker.check(self.config)
             else:
-                stats[category].update(info)
+                checker.update(self.config, changes)
+            result = (checker.get_category(), checker.get_info())
         except Exception as e:
-            HealthChecker.summary = HealthChecker.STATUS_NOT_OK
             error_msg = 'Failed to perform health check for {} due to exception - {}'.format(checker, repr(e))
             entry = {str(checker): {
                 HealthChecker.INFO_FIELD_OBJECT_STATUS: HealthChecker.STATUS_NOT_OK,
                 HealthChecker.INFO_FIELD_OBJECT_MSG: error_msg,
                 HealthChecker.INFO_FIELD_OBJECT_TYPE: "Internal"
             }}
-            if 'Internal' not in stats:
-                stats['Internal'] = entry
+            result = ('Internal', entry)
+        return result, time.monotonic() - begin
+
+    def _collect_stats(self, chassis):
+        """
+        Merge the results of the checkers, update the summary and the system LED.
+        :param chassis: A chassis object.
+        :return: A dictionary that contains the status for all objects that was checked.
+        """
+        HealthChecker.summary = HealthChecker.STATUS_OK
+        stats = {}
+        for category, info in self._results.values():
+            if category not in stats:
+                stats[category] = dict(info)
             else:
-                stats['Internal'].update(entry)
+                stats[category].update(info)
+
+            for obj_data in info.values():
+                if obj_data[HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK:
+                    HealthChecker.summary = HealthChecker.STATUS_NOT_OK
+
+        self._set_system_led(chassis)
+        return stats
 
     def _set_system_led(self, chassis):
         try:
@@ -1,7 +1,13 @@
+import concurrent.futures
 import docker
+import http.client
 import os
 import pickle
 import re
+import socket
+import subprocess
+import time
+import xmlrpc.client
 
 from swsscommon import swsscommon
 from sonic_py_common import multi_asic, device_info
@@ -15,6 +21,33 @@ logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 EVENTS_PUBLISHER_SOURCE = "sonic-events-host"
 EVENTS_PUBLISHER_TAG = "process-not-running"
 
+class UnixStreamHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a unix socket
+    """
+    def __init__(self, socket_path, timeout):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class UnixStreamTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport over a unix socket, used to talk to supervisord
+    """
+    def __init__(self, socket_path, timeout):
+        xmlrpc.client.Transport.__init__(self)
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        return UnixStreamHTTPConnection(self.socket_path, self.timeout)
+
+
 def check_docker_image(image_name):
     """
     @summary: This function will check if docker image exists.
@@ -41,6 +74,18 @@ class ServiceChecker(HealthChecker):
     # Command to get merged directory of a container
     GET_CONTAINER_FOLDER_CMD = 'docker inspect {} --format "{{{{.GraphDriver.Data.MergedDir}}}}"'
 
+    # supervisord XML-RPC socket, relative to the merged directory of a container
+    SUPERVISOR_SOCKET_PATH = 'var/run/supervisor.sock'
+
+    # Command to get the process status of a container if its supervisord socket isn't reachable
+    SUPERVISORCTL_STATUS_CMD = 'docker exec {} bash -c "supervisorctl status"'
+
+    # Maximum number of containers checked concurrently
+    MAX_CONCURRENT_CHECKS = 8
+
+    # Timeout in seconds to get the process status of a container
+    CONTAINER_CHECK_TIMEOUT = 10
+
     # Command to query the status of monit service.
     CHECK_MONIT_SERVICE_CMD = 'systemctl is-active monit.service'
 
@@ -64,6 +109,21 @@ class ServiceChecker(HealthChecker):
 
         self.container_feature_dict = {}
 
+        # Merged directory of the running containers
+        self.container_folders = {}
+
+        # Process status of the containers queried concurrently in check_services
+        self.container_process_status = {}
+
+        # Duration in seconds of the last process status query of each container
+        self.container_check_durations = {}
+
+        # Workers of the process status queries, created at first use and kept for the life of the checker
+        self.executor = None
+
+        # Process status query of each container, a query still running is not started again
+        self.process_status_futures = {}
+
         self.need_save_cache = False
 
         self.config_db = None
@@ -149,8 +209,12 @@ class ServiceChecker(HealthChecker):
         try:
             lst = ctrs.list(filters={"status": "running"})
 
+            self.container_folders = {}
             for ctr in lst:
                 running_containers.add(ctr.name)
+                container_folder = self._get_merged_dir(ctr)
+                if container_folder:
+                    self.container_folders[ctr.name] = container_folder
                 if ctr.name not in self.container_critical_processes:
                     self.fill_critical_process_by_container(ctr.name)
         except docker.errors.APIError as err:
@@ -226,6 +290,21 @@ class ServiceChecker(HealthChecker):
 
         return container_folder.strip()
 
+    def _get_merged_dir(self, ctr):
+        """Get the merged directory of a container from the attributes returned by the docker API
+
+        Args:
+            ctr (object): docker container object
+
+        Returns:
+            str: merged directory, or None if it is not available
+        """
+        try:
+            merged_dir = ctr.attrs['GraphDriver']['Data']['MergedDir']
+        except (AttributeError, KeyError, TypeError):
+            return None
+        return merged_dir if isinstance(merged_dir, str) else None
+
     def save_critical_process_cache(self):
         """Save self.container_critical_processes to a cache file
         """
@@ -324,8 +403,11 @@ class ServiceChecker(HealthChecker):
             self.set_object_not_ok('Service', 'system', 'no critical process found')
             return
 
+        self.query_process_status([container for container in self.container_critical_processes
+                                   if self._is_feature_enabled(container, feature_table)])
         for container, critical_process_list in self.container_critical_processes.items():
             self.check_process_existence(container, critical_process_list, config, feature_table)
+        self.container_process_status = {}
 
         for bad_container in self.bad_containers:
             self.set_object_not_ok('Service', bad_container, 'Syntax of critical_processes file is incorrect')
@@ -360,6 +442,110 @@ class ServiceChecker(HealthChecker):
             data[items[0].strip()] = items[1].strip()
         return data
 
+    def _get_supervisor_process_status(self, container_name):
+        """Get the process status of a container from its supervisord XML-RPC socket
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            dict: {<process_name>: <state>} as reported by "supervisorctl status"
+        """
+        container_folder = self.container_folders.get(container_name)
+        if not container_folder:
+            raise OSError("merged directory of container '{}' is unknown".format(container_name))
+        socket_path = os.path.join(container_folder, ServiceChecker.SUPERVISOR_SOCKET_PATH)
+        server = xmlrpc.client.ServerProxy('http://localhost',
+                                          transport=UnixStreamTransport(socket_path, ServiceChecker.CONTAINER_CHECK_TIMEOUT))
+        data = {}
+        for info in server.supervisor.getAllProcessInfo():
+            if info['group'] == info['name']:
+                process_name = info['name']
+            else:
+                process_name = '{}:{}'.format(info['group'], info['name'])
+            data[process_name] = info['statename']
+        return data
+
+    def _get_process_status(self, container_name):
+        """Get the process status of a container, from supervisord or from supervisorctl if the
+        socket of supervisord is not reachable
+
+        Args:
+            container_name (str): Container name
+
+        Returns:
+            dict: {<process_name>: <state>}, or None if the status could not be retrieved
+        """
+        try:
+            return self._get_supervisor_process_status(container_name)
+        except (OSError, xmlrpc.client.Error, http.client.HTTPException, KeyError, TypeError) as err:
+            logger.log_debug("Failed to query supervisord of container '{}', fallback to supervisorctl: {}".format(container_name, err))
+
+        # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
+        # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
+        # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
+        try:
+            process_status = utils.run_command(ServiceChecker.SUPERVISORCTL_STATUS_CMD.format(container_name),
+                                               timeout=ServiceChecker.CONTAINER_CHECK_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.log_warning("Timeout to get the process status of container '{}' by supervisorctl".format(container_name))
+            return None
+        if process_status is None:
+            return None
+        return self._parse_supervisorctl_status(process_status.strip().splitlines())
+
+    def _timed_get_process_status(self, container_name, durations):
+        begin = time.monotonic()
+        try:
+            return self._get_process_status(container_name)
+        finally:
+            durations[container_name] = time.monotonic() - begin
+
+    def query_process_status(self, containers):
+        """Query the process status of containers concurrently, the results are used by check_process_existence
+
+        Args:
+            containers (list): Container names
+        """
+        self.container_process_status = {}
+        self.container_check_durations = {}
+        if not containers:
+            return
+
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=ServiceChecker.MAX_CONCURRENT_CHECKS)
+
+        futures = {}
+        for container in containers:
+            # A query which timed out in a previous check is waited for instead of being queued again
+            future = self.process_status_futures.get(container)
+            if future is None or future.done():
+                future = self.executor.submit(self._timed_get_process_status, container, self.container_check_durations)
+                self.process_status_futures[container] = future
+            futures[container] = future
+
+        # Each worker checks its share of the containers one after another
+        rounds = (len(containers) - 1) // ServiceChecker.MAX_CONCURRENT_CHECKS + 1
+        deadline = time.monotonic() + ServiceChecker.CONTAINER_CHECK_TIMEOUT * rounds
+        for container, future in futures.items():
+            try:
+                self.container_process_status[container] = future.result(timeout=max(deadline - time.monotonic(), 0))
+            except concurrent.futures.TimeoutError:
+                logger.log_warning("Timeout to get the process status of container '{}'".format(container))
+                self.container_process_status[container] = None
+            except Exception as err:
+                logger.log_warning("Failed to get the process status of container '{}': {}".format(container, repr(err)))
+                self.container_process_status[container] = None
+
+        for container in list(self.process_status_futures):
+            if container not in futures:
+                del self.process_status_futures[container]
+
+    def _is_feature_enabled(self, container_name, feature_table):
+        feature_name = self.container_feature_dict.get(container_name)
+        return (feature_name in feature_table and "state" in feature_table[feature_name]
+                and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"])
+
     def publish_events(self, container_name, critical_process_list):
         params = swsscommon.FieldValueMap()
         params["ctr_name"] = container_name
@@ -383,18 +569,16 @@ class ServiceChecker(HealthChecker):
             if ("state" in feature_table[feature_name]
                     and feature_table[feature_name]["state"] not in ["disabled", "always_disabled"]):
 
-                # We are using supervisorctl status to check the critical process status. We cannot leverage psutil here because
-                # it not always possible to get process cmdline in supervisor.conf. E.g, cmdline of orchagent is "/usr/bin/orchagent",
-                # however, in supervisor.conf it is "/usr/bin/orchagent.sh"
-                cmd = 'docker exec {} bash -c "supervisorctl status"'.format(container_name)
-                process_status = utils.run_command(cmd)
+                if container_name in self.container_process_status:
+                    process_status = self.container_process_status[container_name]
+                else:
+                    process_status = self._get_process_status(container_name)
                 if process_status is None:
                     for process_name in critical_process_list:
                         self.set_object_not_ok('Process', '{}:{}'.format(container_name, process_name), "Process '{}' in container '{}' is not running".format(process_name, container_name))
                     self.publish_events(container_name, critical_process_list)
                     return
 
-                process_status = self._parse_supervisorctl_status(process_status.strip().splitlines())
                 for process_name in critical_process_list:
                     if config and config.ignore_services and process_name in config.ignore_services:
                         continue
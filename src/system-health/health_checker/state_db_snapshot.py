@@ -0,0 +1,75 @@
+from swsscommon import swsscommon
+from sonic_py_common.logger import Logger
+
+SYSLOG_IDENTIFIER = 'state_db_snapshot'
+logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
+
+# Returns the keys matching the patterns in ARGV, each followed by its fields and values:
+# {<key>, {<field>, <value>, ...}, <key>, {...}, ...}
+SNAPSHOT_SCRIPT = """
+local result = {}
+for _, pattern in ipairs(ARGV) do
+    for _, key in ipairs(redis.call('KEYS', pattern)) do
+        table.insert(result, key)
+        table.insert(result, redis.call('HGETALL', key))
+    end
+end
+return result
+"""
+
+
+class StateDbSnapshotReader(object):
+    """
+    Read the STATE_DB entries matching a set of key patterns in one round trip, with a Lua script. If the script
+    can't be run, the entries are read key by key.
+    """
+
+    def __init__(self, db):
+        """
+        Constructor.
+        :param db: SonicV2Connector connected to STATE_DB, used to read the entries key by key.
+        """
+        self._db = db
+        self._script = None
+        self._script_loaded = False
+
+    def _load_script(self):
+        self._script_loaded = True
+        try:
+            import redis
+            client = redis.Redis(unix_socket_path=swsscommon.SonicDBConfig.getDbSock('STATE_DB'),
+                                 db=swsscommon.SonicDBConfig.getDbId('STATE_DB'),
+                                 decode_responses=True)
+            self._script = client.register_script(SNAPSHOT_SCRIPT)
+        except Exception as e:
+            logger.log_warning('Failed to load STATE_DB snapshot script, entries are read key by key: {}'.format(e))
+
+    def read(self, patterns):
+        """
+        Read the entries matching the key patterns.
+        :param patterns: Key patterns, e.g. 'FAN_INFO|*'.
+        :return: A dictionary {<key>: <field-value dictionary>}
+        """
+        if not self._script_loaded:
+            self._load_script()
+
+        if self._script is not None:
+            try:
+                reply = self._script(args=list(patterns))
+                return {reply[i]: dict(zip(reply[i + 1][::2], reply[i + 1][1::2])) for i in range(0, len(reply), 2)}
+            except Exception as e:
+                logger.log_warning('Failed to read STATE_DB snapshot, entries are read key by key: {}'.format(e))
+
+        return self.read_per_key(patterns)
+
+    def read_per_key(self, patterns):
+        """
+        Read the entries matching the key patterns with one request per key.
+        :param patterns: Key patterns, e.g. 'FAN_INFO|*'.
+        :return: A dictionary {<key>: <field-value dictionary>}
+        """
+        entries = {}
+        for pattern in patterns:
+            for key in self._db.keys(self._db.STATE_DB, pattern) or []:
+                entries[key] = self._db.get_all(self._db.STATE_DB, key) or {}
+        return entries
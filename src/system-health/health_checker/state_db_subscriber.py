@@ -0,0 +1,50 @@
+from swsscommon import swsscommon
+from sonic_py_common.logger import Logger
+
+SYSLOG_IDENTIFIER = 'state_db_subscriber'
+logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
+
+REDIS_TIMEOUT_MS = 0
+
+
+class StateDbSubscriber(object):
+    """
+    Subscribe to STATE_DB tables and collect the changed entries.
+    """
+
+    def __init__(self, tables):
+        """
+        Constructor.
+        :param tables: Names of the STATE_DB tables to subscribe to.
+        """
+        self.tables = set(tables)
+        self._db = swsscommon.DBConnector("STATE_DB", REDIS_TIMEOUT_MS, False)
+        self._sel = swsscommon.Select()
+        self._subscribers = {}
+        for table in self.tables:
+            sst = swsscommon.SubscriberStateTable(self._db, table)
+            self._sel.addSelectable(sst)
+            self._subscribers[sst.getFd()] = (table, sst)
+
+    def get_changes(self, timeout):
+        """
+        Wait for changes and collect all the pending ones.
+        :param timeout: Timeout in seconds to wait for the first change.
+        :return: A dictionary {<table_name>: {<key>: <field-value dictionary, or None if the key is removed>}}
+        """
+        changes = {}
+        timeout_ms = int(timeout * 1000)
+        while True:
+            (state, selectable) = self._sel.select(timeout_ms)
+            if state == swsscommon.Select.TIMEOUT:
+                break
+            if state != swsscommon.Select.OBJECT:
+                logger.log_warning("sel.select() did not return swsscommon.Select.OBJECT")
+                break
+
+            table, sst = self._subscribers[selectable.getFd()]
+            (key, op, fvs) = sst.pop()
+            changes.setdefault(table, {})[key] = dict(fvs) if op == 'SET' else None
+            # Drain the changes already received without waiting
+            timeout_ms = 0
+        return changes
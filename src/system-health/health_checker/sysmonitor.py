@@ -22,9 +22,115 @@ spl_srv_list = ['database-chassis', 'gbsyncd']
 SELECT_TIMEOUT_MSECS = 1000
 QUEUE_TIMEOUT = 15
 TASK_STOP_TIMEOUT = 10
+# Events received within this time in seconds after an event are handled together
+EVENT_COALESCE_WINDOW = 0.5
+SYSTEMD_BUS_NAME = 'org.freedesktop.systemd1'
+SYSTEMD_OBJECT_PATH = '/org/freedesktop/systemd1'
+SYSTEMD_MANAGER_INTERFACE = 'org.freedesktop.systemd1.Manager'
+SYSTEMD_UNIT_INTERFACE = 'org.freedesktop.systemd1.Unit'
+DBUS_PROPERTIES_INTERFACE = 'org.freedesktop.DBus.Properties'
 logger = Logger(log_identifier=SYSLOG_IDENTIFIER)
 exclude_srv_list = ['ztp.service']
 
+def unit_name_from_path(path):
+    """Get the unit name from the D-Bus object path of a systemd unit, e.g.
+       /org/freedesktop/systemd1/unit/swss_2eservice -> swss.service
+    """
+    escaped = str(path).rsplit('/', 1)[-1]
+    name = []
+    i = 0
+    while i < len(escaped):
+        if escaped[i] == '_' and i + 2 < len(escaped):
+            name.append(chr(int(escaped[i + 1:i + 3], 16)))
+            i += 3
+        else:
+            name.append(escaped[i])
+            i += 1
+    return ''.join(name)
+
+
+def get_unit_type_interface(unit):
+    """Get the D-Bus interface of the unit type, e.g. org.freedesktop.systemd1.Service for swss.service"""
+    return 'org.freedesktop.systemd1.' + unit.rsplit('.', 1)[-1].capitalize()
+
+
+#Properties of systemd units read over D-Bus, in the format of "systemctl show". Updated with the
+#ListUnits replies and the PropertiesChanged signals forwarded by MonitorSystemBusTask
+class SystemdUnitCache(object):
+
+    UNIT_PROPERTIES = ('Id', 'LoadState', 'UnitFileState', 'ActiveState', 'SubState')
+    UNIT_TYPE_PROPERTIES = ('Type', 'Result')
+
+    def __init__(self):
+        self._bus = None
+        self._manager = None
+        self.units = {}
+
+    def _get_manager(self):
+        if self._manager is None:
+            import dbus
+            self._bus = dbus.SystemBus()
+            systemd = self._bus.get_object(SYSTEMD_BUS_NAME, SYSTEMD_OBJECT_PATH)
+            self._manager = dbus.Interface(systemd, SYSTEMD_MANAGER_INTERFACE)
+        return self._manager
+
+    def _load_unit(self, unit):
+        import dbus
+        unit_path = self._get_manager().LoadUnit(unit)
+        unit_object = dbus.Interface(self._bus.get_object(SYSTEMD_BUS_NAME, unit_path), DBUS_PROPERTIES_INTERFACE)
+        unit_properties = unit_object.GetAll(SYSTEMD_UNIT_INTERFACE)
+        props = {name: str(unit_properties.get(name, '')) for name in SystemdUnitCache.UNIT_PROPERTIES}
+        try:
+            type_properties = unit_object.GetAll(get_unit_type_interface(unit))
+        except dbus.exceptions.DBusException:
+            type_properties = {}
+        props.update({name: str(type_properties.get(name, '')) for name in SystemdUnitCache.UNIT_TYPE_PROPERTIES})
+        self.units[unit] = props
+        return props
+
+    def get_properties(self, unit):
+        """Get the properties of a unit, read over D-Bus if not cached
+
+        Returns:
+            dict: {<property>: <value>}
+        """
+        props = self.units.get(unit)
+        if props is None:
+            props = self._load_unit(unit)
+        return dict(props)
+
+    def load_units(self, units):
+        """Refresh the states of units with one ListUnits call, the units not cached are read over D-Bus"""
+        listed = {}
+        for name, _, load_state, active_state, sub_state in (info[:5] for info in self._get_manager().ListUnits()):
+            listed[str(name)] = (str(load_state), str(active_state), str(sub_state))
+        for unit in units:
+            props = self.units.get(unit)
+            if props is not None and unit in listed:
+                props['LoadState'], props['ActiveState'], props['SubState'] = listed[unit]
+            else:
+                self._load_unit(unit)
+
+    def update(self, unit, changed, invalidated):
+        """Apply the properties of a PropertiesChanged signal"""
+        props = self.units.get(unit)
+        if props is None:
+            return
+        if invalidated:
+            self.units.pop(unit)
+            return
+        for name, value in changed.items():
+            if name in props:
+                props[name] = value
+
+    def invalidate(self, unit=None):
+        """Drop the cached properties of a unit, or of all units"""
+        if unit is None:
+            self.units = {}
+        else:
+            self.units.pop(unit, None)
+
+
 #Subprocess which subscribes to STATE_DB FEATURE table for any update
 #and push service events to main process via queue
 class MonitorStateDbTask(ProcessTaskBase):
@@ -82,6 +188,23 @@ class MonitorSystemBusTask(ProcessTaskBase):
             self.task_notify(msg)
             return
 
+    def on_properties_changed(self, interface, changed, invalidated, path=None):
+        if not interface.startswith('org.freedesktop.systemd1.'):
+            return
+        props = {str(name): str(value) for name, value in changed.items()
+                 if name in SystemdUnitCache.UNIT_PROPERTIES + SystemdUnitCache.UNIT_TYPE_PROPERTIES}
+        invalidated = [str(name) for name in invalidated]
+        if not props and not invalidated:
+            return
+        timestamp = "{}".format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"))
+        msg = {"unit": unit_name_from_path(path), "evt_src": "props", "time": timestamp,
+               "props": props, "invalidated": invalidated}
+        self.task_notify(msg)
+
+    def on_unit_files_changed(self, *args):
+        timestamp = "{}".format(datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"))
+        self.task_notify({"unit": None, "evt_src": "reload", "time": timestamp})
+
     #Function for listening the systemd event on dbus
     def subscribe_sysbus(self):
         import dbus
@@ -94,6 +217,11 @@ class MonitorSystemBusTask(ProcessTaskBase):
         manager = dbus.Interface(systemd, 'org.freedesktop.systemd1.Manager')
         manager.Subscribe()
         manager.connect_to_signal('JobRemoved', self.on_job_removed)
+        manager.connect_to_signal('UnitFilesChanged', self.on_unit_files_changed)
+        manager.connect_to_signal('Reloading', self.on_unit_files_changed)
+        bus.add_signal_receiver(self.on_properties_changed, signal_name='PropertiesChanged',
+                                dbus_interface=DBUS_PROPERTIES_INTERFACE, bus_name=SYSTEMD_BUS_NAME,
+                                path_keyword='path')
 
         loop = GLib.MainLoop()
         loop.run()
@@ -125,6 +253,7 @@ class Sysmonitor(ProcessTaskBase):
         self.state_db = None
         self.config_db = None
         self.config = Config()
+        self.unit_cache = SystemdUnitCache()
         self.mpmgr = multiprocessing.Manager()
         self.myQ = self.mpmgr.Queue()
 
@@ -237,7 +366,7 @@ class Sysmonitor(ProcessTaskBase):
     #Checks FEATURE table from config db for the service' check_up_status flag
     #if marked to true, then read the service up_status from FEATURE table of state db.
     #else, just return Up
-    def get_app_ready_status(self, service):
+    def get_app_ready_status(self, service, configdb_feature_table=None):
         if not self.state_db:
             self.state_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
             self.state_db.connect(self.state_db.STATE_DB)
@@ -248,7 +377,8 @@ class Sysmonitor(ProcessTaskBase):
         fail_reason = ""
         check_app_up_status = ""
         up_status_flag = ""
-        configdb_feature_table = self.config_db.get_table('FEATURE')
+        if configdb_feature_table is None:
+            configdb_feature_table = self.config_db.get_table('FEATURE')
         update_time = "-"
 
         if service not in configdb_feature_table.keys():
@@ -256,16 +386,17 @@ class Sysmonitor(ProcessTaskBase):
         else:
             check_app_up_status = configdb_feature_table[service].get('check_up_status')
             if check_app_up_status is not None and (check_app_up_status.lower()) == "true":
-                up_status_flag = self.state_db.get(self.state_db.STATE_DB, 'FEATURE|{}'.format(service), 'up_status')
+                statedb_feature_entry = self.state_db.get_all(self.state_db.STATE_DB, 'FEATURE|{}'.format(service)) or {}
+                up_status_flag = statedb_feature_entry.get('up_status')
                 if up_status_flag is not None and (up_status_flag.lower()) == "true":
                     pstate = "Up"
                 else:
-                    fail_reason = self.state_db.get(self.state_db.STATE_DB, 'FEATURE|{}'.format(service), 'fail_reason')
+                    fail_reason = statedb_feature_entry.get('fail_reason')
                     if fail_reason is None:
                         fail_reason = "NA"
                     pstate = "Down"
 
-                update_time = self.state_db.get(self.state_db.STATE_DB, 'FEATURE|{}'.format(service), 'update_time')
+                update_time = statedb_feature_entry.get('update_time')
                 if update_time is None:
                     update_time = "-"
             else:
@@ -274,8 +405,13 @@ class Sysmonitor(ProcessTaskBase):
 
         return pstate,fail_reason,update_time
 
-    #Gets the service properties
+    #Gets the service properties, over D-Bus or from systemctl if D-Bus is not available
     def run_systemctl_show(self, service):
+        try:
+            return self.unit_cache.get_properties(service)
+        except Exception as e:
+            logger.log_debug("Failed to get properties of {} over D-Bus: {}".format(service, str(e)))
+
         command = ('systemctl show {} --property=Id,LoadState,UnitFileState,Type,ActiveState,SubState,Result'.format(service))
         output = utils.run_command(command)
         srv_properties = output.split('\n')
@@ -302,7 +438,7 @@ class Sysmonitor(ProcessTaskBase):
         self.state_db.hmset(self.state_db.STATE_DB, key, statusvalue)
 
     #Reads the current status of the service and posts it to state db
-    def get_unit_status(self, event):
+    def get_unit_status(self, event, configdb_feature_table=None):
         """ Get a unit status"""
         global spl_srv_list
         unit_status = "NOT OK"
@@ -335,7 +471,7 @@ class Sysmonitor(ProcessTaskBase):
                         unit_status = "OK"
                     elif active_state == "active" and sub_state == "running":
                         service_status = "OK"
-                        init_state,app_fail_reason,update_time = self.get_app_ready_status(service_name)
+                        init_state,app_fail_reason,update_time = self.get_app_ready_status(service_name, configdb_feature_table)
                         if init_state == "Up":
                             service_up_status = "OK"
                             unit_status = "OK"
@@ -378,8 +514,13 @@ class Sysmonitor(ProcessTaskBase):
         scan_srv_list = []
 
         scan_srv_list = self.get_all_service_list()
+        self.load_unit_properties(scan_srv_list)
+        if not self.config_db:
+            self.config_db = swsscommon.ConfigDBConnector(use_unix_socket_path=True)
+            self.config_db.connect()
+        configdb_feature_table = self.config_db.get_table('FEATURE')
         for service in scan_srv_list:
-            ustate = self.get_unit_status(service)
+            ustate = self.get_unit_status(service, configdb_feature_table)
             if ustate == "NOT OK":
                 if service not in self.dnsrvs_name:
                     self.dnsrvs_name.add(service)
@@ -416,15 +557,23 @@ class Sysmonitor(ProcessTaskBase):
         except Exception as e:
             logger.log_error("update system status exception:{}".format(str(e)))
 
+    #Reads the properties of the units in bulk
+    def load_unit_properties(self, units):
+        try:
+            self.unit_cache.load_units(units)
+        except Exception as e:
+            logger.log_debug("Failed to load unit properties over D-Bus: {}".format(str(e)))
+
     #Checks a service status and updates the system status
-    def check_unit_status(self, event):
+    def check_unit_status(self, event, full_srv_list=None):
         #global dnsrvs_name
         if not self.state_db:
             self.state_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
             self.state_db.connect(self.state_db.STATE_DB)
         astate = "DOWN"
 
-        full_srv_list = self.get_all_service_list()
+        if full_srv_list is None:
+            full_srv_list = self.get_all_service_list()
         if event in full_srv_list:
             ustate = self.get_unit_status(event)
             if ustate == "OK" and system_allsrv_state == "UP":
@@ -465,6 +614,51 @@ class Sysmonitor(ProcessTaskBase):
 
         return 0
 
+    #Collects the events received within EVENT_COALESCE_WINDOW after msg, the unit properties
+    #carried by the events are applied to the cache
+    def collect_events(self, msg):
+        """
+        Returns:
+            (list, bool): units to check in the order of the events, True if stop is requested
+        """
+        from queue import Empty
+        events = []
+        deadline = time.monotonic() + EVENT_COALESCE_WINDOW
+        while True:
+            if msg == "stop":
+                return events, True
+
+            event = msg["unit"]
+            event_src = msg["evt_src"]
+            event_time = msg["time"]
+            logger.log_debug("Main process- received event:{} from source:{} time:{}".format(event,event_src,event_time))
+            if event_src == "props":
+                self.unit_cache.update(event, msg["props"], msg["invalidated"])
+            elif event_src == "reload":
+                self.unit_cache.invalidate()
+            else:
+                if event_src == "sysbus":
+                    # The job may be removed before the new unit state is signaled
+                    self.unit_cache.invalidate(event)
+                if event not in events:
+                    events.append(event)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return events, False
+            try:
+                msg = self.myQ.get(timeout=remaining)
+            except Empty:
+                return events, False
+
+    #Checks the units of the collected events and updates the system status
+    def check_units_status(self, events):
+        full_srv_list = self.get_all_service_list()
+        self.load_unit_properties([event for event in events if event in full_srv_list])
+        for event in events:
+            logger.log_info("check_unit_status for [ "+event+" ] ")
+            self.check_unit_status(event, full_srv_list)
+
     def system_service(self):
         if not self.state_db:
             self.state_db = swsscommon.SonicV2Connector(use_unix_socket_path=True)
@@ -489,14 +683,11 @@ class Sysmonitor(ProcessTaskBase):
         while True:
             try:
                 msg = self.myQ.get(timeout=QUEUE_TIMEOUT)
-                if msg == "stop":
+                events, stop = self.collect_events(msg)
+                if events:
+                    self.check_units_status(events)
+                if stop:
                     break
-                event = msg["unit"]
-                event_src = msg["evt_src"]
-                event_time = msg["time"]
-                logger.log_debug("Main process- received event:{} from source:{} time:{}".format(event,event_src,event_time))
-                logger.log_info("check_unit_status for [ "+event+" ] ")
-                self.check_unit_status(event)
             except (Empty, EOFError):
                 pass
             except Exception as e:
@@ -1,3 +1,5 @@
+import subprocess
+
 from .health_checker import HealthChecker
 from . import utils
 
@@ -20,14 +22,18 @@ class UserDefinedChecker(HealthChecker):
     Device3:Out of power
     """
 
-    def __init__(self, cmd):
+    def __init__(self, cmd, timeout=None):
         """
         Constructor.
         :param cmd: Command string of the user defined checker.
+        :param timeout: Timeout in seconds of the command, None to wait till the command exits.
         """
         HealthChecker.__init__(self)
         self._cmd = cmd
         self._category = None
+        self.timeout = timeout
+        # True if the command timed out in the last check
+        self.timed_out = False
 
     def reset(self):
         self._category = 'UserDefine'
@@ -43,8 +49,16 @@ class UserDefinedChecker(HealthChecker):
         :return:
         """
         self.reset()
+        self.timed_out = False
+
+        try:
+            output = utils.run_command(self._cmd, self.timeout)
+        except subprocess.TimeoutExpired:
+            self.timed_out = True
+            self.set_object_not_ok('UserDefine', str(self),
+                                   'Command \"{}\" timed out after {} seconds'.format(self._cmd, self.timeout))
+            return
 
-        output = utils.run_command(self._cmd)
         if not output:
             self.set_object_not_ok('UserDefine', str(self), 'Failed to get output of command \"{}\"'.format(self._cmd))
             return
@@ -1,15 +1,28 @@
+import os
+import signal
 import subprocess
 
 
-def run_command(command):
+def run_command(command, timeout=None):
     """
     Utility function to run an shell command and return the output.
     :param command: Shell command string.
+    :param timeout: Timeout in seconds, None to wait till the command exits. On timeout, the command and the processes
+    it started are killed and subprocess.TimeoutExpired is raised.
     :return: Output of the shell command.
     """
     try:
-        process = subprocess.Popen(command, shell=True, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return process.communicate()[0]
+        process = subprocess.Popen(command, shell=True, universal_newlines=True, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, start_new_session=timeout is not None)
+    except Exception:
+        return None
+
+    try:
+        return process.communicate(timeout=timeout)[0]
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        raise
     except Exception:
         return None
 
@@ -0,0 +1,138 @@
+"""
+Benchmark of the STATE_DB reads of HardwareChecker.
+
+Run from src/system-health:
+    python tests/benchmark_hardware_checker.py [--asics N] [--fans N] [--psus N] [--rtt-us N] [--rounds N]
+    python tests/benchmark_hardware_checker.py --device [--rounds N]
+
+Without --device, STATE_DB is a mock populated with N ASIC temperature sensors,
+N fans and N PSUs, and every request to it costs one simulated round trip of
+--rtt-us. A full check is measured with the entries read key by key and with
+the snapshot script. With --device, the STATE_DB of this device is read both
+ways.
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+import time
+import timeit
+
+from mock import patch
+
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+
+sys.path.insert(0, os.path.join(TEST_DIR, '..'))
+
+from health_checker.config import Config
+from health_checker.hardware_checker import HardwareChecker
+
+
+class MockStateDb(object):
+    """
+    STATE_DB with a simulated round trip per request.
+    """
+    STATE_DB = 'STATE_DB'
+
+    def __init__(self, data, rtt):
+        self.data = data
+        self.rtt = rtt
+        self.requests = 0
+
+    def connect(self, db_id):
+        pass
+
+    def request(self):
+        self.requests += 1
+        deadline = time.perf_counter() + self.rtt
+        while time.perf_counter() < deadline:
+            pass
+
+    def keys(self, db_id, pattern):
+        self.request()
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    def get_all(self, db_id, key):
+        self.request()
+        return dict(self.data.get(key, {}))
+
+    def script(self, args):
+        self.request()
+        reply = []
+        for pattern in args:
+            for key in self.data:
+                if fnmatch.fnmatchcase(key, pattern):
+                    reply.append(key)
+                    reply.append([item for field_value in self.data[key].items() for item in field_value])
+        return reply
+
+
+def create_state_db(asics, fans, psus):
+    data = {}
+    for i in range(asics):
+        data['TEMPERATURE_INFO|ASIC {}'.format(i)] = {'temperature': '45.0', 'high_threshold': '105.0'}
+        data['TEMPERATURE_INFO|Board sensor {}'.format(i)] = {'temperature': '35.0', 'high_threshold': '80.0'}
+    for i in range(fans):
+        data['FAN_INFO|fan{}'.format(i + 1)] = {
+            'presence': 'True', 'status': 'True', 'speed': '60', 'speed_target': '60',
+            'is_under_speed': 'False', 'is_over_speed': 'False', 'direction': 'intake'
+        }
+    for i in range(psus):
+        data['PSU_INFO|PSU {}'.format(i + 1)] = {
+            'presence': 'True', 'status': 'True', 'temp': '40', 'temp_threshold': '80',
+            'voltage': '12', 'voltage_min_threshold': '11', 'voltage_max_threshold': '13'
+        }
+    return data
+
+
+def bench_mock(args):
+    db = MockStateDb(create_state_db(args.asics, args.fans, args.psus), args.rtt_us / 1e6)
+    with patch('health_checker.hardware_checker.SonicV2Connector', return_value=db), \
+            patch('sonic_py_common.device_info.get_platform', return_value='benchmark'):
+        checker = HardwareChecker()
+        config = Config()
+
+    print("ASIC sensors: {}, fans: {}, PSUs: {}, round trip: {} us".format(args.asics, args.fans, args.psus, args.rtt_us))
+    print("{:<20} {:>10} {:>10}".format("read", "requests", "ms/check"))
+    for name, script in (("key by key", None), ("snapshot script", db.script)):
+        checker._reader._script_loaded = True
+        checker._reader._script = script
+        db.requests = 0
+        checker.check(config)
+        requests = db.requests
+        elapsed = min(timeit.repeat(lambda: checker.check(config), number=1, repeat=args.rounds))
+        print("{:<20} {:>10} {:>10.2f}".format(name, requests, elapsed * 1000))
+
+
+def bench_device(args):
+    checker = HardwareChecker()
+    patterns = [pattern + '*' for pattern in (HardwareChecker.ASIC_TEMPERATURE_KEY,
+                                              HardwareChecker.FAN_TABLE_NAME,
+                                              HardwareChecker.PSU_TABLE_NAME)]
+    entries = checker._reader.read(patterns)
+    print("entries: {}".format(len(entries)))
+    print("{:<20} {:>10}".format("read", "ms"))
+    for name, read in (("key by key", checker._reader.read_per_key), ("snapshot script", checker._reader.read)):
+        elapsed = min(timeit.repeat(lambda: read(patterns), number=1, repeat=args.rounds))
+        print("{:<20} {:>10.2f}".format(name, elapsed * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the STATE_DB reads of HardwareChecker")
+    parser.add_argument('--asics', type=int, default=48, help="number of ASIC temperature sensors")
+    parser.add_argument('--fans', type=int, default=96, help="number of fans")
+    parser.add_argument('--psus', type=int, default=24, help="number of PSUs")
+    parser.add_argument('--rtt-us', type=int, default=100, help="simulated round trip of a request")
+    parser.add_argument('--rounds', type=int, default=20, help="rounds of each measurement")
+    parser.add_argument('--device', action='store_true', help="read the STATE_DB of this device")
+    args = parser.parse_args()
+
+    if args.device:
+        bench_device(args)
+    else:
+        bench_mock(args)
+
+
+if __name__ == '__main__':
+    main()
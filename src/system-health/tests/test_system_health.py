@@ -10,9 +10,17 @@
         3. Config
 """
 import copy
+import json
 import os
+import shutil
+import socket
+import subprocess
 import sys
+import tempfile
+import threading
+import time
 import docker
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
 from imp import load_source
 from swsscommon import swsscommon
 
@@ -36,10 +44,13 @@ from health_checker.hardware_checker import HardwareChecker
 from health_checker.health_checker import HealthChecker
 from health_checker.manager import HealthCheckerManager
 from health_checker.service_checker import ServiceChecker
+from health_checker.state_db_snapshot import StateDbSnapshotReader
 from health_checker.user_defined_checker import UserDefinedChecker
 from health_checker.sysmonitor import Sysmonitor
 from health_checker.sysmonitor import MonitorStateDbTask
 from health_checker.sysmonitor import MonitorSystemBusTask
+from health_checker.sysmonitor import SystemdUnitCache
+from health_checker.sysmonitor import unit_name_from_path
 
 load_source('healthd', os.path.join(scripts_path, 'healthd'))
 from healthd import HealthDaemon
@@ -83,6 +94,14 @@ def test_user_defined_checker(mock_run):
     assert 'Device2' in checker._info
     assert checker._info['Device1'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
     assert checker._info['Device2'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+    assert not checker.timed_out
+
+    mock_run.side_effect = subprocess.TimeoutExpired('some check', 10)
+    checker.timeout = 10
+    checker.check(None)
+    assert checker.timed_out
+    assert checker._info[str(checker)][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+    assert checker._info[str(checker)][HealthChecker.INFO_FIELD_OBJECT_MSG] == 'Command "" timed out after 10 seconds'
 
 
 @patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
@@ -169,6 +188,74 @@ def test_service_checker_single_asic(mock_config_db, mock_run, mock_docker_clien
     assert origin_container_critical_processes == checker.container_critical_processes
 
 
+class UnixXMLRPCRequestHandler(SimpleXMLRPCRequestHandler):
+    disable_nagle_algorithm = False
+
+
+class UnixXMLRPCServer(SimpleXMLRPCServer):
+    address_family = socket.AF_UNIX
+
+
+def start_supervisord_mock(container_folder, process_info):
+    socket_dir = os.path.join(container_folder, 'var', 'run')
+    os.makedirs(socket_dir)
+    server = UnixXMLRPCServer(os.path.join(socket_dir, 'supervisor.sock'), requestHandler=UnixXMLRPCRequestHandler,
+                              logRequests=False)
+    server.register_function(lambda: process_info, 'supervisor.getAllProcessInfo')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+@patch('health_checker.utils.run_command')
+def test_service_checker_query_process_status(mock_run):
+    mock_run.return_value = mock_supervisorctl_output
+    container_folder = tempfile.mkdtemp()
+    server = start_supervisord_mock(container_folder, [
+        {'name': 'orchagent', 'group': 'orchagent', 'statename': 'RUNNING'},
+        {'name': 'portsyncd', 'group': 'orchagent', 'statename': 'EXITED'},
+    ])
+    try:
+        checker = ServiceChecker()
+        checker.container_folders = {'swss': container_folder}
+        checker.query_process_status(['swss', 'snmp'])
+        assert checker.container_process_status == {
+            'swss': {'orchagent': 'RUNNING', 'orchagent:portsyncd': 'EXITED'},
+            'snmp': {'snmpd': 'RUNNING', 'snmp-subagent': 'EXITED'}
+        }
+        # only the container without reachable supervisord is checked by supervisorctl
+        mock_run.assert_called_once_with(ServiceChecker.SUPERVISORCTL_STATUS_CMD.format('snmp'),
+                                         timeout=ServiceChecker.CONTAINER_CHECK_TIMEOUT)
+        assert set(checker.container_check_durations.keys()) == {'swss', 'snmp'}
+
+        # the workers are kept for the next check
+        executor = checker.executor
+        checker.query_process_status(['swss'])
+        assert checker.executor is executor
+        assert list(checker.process_status_futures) == ['swss']
+
+        checker.container_feature_dict = {'swss': 'swss'}
+        feature_table = {'swss': {'state': 'enabled'}}
+        checker.check_process_existence('swss', ['orchagent', 'portsyncd', 'orchagent:portsyncd'], None, feature_table)
+        assert checker._info['swss:orchagent'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_OK
+        assert checker._info['swss:orchagent:portsyncd'][HealthChecker.INFO_FIELD_OBJECT_STATUS] == HealthChecker.STATUS_NOT_OK
+        assert 'swss:portsyncd' not in checker._info
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(container_folder)
+
+
+@patch('health_checker.utils.run_command')
+def test_service_checker_supervisorctl_timeout(mock_run):
+    mock_run.side_effect = subprocess.TimeoutExpired(ServiceChecker.SUPERVISORCTL_STATUS_CMD.format('snmp'),
+                                                     ServiceChecker.CONTAINER_CHECK_TIMEOUT)
+    checker = ServiceChecker()
+    checker.query_process_status(['snmp'])
+    assert checker.container_process_status == {'snmp': None}
+
+
 @patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
 @patch('health_checker.service_checker.ServiceChecker._get_container_folder', MagicMock(return_value=telemetry_path))
 @patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
@@ -522,6 +609,106 @@ def test_hardware_checker():
     assert checker._info['PSU 7'][HealthChecker.INFO_FIELD_OBJECT_MSG] == 'System power exceeds threshold but power_critical_threshold is invalid'
 
 
+@patch.dict(MockConnector.data, {
+    'TEMPERATURE_INFO|ASIC': {'temperature': '20', 'high_threshold': '21'},
+    'FAN_INFO|fan1': {'presence': 'True', 'status': 'True', 'speed': '60', 'speed_target': '60',
+                      'is_under_speed': 'False', 'is_over_speed': 'False', 'direction': 'intake'},
+    'PSU_INFO|PSU 1': {'presence': 'True', 'status': 'True', 'temp': '55', 'temp_threshold': '100',
+                       'voltage': '10', 'voltage_min_threshold': '8', 'voltage_max_threshold': '15'}
+}, clear=True)
+def test_hardware_checker_incremental():
+    config = Config()
+    config.incremental_check = True
+    checker = HardwareChecker()
+    checker.check(config)
+    assert HealthChecker.STATUS_NOT_OK not in [data['status'] for data in checker._info.values()]
+
+    with patch.object(MockConnector, 'get_all') as mock_get_all, patch.object(MockConnector, 'keys') as mock_keys:
+        checker.update(config, {
+            'FAN_INFO': {'fan2': {'presence': 'False'}},
+            'TEMPERATURE_INFO': {'Cpu temp sensor': {'temperature': '80', 'high_threshold': '70'}}
+        })
+        assert checker._info['fan2']['status'] == HealthChecker.STATUS_NOT_OK
+        assert checker._info['fan1']['status'] == HealthChecker.STATUS_OK
+        assert checker._info['PSU 1']['status'] == HealthChecker.STATUS_OK
+        assert 'Cpu temp sensor' not in checker._info
+
+        checker.update(config, {'FAN_INFO': {'fan2': None}, 'PSU_INFO': {'PSU 1': {'presence': 'True', 'status': 'False'}}})
+        assert 'fan2' not in checker._info
+        assert checker._info['PSU 1']['status'] == HealthChecker.STATUS_NOT_OK
+
+        mock_get_all.assert_not_called()
+        mock_keys.assert_not_called()
+
+    # the full check reads the entries again
+    checker.check(config)
+    assert checker._info['PSU 1']['status'] == HealthChecker.STATUS_OK
+
+
+def mock_snapshot_script(args):
+    # Reply of the snapshot script: the matching keys, each followed by its fields and values
+    reply = []
+    for pattern in args:
+        for key in MockConnector(use_unix_socket_path=True).keys(None, pattern):
+            reply.append(key)
+            reply.append([item for field_value in MockConnector.data[key].items() for item in field_value])
+    return reply
+
+
+@patch.dict(MockConnector.data, {
+    'TEMPERATURE_INFO|ASIC': {'temperature': '20', 'high_threshold': '21'},
+    'TEMPERATURE_INFO|Cpu temp sensor': {'temperature': '80', 'high_threshold': '70'},
+    'FAN_INFO|fan1': {'presence': 'True', 'status': 'True'},
+    'PSU_INFO|PSU 1': {'presence': 'True', 'status': 'False'}
+}, clear=True)
+def test_state_db_snapshot_reader():
+    patterns = ['TEMPERATURE_INFO|ASIC*', 'FAN_INFO*', 'PSU_INFO*']
+    reader = StateDbSnapshotReader(MockConnector(use_unix_socket_path=True))
+    reader._script_loaded = True
+    reader._script = MagicMock(side_effect=mock_snapshot_script)
+    with patch.object(MockConnector, 'get_all') as mock_get_all:
+        entries = reader.read(patterns)
+        mock_get_all.assert_not_called()
+    assert entries == {key: MockConnector.data[key] for key in ('TEMPERATURE_INFO|ASIC', 'FAN_INFO|fan1', 'PSU_INFO|PSU 1')}
+    assert reader._script.call_count == 1
+    assert entries == reader.read_per_key(patterns)
+
+    # the entries are read key by key if the script fails
+    reader._script.side_effect = Exception('NOSCRIPT')
+    assert reader.read(patterns) == entries
+
+
+def test_manager_check_changes():
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    hardware_checker = MagicMock()
+    hardware_checker.__str__.return_value = 'HardwareChecker'
+    hardware_checker.get_category.return_value = 'Hardware'
+    hardware_checker.get_subscribed_tables.return_value = ['FAN_INFO']
+    hardware_checker.get_info.return_value = {'fan1': {'type': 'Fan', 'message': '', 'status': 'OK'}}
+    service_checker = MagicMock()
+    service_checker.__str__.return_value = 'ServiceChecker'
+    service_checker.get_category.return_value = 'Services'
+    service_checker.get_subscribed_tables.return_value = ['FEATURE']
+    service_checker.get_info.return_value = {'snmp': {'type': 'Service', 'message': 'down', 'status': 'Not OK'}}
+    manager._checkers = [service_checker, hardware_checker]
+    assert manager.get_subscribed_tables() == {'FAN_INFO', 'FEATURE'}
+
+    stat = manager.check(chassis)
+    assert stat['Services']['snmp']['status'] == 'Not OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_NOT_OK
+
+    changes = {'FEATURE': {'snmp': {'state': 'enabled'}}}
+    service_checker.get_info.return_value = {'snmp': {'type': 'Service', 'message': '', 'status': 'OK'}}
+    stat = manager.check_changes(chassis, changes)
+    service_checker.update.assert_called_once_with(manager.config, changes)
+    hardware_checker.update.assert_not_called()
+    assert list(manager.checker_durations.keys()) == ['ServiceChecker']
+    assert stat['Services']['snmp']['status'] == 'OK'
+    assert stat['Hardware']['fan1']['status'] == 'OK'
+    assert HealthChecker.summary == HealthChecker.STATUS_OK
+
+
 def test_config():
     config = Config()
     config._config_file = os.path.join(test_path, Config.CONFIG_FILE)
@@ -529,6 +716,8 @@ def test_config():
     assert config.config_file_exists()
     config.load_config()
     assert config.interval == 60
+    assert not config.incremental_check
+    assert config.reconciliation_interval == Config.DEFAULT_RECONCILIATION_INTERVAL
     assert 'dummy_service' in config.ignore_services
     assert 'psu.voltage' in config.ignore_devices
     assert len(config.user_defined_checkers) == 0
@@ -598,6 +787,10 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
             'status': 'OK'
         }
     }
+    # user defined checkers run in the background, their results are reported by the next check
+    stat = manager.check(chassis)
+    assert 'UserDefine' not in stat
+    manager.wait_user_defined_checkers()
     stat = manager.check(chassis)
     assert 'Services' in stat
     assert stat['Services']['snmp:snmpd']['status'] == 'OK'
@@ -608,10 +801,14 @@ def test_manager(mock_hw_info, mock_service_info, mock_udc_info):
 
     assert 'UserDefine' in stat
     assert stat['UserDefine']['udc']['status'] == 'OK'
+    assert set(manager.checker_durations.keys()) == {'ServiceChecker', 'HardwareChecker', 'UserDefinedChecker - some check'}
 
     mock_hw_info.side_effect = RuntimeError()
     mock_service_info.side_effect = RuntimeError()
     mock_udc_info.side_effect = RuntimeError()
+    manager.wait_user_defined_checkers()
+    manager.check(chassis)
+    manager.wait_user_defined_checkers()
     stat = manager.check(chassis)
     assert 'Internal' in stat
     assert stat['Internal']['ServiceChecker']['status'] == 'Not OK'
@@ -631,6 +828,91 @@ def test_utils():
     output = utils.run_command('ls')
     assert output
 
+    begin = time.monotonic()
+    try:
+        utils.run_command('sleep 5; echo done', timeout=0.2)
+        assert False
+    except subprocess.TimeoutExpired:
+        pass
+    assert time.monotonic() - begin < 2
+
+
+def test_config_user_defined_checkers():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        config = Config()
+        config._config_file = os.path.join(tmp_dir, Config.CONFIG_FILE)
+        with open(config._config_file, 'w') as f:
+            json.dump({'user_defined_checkers': ['check1', {'command': 'check2', 'timeout': 5, 'interval': 300}]}, f)
+        config.load_config()
+        assert config.user_defined_checkers == {'check1', 'check2'}
+        assert config.get_user_defined_checker_setting('check1', 'timeout') == Config.DEFAULT_USER_DEFINED_CHECKER_SETTINGS['timeout']
+        assert config.get_user_defined_checker_setting('check2', 'timeout') == 5
+        assert config.get_user_defined_checker_setting('check2', 'interval') == 300
+        assert config.get_user_defined_checker_setting('check2', 'ttl') == 0
+
+        config._reset()
+        assert not config.user_defined_checkers
+        assert config.get_user_defined_checker_setting('check2', 'timeout') == Config.DEFAULT_USER_DEFINED_CHECKER_SETTINGS['timeout']
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_manager_user_defined_checkers():
+    chassis = MagicMock()
+    manager = HealthCheckerManager()
+    manager._checkers = []
+    slow_check = 'sleep 0.5; printf "Slow\\nobj1:OK\\n"'
+    cached_check = 'sleep 0.5; printf "Cached\\nobj2:OK\\n"'
+    hung_check = 'sleep 5'
+    manager.config.user_defined_checkers = {slow_check, cached_check, hung_check}
+    manager.config.user_defined_checker_settings = {
+        cached_check: {'interval': 300},
+        hung_check: {'timeout': 1}
+    }
+
+    # the checkers run concurrently in the background, the check doesn't wait for them
+    begin = time.monotonic()
+    stat = manager.check(chassis)
+    assert time.monotonic() - begin < 0.5
+    assert not stat
+    manager.wait_user_defined_checkers()
+    assert time.monotonic() - begin < 2
+    stat = manager.check(chassis)
+    assert stat['Slow']['obj1']['status'] == HealthChecker.STATUS_OK
+    assert stat['Cached']['obj2']['status'] == HealthChecker.STATUS_OK
+    assert stat['UserDefine']['UserDefinedChecker - sleep 5']['status'] == HealthChecker.STATUS_NOT_OK
+    assert manager.checker_timeouts == {'UserDefinedChecker - sleep 5': 1}
+    assert len(manager.checker_durations) == 3
+
+    # the result of the checker is reused till its interval elapsed
+    manager.wait_user_defined_checkers()
+    stat = manager.check(chassis)
+    assert stat['Cached']['obj2']['status'] == HealthChecker.STATUS_OK
+    assert 'UserDefinedChecker - {}'.format(cached_check) not in manager.checker_durations
+    assert manager.checker_timeouts == {'UserDefinedChecker - sleep 5': 2}
+
+    # the last good result is reused till its TTL expires when the command times out
+    manager.config.user_defined_checker_settings[slow_check] = {'timeout': 0.1, 'ttl': 300}
+    manager.wait_user_defined_checkers()
+    manager.check(chassis)
+    manager.wait_user_defined_checkers()
+    stat = manager.check(chassis)
+    assert stat['Slow']['obj1']['status'] == HealthChecker.STATUS_OK
+    assert manager.checker_timeouts['UserDefinedChecker - {}'.format(slow_check)] == 1
+
+    manager.config.user_defined_checker_settings[slow_check] = {'timeout': 0.1}
+    manager.wait_user_defined_checkers()
+    stat = manager.check(chassis)
+    assert 'Slow' not in stat
+
+    # the removed checkers are dropped
+    manager.config.user_defined_checkers = {cached_check}
+    stat = manager.check(chassis)
+    assert list(manager._user_defined_checkers) == [cached_check]
+    assert set(stat) == {'Cached'}
+    assert manager.checker_timeouts == {}
+
 
 @patch('swsscommon.swsscommon.ConfigDBConnector.connect', MagicMock())
 @patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=False))
@@ -896,6 +1178,114 @@ def test_system_service():
     sysmon.task_stop()
 
 
+def test_unit_name_from_path():
+    assert unit_name_from_path('/org/freedesktop/systemd1/unit/swss_2eservice') == 'swss.service'
+    assert unit_name_from_path('/org/freedesktop/systemd1/unit/swss_400_2eservice') == 'swss@0.service'
+    assert unit_name_from_path('/org/freedesktop/systemd1/unit/mock_5fbgp_2eservice') == 'mock_bgp.service'
+
+
+def mock_systemd_bus(units):
+    mock_dbus = MagicMock()
+    mock_dbus.exceptions.DBusException = Exception
+    manager = MagicMock()
+    manager.LoadUnit = MagicMock(side_effect=lambda unit: '/org/freedesktop/systemd1/unit/' + unit)
+    manager.ListUnits = MagicMock(side_effect=lambda: [
+        (unit, '', props['LoadState'], props['ActiveState'], props['SubState'], '', '/unit/' + unit, 0, '', '/')
+        for unit, props in units.items()])
+
+    def get_all(path, interface):
+        props = units[path.rsplit('/', 1)[-1]]
+        if interface == 'org.freedesktop.systemd1.Unit':
+            return {name: props[name] for name in SystemdUnitCache.UNIT_PROPERTIES}
+        return {name: props[name] for name in SystemdUnitCache.UNIT_TYPE_PROPERTIES}
+
+    def interface(obj, name):
+        if name == 'org.freedesktop.systemd1.Manager':
+            return manager
+        properties = MagicMock()
+        properties.GetAll = MagicMock(side_effect=lambda iface: get_all(obj, iface))
+        return properties
+
+    mock_dbus.SystemBus.return_value.get_object = MagicMock(side_effect=lambda bus_name, path: path)
+    mock_dbus.Interface = MagicMock(side_effect=interface)
+    return mock_dbus, manager
+
+
+def test_systemd_unit_cache():
+    units = copy.deepcopy(mock_srv_props)
+    mock_dbus, manager = mock_systemd_bus(units)
+    with patch.dict(sys.modules, {'dbus': mock_dbus}):
+        cache = SystemdUnitCache()
+        assert cache.get_properties('mock_bgp.service') == mock_srv_props['mock_bgp.service']
+        assert cache.get_properties('mock_bgp.service') == mock_srv_props['mock_bgp.service']
+        assert manager.LoadUnit.call_count == 1
+
+        # cached units are refreshed from one ListUnits call
+        units['mock_bgp.service']['ActiveState'] = 'active'
+        units['mock_bgp.service']['SubState'] = 'running'
+        cache.load_units(['mock_bgp.service', 'mock_radv.service'])
+        assert manager.ListUnits.call_count == 1
+        assert manager.LoadUnit.call_count == 2
+        assert cache.get_properties('mock_bgp.service')['ActiveState'] == 'active'
+        assert cache.get_properties('mock_radv.service') == mock_srv_props['mock_radv.service']
+
+        cache.update('mock_bgp.service', {'ActiveState': 'failed', 'Result': 'exit-code'}, [])
+        assert cache.get_properties('mock_bgp.service')['ActiveState'] == 'failed'
+        assert cache.get_properties('mock_bgp.service')['Result'] == 'exit-code'
+        cache.update('mock_bgp.service', {}, ['Result'])
+        assert 'mock_bgp.service' not in cache.units
+        cache.invalidate()
+        assert not cache.units
+
+
+@patch('health_checker.sysmonitor.SystemdUnitCache.get_properties', MagicMock(side_effect=Exception('no bus')))
+@patch('health_checker.utils.run_command')
+def test_run_systemctl_show_fallback(mock_run):
+    mock_run.return_value = 'Id=mock_bgp.service\nLoadState=loaded\nActiveState=active\n'
+    sysmon = Sysmonitor()
+    result = sysmon.run_systemctl_show('mock_bgp.service')
+    assert result['Id'] == 'mock_bgp.service'
+    assert result['ActiveState'] == 'active'
+    assert mock_run.call_count == 1
+
+
+def test_collect_events():
+    sysmon = Sysmonitor()
+    sysmon.myQ = mpmgr.Queue()
+    sysmon.unit_cache.units = {
+        'mock_bgp.service': dict(mock_srv_props['mock_bgp.service']),
+        'mock_radv.service': dict(mock_srv_props['mock_radv.service'])
+    }
+    for msg in [
+        {"unit": "mock_bgp.service", "evt_src": "props", "time": "-", "props": {"ActiveState": "active"}, "invalidated": []},
+        {"unit": "mock_radv.service", "evt_src": "sysbus", "time": "-"},
+        {"unit": "mock_snmp.service", "evt_src": "feature", "time": "-"},
+        {"unit": "mock_radv.service", "evt_src": "sysbus", "time": "-"}]:
+        sysmon.myQ.put(msg)
+
+    events, stop = sysmon.collect_events({"unit": "mock_snmp.service", "evt_src": "sysbus", "time": "-"})
+    assert events == ['mock_snmp.service', 'mock_radv.service']
+    assert not stop
+    assert sysmon.unit_cache.units['mock_bgp.service']['ActiveState'] == 'active'
+    assert 'mock_radv.service' not in sysmon.unit_cache.units
+
+    sysmon.myQ.put("stop")
+    events, stop = sysmon.collect_events({"unit": "mock_bgp.service", "evt_src": "feature", "time": "-"})
+    assert events == ['mock_bgp.service']
+    assert stop
+
+
+@patch('health_checker.sysmonitor.Sysmonitor.get_all_service_list', MagicMock(return_value=['mock_snmp.service', 'mock_bgp.service']))
+@patch('health_checker.sysmonitor.Sysmonitor.check_unit_status')
+@patch('health_checker.sysmonitor.SystemdUnitCache.load_units')
+def test_check_units_status(mock_load_units, mock_check_unit_status):
+    sysmon = Sysmonitor()
+    sysmon.check_units_status(['mock_bgp.service', 'mock_snmp.timer'])
+    mock_load_units.assert_called_once_with(['mock_bgp.service'])
+    assert mock_check_unit_status.call_count == 2
+    mock_check_unit_status.assert_called_with('mock_snmp.timer', ['mock_snmp.service', 'mock_bgp.service'])
+
+
 @patch('sonic_py_common.device_info.get_device_runtime_metadata', MagicMock(return_value=device_runtime_metadata))
 def test_get_service_from_feature_table():
     sysmon = Sysmonitor()
@@ -942,6 +1332,7 @@ def test_healthd_check_interval(mock_log_warning, mock_log_notice, mock_time):
 
     daemon.stop_event.wait.return_value = False
     manager.config.interval = 60
+    manager.config.incremental_check = False
     mock_time.side_effect = [0, 3, 0, 61, 0, 1]
     mock_log_notice.side_effect = no_op
     mock_log_warning.side_effect = no_op
@@ -952,3 +1343,112 @@ def test_healthd_check_interval(mock_log_warning, mock_log_notice, mock_time):
 
     daemon.stop_event.wait.return_value = True
     assert not daemon._run_checker(manager, chassis)
+
+    # in incremental mode, the full check runs every reconciliation interval
+    daemon._wait_for_changes = MagicMock(return_value=False)
+    manager.config.incremental_check = True
+    manager.config.reconciliation_interval = 600
+    mock_time.side_effect = [0, 3]
+    assert daemon._run_checker(manager, chassis)
+    daemon._wait_for_changes.assert_called_once_with(manager, chassis, 597)
+
+
+def test_healthd_process_durations():
+    daemon = HealthDaemon()
+    daemon._db = MagicMock()
+    daemon._process_durations({'ServiceChecker': 1.5, 'HardwareChecker': 0.25})
+    daemon._db.set.assert_any_call(daemon._db.STATE_DB, HealthDaemon.SYSTEM_HEALTH_STATS_TABLE_NAME, 'ServiceChecker', '1.500')
+    daemon._db.set.assert_any_call(daemon._db.STATE_DB, HealthDaemon.SYSTEM_HEALTH_STATS_TABLE_NAME, 'HardwareChecker', '0.250')
+
+
+def test_healthd_process_timeouts():
+    daemon = HealthDaemon()
+    daemon._db = MagicMock()
+    daemon._process_timeouts({'UserDefinedChecker - some check': 3})
+    daemon._db.set.assert_called_once_with(daemon._db.STATE_DB, HealthDaemon.SYSTEM_HEALTH_TIMEOUTS_TABLE_NAME,
+                                           'UserDefinedChecker - some check', '3')
+
+
+def test_healthd_process_stat():
+    daemon = HealthDaemon()
+    daemon._db = MagicMock()
+    redis_client = daemon._db.get_redis_client.return_value
+    HealthChecker.summary = HealthChecker.STATUS_NOT_OK
+    stat = {'Hardware': {
+        'fan1': {'type': 'Fan', 'message': 'fan1 is broken', 'status': 'Not OK'},
+        'fan2': {'type': 'Fan', 'message': '', 'status': 'OK'},
+    }}
+    daemon._db.get_all.return_value = {}
+    daemon._process_stat(None, None, stat)
+    daemon._db.delete_all_by_pattern.assert_called()
+    daemon._db.hmset.assert_called_once_with(daemon._db.STATE_DB, HealthDaemon.SYSTEM_HEALTH_TABLE_NAME,
+                                             {'fan1': 'fan1 is broken', 'summary': 'Not OK'})
+
+    # unchanged fields are not written again by the updates of check_changes
+    daemon._db.reset_mock()
+    daemon._process_stat(None, None, stat, full=False)
+    daemon._db.hmset.assert_not_called()
+    daemon._db.delete_all_by_pattern.assert_not_called()
+
+    HealthChecker.summary = HealthChecker.STATUS_OK
+    stat['Hardware']['fan1']['status'] = 'OK'
+    daemon._process_stat(None, None, stat, full=False)
+    daemon._db.hmset.assert_called_once_with(daemon._db.STATE_DB, HealthDaemon.SYSTEM_HEALTH_TABLE_NAME,
+                                             {'summary': 'OK'})
+    redis_client.hdel.assert_called_once_with(HealthDaemon.SYSTEM_HEALTH_TABLE_NAME, 'fan1')
+
+    # a full check writes the whole table and removes the fields it doesn't have, whoever wrote them
+    daemon._db.reset_mock()
+    redis_client.reset_mock()
+    daemon._db.get_all.return_value = {'summary': 'OK', 'fan3': 'fan3 is broken'}
+    daemon._process_stat(None, None, stat)
+    daemon._db.hmset.assert_called_once_with(daemon._db.STATE_DB, HealthDaemon.SYSTEM_HEALTH_TABLE_NAME,
+                                             {'summary': 'OK'})
+    redis_client.hdel.assert_called_once_with(HealthDaemon.SYSTEM_HEALTH_TABLE_NAME, 'fan3')
+
+
+@patch('healthd.StateDbSubscriber')
+def test_healthd_wait_for_changes(mock_subscriber_class):
+    daemon = HealthDaemon()
+    daemon._process_stat = MagicMock()
+    daemon._process_durations = MagicMock()
+    manager = MagicMock()
+    manager.config.incremental_check = True
+    manager.get_subscribed_tables.return_value = {'FAN_INFO'}
+    changes = {'FAN_INFO': {'fan1': None}}
+    mock_subscriber = mock_subscriber_class.return_value
+    mock_subscriber.tables = {'FAN_INFO'}
+    pending_changes = [changes]
+
+    def get_changes(timeout):
+        if pending_changes:
+            return pending_changes.pop()
+        time.sleep(timeout)
+        return {}
+    mock_subscriber.get_changes.side_effect = get_changes
+    assert not daemon._wait_for_changes(manager, None, 0.2)
+    mock_subscriber_class.assert_called_once_with({'FAN_INFO'})
+    manager.check_changes.assert_called_once_with(None, changes)
+    daemon._process_stat.assert_called_once_with(None, manager.config, manager.check_changes.return_value, full=False)
+
+    daemon.stop_event.set()
+    assert daemon._wait_for_changes(manager, None, 10)
+    mock_subscriber_class.assert_called_once()
+
+
+def test_state_db_subscriber():
+    from health_checker import state_db_subscriber
+    with patch.object(state_db_subscriber, 'swsscommon') as mock_swsscommon:
+        mock_swsscommon.Select.OBJECT = 'object'
+        mock_swsscommon.Select.TIMEOUT = 'timeout'
+        fan_table = MagicMock()
+        fan_table.getFd.return_value = 1
+        fan_table.pop.side_effect = [('fan1', 'SET', (('presence', 'True'),)), ('fan2', 'DEL', ())]
+        psu_table = MagicMock()
+        psu_table.getFd.return_value = 2
+        mock_swsscommon.SubscriberStateTable.side_effect = lambda db, table: fan_table if table == 'FAN_INFO' else psu_table
+        subscriber = state_db_subscriber.StateDbSubscriber(['FAN_INFO', 'PSU_INFO'])
+        sel = mock_swsscommon.Select.return_value
+        sel.select.side_effect = [('object', fan_table), ('object', fan_table), ('timeout', None)]
+        assert subscriber.get_changes(1) == {'FAN_INFO': {'fan1': {'presence': 'True'}, 'fan2': None}}
+        assert [c[0][0] for c in sel.select.call_args_list] == [1000, 0, 0]